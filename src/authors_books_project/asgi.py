@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'authors_books_project.settings')
+os.environ.setdefault('SERVER_INTERFACE', 'asgi') # ПОДКЛЮЧЕНИЯ К БД ПОД ASGI ПОВТОРНО ИСПОЛЬЗУЮТСЯ ТОЛЬКО ЧЕРЕЗ ПУЛ (см. DB_POOL в settings.py)
 
 application = get_asgi_application()
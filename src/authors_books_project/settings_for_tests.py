@@ -61,6 +61,11 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
     ],
+    # КОМПАКТНЫЙ JSON ДЛЯ КЛИЕНТОВ API (С ОТСТУПАМИ - ТОЛЬКО ПО ?pretty=1) И БРАУЗЕРНЫЙ ИНТЕРФЕЙС DRF:
+    "DEFAULT_RENDERER_CLASSES": [
+        "kinopoiskapiunofficial_tech_app.renderers.CompactJSONRenderer",
+        "kinopoiskapiunofficial_tech_app.renderers.UTF8BrowsableAPIRenderer",
+    ],
 }
 
 # СИСТЕМА ХУКОВ ДЛЯ ОБРАБОТКИ ЗАПРОСОВ/ОТВЕТОВ ВО ФРЕЙМВОРКЕ:
@@ -72,6 +77,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware', # ЭТО ВСТРОЕННОЕ ПО, КОТОРОЕ ОТВЕЧАЕТ ЗА АУТЕНТИФИКАЦИЮ ПОЛЬЗОВАТЕЛЕЙ (ОНО СВЯЗЫВАЕТ КАЖДОГО ПОЛЬЗОВАТЕЛЯ С ЕГО СЕССИЕЙ И ПРЕДОСТАВЛЯЕТ ДОСТУП К ИНФОРМАЦИИ О ТЕКУЩЕМ ПОЛЬЗОВАТЕЛЕ В КАЖДОМ ЗАПРОСЕ)
     'django.contrib.messages.middleware.MessageMiddleware', # ЭТО ВСТРОЕННОЕ ПО ОТВЕЧАЕТ ЗА ОБРАБОТКУ ЗАПРОСОВ/ОТВЕТОВ ДЛЯ РАБОТЫ С ОДНОРАЗОВЫМИ СООБЩЕНИЯМИ (flash messages) (которые чаще всего применяются с такими методами как success(), info(), warning(), error() и debug()), ИСПОЛЬЗУЕМЫМИ ДЛЯ ПЕРЕДАЧИ ИНФОРМАЦИИ ПОЛЬЗОВАТЕЛЮ ПОСЛЕ ВЫПОЛНЕНИЯ ОПРЕДЕЛЁННЫХ ДЕЙСТВИЙ
     'django.middleware.clickjacking.XFrameOptionsMiddleware', # ЭТО ВСТРОЕННОЕ ПО ОТВЕЧАЕТ ЗА ЗАЩИТУ ОТ АТАК ТИПА clickjacking, CSRF И Т.Д...
+    'kinopoiskapiunofficial_tech_app.db_routing.ReplicaRoutingMiddleware', # ЭТО ПО РАЗРЕШАЕТ ЧТЕНИЕ С РЕПЛИК БД ДЛЯ ЗАПРОСОВ НА ЧТЕНИЕ К СПИСКАМ, СТРАНИЦАМ ЗАПИСЕЙ И ГЛАВНОЙ СТРАНИЦЕ
 
     "debug_toolbar.middleware.DebugToolbarMiddleware", # ЭТО ДОПОЛНИТЕЛЬНОЕ ПО ДЛЯ ОТЛАДКИ И АНАЛИЗА ПРОИЗВОДИТЕЛЬНОСТИ ВЕБ-ПРИЛОЖЕНИЙ
 ]
@@ -173,3 +179,102 @@ INTERNAL_IPS = [
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField' # ЭТА НАСТРОЙКА ОТВЕЧАЕТ ЗА ТИП ПОЛЯ ПО УМОЛЧАНИЮ ДЛЯ АВТОМАТИЧЕСКИ СОЗДАВАЕМОГО ПЕРВИЧНОГО КЛЮЧА (Primary Key) В МОДЕЛИ
 
 AUTH_USER_MODEL = "kinopoiskapiunofficial_tech_app.User"
+
+# ОЖИДАНИЕ ПОСЛЕ ОТВЕТА API 429 (Too Many Requests): ДОЛЬШЕ ЭТОГО ЧИСЛА СЕКУНД НЕ ЖДЁМ - ЗАПРОС СРАЗУ ЗАВЕРШАЕТСЯ ОШИБКОЙ (см. api_sync.APISynchronizer):
+API_RATE_LIMIT_MAX_WAIT = float(os.getenv("API_RATE_LIMIT_MAX_WAIT", 30)) # ФОНОВАЯ СИНХРОНИЗАЦИЯ (КОМАНДЫ manage.py)
+API_RATE_LIMIT_REQUEST_MAX_WAIT = float(os.getenv("API_RATE_LIMIT_REQUEST_MAX_WAIT", 0)) # СИНХРОНИЗАЦИЯ ВО ВРЕМЯ HTTP-ЗАПРОСА (НЕ ЗАНИМАЕМ ПОТОК СЕРВЕРА)
+
+# НАСТРОЙКИ ФОНОВОГО ОБНОВЛЕНИЯ ЗАПИСЕЙ О ФИЛЬМАХ (python manage.py refresh_films):
+FILMS_REFRESH_REQUESTS_PER_HOUR = int(os.getenv("FILMS_REFRESH_REQUESTS_PER_HOUR", 500)) # БЮДЖЕТ ЗАПРОСОВ К API В ЧАС
+FILMS_REFRESH_JITTER = float(os.getenv("FILMS_REFRESH_JITTER", 0.2)) # СЛУЧАЙНЫЙ РАЗБРОС ПАУЗЫ МЕЖДУ ОБНОВЛЕНИЯМИ (ДОЛЯ ОТ 0 ДО 1)
+FILMS_REFRESH_BATCH_SIZE = int(os.getenv("FILMS_REFRESH_BATCH_SIZE", 100)) # СКОЛЬКО ЗАПИСЕЙ ВЫБИРАТЬ ИЗ БД ЗА ОДНО ПОПОЛНЕНИЕ ОЧЕРЕДИ
+
+# НАСТРОЙКИ СЧЁТЧИКОВ ОБРАЩЕНИЙ К ЗАПИСЯМ О ФИЛЬМАХ (копятся в памяти процесса и сбрасываются в БД пачками):
+FILMS_HITS_FLUSH_THRESHOLD = int(os.getenv("FILMS_HITS_FLUSH_THRESHOLD", 1000000)) # СБРАСЫВАТЬ В БД ПОСЛЕ СТОЛЬКИХ ОБРАЩЕНИЙ
+FILMS_HITS_FLUSH_INTERVAL = int(os.getenv("FILMS_HITS_FLUSH_INTERVAL", 3600)) # ИЛИ НЕ РЕЖЕ, ЧЕМ РАЗ В СТОЛЬКО СЕКУНД
+
+# АРХИВ "СЫРЫХ" ОТВЕТОВ API (python manage.py rematerialize_archive ПЕРЕСОБИРАЕТ ИЗ НЕГО ТАБЛИЦЫ БЕЗ ЗАПРОСОВ К API):
+UPSTREAM_ARCHIVE_ENABLED = os.getenv("UPSTREAM_ARCHIVE_ENABLED", "True") == "True"
+
+# РАЗМЕР СТРАНИЦЫ СПИСКОВ ЗАПИСЕЙ ПО УМОЛЧАНИЮ И МАКСИМАЛЬНЫЙ РАЗМЕР, КОТОРЫЙ КЛИЕНТ МОЖЕТ ЗАПРОСИТЬ ПАРАМЕТРОМ page_size (см. pagination.KeysetPagination):
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 50))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 500))
+
+# ОБЩИЙ КЕШ ДЛЯ ВСЕХ ПРОЦЕССОВ (ВЕРСИИ ДАННЫХ И КЕШ ОТВЕТОВ, КОЛИЧЕСТВО ЗАПИСЕЙ, ТАБЛИЦА ОСНОВНОЙ СТРАНИЦЫ, РЕЗУЛЬТАТЫ СИНХРОНИЗАЦИЙ):
+#   -> CACHE_URL=redis://host:6379/0 - Redis (НУЖЕН ПАКЕТ redis), CACHE_URL=memcached://host:11211 - Memcached (НУЖЕН ПАКЕТ pymemcache),
+#      CACHE_URL=file:///var/tmp/django_cache - ФАЙЛЫ (ОБЩИЙ ТОЛЬКО ДЛЯ ПРОЦЕССОВ НА ОДНОМ СЕРВЕРЕ)
+#   -> ИНАЧЕ - КЕШ В ПАМЯТИ КАЖДОГО ПРОЦЕССА: НОВЫЕ ВЕРСИИ ДАННЫХ ДРУГИМ ПРОЦЕССАМ НЕ ВИДНЫ, ПОЭТОМУ КЕШ ОТВЕТОВ ПО УМОЛЧАНИЮ ВЫКЛЮЧЕН
+#   -> ПОТОКУ СОБЫТИЙ СИНХРОНИЗАЦИИ (SSE, см. sync_progress) ОБЩИЙ КЕШ ОБЯЗАТЕЛЕН, ЕСЛИ ПРОЦЕССОВ БОЛЬШЕ ОДНОГО: БЕЗ НЕГО СОБЫТИЯ ВИДНЫ
+#      ТОЛЬКО В ПРОЦЕССЕ, ВЫПОЛНЯЮЩЕМ СИНХРОНИЗАЦИЮ
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL.startswith(("redis://", "rediss://")):
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}}
+elif CACHE_URL.startswith("memcached://"):
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache", "LOCATION": CACHE_URL.removeprefix("memcached://")}}
+elif CACHE_URL.startswith("file://"):
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": CACHE_URL.removeprefix("file://")}}
+elif CACHE_URL:
+    raise ValueError(f"Неподдерживаемый адрес общего кеша CACHE_URL: {CACHE_URL}!")
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# КЕШ ОТВЕТОВ СО СПИСКАМИ ФИЛЬМОВ И АКТЁРОВ (см. response_cache.ResponseCache, сбрасывается сигналами при изменении записей):
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", str(bool(CACHE_URL))) == "True" # ПО УМОЛЧАНИЮ - ТОЛЬКО С ОБЩИМ КЕШЕМ
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300)) # СКОЛЬКО СЕКУНД ХРАНИТЬ ОТВЕТ В ОБЩЕМ КЕШЕ
+RESPONSE_CACHE_LOCAL_MAXSIZE = int(os.getenv("RESPONSE_CACHE_LOCAL_MAXSIZE", 256)) # СКОЛЬКО ОТВЕТОВ ХРАНИТЬ В ПАМЯТИ КАЖДОГО ПРОЦЕССА
+
+# БЫСТРОЕ ЧТЕНИЕ СПИСКОВ ФИЛЬМОВ И АКТЁРОВ ЧЕРЕЗ values() ВМЕСТО СЕРИАЛИЗАТОРОВ DRF (см. fast_serializers.FastListMixin):
+API_FAST_READ_ENABLED = os.getenv("API_FAST_READ_ENABLED", "True") == "True"
+
+# СКОЛЬКО ЗАПИСЕЙ ЧИТАТЬ ИЗ БД ЗА ОДИН РАЗ ПРИ ПОТОКОВОЙ ВЫГРУЗКЕ В ФОРМАТЕ NDJSON (films/export.ndjson, actors/export.ndjson):
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+# МАКСИМАЛЬНОЕ КОЛИЧЕСТВО ОБЪЕКТОВ В ОДНОМ ЗАПРОСЕ ПАКЕТНОЙ ЗАПИСИ (films/bulk/, actors/bulk/, см. bulk.BulkWriteMixin):
+API_BULK_MAX_ITEMS = int(os.getenv("API_BULK_MAX_ITEMS", 1000))
+
+# КОЛИЧЕСТВО ЗАПИСЕЙ В СПИСКАХ (см. counts.count_rows): ДО СКОЛЬКИ ЗАПИСЕЙ СЧИТАТЬ ТОЧНО (ДАЛЬШЕ - ОЦЕНКА PostgreSQL)
+# И СКОЛЬКО СЕКУНД ХРАНИТЬ ТОЧНОЕ КОЛИЧЕСТВО В КЕШЕ (0 - НЕ КЕШИРОВАТЬ):
+API_COUNT_EXACT_THRESHOLD = int(os.getenv("API_COUNT_EXACT_THRESHOLD", 10000))
+API_COUNT_CACHE_TIMEOUT = int(os.getenv("API_COUNT_CACHE_TIMEOUT", 300))
+
+# МАКСИМАЛЬНОЕ КОЛИЧЕСТВО АКТЁРОВ В ОДНОМ ЗАПРОСЕ ФИЛЬМОГРАФИИ (/actors/films/?actor_id=1,2,3):
+API_FILMOGRAPHY_MAX_ACTORS = int(os.getenv("API_FILMOGRAPHY_MAX_ACTORS", 100))
+
+# ОСНОВНАЯ СТРАНИЦА С ТАБЛИЦЕЙ ФИЛЬМОВ: КОЛИЧЕСТВО ФИЛЬМОВ НА СТРАНИЦЕ И СКОЛЬКО СЕКУНД ХРАНИТЬ ОТРИСОВАННУЮ ТАБЛИЦУ В КЕШЕ:
+INDEX_PAGE_SIZE = int(os.getenv("INDEX_PAGE_SIZE", 100))
+INDEX_CACHE_TIMEOUT = int(os.getenv("INDEX_CACHE_TIMEOUT", 300))
+
+# ПОВТОРНОЕ ИСПОЛЬЗОВАНИЕ ПОДКЛЮЧЕНИЙ К PostgreSQL (ВМЕСТО НОВОГО ПОДКЛЮЧЕНИЯ НА КАЖДЫЙ ЗАПРОС):
+#   -> DB_POOL=1 - ПУЛ ПОДКЛЮЧЕНИЙ ПРОЦЕССА (НУЖНЫ psycopg 3 И psycopg_pool, РАБОТАЕТ И ДЛЯ WSGI, И ДЛЯ ASGI): ОГРАНИЧЕНИЕ РАЗМЕРА,
+#      ТАЙМАУТ ОЖИДАНИЯ СВОБОДНОГО ПОДКЛЮЧЕНИЯ, ПЕРЕСОЗДАНИЕ СТАРЫХ И ПРОСТАИВАЮЩИХ ПОДКЛЮЧЕНИЙ, ПРОВЕРКА ПОДКЛЮЧЕНИЯ ПРИ ВЫДАЧЕ ИЗ ПУЛА
+#   -> ИНАЧЕ - ПОСТОЯННЫЕ ПОДКЛЮЧЕНИЯ НА DB_CONN_MAX_AGE СЕКУНД С ПРОВЕРКОЙ ПЕРЕД ПОВТОРНЫМ ИСПОЛЬЗОВАНИЕМ; ПОД ASGI (см. asgi.py) ПО УМОЛЧАНИЮ
+#      ОНИ ОТКЛЮЧЕНЫ: ПОДКЛЮЧЕНИЯ ТАМ ПРИВЯЗАНЫ К ПОТОКАМ sync_to_async, И ПОВТОРНО ИСПОЛЬЗОВАТЬ ИХ БЕЗОПАСНО ТОЛЬКО ЧЕРЕЗ ПУЛ
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
+SERVER_INTERFACE = os.getenv("SERVER_INTERFACE", "wsgi")
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    if DB_POOL:
+        DATABASES["default"]["CONN_MAX_AGE"] = 0 # пул и постоянные подключения Django вместе не работают
+        DATABASES["default"]["OPTIONS"] = {**DATABASES["default"].get("OPTIONS", {}), "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 3600)),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 600)),
+        }}
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", 0 if SERVER_INTERFACE == "asgi" else 60))
+
+# РЕПЛИКИ БД ТОЛЬКО ДЛЯ ЧТЕНИЯ: АДРЕСА ЧЕРЕЗ ЗАПЯТУЮ (ОСТАЛЬНЫЕ ПАРАМЕТРЫ ПОДКЛЮЧЕНИЯ - КАК У default), см. db_routing.ReplicaRouter:
+DATABASE_REPLICAS = []
+for number, host in enumerate(filter(None, map(str.strip, os.getenv("DB_REPLICA_HOSTS", "").split(","))), start=1):
+    DATABASES[f"replica_{number}"] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica_{number}")
+DATABASE_ROUTERS = ["kinopoiskapiunofficial_tech_app.db_routing.ReplicaRouter"]
+
+# СКОЛЬКО СЕКУНД ПОСЛЕ УСПЕШНОГО ЗАПРОСА, ЗАПИСАВШЕГО В ОСНОВНУЮ БД, КЛИЕНТ ЧИТАЕТ ТОЛЬКО ИЗ ОСНОВНОЙ БД (ЧТОБЫ ВИДЕТЬ СВОИ ИЗМЕНЕНИЯ ДО РЕПЛИКАЦИИ) И ИМЯ ЭТОЙ cookie:
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+REPLICA_STICKY_COOKIE = os.getenv("REPLICA_STICKY_COOKIE", "db_primary")
+
+# АСИНХРОННОЕ ЧТЕНИЕ СПИСКОВ И СТРАНИЦ ФИЛЬМОВ/АКТЁРОВ ПОД ASGI (GET/HEAD - ЧЕРЕЗ АСИНХРОННЫЙ ORM, см. async_views.read_view):
+API_ASYNC_READS = os.getenv("API_ASYNC_READS", "0") == "1"
@@ -1,10 +1,35 @@
 from django.contrib import admin
+from django.contrib.admin.utils import lookup_spawns_duplicates
+from django.utils.text import smart_split, unescape_string_literal
 
 from .models import Film, Actor
+from .counts import EstimatedCountPaginator
+from .search import trigram_search
+
+
+class TrigramSearchAdminMixin:
+    """
+    Примесь для ModelAdmin: поиск (и автодополнение в полях других моделей) по тем же search_fields, что и в API
+    (см. search.TrigramSearchFilter): "%"-поля - по вхождению через GIN-индекс pg_trgm, "="-поля - точное совпадение.
+    Количество записей в списке - по counts.count_rows() (на больших таблицах - оценка без COUNT(*)),
+    а количество всех записей без фильтров не считается вовсе.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        # СЛОВА ЗАПРОСА - ТАК ЖЕ, КАК В СТАНДАРТНОМ ПОИСКЕ АДМИНКИ (С УЧЁТОМ КАВЫЧЕК):
+        terms = [unescape_string_literal(bit) if bit[0] in "\"'" and bit[-1] == bit[0] else bit for bit in smart_split(search_term)]
+        queryset = trigram_search(queryset, search_fields, [term for term in terms if term])
+        opts = queryset.model._meta
+        may_have_duplicates = any(lookup_spawns_duplicates(opts, field.lstrip("%=")) for field in search_fields)
+        return queryset, may_have_duplicates
 
 
 @admin.register(Film)
-class FilmAdmin(admin.ModelAdmin):
+class FilmAdmin(TrigramSearchAdminMixin, admin.ModelAdmin):
     
     def get_actors(self, obj):
         return ", ".join([actor.name for actor in obj.actors.all()])
@@ -12,9 +37,20 @@ class FilmAdmin(admin.ModelAdmin):
     get_actors.short_description = "Actors"
     
     list_display = ("kinopoisk_id", "name", "year", "get_actors", "created_or_updated_at",)
+    list_filter = ("created_or_updated_at",) # диапазон дат - по BRIN-индексу (см. миграцию 0006), без запроса значений фильтра
+    search_fields = ("=kinopoisk_id", "%name", "=year",)
+    autocomplete_fields = ("actors",) # вместо списка всех актёров в форме - поиск по ActorAdmin.search_fields
+    raw_id_fields = ("owner",)
+
+    def get_queryset(self, request):
+        # АКТЁРЫ ВСЕХ ФИЛЬМОВ СТРАНИЦЫ ОДНИМ ЗАПРОСОМ (ДЛЯ get_actors()):
+        return super().get_queryset(request).with_cast()
 
 
 @admin.register(Actor)
-class ActorAdmin(admin.ModelAdmin):
+class ActorAdmin(TrigramSearchAdminMixin, admin.ModelAdmin):
     
     list_display = ("staff_id", "name", "poster_url", "profession", "created_or_updated_at",)
+    list_filter = ("created_or_updated_at",)
+    search_fields = ("=staff_id", "%name", "%profession",)
+    raw_id_fields = ("owner",)
@@ -1,7 +1,11 @@
 import os
+import time
 import requests
 from dotenv import load_dotenv
-from .models import Film, Actor
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from .models import Film, Actor, UpstreamPayload
 from .serializers import FilmSerializer, ActorSerializer
 
 import logging
@@ -17,24 +21,73 @@ class APISynchronizer:
     BASE_URL_V1 = "https://kinopoiskapiunofficial.tech/api/v1"
     BASE_URL_V2 = "https://kinopoiskapiunofficial.tech/api/v2.2"
 
-    def __init__(self):
+    # СКОЛЬКО РАЗ ПОВТОРЯТЬ ЗАПРОС ПОСЛЕ ОТВЕТА 429 (Too Many Requests) И СКОЛЬКО СЕКУНД ЖДАТЬ, ЕСЛИ API НЕ ПРИСЛАЛ Retry-After:
+    RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_DEFAULT_WAIT = 1
+
+    def __init__(self, progress=None, max_wait=None):
         self.headers = {
             "X-API-KEY": os.getenv("API_KEY"),
             "Content-Type": "application/json",
         }
+        self.progress = progress # необязательный приёмник событий о ходе синхронизации (см. sync_progress.SyncProgress)
+        # ДОЛЬШЕ СКОЛЬКИХ СЕКУНД НЕ ЖДАТЬ ПОСЛЕ ОТВЕТА 429 (ПО УМОЛЧАНИЮ - settings.API_RATE_LIMIT_MAX_WAIT):
+        self.max_wait = settings.API_RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
         logger.debug("Инициализация APISynchronizer с заголовками...")
 
+    def emit(self, event, **data):
+        """Публикуем событие о ходе синхронизации (если за ней кто-то следит)"""
+        if self.progress is not None:
+            self.progress.publish(event, **data)
+
+    def get_retry_after(self, response):
+        try:
+            return max(float(response.headers.get("Retry-After")), 0)
+        except (TypeError, ValueError):
+            return self.RATE_LIMIT_DEFAULT_WAIT
+
     def make_request(self, url, params=None):
         """Общий метод для выполнения запросов к API"""
-        logger.debug(f"Запрос к API: {url}, параметры: {params}...")
+        logger.debug("Запрос к API: %s, параметры: %s...", url, params)
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+                response = requests.get(url, headers=self.headers, params=params)
+                if response.status_code != 429 or attempt == self.RATE_LIMIT_RETRIES:
+                    break
+                # ПРИ ПРЕВЫШЕНИИ ЛИМИТА ЗАПРОСОВ ЖДЁМ СТОЛЬКО, СКОЛЬКО ПРОСИТ API (НО НЕ ДОЛЬШЕ max_wait), И ПОВТОРЯЕМ ЗАПРОС:
+                wait = self.get_retry_after(response)
+                if wait > self.max_wait:
+                    logger.warning(f"Превышен лимит запросов к API с URL - {url}, ожидание {wait} сек. дольше допустимого ({self.max_wait} сек.)!")
+                    break
+                logger.warning(f"Превышен лимит запросов к API с URL - {url}, повтор через {wait} сек...")
+                self.emit("rate_limit_wait", url=self.get_endpoint(url), seconds=wait)
+                time.sleep(wait)
             response.raise_for_status()
-            logger.debug(f"Успешный ответ от API: {url}, статус-код: {response.status_code}!")
-            return response.json()
+            logger.debug("Успешный ответ от API: %s, статус-код: %s!", url, response.status_code)
+            data = response.json()
         except requests.RequestException as e:
             logger.error(f"Ошибка при запросе к API с URL - {url}: {str(e)}!", exc_info=True)
             raise Exception(f"Ошибка при запросе к API: {response.status_code if 'response' in locals() else 'НЕИЗВЕСТНО'}!")
+        self.archive_response(url, params, data)
+        return data
+
+    @classmethod
+    def get_endpoint(cls, url):
+        """Эндпоинт API без базового URL (например, "/films" или "/staff")"""
+        for base_url in (cls.BASE_URL_V1, cls.BASE_URL_V2):
+            if url.startswith(base_url):
+                return url[len(base_url):]
+        return url
+
+    def archive_response(self, url, params, data):
+        """Сохраняем "сырой" ответ API в архив, чтобы потом пересобрать из него наши таблицы без повторных запросов к API"""
+        if not settings.UPSTREAM_ARCHIVE_ENABLED:
+            return
+        try:
+            UpstreamPayload.archive(self.get_endpoint(url), params, data)
+        except Exception as e:
+            # ОШИБКА АРХИВИРОВАНИЯ НЕ ДОЛЖНА ЛОМАТЬ САМУ СИНХРОНИЗАЦИЮ:
+            logger.error(f"Ошибка при сохранении ответа API с URL - {url} в архив: {str(e)}!", exc_info=True)
 
     def get_films(self, page=1):
         """Получаем информацию о фильме или список фильмов"""
@@ -42,10 +95,10 @@ class APISynchronizer:
         params = {
             "page": page,
         }
-        logger.debug(f"Получение записей о фильмах, страница: {page}...")
+        logger.debug("Получение записей о фильмах, страница: %s...", page)
         try:
             data = self.make_request(url, params)
-            logger.info(f"Успешно получено {len(data.get('items', []))} записей о фильмах со страницы {page}!")
+            logger.info("Успешно получено %s записей о фильмах со страницы %s!", len(data.get('items', [])), page)
             return data
         except Exception as e:
             logger.error(f"Ошибка при получении записей о фильмах со страницы {page}: {str(e)}!", exc_info=True)
@@ -60,19 +113,90 @@ class APISynchronizer:
         params = {
             "filmId": film_id
         }
-        logger.debug(f"Получение записи об актёрах для фильма с ID {film_id}...")
+        logger.debug("Получение записи об актёрах для фильма с ID %s...", film_id)
         try:
             data = self.make_request(url, params=params)
-            logger.info(f"Успешно получено {len(data)} записей об актёрах для фильма с ID {film_id}!")
+            logger.info("Успешно получено %s записей об актёрах для фильма с ID %s!", len(data), film_id)
             return data
         except Exception as e:
             logger.error(f"Ошибка при получении записей об актёрах для фильма с ID {film_id}: {str(e)}!", exc_info=True)
             raise
     
+    def get_film(self, kinopoisk_id=None):
+        """Получаем информацию об одном фильме по его ID на стороне API"""
+        if not kinopoisk_id:
+            logger.warning("Попытка получить запись о фильме без указания 'kinopoisk_id'...")
+            raise Exception("Необходимо указать kinopoisk_id для получения фильма")
+        url = f"{self.BASE_URL_V2}/films/{kinopoisk_id}"
+        logger.debug("Получение записи о фильме с ID %s...", kinopoisk_id)
+        try:
+            data = self.make_request(url)
+            logger.info("Успешно получена запись о фильме с ID %s!", kinopoisk_id)
+            return data
+        except Exception as e:
+            logger.error(f"Ошибка при получении записи о фильме с ID {kinopoisk_id}: {str(e)}!", exc_info=True)
+            raise
+
+    @staticmethod
+    def format_film_data(film):
+        """Приводим запись о фильме из ответа API к полям модели Film"""
+        return {
+            "kinopoisk_id": film.get("kinopoiskId"),
+            "name": film.get("nameRu") or film.get("nameOriginal") or "Без названия",
+            "year": film.get("year"),
+        }
+
+    @staticmethod
+    def format_actor_data(actor):
+        """Приводим запись об актёре из ответа API к полям модели Actor"""
+        return {
+            "staff_id": actor.get("staffId"),
+            "name": actor.get("nameRu"),
+            "poster_url": actor.get("posterUrl"),
+            "profession": actor.get("professionText"),
+        }
+
+    def sync_actors_for_film(self, film):
+        """Актуализируем записи об актёрах для одной (уже сохранённой в нашей БД) записи о фильме"""
+
+        kinopoisk_id = film.kinopoisk_id
+        actors_data = self.get_actors(film_id=kinopoisk_id)
+        actors_formatted_data = [self.format_actor_data(actor) for actor in actors_data]
+        logger.debug("Подготовлено %s записей об актёрах для фильма %s!", len(actors_formatted_data), kinopoisk_id)
+
+        # ВАЛИДИРУЕМ ИНФОРМАЦИЮ ОБ АКТЁРАХ ЧЕРЕЗ СЕРИАЛИЗАТОР:
+        actor_serializer = ActorSerializer(
+            data=actors_formatted_data,
+            many=True
+        )
+        actor_serializer.is_valid(raise_exception=True)
+        logger.debug("Валидация записей об актёрах для фильма %s прошла успешно!", kinopoisk_id)
+
+        # ОЧИЩАЕМ ВСЮ УЖЕ ИМЕЮЩУЮСЯ В НАШЕЙ БД ИНФОРМАЦИЮ ОБ АКТЁРАХ, ОТНОСЯЩИХСЯ К ЗАПИСИ ФИЛЬМА ИЗ ТЕКУЩЕЙ ИТЕРАЦИИ:
+        film.actors.clear()
+        logger.debug("Очищены имеющиеся в БД записи об актёрах для фильма %s!", kinopoisk_id)
+
+        # СОЗДАЁМ ЛИБО ОБНОВЛЯЕМ ЗАПИСИ ОБ АКТЁРАХ И ДОБАВЛЯЕМ ИХ В ЗАПИСЬ О ФИЛЬМЕ ИЗ ТЕКУЩЕЙ ИТЕРАЦИИ:
+        for actor_data in actor_serializer.validated_data:
+            actor, created = Actor.objects.update_or_create(
+                staff_id=actor_data["staff_id"],
+                defaults={
+                    "name": actor_data["name"],
+                    "poster_url": actor_data["poster_url"],
+                    "profession": actor_data["profession"],
+                }
+            )
+            film.actors.add(actor)
+            logger.info("Запись об актёре %s (staff_id: %s) %s %s!", actor.name, actor_data['staff_id'], 'добавлена к записи о фильме' if created else 'обновлена', kinopoisk_id)
+
+        self.emit("actors_written", kinopoisk_id=kinopoisk_id, count=len(actor_serializer.validated_data))
+        return len(actor_serializer.validated_data)
+
     def sync_films_and_actors(self, page=1, user=None):
         """Актуализируем всю информацию в своей БД путём синхронизации"""
 
-        logger.debug(f"Начало синхронизации записей о фильмах и актёрах, страница: {page}, пользователь: {user}...")
+        logger.debug("Начало синхронизации записей о фильмах и актёрах, страница: %s, пользователь: %s...", page, user)
+        self.emit("started", page=page)
         try:
 
             # ПОЛУЧАЕМ ПЕРВИЧНЫЕ ДАННЫЕ (ЗАПИСИ) О ФИЛЬМАХ:
@@ -80,15 +204,8 @@ class APISynchronizer:
             films_data = api_data.get("items", [])
         
             # ФОРМАТИРУЕМ ПОЛУЧЕННЫЕ ДАННЫЕ:
-            films_formatted_data = [
-                {
-                    "kinopoisk_id": film.get("kinopoiskId"),
-                    "name": film.get("nameRu") or film.get("nameOriginal") or "Без названия",
-                    "year": film.get("year"),
-                }
-                for film in films_data
-            ]
-            logger.debug(f"Подготовлено {len(films_formatted_data)} записей о фильмах для сериализации!")
+            films_formatted_data = [self.format_film_data(film) for film in films_data]
+            logger.debug("Подготовлено %s записей о фильмах для сериализации!", len(films_formatted_data))
 
             # ВАЛИДИРУЕМ ИНФОРМАЦИЮ О ФИЛЬМАХ ЧЕРЕЗ СЕРИАЛИЗАТОР:
             film_serializer = FilmSerializer(
@@ -101,7 +218,8 @@ class APISynchronizer:
             synced_films = []
             for film_data in film_serializer.validated_data:
                 kinopoisk_id = film_data["kinopoisk_id"]
-                logger.debug(f"Обработка записи о фильме с kinopoisk_id: {kinopoisk_id}...")
+                logger.debug("Обработка записи о фильме с kinopoisk_id: %s...", kinopoisk_id)
+                self.emit("film_started", kinopoisk_id=kinopoisk_id)
                 # СОЗДАЁМ ИЛИ ОБНОВЛЯЕМ (В СЛУЧАЕ НАЛИЧИЯ) ЗАПИСЬ О ФИЛЬМЕ ИЗ ТЕКУЩЕЙ ИТЕРАЦИИ (ПОКА ЧТО БЕЗ ИНФОРМАЦИИ ОБ АКТЁРАХ):
                 film, created = Film.objects.update_or_create(
                     kinopoisk_id=kinopoisk_id,
@@ -111,59 +229,148 @@ class APISynchronizer:
                     }
                 )
                 synced_films.append(film)
-                logger.info(f"Запись о фильме {film.name} (kinopoisk_id: {kinopoisk_id}) {'создана' if created else 'обновлена'}!")
+                logger.info("Запись о фильме %s (kinopoisk_id: %s) %s!", film.name, kinopoisk_id, 'создана' if created else 'обновлена')
                 
                 # ПЫТАЕМСЯ ПОЛУЧИТЬ И СИНХРОНИЗИРОВАТЬ ИНФОРМАЦИЮ ОБ АКТЁРАХ ДЛЯ ЗАПИСИ ФИЛЬМА ИЗ ТЕКУЩЕЙ ИТЕРАЦИИ:
                 try:
-                    actors_data = self.get_actors(film_id=kinopoisk_id)
-                    actors_formatted_data = [
-                        {
-                            "staff_id": actor.get("staffId"),
-                            "name": actor.get("nameRu"),
-                            "poster_url": actor.get("posterUrl"),
-                            "profession": actor.get("professionText"),
-                        }
-                        for actor in actors_data
-                    ]
-                    logger.debug(f"Подготовлено {len(actors_formatted_data)} записей об актёрах для фильма {kinopoisk_id}!")
-
-                    # ВАЛИДИРУЕМ ИНФОРМАЦИЮ ОБ АКТЁРАХ ЧЕРЕЗ СЕРИАЛИЗАТОР:
-                    actor_serializer = ActorSerializer(
-                        data=actors_formatted_data,
-                        many=True
-                    )
-                    actor_serializer.is_valid(raise_exception=True)
-                    logger.debug(f"Валидация записей об актёрах для фильма {kinopoisk_id} прошла успешно!")
-                    
-                    # ОЧИЩАЕМ ВСЮ УЖЕ ИМЕЮЩУЮСЯ В НАШЕЙ БД ИНФОРМАЦИЮ ОБ АКТЁРАХ, ОТНОСЯЩИХСЯ К ЗАПИСИ ФИЛЬМА ИЗ ТЕКУЩЕЙ ИТЕРАЦИИ:
-                    film.actors.clear()
-                    logger.debug(f"Очищены имеющиеся в БД записи об актёрах для фильма {kinopoisk_id}!")
-
-                    # СОЗДАЁМ ЛИБО ОБНОВЛЯЕМ ЗАПИСИ ОБ АКТЁРАХ И ДОБАВЛЯЕМ ИХ В ЗАПИСЬ О ФИЛЬМЕ ИЗ ТЕКУЩЕЙ ИТЕРАЦИИ:
-                    for actor_data in actor_serializer.validated_data:
-                        actor, created = Actor.objects.update_or_create(
-                            staff_id=actor_data["staff_id"],
-                            defaults={
-                                "name": actor_data["name"],
-                                "poster_url": actor_data["poster_url"],
-                                "profession": actor_data["profession"],
-                            }
-                        )
-                        film.actors.add(actor)
-                        logger.info(f"Запись об актёре {actor.name} (staff_id: {actor_data['staff_id']}) {'добавлена к записи о фильме' if created else 'обновлена'} {kinopoisk_id}!")
-
+                    self.sync_actors_for_film(film)
                 except Exception as e:
                     logger.error(f"Ошибка при загрузке записей об актёрах для фильма {kinopoisk_id}: {str(e)}!", exc_info=True)
+                    self.emit("error", kinopoisk_id=kinopoisk_id, message=str(e))
                     continue
+                finally:
+                    self.emit("film_finished", kinopoisk_id=kinopoisk_id, film_id=film.id, created=created)
 
             result = {
                 "synced_count": len(synced_films),
                 "total_pages": api_data.get("totalPages", 1),
                 "current_page": page
             }
-            logger.info(f"Синхронизация завершена: {result['synced_count']} записей о фильмах, страница {page} из {result['total_pages']}!")
+            logger.info("Синхронизация завершена: %s записей о фильмах, страница %s из %s!", result['synced_count'], page, result['total_pages'])
             return result
         
         except Exception as e:
             logger.error(f"Ошибка при синхронизации записей о фильмах и актёрах на странице {page}: {str(e)}!", exc_info=True)
             raise
+
+    def sync_film_and_actors(self, kinopoisk_id, user=None):
+        """Актуализируем в своей БД одну запись о фильме (вместе с актёрами) по её ID на стороне API"""
+
+        logger.debug("Начало синхронизации записи о фильме с kinopoisk_id: %s, пользователь: %s...", kinopoisk_id, user)
+        self.emit("film_started", kinopoisk_id=kinopoisk_id)
+        try:
+            film_serializer = FilmSerializer(data=self.format_film_data(self.get_film(kinopoisk_id)))
+            film_serializer.is_valid(raise_exception=True)
+            film_data = film_serializer.validated_data
+
+            film, created = Film.objects.update_or_create(
+                kinopoisk_id=kinopoisk_id,
+                defaults={
+                    "name": film_data["name"],
+                    "year": film_data["year"],
+                }
+            )
+            logger.info("Запись о фильме %s (kinopoisk_id: %s) %s!", film.name, kinopoisk_id, 'создана' if created else 'обновлена')
+
+            actors_count = self.sync_actors_for_film(film)
+            self.emit("film_finished", kinopoisk_id=kinopoisk_id, film_id=film.id, created=created)
+            return {
+                "film_id": film.id,
+                "kinopoisk_id": kinopoisk_id,
+                "actors_count": actors_count,
+            }
+
+        except Exception as e:
+            logger.error(f"Ошибка при синхронизации записи о фильме с kinopoisk_id {kinopoisk_id}: {str(e)}!", exc_info=True)
+            self.emit("error", kinopoisk_id=kinopoisk_id, message=str(e))
+            raise
+
+
+class ArchiveSynchronizer(APISynchronizer):
+    """
+    Класс для пересборки записей о фильмах и актёрах из архива ответов API (модель UpstreamPayload) без обращения к API.
+    Использует те же правила преобразования, что и APISynchronizer, но берёт "сырые" данные из самых свежих архивных ответов.
+    Страницы списка и отдельные фильмы пересобираются в порядке получения их ответов, поэтому старый ответ /films/{id}
+    не перезаписывает более свежие данные со страницы списка (и наоборот).
+    Пересборка обычно выполняется в одной транзакции (см. команду rematerialize_archive), поэтому каждый фильм и каждая страница
+    пересобираются в своей точке сохранения (transaction.atomic()): ошибка БД откатывает только их, а не делает транзакцию
+    непригодной для всех следующих фильмов.
+    """
+
+    def __init__(self, fetched_before=None, progress=None):
+        super().__init__(progress=progress)
+        self.fetched_before = fetched_before
+
+    def latest_payload(self, endpoint, **params):
+        payloads = UpstreamPayload.objects.filter(endpoint=endpoint, **{f"params__{key}": value for key, value in params.items()})
+        if self.fetched_before is not None:
+            payloads = payloads.filter(fetched_at__lt=self.fetched_before)
+        payload = payloads.order_by("-fetched_at", "-id").first()
+        if payload is None:
+            raise Exception(f"В архиве нет ответа API для эндпоинта {endpoint} с параметрами {params}")
+        return payload.data
+
+    def make_request(self, url, params=None):
+        raise Exception("Запросы к API при пересборке данных из архива запрещены!")
+
+    def get_films(self, page=1):
+        logger.debug("Получение записей о фильмах из архива, страница: %s...", page)
+        return self.latest_payload("/films", page=page)
+
+    def get_film(self, kinopoisk_id=None):
+        logger.debug("Получение записи о фильме с ID %s из архива...", kinopoisk_id)
+        return self.latest_payload(f"/films/{kinopoisk_id}")
+
+    def get_actors(self, film_id=None):
+        logger.debug("Получение записей об актёрах для фильма с ID %s из архива...", film_id)
+        return self.latest_payload("/staff", filmId=film_id)
+
+    def sync_actors_for_film(self, film):
+        with transaction.atomic():
+            return super().sync_actors_for_film(film)
+
+    def archived_payloads(self):
+        """
+        Страницы списка фильмов ("page", номер) и отдельные фильмы ("film", ID на стороне API), ответы для которых есть в архиве,
+        в порядке получения их самых свежих ответов (тех, что вернёт latest_payload())
+        """
+        payloads = UpstreamPayload.objects.all()
+        if self.fetched_before is not None:
+            payloads = payloads.filter(fetched_at__lt=self.fetched_before)
+        pages = payloads.filter(endpoint="/films").values("params__page").annotate(latest_fetched_at=Max("fetched_at"), latest_id=Max("id"))
+        films = payloads.filter(endpoint__startswith="/films/").values("endpoint").annotate(latest_fetched_at=Max("fetched_at"), latest_id=Max("id"))
+        replay = [(row["latest_fetched_at"], row["latest_id"], "page", row["params__page"]) for row in pages if row["params__page"] is not None]
+        replay += [
+            (row["latest_fetched_at"], row["latest_id"], "film", int(row["endpoint"].rsplit("/", 1)[-1]))
+            for row in films if row["endpoint"].rsplit("/", 1)[-1].isdigit()
+        ]
+        return [(kind, key) for _, _, kind, key in sorted(replay)]
+
+    def rematerialize(self):
+        """Пересобираем записи о фильмах и актёрах из всех архивных ответов API"""
+        logger.debug("Начало пересборки записей о фильмах и актёрах из архива ответов API...")
+        films_count = 0
+        pages, film_ids = [], []
+        for kind, key in self.archived_payloads():
+            if kind == "page":
+                pages.append(key)
+                try:
+                    with transaction.atomic():
+                        films_count += self.sync_films_and_actors(page=key)["synced_count"]
+                except Exception as e:
+                    logger.error(f"Ошибка при пересборке страницы {key} списка фильмов из архива: {str(e)}!", exc_info=True)
+            else:
+                film_ids.append(key)
+                try:
+                    with transaction.atomic():
+                        self.sync_film_and_actors(key)
+                    films_count += 1
+                except Exception as e:
+                    logger.error(f"Ошибка при пересборке записи о фильме с kinopoisk_id {key} из архива: {str(e)}!", exc_info=True)
+        result = {
+            "pages": len(pages),
+            "films": len(film_ids),
+            "synced_count": films_count,
+        }
+        logger.info("Пересборка из архива завершена: %s записей о фильмах, %s страниц списка и %s отдельных фильмов!", films_count, len(pages), len(film_ids))
+        return result
@@ -0,0 +1,119 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+# МЕТОДЫ, КОТОРЫЕ ОБСЛУЖИВАЮТСЯ АСИНХРОННО (ОСТАЛЬНЫЕ - ОБЫЧНЫМ ПРЕДСТАВЛЕНИЕМ DRF В ПОТОКЕ):
+ASYNC_METHODS = ("GET", "HEAD")
+
+
+class AsyncReadMixin:
+    """
+    Базовая примесь для представлений DRF с асинхронным чтением (см. read_view()): aget() - асинхронный вариант get().
+    Асинхронно обслуживаются только ответы в JSON (браузерный интерфейс DRF строит формы с запросами к БД) и только если
+    представление может обойтись без синхронных запросов к БД (can_serve_async()), иначе запрос обслуживает обычное представление.
+    """
+
+    def can_serve_async(self, request):
+        return isinstance(request.accepted_renderer, JSONRenderer)
+
+
+class AsyncListMixin(AsyncReadMixin):
+    """
+    Примесь для ListAPIView: список записей асинхронно - выборка values() через быстрый сериализатор (fast_serializers.FastListMixin),
+    количество, страница и актёры - через асинхронный ORM (acount(), async for), кеш ответов и валидаторы ETag - через асинхронный кеш
+    """
+
+    def can_serve_async(self, request):
+        return super().can_serve_async(request) and getattr(self, "fast_read_enabled", False)
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncRetrieveMixin(AsyncReadMixin):
+    """Примесь для RetrieveAPIView: одна запись асинхронно (aget() ORM), без раскрытия отложенных полей (например, фильмов актёра)"""
+
+    def can_serve_async(self, request):
+        if not super().can_serve_async(request):
+            return False
+        deferred = getattr(self.get_serializer_class(), "deferred_fields", ())
+        get_selected_fields = getattr(self, "get_selected_fields", None)
+        return not (deferred and get_selected_fields is not None and set(get_selected_fields() or ()) & set(deferred))
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        """Асинхронный вариант get_object() (те же 404 и проверки прав доступа к записи)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+async def dispatch_async(view_class, initkwargs, request, args, kwargs):
+    """
+    Асинхронный вариант APIView.dispatch() для GET/HEAD: аутентификация, права доступа и согласование формата - те же, что у DRF
+    (пользователь сессии загружается заранее через request.auser(), поэтому проверки не обращаются к БД синхронно).
+    Возвращает None, если запрос нужно обслужить обычным представлением (см. AsyncReadMixin.can_serve_async()).
+    """
+    if hasattr(request, "auser"):
+        request.user = await request.auser()
+    view = view_class(**initkwargs)
+    view.setup(request, *args, **kwargs)
+    view.args, view.kwargs = args, kwargs
+    request = view.initialize_request(request, *args, **kwargs)
+    view.request = request
+    view.headers = view.default_response_headers
+    try:
+        view.initial(request, *args, **kwargs)
+        if not view.can_serve_async(request):
+            return None
+        response = await view.aget(request, *args, **kwargs)
+    except Exception as exc:
+        response = view.handle_exception(exc)
+    view.response = view.finalize_response(request, response, *args, **kwargs)
+    return view.response
+
+
+def read_view(view_class, **initkwargs):
+    """
+    Представление для маршрута с чтением и записью: при API_ASYNC_READS - асинхронное (GET/HEAD - через aget() представления,
+    остальные запросы - обычным представлением DRF в потоке через sync_to_async), иначе - обычное представление DRF (as_view()).
+    Под ASGI асинхронное чтение не занимает поток на время ожидания БД и медленных клиентов.
+    """
+    sync_view = view_class.as_view(**initkwargs)
+    if not settings.API_ASYNC_READS:
+        return sync_view
+    run_sync = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in ASYNC_METHODS:
+            response = await dispatch_async(view_class, initkwargs, request, args, kwargs)
+            if response is not None:
+                return response
+            logger.debug("Запрос %s %s обслуживается синхронным представлением %s", request.method, request.path, view_class.__name__)
+        return await run_sync(request, *args, **kwargs)
+
+    # АТРИБУТЫ (cls, initkwargs, csrf_exempt...) - КАК У ОБЫЧНОГО ПРЕДСТАВЛЕНИЯ DRF (ИХ ИСПОЛЬЗУЮТ CSRF-ПРОВЕРКА, СХЕМА API И ОТЛАДКА):
+    view.__dict__.update({name: value for name, value in sync_view.__dict__.items() if name != "__wrapped__"})
+    view.__doc__, view.__module__ = view_class.__doc__, view_class.__module__
+    return view
@@ -0,0 +1,217 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .response_cache import bump_version_on_commit
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+def unique_errors(model, rows, own_pks=None):
+    """
+    Проверка уникальных полей модели для пачки объектов rows ({индекс объекта: проверенные данные}) одним запросом на поле:
+    значение не должно повторяться внутри пачки и не должно быть занято другой записью в БД (own_pks - {индекс: id изменяемой записи}).
+    Возвращает {индекс: {поле: [сообщение]}}.
+    """
+    own_pks = own_pks or {}
+    errors = defaultdict(dict)
+    for field in model._meta.concrete_fields:
+        if not field.unique or field.primary_key:
+            continue
+        first_index = {}
+        for index, attrs in rows.items():
+            value = attrs.get(field.name)
+            if value is None: # NULL в уникальном поле может повторяться
+                continue
+            if value in first_index:
+                errors[index][field.name] = [f"Значение повторяется в объекте #{first_index[value]}."]
+            else:
+                first_index[value] = index
+        if not first_index:
+            continue
+        taken = dict(model._default_manager.filter(**{f"{field.name}__in": list(first_index)}).values_list(field.name, "pk"))
+        for value, index in first_index.items():
+            if value in taken and taken[value] != own_pks.get(index):
+                errors[index][field.name] = [f"Запись со значением {value} уже существует."]
+    return errors
+
+
+def touch_auto_now(obj):
+    """bulk_update() не вызывает pre_save(), поэтому поля с auto_now (created_or_updated_at) заполняются вручную. Возвращает их имена"""
+    names = []
+    for field in obj._meta.concrete_fields:
+        if getattr(field, "auto_now", False):
+            setattr(obj, field.attname, timezone.now())
+            names.append(field.name)
+    return names
+
+
+class BulkWriteMixin:
+    """
+    Примесь для GenericAPIView с пакетной записью (массив объектов в теле запроса, не больше API_BULK_MAX_ITEMS):
+        -> POST - создание записей одним bulk_create() (владелец - текущий пользователь)
+        -> PUT/PATCH - изменение записей (у каждого объекта есть "id") одним bulk_update()
+        -> DELETE - удаление записей по массиву id одним запросом
+    Все объекты проверяются вместе до записи в БД, а права (permission_classes, например ReadForAllCreateUpdateDeleteForOwnerOrAdmin) -
+    для каждой записи отдельно. Если хотя бы один объект не прошёл проверку, ничего не записывается.
+    В ответе {"results": [...]} - результат для каждого объекта в порядке запроса: индекс, id, код статуса и данные или ошибки.
+    """
+
+    # СТАТУС ОБЪЕКТОВ, КОТОРЫЕ САМИ ПРОШЛИ ПРОВЕРКУ, НО НЕ ЗАПИСАНЫ ИЗ-ЗА ОШИБОК В ДРУГИХ ОБЪЕКТАХ ПАКЕТА:
+    NOT_APPLIED = status.HTTP_424_FAILED_DEPENDENCY
+
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"error": "Тело запроса должно быть непустым массивом!"})
+        if len(items) > settings.API_BULK_MAX_ITEMS:
+            raise ValidationError({"error": f"В одном запросе можно передать не больше {settings.API_BULK_MAX_ITEMS} объектов!"})
+        return items
+
+    def has_item_permission(self, request, obj):
+        return all(permission.has_object_permission(request, self, obj) for permission in self.get_permissions())
+
+    def failed(self, results):
+        """Ответ для пакета с ошибками: код статуса - общий для всех ошибочных объектов (если он один) или 400"""
+        for result in results:
+            result.setdefault("status", self.NOT_APPLIED)
+        codes = {result["status"] for result in results if result["status"] != self.NOT_APPLIED}
+        status_code = codes.pop() if len(codes) == 1 else status.HTTP_400_BAD_REQUEST
+        logger.warning(f"Пакет из {len(results)} записей {self.get_queryset().model.__name__} отклонён (статус {status_code})!")
+        return Response({"results": results}, status=status_code)
+
+    def conflict(self, e):
+        # ПРОВЕРКИ ВЫШЕ НЕ ЗАЩИЩАЮТ ОТ ОДНОВРЕМЕННОЙ ЗАПИСИ ТЕХ ЖЕ ЗНАЧЕНИЙ ДРУГИМ ЗАПРОСОМ - ТОГДА ОТКАТЫВАЕТСЯ ВЕСЬ ПАКЕТ:
+        logger.warning(f"Пакетная запись {self.get_queryset().model.__name__} отменена из-за конфликта в БД: {str(e)}!")
+        return Response({"error": "Конфликт с одновременным изменением записей, пакет не записан. Повторите запрос!"}, status=status.HTTP_409_CONFLICT)
+
+    def lookup_items(self, request, items, key=None):
+        """
+        Для PUT/PATCH/DELETE: находит записи по id одним запросом и проверяет права на каждую.
+        Возвращает (results, objects): результаты с ошибками по индексам и {индекс: запись} для остальных объектов.
+        """
+        results = [{"index": index} for index in range(len(items))]
+        ids, seen = {}, set()
+        for index, item in enumerate(items):
+            pk = item.get(key) if key is not None and isinstance(item, dict) else item
+            if key is not None and not isinstance(item, dict):
+                results[index].update(status=status.HTTP_400_BAD_REQUEST, errors={"non_field_errors": ["Ожидается объект."]})
+            elif not isinstance(pk, int) or isinstance(pk, bool):
+                results[index].update(status=status.HTTP_400_BAD_REQUEST, errors={"id": ["Ожидается целое число (id записи)."]})
+            elif pk in seen:
+                results[index].update(id=pk, status=status.HTTP_400_BAD_REQUEST, errors={"id": ["Запись уже есть в этом пакете."]})
+            else:
+                ids[index] = pk
+                seen.add(pk)
+        # ВЛАДЕЛЕЦ НУЖЕН ДЛЯ ПРОВЕРКИ ПРАВ - ПОДГРУЖАЕМ ЕГО ТЕМ ЖЕ ЗАПРОСОМ:
+        found = self.get_queryset().select_related("owner").in_bulk(list(ids.values()))
+        objects = {}
+        for index, pk in ids.items():
+            results[index]["id"] = pk
+            obj = found.get(pk)
+            if obj is None:
+                results[index].update(status=status.HTTP_404_NOT_FOUND, errors={"detail": "Запись не найдена."})
+            elif not self.has_item_permission(request, obj):
+                results[index].update(status=status.HTTP_403_FORBIDDEN, errors={"detail": "У вас недостаточно прав для выполнения данного действия."})
+            else:
+                objects[index] = obj
+        return results, objects
+
+    def post(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        model = self.get_queryset().model
+        results = [{"index": index} for index in range(len(items))]
+        rows = {}
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                rows[index] = serializer.validated_data
+            else:
+                results[index].update(status=status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+        for index, errors in unique_errors(model, rows).items():
+            results[index].update(status=status.HTTP_400_BAD_REQUEST, errors=errors)
+        if any("status" in result for result in results):
+            return self.failed(results)
+
+        objects = [model(**rows[index], owner=request.user) for index in range(len(items))]
+        try:
+            with transaction.atomic():
+                objects = model._default_manager.bulk_create(objects)
+                bump_version_on_commit(model._meta.model_name) # bulk_create() не отправляет сигнал post_save
+        except IntegrityError as e:
+            return self.conflict(e)
+        logger.info("Пакетно создано %s записей %s с владельцем %s!", len(objects), model.__name__, request.user)
+
+        # ПЕРЕЧИТЫВАЕМ СОЗДАННЫЕ ЗАПИСИ ОДНИМ ЗАПРОСОМ (С ПОДГРУЗКОЙ СВЯЗЕЙ ИЗ get_queryset()) ДЛЯ ОТВЕТА:
+        created = self.get_queryset().in_bulk([obj.pk for obj in objects])
+        data = self.get_serializer([created[obj.pk] for obj in objects], many=True).data
+        for result, obj, item_data in zip(results, objects, data):
+            result.update(id=obj.pk, status=status.HTTP_201_CREATED, data=item_data)
+        return Response({"results": results}, status=status.HTTP_201_CREATED)
+
+    def update(self, request, partial):
+        items = self.get_items(request)
+        model = self.get_queryset().model
+        results, objects = self.lookup_items(request, items, key="id")
+        rows = {}
+        for index, obj in objects.items():
+            serializer = self.get_serializer(obj, data=items[index], partial=partial)
+            if serializer.is_valid():
+                rows[index] = serializer.validated_data
+            else:
+                results[index].update(status=status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+        for index, errors in unique_errors(model, rows, own_pks={index: objects[index].pk for index in rows}).items():
+            results[index].update(status=status.HTTP_400_BAD_REQUEST, errors=errors)
+        if any("status" in result for result in results):
+            return self.failed(results)
+
+        fields = set()
+        for index, attrs in rows.items():
+            for attr, value in attrs.items():
+                setattr(objects[index], attr, value)
+                fields.add(attr)
+            fields.update(touch_auto_now(objects[index]))
+        updated = [objects[index] for index in range(len(items))]
+        try:
+            with transaction.atomic():
+                model._default_manager.bulk_update(updated, sorted(fields))
+                bump_version_on_commit(model._meta.model_name) # bulk_update() не отправляет сигнал post_save
+        except IntegrityError as e:
+            return self.conflict(e)
+        logger.info("Пакетно изменено %s записей %s пользователем %s (поля: %s)!", len(updated), model.__name__, request.user, sorted(fields))
+
+        data = self.get_serializer(updated, many=True).data
+        for result, item_data in zip(results, data):
+            result.update(status=status.HTTP_200_OK, data=item_data)
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def put(self, request, *args, **kwargs):
+        return self.update(request, partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, partial=True)
+
+    def delete(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        model = self.get_queryset().model
+        results, objects = self.lookup_items(request, items)
+        if any("status" in result for result in results):
+            return self.failed(results)
+
+        with transaction.atomic():
+            # ОДИН DELETE ... WHERE id IN (...) (ПЛЮС УДАЛЕНИЕ СВЯЗЕЙ И СИГНАЛЫ post_delete, КОТОРЫЕ СБРАСЫВАЮТ КЕШ ОТВЕТОВ):
+            model._default_manager.filter(pk__in=[obj.pk for obj in objects.values()]).delete()
+        logger.info("Пакетно удалено %s записей %s пользователем %s!", len(objects), model.__name__, request.user)
+
+        for result in results:
+            result["status"] = status.HTTP_204_NO_CONTENT
+        return Response({"results": results}, status=status.HTTP_200_OK)
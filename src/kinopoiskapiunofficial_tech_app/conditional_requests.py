@@ -0,0 +1,212 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.db.models import BigIntegerField, Count, Max, Sum
+from django.db.models.functions import Cast, Coalesce
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .single_flight import shared_cache_configured
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+def make_etag(*parts):
+    """Строгий ETag (в кавычках) из произвольных значений"""
+    raw = "|".join(str(part) for part in parts)
+    return f'"{hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+# МОДУЛЬ ДЛЯ row_digest() - ПРОСТОЕ ЧИСЛО 2^31 - 1: КВАДРАТ ОСТАТКА ПОМЕЩАЕТСЯ В BIGINT И НА PostgreSQL, И НА sqlite3:
+DIGEST_MODULUS = 2147483647
+
+
+def row_digest(id_field, related_id_field=None):
+    """
+    Агрегат Sum() - не зависящая от порядка строк "контрольная сумма" id записей выборки (и id связанных записей, если задано
+    related_id_field): каждая пара (id, id связанной записи) сворачивается в остаток и возводится в квадрат по модулю, поэтому
+    удаление записи или замена связей дают другую сумму, даже если количество и сумма id не изменились
+    """
+    value = Cast(id_field, BigIntegerField()) * 7919
+    if related_id_field is not None:
+        value = value + Coalesce(Cast(related_id_field, BigIntegerField()), 0)
+    value = value % DIGEST_MODULUS
+    return Sum(value * value % DIGEST_MODULUS)
+
+
+class ConditionalGetMixin:
+    """
+    Примесь для GET-представлений DRF с условными запросами:
+        -> перед формированием ответа вычисляются валидаторы ETag/Last-Modified (см. get_validators() в наследниках) - одним дешёвым запросом
+           (Last-Modified - только там, где дата изменения записи действительно меняется при любом изменении ответа)
+        -> если клиент прислал If-None-Match/If-Modified-Since и данные не изменились, сразу отдаётся 304 без выборки и сериализации записей
+        -> иначе валидаторы добавляются в заголовки обычного ответа
+    Проверки аутентификации и прав доступа DRF выполняются до вызова get(), поэтому 304 получают только те, кому доступен сам ответ.
+    """
+
+    def get_validators(self, request, *args, **kwargs):
+        """Возвращает кортеж (etag, last_modified) или (None, None), если валидаторы вычислить нельзя (например, записи нет); last_modified может быть None"""
+        return None, None
+
+    def not_modified(self, request, *args, **kwargs):
+        """Вызывается перед ответом 304 (например, чтобы учесть обращение к записи)"""
+
+    async def aget_validators(self, request, *args, **kwargs):
+        """Асинхронный вариант get_validators() (для async_views.py)"""
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+        etag, timestamp, response = self.conditional_response(request, etag, last_modified, *args, **kwargs)
+        if response is not None:
+            return response
+        return self.add_validators(super().get(request, *args, **kwargs), etag, timestamp)
+
+    async def aget(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_validators(request, *args, **kwargs)
+        if etag is None:
+            return await super().aget(request, *args, **kwargs)
+        etag, timestamp, response = self.conditional_response(request, etag, last_modified, *args, **kwargs)
+        if response is not None:
+            return response
+        return self.add_validators(await super().aget(request, *args, **kwargs), etag, timestamp)
+
+    def conditional_response(self, request, etag, last_modified, *args, **kwargs):
+        """Итоговые ETag и Last-Modified (timestamp) и ответ 304/412, если клиенту не нужно тело ответа (иначе None)"""
+        # ОДНИ И ТЕ ЖЕ ДАННЫЕ В РАЗНЫХ ФОРМАТАХ (json, api) - ЭТО РАЗНЫЕ ПРЕДСТАВЛЕНИЯ С РАЗНЫМИ ETag:
+        etag = make_etag(etag, request.accepted_renderer.format)
+        timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            logger.debug("Данные для %s не изменились, ответ %s без тела!", request.get_full_path(), response.status_code)
+            self.not_modified(request, *args, **kwargs)
+        return etag, timestamp, response
+
+    @staticmethod
+    def add_validators(response, etag, timestamp):
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class ConditionalDetailMixin(ConditionalGetMixin):
+    """
+    Валидаторы для одной записи: дата изменения записи, а если задано cast_field - ещё и отсортированные id связанных записей
+    и дата их последнего изменения (тем же запросом, по строке на связанную запись), чтобы изменение состава актёров фильма
+    тоже меняло ETag (m2m_changed не сдвигает дат изменения ни у фильма, ни у актёров).
+    С cast_field ответ отдаётся только с ETag: удаление связи или связанной записи не сдвигает ни одну дату изменения,
+    и Last-Modified позволил бы клиенту получить 304 по If-Modified-Since для уже изменившегося ответа.
+    """
+
+    cast_field = None
+
+    def get_validators(self, request, *args, **kwargs):
+        return self.validators_from_rows(request, list(self.validators_queryset(kwargs)))
+
+    async def aget_validators(self, request, *args, **kwargs):
+        return self.validators_from_rows(request, [row async for row in self.validators_queryset(kwargs)])
+
+    def validators_queryset(self, kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        rows = self.get_queryset().model._default_manager.filter(**{self.lookup_field: kwargs[lookup]})
+        if not self.cast_field:
+            return rows.values("id", "created_or_updated_at").order_by()[:1]
+        return rows.values(
+            "id", "created_or_updated_at", f"{self.cast_field}__id", f"{self.cast_field}__created_or_updated_at",
+        ).order_by(f"{self.cast_field}__id")
+
+    def validators_from_rows(self, request, rows):
+        if not rows:
+            return None, None
+        row = {"id": rows[0]["id"], "created_or_updated_at": rows[0]["created_or_updated_at"]}
+        if self.cast_field:
+            row["cast_ids"] = [cast[f"{self.cast_field}__id"] for cast in rows]
+            row["cast_updated_at"] = max(
+                (cast[f"{self.cast_field}__created_or_updated_at"] for cast in rows if cast[f"{self.cast_field}__id"] is not None),
+                default=None,
+            )
+        # РАЗНЫЕ НАБОРЫ ПОЛЕЙ ОДНОЙ ЗАПИСИ (?fields=..., ?expand=...) - РАЗНЫЕ ПРЕДСТАВЛЕНИЯ:
+        etag = make_etag(*(row[key] for key in sorted(row)), urlencode(sorted(request.query_params.lists()), doseq=True))
+        return etag, None if self.cast_field else row["created_or_updated_at"]
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """
+    Валидаторы для списка записей: нормализованная строка запроса, количество и дата последнего изменения отфильтрованных записей
+    (одним агрегирующим запросом или, если у представления есть get_row_count(), количество - по его стратегии), а для удалений
+    и изменений связанных записей (cast_field) - одно из двух:
+        -> с общим кешем (single_flight.shared_cache_configured()) - версии данных моделей из кеша ответов (их меняют и удаления,
+           и изменения состава актёров)
+        -> без него версии у каждого процесса свои и изменение в одном процессе не дошло бы до других, поэтому тот же агрегирующий
+           запрос считает "контрольную сумму" id записей и пар из промежуточной таблицы (row_digest()) и дату последнего изменения
+           связанных записей
+    Ответ отдаётся только с ETag: дата последнего изменения не сдвигается при удалении записей и изменении состава актёров,
+    поэтому Last-Modified для списка был бы неверным.
+    """
+
+    cast_field = None
+
+    def uses_versions(self):
+        return getattr(self, "response_cache", None) is not None and shared_cache_configured()
+
+    def stats_queryset(self, queryset):
+        """Выборка и агрегаты для валидаторов: без общего кеша - по самим записям и их связям (JOIN - в подзапросе, не с фильтрами)"""
+        if self.uses_versions():
+            return queryset, {"last_modified": Max("created_or_updated_at")}
+        rows = queryset.model._default_manager.filter(pk__in=queryset.values("pk")).order_by()
+        aggregates = {"last_modified": Max("created_or_updated_at")}
+        # СВЯЗАННЫЕ ЗАПИСИ УЧИТЫВАЮТСЯ, ТОЛЬКО ЕСЛИ ОНИ ЕСТЬ В ОТВЕТЕ (НЕ ОТСЕЧЕНЫ ПАРАМЕТРОМ ?fields=, см. sparse_fields.py):
+        get_selected_fields = getattr(self, "get_selected_fields", None)
+        selected = get_selected_fields() if get_selected_fields is not None else None
+        if self.cast_field and (selected is None or self.cast_field in selected):
+            aggregates["digest"] = row_digest("id", f"{self.cast_field}__id")
+            aggregates["cast_updated_at"] = Max(f"{self.cast_field}__created_or_updated_at")
+        else:
+            aggregates["digest"] = row_digest("id")
+        return rows, aggregates
+
+    def get_validators(self, request, *args, **kwargs):
+        try:
+            versions = self.response_cache.versions() if self.uses_versions() else []
+        except Exception as e:
+            logger.warning(f"Не удалось получить версии данных для валидаторов {request.get_full_path()}: {str(e)}!")
+            return None, None
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        rows, aggregates = self.stats_queryset(queryset)
+        get_row_count = getattr(self, "get_row_count", None)
+        if get_row_count is None:
+            stats = rows.aggregate(count=Count("id", distinct=True), **aggregates)
+        else:
+            # КОЛИЧЕСТВО ЗАПИСЕЙ - ПО СТРАТЕГИИ ПРЕДСТАВЛЕНИЯ (ИЗ КЕША ИЛИ ОЦЕНКА), ЕГО ЖЕ ПОТОМ ВОЗЬМЁТ ПАГИНАЦИЯ (см. counts.RowCountMixin):
+            stats = rows.aggregate(**aggregates)
+            stats["count"] = get_row_count(queryset)
+        return self.validators_from_stats(request, stats, versions)
+
+    async def aget_validators(self, request, *args, **kwargs):
+        try:
+            versions = await self.response_cache.aversions() if self.uses_versions() else []
+        except Exception as e:
+            logger.warning(f"Не удалось получить версии данных для валидаторов {request.get_full_path()}: {str(e)}!")
+            return None, None
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        rows, aggregates = self.stats_queryset(queryset)
+        aget_row_count = getattr(self, "aget_row_count", None)
+        if aget_row_count is None:
+            stats = await rows.aaggregate(count=Count("id", distinct=True), **aggregates)
+        else:
+            stats = await rows.aaggregate(**aggregates)
+            stats["count"] = await aget_row_count(queryset)
+        return self.validators_from_stats(request, stats, versions)
+
+    def validators_from_stats(self, request, stats, versions):
+        response_cache = getattr(self, "response_cache", None)
+        query = response_cache.normalize_query(request) if response_cache is not None else request.META.get("QUERY_STRING", "")
+        etag = make_etag(request.path, query, *(stats[key] for key in sorted(stats)), *versions)
+        return etag, None
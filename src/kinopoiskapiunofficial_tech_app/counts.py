@@ -0,0 +1,178 @@
+import hashlib
+import json
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .db_routing import may_fill_cache, may_read_cache
+from .search import is_postgresql
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+def table_estimate(queryset):
+    """Оценка количества строк всей таблицы из статистики PostgreSQL (pg_class.reltuples) без её сканирования; None, если статистики ещё нет"""
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row is not None and row[0] >= 0 else None
+
+
+def planner_estimate(queryset):
+    """Оценка количества строк отфильтрованной выборки планировщиком PostgreSQL (EXPLAIN без выполнения запроса)"""
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(queryset, cache_key=None):
+    """
+    Количество записей выборки и признак его точности - (count, exact):
+        -> точное значение из кеша, если оно уже считалось (cache_key содержит версии данных моделей, поэтому после изменения записей
+           старое значение не находится)
+        -> на PostgreSQL для выборки без фильтров из большой таблицы - оценка из статистики таблицы, без сканирования
+        -> иначе COUNT, но не дальше API_COUNT_EXACT_THRESHOLD записей (COUNT по подзапросу с LIMIT); если записей больше,
+           на PostgreSQL берётся оценка планировщика, а на остальных СУБД (sqlite3 в тестах) - полный COUNT
+    Точные значения кешируются на API_COUNT_CACHE_TIMEOUT секунд (только посчитанные в основной БД, см. db_routing.may_fill_cache()).
+    """
+    threshold = settings.API_COUNT_EXACT_THRESHOLD
+    if cache_key is not None:
+        try:
+            count = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать количество записей {queryset.model.__name__} из кеша: {str(e)}!")
+            count = None
+        if count is not None:
+            return count, True
+
+    queryset = queryset.order_by()
+    postgresql = is_postgresql(queryset)
+    if postgresql and not queryset.query.where:
+        estimate = table_estimate(queryset)
+        if estimate is not None and estimate > threshold:
+            logger.debug("Количество записей %s взято из статистики таблицы: ~%s", queryset.model.__name__, estimate)
+            return estimate, False
+
+    count = queryset[:threshold + 1].count()
+    if count > threshold:
+        if postgresql:
+            estimate = max(planner_estimate(queryset), count)
+            logger.debug("Записей %s больше %s, количество по оценке планировщика: ~%s", queryset.model.__name__, threshold, estimate)
+            return estimate, False
+        count = queryset.count()
+
+    if cache_key is not None and may_fill_cache():
+        try:
+            cache.set(cache_key, count, settings.API_COUNT_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить количество записей {queryset.model.__name__} в кеш: {str(e)}!")
+    return count, True
+
+
+async def acount_rows(queryset, cache_key=None):
+    """
+    Асинхронный вариант count_rows() (для async_views.py): кеш и COUNT - через асинхронные API кеша и ORM,
+    оценки PostgreSQL (запросы к статистике и EXPLAIN) - через count_rows() в потоке
+    """
+    if is_postgresql(queryset):
+        return await sync_to_async(count_rows)(queryset, cache_key)
+
+    if cache_key is not None:
+        try:
+            count = await cache.aget(cache_key)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать количество записей {queryset.model.__name__} из кеша: {str(e)}!")
+            count = None
+        if count is not None:
+            return count, True
+
+    queryset = queryset.order_by()
+    count = await queryset[:settings.API_COUNT_EXACT_THRESHOLD + 1].acount()
+    if count > settings.API_COUNT_EXACT_THRESHOLD:
+        count = await queryset.acount()
+
+    if cache_key is not None and may_fill_cache():
+        try:
+            await cache.aset(cache_key, count, settings.API_COUNT_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить количество записей {queryset.model.__name__} в кеш: {str(e)}!")
+    return count, True
+
+
+class RowCountMixin:
+    """
+    Примесь для ListAPIView: количество отфильтрованных записей (см. count_rows()) считается один раз за запрос - его используют
+    и валидаторы ETag (conditional_requests.ConditionalListMixin), и пагинация (pagination.KeysetPagination). Точные значения кешируются
+    с версиями данных из response_cache представления (только с включённым общим кешем, см. ResponseCache.shared), поэтому любое
+    изменение записей делает их неактуальными
+    (клиентам, которые должны видеть свои изменения, кешированное количество не отдаётся - см. db_routing.may_read_cache()).
+    """
+
+    # ПАРАМЕТРЫ ЗАПРОСА, КОТОРЫЕ НЕ ВЛИЯЮТ НА КОЛИЧЕСТВО ЗАПИСЕЙ:
+    COUNT_IGNORED_PARAMS = ("cursor", "page_size", "ordering", "fields", "expand", "format", "pretty")
+
+    def get_count_cache_key(self):
+        response_cache = getattr(self, "response_cache", None)
+        if response_cache is None or not response_cache.shared or not settings.API_COUNT_CACHE_TIMEOUT or not may_read_cache(self.request):
+            return None
+        try:
+            versions = response_cache.versions()
+        except Exception as e:
+            logger.warning(f"Не удалось получить версии данных для кеша количества записей: {str(e)}!")
+            return None
+        return self.count_cache_key(versions)
+
+    async def aget_count_cache_key(self):
+        response_cache = getattr(self, "response_cache", None)
+        if response_cache is None or not response_cache.shared or not settings.API_COUNT_CACHE_TIMEOUT or not may_read_cache(self.request):
+            return None
+        try:
+            versions = await response_cache.aversions()
+        except Exception as e:
+            logger.warning(f"Не удалось получить версии данных для кеша количества записей: {str(e)}!")
+            return None
+        return self.count_cache_key(versions)
+
+    def count_cache_key(self, versions):
+        params = [
+            (name, value)
+            for name, values in sorted(self.request.query_params.lists())
+            if name not in self.COUNT_IGNORED_PARAMS
+            for value in values
+            if value != ""
+        ]
+        raw = "|".join((self.request.path, urlencode(params), *map(str, versions)))
+        return f"row-count:{hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()}"
+
+    def get_row_count(self, queryset):
+        if not hasattr(self, "_row_count"):
+            self._row_count = count_rows(queryset, self.get_count_cache_key())
+        return self._row_count
+
+    async def aget_row_count(self, queryset):
+        if not hasattr(self, "_row_count"):
+            self._row_count = await acount_rows(queryset, await self.aget_count_cache_key())
+        return self._row_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор по номерам страниц (для админки), который считает записи через count_rows(): на больших таблицах PostgreSQL
+    вместо COUNT(*) берётся оценка, поэтому количество страниц тоже приблизительное (count_is_exact)
+    """
+
+    count_is_exact = True
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return super().count
+        count, self.count_is_exact = count_rows(self.object_list)
+        return count
@@ -1,5 +1,7 @@
-from django.db.models import functions
-from django_filters import rest_framework as filters, DateTimeFilter
+from django_filters import rest_framework as filters
+
+from ..search import FoldedCharFilter
+from .base import DateRangeFilter, IntegerFilter, IntegerInFilter
 
 from ..models import Actor
 
@@ -7,21 +9,26 @@ from ..models import Actor
 class ActorFilterSet(filters.FilterSet):
     """Класс для фильтрации актёров по критериям"""
     
-    staff_id = filters.CharFilter(lookup_expr="icontains", label="ID актёра на стороне API")
-    name = filters.CharFilter(lookup_expr="icontains", label="Имя/Ф.И.О.") # поиск по части слова и без учёта регистра
+    # ФИЛЬТРАЦИЯ ПО ID НА СТОРОНЕ API (ТОЧНОЕ СОВПАДЕНИЕ, СПИСОК ЧЕРЕЗ ЗАПЯТУЮ И ДИАПАЗОН - ВСЁ ПО УНИКАЛЬНОМУ ИНДЕКСУ):
+    staff_id = IntegerFilter(label="ID актёра на стороне API")
+    staff_id_in = IntegerInFilter(field_name="staff_id", lookup_expr="in", label="ID актёров на стороне API (список через запятую)")
+    staff_id_gte = IntegerFilter(field_name="staff_id", lookup_expr="gte", label="ID актёра на стороне API (от)")
+    staff_id_lte = IntegerFilter(field_name="staff_id", lookup_expr="lte", label="ID актёра на стороне API (до)")
+
+    name = FoldedCharFilter(label="Имя/Ф.И.О.") # поиск по части слова без учёта регистра и разницы между е/ё
     poster_url = filters.CharFilter(lookup_expr="icontains", label="Ссылка на постер")
     profession = filters.CharFilter(lookup_expr="icontains", label="Профессия/Специальность")
-    created_or_updated_at = filters.CharFilter(lookup_expr="icontains", label="Создано/Обновлено")
 
-    created_or_updated_at_gte = DateTimeFilter(
-        field_name="updated_at",
+    # ФИЛЬТРАЦИЯ ПО ДАТЕ СОЗДАНИЯ/ОБНОВЛЕНИЯ ("ДО" - ВКЛЮЧИТЕЛЬНО ДО КОНЦА ДНЯ):
+    created_or_updated_at_gte = DateRangeFilter(
+        field_name="created_or_updated_at",
         lookup_expr="gte",
         label="Создано/Обновлено на стороне нашего проекта (от) (ДД.ММ.ГГГГ)",
         input_formats=("%d.%m.%Y",)
     )
 
-    created_or_updated_at_lte = DateTimeFilter(
-        field_name="updated_at",
+    created_or_updated_at_lte = DateRangeFilter(
+        field_name="created_or_updated_at",
         lookup_expr="lte",
         label="Создано/Обновлено на стороне нашего проекта (до) (ДД.ММ.ГГГГ)",
         input_formats=("%d.%m.%Y",)
@@ -0,0 +1,66 @@
+import datetime
+
+from django import forms
+from django.db.models import Exists, OuterRef, Q
+from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+
+from ..search import folded_contains
+
+
+class IntegerFilter(filters.NumberFilter):
+    """Фильтр по целочисленному полю: значение сравнивается с полем как есть (без приведения поля к строке), поэтому работает индекс"""
+
+    field_class = forms.IntegerField # NumberFilter принимает дробные числа, которые IntegerField молча округлил бы
+
+
+class IntegerInFilter(filters.BaseInFilter, IntegerFilter):
+    """Фильтр по списку целых чисел через запятую (?kinopoisk_id_in=1,2,3)"""
+
+
+class DateRangeFilter(filters.DateTimeFilter):
+    """
+    Граница периода по дате изменения записи (ДД.ММ.ГГГГ). Поле сравнивается с моментом времени, а не приводится к дате,
+    поэтому работает индекс; для lookup_expr="lte" граница - конец дня (записи за сам этот день тоже попадают в выборку).
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        if self.lookup_expr == "lte":
+            qs = qs.filter(**{f"{self.field_name}__lt": value + datetime.timedelta(days=1)})
+            return qs.distinct() if self.distinct else qs
+        return super().filter(qs, value)
+
+
+class RelatedExistsFilter(filters.Filter):
+    """
+    Фильтр по связанным записям поля ManyToManyField (field_name) через EXISTS-подзапрос к промежуточной таблице:
+    в отличие от JOIN запись не дублируется, если подходят сразу несколько связанных записей, и не нужен DISTINCT
+    """
+
+    def related_condition(self, rows, related_field, value):
+        """Возвращает (queryset строк промежуточной таблицы, условие на связанную запись)"""
+        raise NotImplementedError
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        m2m_field = qs.model._meta.get_field(self.field_name)
+        rows = m2m_field.remote_field.through.objects.filter(**{m2m_field.m2m_field_name(): OuterRef("pk")})
+        rows, condition = self.related_condition(rows, m2m_field.m2m_reverse_field_name(), value)
+        return qs.filter(Exists(rows.filter(condition)))
+
+
+class RelatedNameFilter(RelatedExistsFilter, filters.CharFilter):
+    """Есть связанная запись, имя которой содержит строку (без учёта регистра и разницы между е/ё)"""
+
+    def related_condition(self, rows, related_field, value):
+        return folded_contains(rows, f"{related_field}__name", value)
+
+
+class RelatedIdFilter(RelatedExistsFilter, IntegerInFilter):
+    """Есть связанная запись с одним из id через запятую (условие только по промежуточной таблице, без JOIN связанной)"""
+
+    def related_condition(self, rows, related_field, value):
+        return rows, Q(**{f"{related_field}__in": value})
@@ -1,5 +1,7 @@
-from django.db.models import functions
-from django_filters import rest_framework as filters, DateTimeFilter
+from django_filters import rest_framework as filters
+
+from ..search import FoldedCharFilter
+from .base import DateRangeFilter, IntegerFilter, IntegerInFilter, RelatedIdFilter, RelatedNameFilter
 
 from ..models import Film
 
@@ -7,23 +9,32 @@ from ..models import Film
 class FilmFilterSet(filters.FilterSet):
     """Класс для фильтрации фильмов по критериям"""
 
-    kinopoisk_id = filters.CharFilter(lookup_expr="icontains", label="ID на сайте")
-    name = filters.CharFilter(lookup_expr="icontains", label="Название") # поиск по части слова и без учёта регистра
-    actors = filters.CharFilter(field_name="actors__name", lookup_expr="icontains", label="Актёры")
-    
+    name = FoldedCharFilter(label="Название") # поиск по части слова без учёта регистра и разницы между е/ё
+
+    # ФИЛЬТРАЦИЯ ПО ID НА САЙТЕ (ТОЧНОЕ СОВПАДЕНИЕ, СПИСОК ЧЕРЕЗ ЗАПЯТУЮ И ДИАПАЗОН - ВСЁ ПО УНИКАЛЬНОМУ ИНДЕКСУ):
+    kinopoisk_id = IntegerFilter(label="ID на сайте")
+    kinopoisk_id_in = IntegerInFilter(field_name="kinopoisk_id", lookup_expr="in", label="ID на сайте (список через запятую)")
+    kinopoisk_id_gte = IntegerFilter(field_name="kinopoisk_id", lookup_expr="gte", label="ID на сайте (от)")
+    kinopoisk_id_lte = IntegerFilter(field_name="kinopoisk_id", lookup_expr="lte", label="ID на сайте (до)")
+
+    # ФИЛЬТРАЦИЯ ПО АКТЁРАМ (ЧЕРЕЗ EXISTS, БЕЗ ДУБЛИРОВАНИЯ ФИЛЬМОВ):
+    actors = RelatedNameFilter(field_name="actors", label="Актёры") # поиск по части имени без учёта регистра и разницы между е/ё
+    actor_id = RelatedIdFilter(field_name="actors", label="ID актёров (список через запятую)")
+
     # ФИЛЬТРАЦИЯ ПО ГОДАМ ВЫХОДА:
     year_gte = filters.NumberFilter(field_name="year", lookup_expr="gte", label="Год выхода (от)")  # поиск по году выхода по критерию ">="
     year_lte = filters.NumberFilter(field_name="year", lookup_expr="lte", label="Год выхода (до)")  # поиск по году выхода по критерию "<="
 
-    created_or_updated_at_gte = DateTimeFilter(
-        field_name="updated_at",
+    # ФИЛЬТРАЦИЯ ПО ДАТЕ СОЗДАНИЯ/ОБНОВЛЕНИЯ ("ДО" - ВКЛЮЧИТЕЛЬНО ДО КОНЦА ДНЯ):
+    created_or_updated_at_gte = DateRangeFilter(
+        field_name="created_or_updated_at",
         lookup_expr="gte",
         label="Создано/Обновлено на стороне нашего проекта (от) (ДД.ММ.ГГГГ)",
         input_formats=("%d.%m.%Y",)
     )
 
-    created_or_updated_at_lte = DateTimeFilter(
-        field_name="updated_at",
+    created_or_updated_at_lte = DateRangeFilter(
+        field_name="created_or_updated_at",
         lookup_expr="lte",
         label="Создано/Обновлено на стороне нашего проекта (до) (ДД.ММ.ГГГГ)",
         input_formats=("%d.%m.%Y",)
@@ -0,0 +1,128 @@
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from rest_framework import permissions
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+# МОЖНО ЛИ ЧИТАТЬ С РЕПЛИК В ТЕКУЩЕМ ЗАПРОСЕ (ВНЕ ЗАПРОСОВ - СИНХРОНИЗАЦИЯ, КОМАНДЫ manage.py - ВСЕГДА НЕЛЬЗЯ):
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+# БЫЛА ЛИ В ТЕКУЩЕМ ЗАПРОСЕ ЗАПИСЬ В ОСНОВНУЮ БД (ОТМЕЧАЕТ ReplicaRouter.db_for_write(), см. ReplicaRoutingMiddleware.mark_sticky()):
+_primary_writes = contextvars.ContextVar("primary_writes", default=False)
+
+# ПРЕДСТАВЛЕНИЯ (url_name), ЗАПРОСЫ НА ЧТЕНИЕ К КОТОРЫМ МОЖНО ОБСЛУЖИВАТЬ С РЕПЛИК:
+REPLICA_READ_VIEWS = (
+    "index",
+    "film-list", "film-detail", "film-export",
+    "actor-list", "actor-detail", "actor-export", "actor-films", "actor-films-batch",
+)
+
+
+def may_read_cache(request):
+    """
+    Можно ли отдавать запросу данные из кешей (ответов, количества записей, таблицы основной страницы): клиент, который недавно
+    изменял данные (cookie REPLICA_STICKY_COOKIE), должен видеть свои изменения, поэтому для него кеши пропускаются
+    """
+    return not (settings.DATABASE_REPLICAS and settings.REPLICA_STICKY_COOKIE in request.COOKIES)
+
+
+def may_fill_cache():
+    """
+    Можно ли сохранять в кеши данные текущего запроса: прочитанное с реплики может отставать от основной БД и попало бы в кеш
+    под уже новой версией данных (см. response_cache.py), поэтому кеши заполняются только данными из основной БД
+    """
+    return not _replica_reads.get()
+
+
+class ReplicaRouter:
+    """
+    Маршрутизатор БД: запись - всегда в основную БД (default), чтение - со случайной реплики из settings.DATABASE_REPLICAS,
+    если текущий запрос это разрешил (см. ReplicaRoutingMiddleware), иначе тоже из основной БД.
+    После первой записи в запросе остальные чтения этого запроса тоже идут в основную БД (реплика может отставать).
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or not _replica_reads.get():
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _replica_reads.set(False)
+        _primary_writes.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True # реплики - копии основной БД
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # МИГРАЦИИ ПРИМЕНЯЮТСЯ ТОЛЬКО К ОСНОВНОЙ БД, НА РЕПЛИКИ ОНИ ПРИХОДЯТ РЕПЛИКАЦИЕЙ:
+        return False if db in settings.DATABASE_REPLICAS else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Промежуточное ПО, которое разрешает чтение с реплик (ReplicaRouter) для запросов на чтение (GET/HEAD/OPTIONS)
+    к представлениям из REPLICA_READ_VIEWS. Админка, синхронизация и всё остальное работают только с основной БД.
+    После успешного (2xx/3xx) запроса, который записывал в основную БД, клиент получает cookie REPLICA_STICKY_COOKIE
+    на REPLICA_STICKY_SECONDS секунд, и пока она есть, его запросы читают из основной БД - так он сразу видит свои изменения,
+    даже если реплики отстают. Отклонённые запросы на изменение (ошибки прав, валидации) cookie не получают.
+    """
+
+    # РАБОТАЕТ И ПОД ASGI БЕЗ ПЕРЕХОДА В ПОТОК (ИНАЧЕ АСИНХРОННЫЕ ПРЕДСТАВЛЕНИЯ ВЫЗЫВАЛИСЬ БЫ ЧЕРЕЗ async_to_sync, см. async_views.py):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        tokens = _replica_reads.set(False), _primary_writes.set(False)
+        try:
+            return self.mark_sticky(request, self.get_response(request))
+        finally:
+            _replica_reads.reset(tokens[0])
+            _primary_writes.reset(tokens[1])
+
+    async def __acall__(self, request):
+        tokens = _replica_reads.set(False), _primary_writes.set(False)
+        try:
+            return self.mark_sticky(request, await self.get_response(request))
+        finally:
+            _replica_reads.reset(tokens[0])
+            _primary_writes.reset(tokens[1])
+
+    def mark_sticky(self, request, response):
+        if settings.DATABASE_REPLICAS and _primary_writes.get() and response.status_code < 400:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE, "1", max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in permissions.SAFE_METHODS
+            and match is not None and match.url_name in REPLICA_READ_VIEWS and match.namespace != "admin"
+            and settings.REPLICA_STICKY_COOKIE not in request.COOKIES
+        ):
+            logger.debug("Запрос %s %s читает с реплик БД", request.method, request.path)
+            _replica_reads.set(True)
+        return None
@@ -0,0 +1,80 @@
+from gzip import GzipFile
+from itertools import islice
+
+from django.conf import settings
+from django.utils.text import StreamingBuffer
+
+from .renderers import NDJSONRenderer
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+def chunked(iterable, size):
+    """Разбивает итератор на списки не длиннее size элементов, не загружая его целиком"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def achunked(aiterable, size):
+    """Асинхронный вариант chunked() для асинхронных итераторов"""
+    chunk = []
+    async for item in aiterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_ndjson(queryset, fast_serializer, chunk_size=None):
+    """
+    Генератор выгрузки записей в формате NDJSON (одна запись - одна строка JSON):
+        -> записи читаются через values().iterator(chunk_size) (на PostgreSQL - серверным курсором), поэтому в памяти одновременно
+           находится не больше chunk_size записей, сколько бы их ни было в таблице
+        -> каждая порция преобразуется быстрым сериализатором (для фильмов - с актёрами всей порции одним запросом)
+        -> наружу отдаётся одна строка байтов на порцию, чтобы не дробить поток на слишком мелкие куски
+    """
+
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    renderer = NDJSONRenderer()
+    exported = 0
+    rows = fast_serializer.values(queryset.prefetch_related(None)).iterator(chunk_size=chunk_size)
+    for chunk in chunked(rows, chunk_size):
+        yield b"".join(renderer.render(row) for row in fast_serializer.to_representation(chunk))
+        exported += len(chunk)
+    logger.info("Выгрузка записей %s в формате NDJSON завершена: %s записей!", queryset.model.__name__, exported)
+
+
+async def astream_ndjson(queryset, fast_serializer, chunk_size=None):
+    """
+    Асинхронный вариант stream_ndjson() для ASGI: синхронный генератор StreamingHttpResponse под ASGI сначала читает целиком
+    (в памяти), а асинхронный отдаёт порции по мере чтения - записи через values().aiterator(chunk_size), актёры каждой порции
+    одним запросом через ato_representation()
+    """
+
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    renderer = NDJSONRenderer()
+    exported = 0
+    rows = fast_serializer.values(queryset.prefetch_related(None)).aiterator(chunk_size=chunk_size)
+    async for chunk in achunked(rows, chunk_size):
+        yield b"".join(renderer.render(row) for row in await fast_serializer.ato_representation(chunk))
+        exported += len(chunk)
+    logger.info("Выгрузка записей %s в формате NDJSON завершена: %s записей!", queryset.model.__name__, exported)
+
+
+async def acompress_sequence(sequence):
+    """Асинхронный вариант django.utils.text.compress_sequence(): сжимает асинхронный поток байтов в gzip по мере его чтения"""
+    buffer = StreamingBuffer()
+    with GzipFile(mode="wb", compresslevel=6, fileobj=buffer, mtime=0) as zfile:
+        yield buffer.read()
+        async for item in sequence:
+            zfile.write(item)
+            data = buffer.read()
+            if data:
+                yield data
+    yield buffer.read()
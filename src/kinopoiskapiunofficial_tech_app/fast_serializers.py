@@ -0,0 +1,233 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import CharField, F, Func, Value
+from django.utils import timezone
+
+from rest_framework.response import Response
+
+from .models import Film, Actor
+from .sparse_fields import ordering_columns
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+# ИМЯ СТОЛБЦА С ДАТОЙ ИЗМЕНЕНИЯ, ОТФОРМАТИРОВАННОЙ НА СТОРОНЕ БД (см. FastSerializer.values()):
+FORMATTED = "created_or_updated_at_formatted"
+
+
+def formatted_datetime(field_name, vendor):
+    """
+    Выражение для даты в формате "дд.мм.гггг | чч:мм:сс" (в UTC, как в сериализаторах) на стороне БД: to_char() на PostgreSQL
+    и strftime() на sqlite3 (даты хранятся в UTC). На остальных СУБД - None, дата форматируется в format_datetime().
+    """
+    if vendor == "postgresql":
+        utc = Func(F(field_name), template="(%(expressions)s AT TIME ZONE 'UTC')")
+        return Func(utc, Value("DD.MM.YYYY | HH24:MI:SS"), function="to_char", output_field=CharField())
+    if vendor == "sqlite":
+        return Func(Value("%d.%m.%Y | %H:%M:%S"), F(field_name), function="strftime", output_field=CharField())
+    return None
+
+
+def current_timezone():
+    """Временная зона для ISO-представления дат (None - без перевода, USE_TZ = False); определяется один раз на страницу, а не на запись"""
+    return timezone.get_current_timezone() if settings.USE_TZ else None
+
+
+def format_datetime(value, tz=None, formatted=None):
+    """
+    Пара (ISO-представление, "дд.мм.гггг | чч:мм:сс") для даты изменения записи.
+    tz - результат current_timezone() (если не передан, определяется здесь), formatted - строка, уже отформатированная в запросе.
+    """
+    if value is None:
+        return None, formatted
+    # ТОЧНО ТАК ЖЕ, КАК serializers.DateTimeField.to_representation() (В ТЕКУЩЕЙ ВРЕМЕННОЙ ЗОНЕ, "+00:00" -> "Z"):
+    tz = tz or current_timezone()
+    iso = value.astimezone(tz).isoformat() if tz is not None else value.isoformat()
+    if iso.endswith("+00:00"):
+        iso = iso[:-6] + "Z"
+    # ТОЧНО ТАК ЖЕ, КАК get_created_or_updated_at_formatted() В СЕРИАЛИЗАТОРАХ (БЕЗ ПЕРЕВОДА В ТЕКУЩУЮ ВРЕМЕННУЮ ЗОНУ):
+    if formatted is None:
+        formatted = f"{value.day:02d}.{value.month:02d}.{value.year:04d} | {value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+    return iso, formatted
+
+
+class FastSerializer:
+    """
+    Базовый класс быстрых сериализаторов: fields - все столбцы, которые читаются через values(), selected - выводимые поля
+    (None - все поля в формате обычного сериализатора, см. sparse_fields.selected_fields)
+    """
+
+    fields = ()
+
+    def __init__(self, selected=None):
+        self.selected = selected
+
+    def columns(self):
+        """Столбцы, которые нужно выбрать из БД для выводимых полей"""
+        if self.selected is None:
+            return self.fields
+        wanted = {"id", *self.selected}
+        if "created_or_updated_at_formatted" in wanted:
+            wanted.add("created_or_updated_at")
+        return tuple(column for column in self.fields if column in wanted)
+
+    def wants(self, name):
+        return self.selected is None or name in self.selected
+
+    def values(self, queryset, *extra):
+        """
+        Выборка values() с нужными столбцами (и extra): если СУБД умеет форматировать даты (см. formatted_datetime()), дата
+        изменения в формате "дд.мм.гггг | чч:мм:сс" формируется в том же запросе, а не в Python для каждой записи
+        """
+        columns = self.columns()
+        expression = formatted_datetime("created_or_updated_at", connections[queryset.db].vendor)
+        if expression is not None and "created_or_updated_at" in self.fields and self.wants(FORMATTED):
+            queryset = queryset.annotate(**{FORMATTED: expression})
+            columns += (FORMATTED,)
+        return queryset.values(*columns, *extra)
+
+    def select(self, item):
+        return item if self.selected is None else {name: item[name] for name in self.selected}
+
+    async def ato_representation(self, rows):
+        """Асинхронный вариант to_representation() (для async_views.py); сериализаторы, которым нужны связанные записи, его переопределяют"""
+        return self.to_representation(rows)
+
+
+class FastFilmSerializer(FastSerializer):
+    """
+    Класс для быстрого (только для чтения) преобразования записей о фильмах в тот же формат, что и у FilmSerializer:
+    записи выбираются через values() без создания объектов модели и полей DRF, а актёры всей страницы - одним запросом к промежуточной таблице.
+    """
+
+    fields = ("id", "kinopoisk_id", "name", "year", "created_or_updated_at")
+
+    @staticmethod
+    def cast_rows(film_ids):
+        """Выборка актёров (film_id, id и name) для переданных фильмов, в том же порядке, что и Film.objects.with_cast()"""
+        return (
+            Film.actors.through.objects
+            .filter(film_id__in=film_ids)
+            .order_by(*(f"actor__{term}" for term in Actor._meta.ordering))
+            .values_list("film_id", "actor_id", "actor__name")
+        )
+
+    @staticmethod
+    def add_cast(casts, film_id, actor_id, name):
+        casts[film_id].append({"id": actor_id, "name": name})
+
+    def casts(self, film_ids):
+        """Актёры (id и name) для переданных фильмов одним запросом"""
+        casts = defaultdict(list)
+        for row in self.cast_rows(film_ids):
+            self.add_cast(casts, *row)
+        return casts
+
+    async def acasts(self, film_ids):
+        casts = defaultdict(list)
+        async for row in self.cast_rows(film_ids):
+            self.add_cast(casts, *row)
+        return casts
+
+    def represent(self, row, casts, tz=None):
+        iso, formatted = format_datetime(row.get("created_or_updated_at"), tz, row.get(FORMATTED))
+        return {
+            "id": row["id"],
+            "kinopoisk_id": row.get("kinopoisk_id"),
+            "name": row.get("name"),
+            "year": row.get("year"),
+            "actors": casts.get(row["id"], []),
+            "created_or_updated_at": iso,
+            "created_or_updated_at_formatted": formatted,
+        }
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        casts = self.casts([row["id"] for row in rows]) if self.wants("actors") else {}
+        tz = current_timezone()
+        return [self.select(self.represent(row, casts, tz)) for row in rows]
+
+    async def ato_representation(self, rows):
+        rows = list(rows)
+        casts = await self.acasts([row["id"] for row in rows]) if self.wants("actors") else {}
+        tz = current_timezone()
+        return [self.select(self.represent(row, casts, tz)) for row in rows]
+
+
+class FastFilmographySerializer(FastFilmSerializer):
+    """Класс для быстрого преобразования фильмографии актёров в тот же формат, что и у FilmographySerializer (actor_id - аннотация выборки)"""
+
+    def represent(self, row, casts, tz=None):
+        return {"actor_id": row["actor_id"], **super().represent(row, casts, tz)}
+
+
+class FastActorSerializer(FastSerializer):
+    """Класс для быстрого (только для чтения) преобразования записей об актёрах в тот же формат, что и у ActorSerializer"""
+
+    fields = ("id", "staff_id", "name", "poster_url", "profession", "created_or_updated_at")
+
+    def to_representation(self, rows):
+        result = []
+        tz = current_timezone()
+        for row in rows:
+            iso, formatted = format_datetime(row.get("created_or_updated_at"), tz, row.get(FORMATTED))
+            result.append(self.select({
+                "id": row["id"],
+                "staff_id": row.get("staff_id"),
+                "name": row.get("name"),
+                "poster_url": row.get("poster_url"),
+                "profession": row.get("profession"),
+                "created_or_updated_at": iso,
+                "created_or_updated_at_formatted": formatted,
+            }))
+        return result
+
+
+class FastListMixin:
+    """
+    Примесь для ListAPIView: GET-запросы списка записей обслуживаются через fast_serializer_class (values() вместо объектов модели),
+    если он задан у представления и быстрый режим не отключён настройкой API_FAST_READ_ENABLED
+    """
+
+    fast_serializer_class = None
+
+    @property
+    def fast_read_enabled(self):
+        return self.fast_serializer_class is not None and settings.API_FAST_READ_ENABLED
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_read_enabled:
+            return super().list(request, *args, **kwargs)
+
+        fast_serializer, queryset = self.fast_queryset(request)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer.to_representation(page))
+        return Response(fast_serializer.to_representation(queryset))
+
+    async def alist(self, request, *args, **kwargs):
+        """Асинхронный вариант list() (см. async_views.AsyncListMixin - он вызывается, только если включён быстрый режим)"""
+        fast_serializer, queryset = self.fast_queryset(request)
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            return self.get_paginated_response(await fast_serializer.ato_representation(page))
+        return Response(await fast_serializer.ato_representation([row async for row in queryset]))
+
+    def fast_queryset(self, request):
+        """Быстрый сериализатор с выбранными полями и отфильтрованная выборка values() только с нужными ему столбцами"""
+        # ВЫБРАННЫЕ КЛИЕНТОМ ПОЛЯ (?fields=...), ЕСЛИ ПРЕДСТАВЛЕНИЕ ИХ ПОДДЕРЖИВАЕТ (см. sparse_fields.SparseFieldsMixin):
+        get_selected_fields = getattr(self, "get_selected_fields", None)
+        fast_serializer = self.fast_serializer_class(get_selected_fields() if get_selected_fields is not None else None)
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        # ПОЛЯ СОРТИРОВКИ И АННОТАЦИИ (НАПРИМЕР, РЕЛЕВАНТНОСТЬ ПОИСКА) НУЖНЫ ПАГИНАЦИИ ДЛЯ КУРСОРА, САМ СЕРИАЛИЗАТОР ИХ НЕ ВЫВОДИТ:
+        columns = fast_serializer.columns()
+        ordering = sorted(ordering_columns(request, queryset, self) & set(fast_serializer.fields) - set(columns))
+        queryset = fast_serializer.values(queryset, *ordering, *queryset.query.annotation_select)
+        logger.debug("Список записей %s формируется через %s...", queryset.model.__name__, self.fast_serializer_class.__name__)
+        return fast_serializer, queryset
+
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db.models import F
+from django.urls import reverse
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Film
+from .pagination import KeysetPagination
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+ACTOR_ID_PARAM = "actor_id"
+
+# ПОРЯДОК ФИЛЬМОГРАФИИ - ТОТ ЖЕ, ЧТО У ИНДЕКСА ПРОМЕЖУТОЧНОЙ ТАБЛИЦЫ film_actors_actor_film_idx (actor_id, film_id), СМ. МИГРАЦИЮ 0006:
+ORDERING = ("actor_id", "id")
+
+
+def filmography(actor_ids, queryset=None):
+    """
+    Фильмы актёров actor_ids одним запросом: JOIN промежуточной таблицы с условием по actor_id (индекс (actor_id, film_id))
+    и аннотацией actor_id - фильм, в котором снимались несколько из этих актёров, выводится для каждого из них
+    """
+    queryset = Film.objects.all() if queryset is None else queryset
+    return queryset.filter(actors__in=actor_ids).annotate(actor_id=F("actors"))
+
+
+def parse_actor_ids(request):
+    """id актёров из параметра ?actor_id=1,2,3 (не больше API_FILMOGRAPHY_MAX_ACTORS)"""
+    raw = [value.strip() for value in request.query_params.get(ACTOR_ID_PARAM, "").split(",") if value.strip()]
+    if not raw:
+        raise ValidationError({ACTOR_ID_PARAM: ["Передайте id актёров через запятую."]})
+    if not all(value.isdigit() for value in raw):
+        raise ValidationError({ACTOR_ID_PARAM: ["Ожидаются целые числа (id актёров) через запятую."]})
+    actor_ids = sorted({int(value) for value in raw})
+    if len(actor_ids) > settings.API_FILMOGRAPHY_MAX_ACTORS:
+        raise ValidationError({ACTOR_ID_PARAM: [f"В одном запросе можно передать не больше {settings.API_FILMOGRAPHY_MAX_ACTORS} актёров."]})
+    return actor_ids
+
+
+def first_page(request, actor):
+    """
+    Первая страница фильмографии актёра (для ?expand=films у актёра) - та же, что отдаёт /actors/<pk>/films/,
+    со ссылкой next на продолжение по этому адресу
+    """
+    paginator = KeysetPagination()
+    page_size = paginator.page_size
+    rows = list(filmography([actor.pk]).order_by(*ORDERING).values("id", "kinopoisk_id", "name", "year", "actor_id")[:page_size + 1])
+    next_link = None
+    if len(rows) > page_size:
+        paginator.ordering = ORDERING
+        namespace = request.resolver_match.namespace if request is not None and request.resolver_match is not None else "api_v1"
+        url = reverse(f"{namespace}:actor-films", kwargs={"pk": actor.pk})
+        paginator.base_url = request.build_absolute_uri(url) if request is not None else url
+        next_link = paginator.encode_cursor(paginator.get_position(rows[page_size - 1]), "next")
+    logger.debug("Первая страница фильмографии актёра %s: %s фильмов", actor.pk, min(len(rows), page_size))
+    return {
+        "next": next_link,
+        "results": [{key: row[key] for key in ("id", "kinopoisk_id", "name", "year")} for row in rows[:page_size]],
+    }
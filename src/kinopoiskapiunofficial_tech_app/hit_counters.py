@@ -0,0 +1,118 @@
+import atexit
+import math
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, F, PositiveBigIntegerField, Value, When
+from django.utils import timezone
+
+from .models import Film
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+class HitCounter:
+    """
+    Класс для подсчёта обращений к записям через API:
+        -> на "горячем" пути запроса счётчик только увеличивается в памяти процесса (под коротким локом, без обращения к БД)
+        -> накопленные значения сбрасываются в БД пачкой (одним UPDATE на FLUSH_CHUNK_SIZE записей) в фоновом потоке,
+           когда накопилось flush_threshold обращений или прошло flush_interval секунд с предыдущего сброса
+    """
+
+    FLUSH_CHUNK_SIZE = 500
+
+    def __init__(self, model, field_name="hits", flush_threshold=None, flush_interval=None):
+        self.model = model
+        self.field_name = field_name
+        self.flush_threshold = flush_threshold or settings.FILMS_HITS_FLUSH_THRESHOLD
+        self.flush_interval = flush_interval or settings.FILMS_HITS_FLUSH_INTERVAL
+        self._counts = Counter()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_thread = None # фоновый поток сброса (не больше одного одновременно)
+
+    def hit(self, *pks):
+        """Учитываем обращения к записям с переданными pk. Никогда не обращается к БД в вызывающем потоке"""
+        if not pks:
+            return
+        with self._lock:
+            self._counts.update(pks)
+            self._pending += len(pks)
+            should_flush = self._pending >= self.flush_threshold or time.monotonic() - self._last_flush >= self.flush_interval
+            # ПОТОК ЗАПУСКАЕТСЯ ПОД ТЕМ ЖЕ ЛОКОМ: ОДНОВРЕМЕННЫЕ ОБРАЩЕНИЯ НЕ ЗАПУСТЯТ НЕСКОЛЬКО ПОТОКОВ СБРОСА:
+            if should_flush and not self._flushing.locked() and (self._flush_thread is None or not self._flush_thread.is_alive()):
+                self._flush_thread = threading.Thread(target=self._flush_in_background, name="hit-counter-flush", daemon=True)
+                self._flush_thread.start()
+
+    def pending(self):
+        """Копия ещё не сброшенных в БД счётчиков"""
+        with self._lock:
+            return dict(self._counts)
+
+    def _take(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        return counts
+
+    def _restore(self, counts):
+        with self._lock:
+            self._counts.update(counts)
+            self._pending += sum(counts.values())
+
+    def flush(self):
+        """Сбрасываем накопленные счётчики в БД. Возвращает количество обновлённых записей"""
+        with self._flushing:
+            counts = self._take()
+            if not counts:
+                return 0
+            updated = 0
+            done = 0
+            items = list(counts.items())
+            try:
+                for start in range(0, len(items), self.FLUSH_CHUNK_SIZE):
+                    chunk = items[start:start + self.FLUSH_CHUNK_SIZE]
+                    increment = Case(
+                        *[When(pk=pk, then=Value(count)) for pk, count in chunk],
+                        default=Value(0),
+                        output_field=PositiveBigIntegerField(),
+                    )
+                    # QuerySet.update() НЕ ВЫЗЫВАЕТ save() И НЕ ТРОГАЕТ auto_now-ПОЛЕ created_or_updated_at:
+                    updated += self.model.objects.filter(pk__in=[pk for pk, _ in chunk]).update(**{self.field_name: F(self.field_name) + increment})
+                    done += len(chunk)
+            except Exception as e:
+                # НЕ ТЕРЯЕМ НЕСБРОШЕННЫЕ ОБРАЩЕНИЯ - ВЕРНЁМ ИХ В СЧЁТЧИК ДО СЛЕДУЮЩЕЙ ПОПЫТКИ:
+                self._restore(Counter(dict(items[done:])))
+                logger.error(f"Ошибка при сбросе счётчиков обращений к записям {self.model.__name__} в БД: {str(e)}!", exc_info=True)
+                return updated
+            logger.debug("Счётчики обращений сброшены в БД для %s записей %s!", updated, self.model.__name__)
+            return updated
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all() # закрываем соединения с БД, открытые фоновым потоком
+
+
+def refresh_priority(hits, created_or_updated_at, now=None):
+    """
+    Приоритет обновления записи о фильме (чем больше значение, тем раньше запись нужно обновить):
+    "устаревание" записи в часах, усиленное логарифмом количества обращений к ней.
+    """
+    now = now or timezone.now()
+    staleness_hours = max((now - created_or_updated_at).total_seconds(), 0) / 3600
+    return staleness_hours * (1 + math.log1p(hits or 0))
+
+
+film_hits = HitCounter(Film)
+atexit.register(film_hits.flush) # при завершении процесса сбрасываем в БД всё, что успели накопить
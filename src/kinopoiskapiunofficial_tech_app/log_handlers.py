@@ -0,0 +1,35 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    Обработчик логов для файла (settings.LOGGING): поток запроса только кладёт запись в очередь, а форматирование и запись
+    в файл выполняет фоновый поток QueueListener, поэтому запросы и синхронизация не ждут диск.
+    Текст сообщения подставляется ещё в потоке запроса (аргументы могут измениться позже), остальное - в фоновом потоке.
+    При остановке процесса (logging.shutdown() -> close()) очередь дописывается в файл до конца.
+    """
+
+    def __init__(self, filename, mode="a", encoding="utf-8", delay=False):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.FileHandler(filename, mode=mode, encoding=encoding, delay=delay)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        # ФОРМАТ ИЗ НАСТРОЕК ПРИМЕНЯЕТ ФАЙЛОВЫЙ ОБРАБОТЧИК В ФОНОВОМ ПОТОКЕ:
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # БЕЗ КОПИИ ЗАПИСИ: ДРУГИЕ ОБРАБОТЧИКИ ПОЛУЧАТ ТО ЖЕ ГОТОВОЕ СООБЩЕНИЕ (getMessage() БЕЗ args ВОЗВРАЩАЕТ msg КАК ЕСТЬ):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def close(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        super().close()
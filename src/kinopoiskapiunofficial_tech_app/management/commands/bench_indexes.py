@@ -0,0 +1,110 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ...models import Film, Actor
+
+
+class Command(BaseCommand):
+    """
+    Команда для оценки индексов из миграции 0006 (python manage.py bench_indexes):
+        -> в транзакции создаётся тестовый набор фильмов и актёров заданного размера
+        -> для каждого индекса выполняется характерный для него запрос: план (EXPLAIN) и лучшее время - с индексом и после его удаления
+        -> транзакция откатывается, поэтому ни тестовые записи, ни удаление индексов в БД не остаются
+    """
+
+    help = "Сравнивает планы и время типичных запросов к фильмам и актёрам с индексами и без них на тестовом наборе данных"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--films", type=int, default=100000, help="Количество тестовых фильмов")
+        parser.add_argument("--actors", type=int, default=20000, help="Количество тестовых актёров")
+        parser.add_argument("--cast", type=int, default=5, help="Количество актёров у каждого фильма")
+        parser.add_argument("--repeat", type=int, default=5, help="Сколько раз выполнять запрос (берётся лучшее время)")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Размер пачки при создании тестовых записей")
+
+    def seed(self, films, actors, cast, batch_size):
+        """Тестовые записи; даты изменения растут вместе с id (как при обычной синхронизации), что важно для BRIN-индекса"""
+        generator = random.Random(films)
+        Actor.objects.bulk_create(
+            (Actor(staff_id=-(i + 1), name=f"Актёр #{generator.randrange(actors)}", profession="Актёр") for i in range(actors)),
+            batch_size=batch_size,
+        )
+        actor_ids = list(Actor.objects.filter(staff_id__lt=0).values_list("id", flat=True))
+        for start in range(0, films, batch_size):
+            Film.objects.bulk_create(
+                Film(kinopoisk_id=-(i + 1), name=f"Фильм #{generator.randrange(films)}", year=1900 + generator.randrange(125))
+                for i in range(start, min(start + batch_size, films))
+            ) # ПАЧКИ СОЗДАЮТСЯ ПОСЛЕДОВАТЕЛЬНО, ПОЭТОМУ created_or_updated_at (auto_now) У КАЖДОЙ СЛЕДУЮЩЕЙ ПОЗЖЕ
+        film_ids = list(Film.objects.filter(kinopoisk_id__lt=0).values_list("id", flat=True))
+        through = Film.actors.through
+        rows = (through(film_id=film_id, actor_id=actor_id) for film_id in film_ids for actor_id in generator.sample(actor_ids, min(cast, len(actor_ids))))
+        through.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE") # СТАТИСТИКА ДЛЯ ПЛАНИРОВЩИКА ПО СВЕЖИМ ДАННЫМ
+        return film_ids, actor_ids
+
+    def cases(self, film_ids, actor_ids):
+        """Кортежи (имя индекса, таблица, описание запроса, queryset)"""
+        films = Film.objects.filter(kinopoisk_id__lt=0)
+        recent = films.order_by("-id").values_list("created_or_updated_at", flat=True)[len(film_ids) // 20]
+        through = Film.actors.through
+        return (
+            ("film_year_id_idx", Film._meta.db_table, "фильмы за 2000-2005 годы по году выхода",
+             Film.objects.filter(year__gte=2000, year__lte=2005).order_by("year", "id")[:50]),
+            ("film_name_id_idx", Film._meta.db_table, "первая страница фильмов по названию",
+             Film.objects.order_by("name", "id")[:50]),
+            ("actor_name_id_idx", Actor._meta.db_table, "первая страница актёров по имени",
+             Actor.objects.order_by("name", "id")[:50]),
+            ("film_updated_brin_idx", Film._meta.db_table, "фильмы, изменённые за последние 5% времени",
+             Film.objects.filter(created_or_updated_at__gte=recent).values_list("id", flat=True)),
+            ("film_actors_actor_film_idx", through._meta.db_table, "id фильмов актёра",
+             through.objects.filter(actor_id=actor_ids[len(actor_ids) // 2]).values_list("film_id", flat=True)),
+        )
+
+    @staticmethod
+    def explain(queryset, label):
+        """
+        План запроса. Комментарий с label делает текст запроса уникальным: sqlite3 кеширует подготовленные запросы по тексту,
+        и без него EXPLAIN после удаления индекса вернул бы прежний план
+        """
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql} /* {label} */", params)
+            return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+
+    def measure(self, queryset, repeat, label):
+        best = None
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            list(queryset.all()) # all() - новый запрос без кеша результатов queryset
+            elapsed = time.perf_counter() - started_at
+            best = elapsed if best is None else min(best, elapsed)
+        return self.explain(queryset, label), best
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started_at = timezone.now()
+            film_ids, actor_ids = self.seed(options["films"], options["actors"], options["cast"], options["batch_size"])
+            self.stdout.write(
+                f"Тестовый набор: {len(film_ids)} фильмов, {len(actor_ids)} актёров (создан за {(timezone.now() - started_at) / datetime.timedelta(seconds=1):.1f} с)"
+            )
+            for name, table, description, queryset in self.cases(film_ids, actor_ids):
+                with connection.cursor() as cursor:
+                    indexes = connection.introspection.get_constraints(cursor, table)
+                if name not in indexes:
+                    self.stdout.write(f"\n{name}: индекса нет в этой БД ({connection.vendor}), пропущено")
+                    continue
+                plan, elapsed = self.measure(queryset, options["repeat"], "with_index")
+                savepoint = transaction.savepoint()
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+                plan_without, elapsed_without = self.measure(queryset, options["repeat"], "without_index")
+                transaction.savepoint_rollback(savepoint)
+                self.stdout.write(f"\n{name}: {description}")
+                self.stdout.write(f"  с индексом:  {elapsed * 1000:>9.2f} мс | {' / '.join(plan.splitlines())}")
+                self.stdout.write(f"  без индекса: {elapsed_without * 1000:>9.2f} мс | {' / '.join(plan_without.splitlines())}")
+            transaction.set_rollback(True) # ТЕСТОВЫЕ ЗАПИСИ НЕ СОХРАНЯЮТСЯ
@@ -0,0 +1,110 @@
+import logging
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...log_handlers import QueuedFileHandler
+from ...models import Actor
+from ...serializers import ActorSerializer
+
+
+class Command(BaseCommand):
+    """
+    Команда для оценки накладных расходов логирования (python manage.py bench_logging):
+        -> на запись списка: сериализация актёров (по 2 DEBUG-сообщения на запись), когда DEBUG-сообщения отсекаются обработчиком
+           (как раньше - логгер приложения с уровнем DEBUG) и когда уровнем логгера (APP_LOG_LEVEL=INFO)
+        -> на сообщение: подстановка аргументов в f-строку и отложенная (%s) при отключённом уровне
+        -> на запрос: INFO-сообщения в файл через logging.FileHandler и через log_handlers.QueuedFileHandler (время в потоке запроса)
+    """
+
+    help = "Сравнивает накладные расходы логирования на запись, сообщение и запрос до и после перехода на отложенные сообщения и очередь"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000, help="Количество сериализуемых записей")
+        parser.add_argument("--messages", type=int, default=200000, help="Количество сообщений в замере подстановки аргументов")
+        parser.add_argument("--requests", type=int, default=2000, help="Количество запросов в замере записи в файл")
+        parser.add_argument("--per-request", type=int, default=5, help="Количество INFO-сообщений на один запрос")
+        parser.add_argument("--repeat", type=int, default=3, help="Сколько раз повторять замер (берётся лучшее время)")
+
+    @staticmethod
+    def best(function, repeat):
+        result = None
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started_at
+            result = elapsed if result is None else min(result, elapsed)
+        return result
+
+    def rows(self, logger, options):
+        now = timezone.now()
+        actors = [Actor(id=i + 1, staff_id=i + 1, name=f"Актёр Актёров {i}", profession="Актёр", created_or_updated_at=now) for i in range(options["rows"])]
+        serialize = lambda: ActorSerializer(actors, many=True).data
+        handler = logging.NullHandler()
+        handler.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        try:
+            logger.setLevel(logging.DEBUG)
+            before = self.best(serialize, options["repeat"])
+            logger.setLevel(logging.INFO)
+            after = self.best(serialize, options["repeat"])
+        finally:
+            logger.removeHandler(handler)
+        self.write("на запись (сериализация)", before / options["rows"], after / options["rows"])
+
+    def messages(self, logger, options):
+        logger.setLevel(logging.INFO)
+        film = {"id": 1, "name": "Тестовый фильм", "year": 2000}
+        count = options["messages"]
+
+        def eager():
+            for _ in range(count):
+                logger.debug(f"Сохранение записи о фильме: {film['name']}, id={film['id']}, year={film['year']}...")
+
+        def lazy():
+            for _ in range(count):
+                logger.debug("Сохранение записи о фильме: %s, id=%s, year=%s...", film["name"], film["id"], film["year"])
+
+        self.write("на DEBUG-сообщение при уровне INFO", self.best(eager, options["repeat"]) / count, self.best(lazy, options["repeat"]) / count)
+
+    def requests(self, logger, options):
+        logger.setLevel(logging.INFO)
+        formatter = logging.Formatter("{levelname} {asctime} {module} {message}", style="{")
+        count, per_request = options["requests"], options["per_request"]
+
+        def emit():
+            for i in range(count):
+                for j in range(per_request):
+                    logger.info("Запрос %s: сообщение %s", i, j)
+
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for handler_class in (logging.FileHandler, QueuedFileHandler):
+                handler = handler_class(os.path.join(directory, f"{handler_class.__name__}.log"), encoding="utf-8")
+                handler.setFormatter(formatter)
+                logger.addHandler(handler)
+                try:
+                    results.append(self.best(emit, options["repeat"]) / count)
+                finally:
+                    logger.removeHandler(handler)
+                    handler.close()
+        self.write(f"на запрос ({per_request} INFO-сообщений в файл)", *results)
+
+    def write(self, name, before, after):
+        self.stdout.write(f"{name:<44} до: {before * 1e6:>9.2f} мкс   после: {after * 1e6:>9.2f} мкс   ({after / before:>6.1%})")
+
+    def handle(self, *args, **options):
+        logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+        # НА ВРЕМЯ ЗАМЕРОВ ОТКЛЮЧАЕМ ОБРАБОТЧИКИ ИЗ НАСТРОЕК (КОНСОЛЬ И ФАЙЛ ПРОЕКТА):
+        handlers, level, propagate = logger.handlers[:], logger.level, logger.propagate
+        logger.handlers, logger.propagate = [], False
+        try:
+            self.rows(logger, options)
+            self.messages(logger, options)
+            self.requests(logger, options)
+        finally:
+            logger.handlers, logger.level, logger.propagate = handlers, level, propagate
+            logging.getLogger().manager._clear_cache()
@@ -0,0 +1,67 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from ... import renderers
+from ...fast_serializers import format_datetime
+
+
+class Command(BaseCommand):
+    """Команда для сравнения рендереров JSON по размеру ответа и времени кодирования (python manage.py bench_renderers)"""
+
+    help = "Сравнивает размер ответа и время кодирования списка фильмов разными рендерерами JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--films", type=int, default=10000, help="Количество фильмов в списке")
+        parser.add_argument("--repeat", type=int, default=5, help="Сколько раз кодировать список (берётся лучшее время)")
+
+    @staticmethod
+    def make_films(count):
+        """Список фильмов в формате ответа FilmListView (без обращения к БД)"""
+        films = []
+        for i in range(count):
+            iso, formatted = format_datetime(datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(minutes=i))
+            films.append({
+                "id": i + 1,
+                "kinopoisk_id": 300 + i,
+                "name": f"Тестовый фильм №{i}",
+                "year": 1950 + i % 75,
+                "actors": [{"id": i * 10 + j, "name": f"Актёр Актёров {i}-{j}"} for j in range(5)],
+                "created_or_updated_at": iso,
+                "created_or_updated_at_formatted": formatted,
+            })
+        return {"next": None, "previous": None, "results": films}
+
+    def measure(self, renderer, data, repeat, indent=None):
+        best = None
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            body = renderer.render(data, "application/json", {"indent": indent})
+            elapsed = time.perf_counter() - started_at
+            best = elapsed if best is None else min(best, elapsed)
+        return len(body), best
+
+    def handle(self, *args, **options):
+        data = self.make_films(options["films"])
+        candidates = [
+            ("JSONRenderer (indent=4)", JSONRenderer(), 4),
+            ("JSONRenderer (DRF)", JSONRenderer(), None),
+            (f"CompactJSONRenderer ({'orjson' if renderers.orjson is not None else 'json'})", renderers.CompactJSONRenderer(), None),
+        ]
+        results = [(name, *self.measure(renderer, data, options["repeat"], indent)) for name, renderer, indent in candidates]
+        if renderers.orjson is not None:
+            # ТОТ ЖЕ РЕНДЕРЕР БЕЗ orjson - ДЛЯ ОЦЕНКИ ВКЛАДА САМОГО КОДИРОВЩИКА:
+            orjson, renderers.orjson = renderers.orjson, None
+            try:
+                results.append(("CompactJSONRenderer (json)", *self.measure(renderers.CompactJSONRenderer(), data, options["repeat"])))
+            finally:
+                renderers.orjson = orjson
+
+        base_size, base_time = results[0][1], results[0][2]
+        self.stdout.write(f"Фильмов в списке: {options['films']}, повторов: {options['repeat']}")
+        for name, size, elapsed in results:
+            self.stdout.write(
+                f"{name:<36} {size / 1024:>10.1f} КБ ({size / base_size:>6.1%})  {elapsed * 1000:>9.1f} мс ({elapsed / base_time:>6.1%})"
+            )
@@ -0,0 +1,75 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...fast_serializers import FORMATTED, FastActorSerializer, current_timezone, format_datetime
+from ...renderers import CompactJSONRenderer
+
+
+class Command(BaseCommand):
+    """
+    Команда для оценки доли форматирования дат в ответе со списком (python manage.py bench_serializers):
+        -> format_datetime(): временная зона определяется для каждой записи (как раньше), один раз на страницу и, кроме того,
+           строка "дд.мм.гггг | чч:мм:сс" уже получена из БД (см. fast_serializers.formatted_datetime())
+        -> FastActorSerializer.to_representation() вместе с кодированием ответа в JSON - без строки из БД и с ней
+    """
+
+    help = "Сравнивает время форматирования дат изменения со временем сериализации и кодирования списка записей"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000, help="Количество записей в списке")
+        parser.add_argument("--repeat", type=int, default=5, help="Сколько раз повторять замер (берётся лучшее время)")
+
+    @staticmethod
+    def best(function, repeat):
+        result = None
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started_at
+            result = elapsed if result is None else min(result, elapsed)
+        return result
+
+    @staticmethod
+    def make_rows(count):
+        """Записи об актёрах в том виде, в котором их возвращает values() (без обращения к БД), со строкой даты из БД"""
+        started_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        rows = []
+        for i in range(count):
+            value = started_at + datetime.timedelta(seconds=i, microseconds=i % 1000)
+            rows.append({
+                "id": i + 1,
+                "staff_id": 5000 + i,
+                "name": f"Актёр Актёров {i}",
+                "poster_url": f"https://example.com/poster_{i}.jpg",
+                "profession": "Актёр",
+                "created_or_updated_at": value,
+                FORMATTED: value.strftime("%d.%m.%Y | %H:%M:%S"),
+            })
+        return rows
+
+    def handle(self, *args, **options):
+        rows = self.make_rows(options["rows"])
+        python_rows = [{key: value for key, value in row.items() if key != FORMATTED} for row in rows]
+        serializer, renderer = FastActorSerializer(), CompactJSONRenderer()
+
+        def per_page(with_formatted):
+            tz = current_timezone()
+            for row in rows:
+                format_datetime(row["created_or_updated_at"], tz, row[FORMATTED] if with_formatted else None)
+
+        results = [
+            ("format_datetime() (зона на запись)", self.best(lambda: [format_datetime(row["created_or_updated_at"]) for row in rows], options["repeat"])),
+            ("format_datetime() (зона на страницу)", self.best(lambda: per_page(False), options["repeat"])),
+            ("format_datetime() (строка из БД)", self.best(lambda: per_page(True), options["repeat"])),
+            ("сериализация + JSON", self.best(lambda: renderer.render({"results": serializer.to_representation(python_rows)}), options["repeat"])),
+            ("сериализация + JSON (строка из БД)", self.best(lambda: renderer.render({"results": serializer.to_representation(rows)}), options["repeat"])),
+        ]
+
+        total = results[3][1]
+        self.stdout.write(f"Записей в списке: {options['rows']}, повторов: {options['repeat']}")
+        for name, elapsed in results:
+            self.stdout.write(
+                f"{name:<38} {elapsed * 1000:>9.1f} мс  {elapsed / options['rows'] * 1e6:>7.2f} мкс на запись ({elapsed / total:>6.1%})"
+            )
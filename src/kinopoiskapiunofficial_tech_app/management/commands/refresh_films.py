@@ -0,0 +1,49 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...refresh_scheduler import RefreshScheduler
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+class Command(BaseCommand):
+    """
+    Команда для запуска фонового обновления записей о фильмах (python manage.py refresh_films):
+        -> SIGUSR1 - приостановить обновление
+        -> SIGUSR2 - возобновить обновление
+        -> SIGINT/SIGTERM - остановить обновление после текущей записи
+    """
+
+    help = "Непрерывно обновляет самые \"устаревшие\" записи о фильмах в пределах бюджета запросов к API в час"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests-per-hour", type=int, default=None, help="Бюджет запросов к API в час (по умолчанию FILMS_REFRESH_REQUESTS_PER_HOUR)")
+        parser.add_argument("--jitter", type=float, default=None, help="Случайный разброс паузы между обновлениями, доля от 0 до 1 (по умолчанию FILMS_REFRESH_JITTER)")
+        parser.add_argument("--batch-size", type=int, default=None, help="Сколько записей о фильмах выбирать из БД за одно пополнение очереди (по умолчанию FILMS_REFRESH_BATCH_SIZE)")
+        parser.add_argument("--pause-file", default=None, help="Путь к файлу-флагу: пока файл существует, обновление стоит на паузе")
+        parser.add_argument("--max-iterations", type=int, default=None, help="Остановиться после заданного числа обновлений")
+
+    def handle(self, *args, **options):
+        try:
+            scheduler = RefreshScheduler(
+                requests_per_hour=options["requests_per_hour"],
+                jitter=options["jitter"],
+                batch_size=options["batch_size"],
+                pause_file=options["pause_file"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # ПРИВЯЗЫВАЕМ СИГНАЛЫ ОПЕРАЦИОННОЙ СИСТЕМЫ К УПРАВЛЕНИЮ ПЛАНИРОВЩИКОМ:
+        signal.signal(signal.SIGUSR1, lambda signum, frame: scheduler.pause())
+        signal.signal(signal.SIGUSR2, lambda signum, frame: scheduler.resume())
+        signal.signal(signal.SIGINT, lambda signum, frame: scheduler.stop())
+        signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+
+        self.stdout.write(f"Фоновое обновление запущено: {scheduler.requests_per_hour} запросов к API в час, одна запись каждые ~{scheduler.interval:.1f} сек.")
+        iterations = scheduler.run(max_iterations=options["max_iterations"])
+        self.stdout.write(self.style.SUCCESS(f"Фоновое обновление остановлено, выполнено итераций: {iterations}."))
@@ -0,0 +1,31 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from ...api_sync import ArchiveSynchronizer
+
+
+class Command(BaseCommand):
+    """Команда для пересборки записей о фильмах и актёрах из архива ответов API (python manage.py rematerialize_archive)"""
+
+    help = "Пересобирает таблицы Film/Actor из архива ответов API без обращения к API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", default=None, help="Использовать только ответы, полученные до этой даты (ДД.ММ.ГГГГ)")
+
+    def handle(self, *args, **options):
+        fetched_before = None
+        if options["before"]:
+            try:
+                fetched_before = timezone.make_aware(datetime.datetime.strptime(options["before"], "%d.%m.%Y"))
+            except ValueError:
+                raise CommandError("Дата в параметре --before должна быть в формате ДД.ММ.ГГГГ!")
+
+        with transaction.atomic():
+            result = ArchiveSynchronizer(fetched_before=fetched_before).rematerialize()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Пересобрано {result['synced_count']} записей о фильмах: {result['pages']} страниц списка и {result['films']} отдельных фильмов из архива."
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kinopoiskapiunofficial_tech_app', '0002_alter_user_options_actor_owner_film_owner_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='film',
+            name='hits',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Количество обращений через API'),
+        ),
+    ]
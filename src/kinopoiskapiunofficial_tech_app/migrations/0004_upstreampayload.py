@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kinopoiskapiunofficial_tech_app', '0003_film_hits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UpstreamPayload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=255, verbose_name='Эндпоинт API')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Параметры запроса')),
+                ('fetched_at', models.DateTimeField(auto_now_add=True, verbose_name='Получено')),
+                ('payload', models.BinaryField(verbose_name='Ответ API (JSON, сжатый zlib)')),
+            ],
+            options={
+                'verbose_name': 'Ответ API',
+                'verbose_name_plural': 'Архив ответов API',
+                'ordering': ('id',),
+                'indexes': [models.Index(fields=['endpoint', 'fetched_at'], name='upstream_payload_endpoint_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+# GIN-ИНДЕКСЫ pg_trgm ПО ТОМУ ЖЕ ВЫРАЖЕНИЮ, ЧТО И В search.folded(): REPLACE(UPPER(поле), 'Ё', 'Е')
+TRIGRAM_INDEXES = (
+    ("film_name_trgm_idx", "kinopoiskapiunofficial_tech_app_film", "name"),
+    ("actor_name_trgm_idx", "kinopoiskapiunofficial_tech_app_actor", "name"),
+    ("actor_profession_trgm_idx", "kinopoiskapiunofficial_tech_app_actor", "profession"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Индексы создаются только на PostgreSQL (на sqlite3 в тестах поиск работает без них)"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ((REPLACE(UPPER({column}), 'Ё', 'Е')) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kinopoiskapiunofficial_tech_app', '0004_upstreampayload'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:32
+
+from django.db import migrations, models
+
+
+# ИНДЕКС "ОБРАТНОЙ" СТОРОНЫ ПРОМЕЖУТОЧНОЙ ТАБЛИЦЫ ФИЛЬМОВ И АКТЁРОВ: ФИЛЬМЫ АКТЁРА ВЫБИРАЮТСЯ ТОЛЬКО ПО ИНДЕКСУ (БЕЗ ЧТЕНИЯ ТАБЛИЦЫ)
+THROUGH_INDEX = ("film_actors_actor_film_idx", "kinopoiskapiunofficial_tech_app_film_actors", "actor_id, film_id")
+
+# BRIN-ИНДЕКСЫ ПО ДАТЕ ИЗМЕНЕНИЯ (ТОЛЬКО PostgreSQL): ЗАНИМАЮТ ЕДИНИЦЫ СТРАНИЦ И ПОДХОДЯТ ДЛЯ ФИЛЬТРОВ ПО ДИАПАЗОНУ ДАТ
+BRIN_INDEXES = (
+    ("film_updated_brin_idx", "kinopoiskapiunofficial_tech_app_film", "created_or_updated_at"),
+    ("actor_updated_brin_idx", "kinopoiskapiunofficial_tech_app_actor", "created_or_updated_at"),
+)
+
+
+def create_indexes(apps, schema_editor):
+    name, table, columns = THROUGH_INDEX
+    schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING brin ({column})")
+
+
+def drop_indexes(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {THROUGH_INDEX[0]}")
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in BRIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kinopoiskapiunofficial_tech_app', '0005_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='actor',
+            index=models.Index(fields=['name', 'id'], name='actor_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(fields=['year', 'id'], name='film_year_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(fields=['name', 'id'], name='film_name_id_idx'),
+        ),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
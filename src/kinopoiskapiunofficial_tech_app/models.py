@@ -3,9 +3,14 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 
+import json
+import zlib
+
 import logging
 from django.dispatch import receiver
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save, m2m_changed
+
+from .response_cache import bump_version_on_commit
 
 
 logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
@@ -21,9 +26,17 @@ class User(AbstractUser):
         verbose_name_plural = "Пользователи"
     
     def save(self, *args, **kwargs):
-        logger.debug(f"Сохранение записи о пользователе {self.username}, is_owner={self.is_owner}...")
+        logger.debug("Сохранение записи о пользователе %s, is_owner=%s...", self.username, self.is_owner)
         super().save(*args, **kwargs)
-        logger.info(f"Запись о пользователе {self.username} успешно сохранена/обновлена!")
+        logger.info("Запись о пользователе %s успешно сохранена/обновлена!", self.username)
+
+
+class FilmQuerySet(models.QuerySet):
+    """Класс с часто используемыми выборками записей о фильмах"""
+
+    def with_cast(self):
+        """Подгружает актёров для всей выборки одним запросом и только с теми полями, которые нужны для вывода (id и name)"""
+        return self.prefetch_related(models.Prefetch("actors", queryset=Actor.objects.only("id", "name")))
 
 
 class Film(models.Model):
@@ -35,9 +48,18 @@ class Film(models.Model):
     actors = models.ManyToManyField("Actor", related_name="film_actors", blank=True, verbose_name="Персонал")
     created_or_updated_at = models.DateTimeField(auto_now=True, verbose_name="Создано/Обновлено")
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="films", verbose_name="Владелец записи")
+    hits = models.PositiveBigIntegerField(default=0, editable=False, verbose_name="Количество обращений через API")
+
+    objects = FilmQuerySet.as_manager()
     
     class Meta:
         ordering = ("id",)
+        # ИНДЕКСЫ ДЛЯ СОРТИРОВОК СПИСКА (id ПОСЛЕДНИМ - ТАК ЖЕ, КАК В КУРСОРЕ pagination.KeysetPagination) И ФИЛЬТРА ПО ГОДАМ ВЫХОДА
+        # (BRIN-ИНДЕКС ПО created_or_updated_at И ИНДЕКС ПРОМЕЖУТОЧНОЙ ТАБЛИЦЫ С АКТЁРАМИ - В МИГРАЦИИ 0006):
+        indexes = (
+            models.Index(fields=("year", "id"), name="film_year_id_idx"),
+            models.Index(fields=("name", "id"), name="film_name_id_idx"),
+        )
         verbose_name = "Фильм"
         verbose_name_plural = "Фильмы"
     
@@ -45,9 +67,9 @@ class Film(models.Model):
         return f"{self.name} {self.year}"
     
     def save(self, *args, **kwargs):
-        logger.debug(f"Сохранение записи о фильме: {self.name}, kinopoisk_id={self.kinopoisk_id}, owner={self.owner}...")
+        logger.debug("Сохранение записи о фильме: %s, kinopoisk_id=%s, owner=%s...", self.name, self.kinopoisk_id, self.owner)
         super().save(*args, **kwargs)
-        logger.info(f"Запись о фильме {self.name} (ID: {self.id}) успешно сохранена/обновлена!")
+        logger.info("Запись о фильме %s (ID: %s) успешно сохранена/обновлена!", self.name, self.id)
 
 
 class Actor(models.Model):
@@ -64,6 +86,9 @@ class Actor(models.Model):
     
     class Meta:
         ordering = ("id",)
+        indexes = (
+            models.Index(fields=("name", "id"), name="actor_name_id_idx"),
+        )
         verbose_name = "Актёр"
         verbose_name_plural = "Актёры"
     
@@ -71,18 +96,69 @@ class Actor(models.Model):
         return self.name
     
     def save(self, *args, **kwargs):
-        logger.debug(f"Сохранение записи об актёрах: {self.name}, staff_id={self.staff_id}, profession={self.profession}, owner={self.owner}...")
+        logger.debug("Сохранение записи об актёрах: %s, staff_id=%s, profession=%s, owner=%s...", self.name, self.staff_id, self.profession, self.owner)
         super().save(*args, **kwargs)
-        logger.info(f"Запись об актёрах {self.name} (ID: {self.id}) успешно сохранена/обновлена!")
+        logger.info("Запись об актёрах %s (ID: %s) успешно сохранена/обновлена!", self.name, self.id)
+
+
+class UpstreamPayload(models.Model):
+    """Класс для таблицы-архива "сырых" (сжатых) ответов API. Записи в архив только добавляются и никогда не изменяются"""
+
+    endpoint = models.CharField(max_length=255, verbose_name="Эндпоинт API")
+    params = models.JSONField(default=dict, blank=True, verbose_name="Параметры запроса")
+    fetched_at = models.DateTimeField(auto_now_add=True, verbose_name="Получено")
+    payload = models.BinaryField(verbose_name="Ответ API (JSON, сжатый zlib)")
+
+    class Meta:
+        ordering = ("id",)
+        indexes = (
+            models.Index(fields=("endpoint", "fetched_at"), name="upstream_payload_endpoint_idx"),
+        )
+        verbose_name = "Ответ API"
+        verbose_name_plural = "Архив ответов API"
+
+    def __str__(self):
+        return f"{self.endpoint} {self.params} {self.fetched_at}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Архив ответов API доступен только для добавления записей!")
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def archive(cls, endpoint, params, data):
+        """Добавляет ответ API в архив в сжатом виде"""
+        payload = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        return cls.objects.create(endpoint=endpoint, params=params or {}, payload=payload)
+
+    @property
+    def data(self):
+        """Распакованный ответ API"""
+        return json.loads(zlib.decompress(bytes(self.payload)).decode("utf-8"))
 
 
 @receiver(post_delete, sender=Film)
 def log_film_deletion(sender, instance, **kwargs):
-    logger.debug(f"Сигнал 'post_delete' для записи о фильме: {instance.name} (ID: {instance.id})...")
-    logger.info(f"Запись о фильме {instance.name} (ID: {instance.id}) удалена!")
+    logger.debug("Сигнал 'post_delete' для записи о фильме: %s (ID: %s)...", instance.name, instance.id)
+    logger.info("Запись о фильме %s (ID: %s) удалена!", instance.name, instance.id)
 
 
 @receiver(post_delete, sender=Actor)
 def log_actor_deletion(sender, instance, **kwargs):
-    logger.debug(f"Сигнал 'post_delete' для записи об актёрах: {instance.name} (ID: {instance.id})")
-    logger.info(f"Запись об актёрах {instance.name} (ID: {instance.id}) удалена!")
+    logger.debug("Сигнал 'post_delete' для записи об актёрах: %s (ID: %s)", instance.name, instance.id)
+    logger.info("Запись об актёрах %s (ID: %s) удалена!", instance.name, instance.id)
+
+
+# ПРИ ЛЮБОМ ИЗМЕНЕНИИ ЗАПИСЕЙ УВЕЛИЧИВАЕМ ВЕРСИЮ ДАННЫХ МОДЕЛИ ДЛЯ КЕША ОТВЕТОВ (см. response_cache.ResponseCache):
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+@receiver(m2m_changed, sender=Film.actors.through)
+def bump_film_version(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        bump_version_on_commit("film")
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_delete, sender=Actor)
+def bump_actor_version(sender, **kwargs):
+    bump_version_on_commit("actor")
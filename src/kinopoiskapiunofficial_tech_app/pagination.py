@@ -0,0 +1,254 @@
+import base64
+import datetime
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counts import count_rows, acount_rows
+from .search import RELEVANCE
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+class KeysetPagination(BasePagination):
+    """
+    Класс для "курсорной" (keyset) пагинации списков записей:
+        -> записи упорядочиваются по полям из параметра ordering (см. OrderingFilter представления) и дополнительно по id,
+           поэтому порядок всегда однозначный; NULL считается больше любого значения (как в индексах PostgreSQL), поэтому при сортировке
+           по возрастанию NULL-значения идут в конце, а по убыванию - в начале, и оба направления читаются одним индексом (поле, id)
+        -> курсор хранит значения этих полей у последней (первой) записи страницы, и следующая страница выбирается условием
+           "строго после курсора" (WHERE ... > ...), а не через OFFSET, поэтому стоимость запроса не растёт с "глубиной" страницы
+           (см. keyset_phases())
+        -> общее количество записей (count) считается по стратегии counts.count_rows(): на больших выборках это оценка,
+           поэтому в ответе есть признак count_is_exact
+    """
+
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Неверный курсор"
+
+    # РАЗМЕРЫ СТРАНИЦ ЧИТАЮТСЯ ИЗ НАСТРОЕК ПРИ КАЖДОМ ЗАПРОСЕ (А НЕ ОДИН РАЗ ПРИ ИМПОРТЕ МОДУЛЯ):
+    @property
+    def page_size(self):
+        return settings.API_PAGE_SIZE
+
+    @property
+    def max_page_size(self):
+        return settings.API_MAX_PAGE_SIZE
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """Поля сортировки (как их понимает OrderingFilter представления), которые всегда заканчиваются уникальным id (в направлении последнего поля)"""
+        terms = OrderingFilter().get_ordering(request, queryset, view)
+        if not terms and RELEVANCE in queryset.query.annotation_select:
+            terms = (f"-{RELEVANCE}",) # результаты поиска без явной сортировки - по убыванию релевантности (см. search.TrigramSearchFilter)
+        ordering = []
+        for term in terms or ():
+            if not isinstance(term, str):
+                continue
+            term = term.replace("pk", "id") if term.lstrip("-") == "pk" else term
+            ordering.append(term)
+            if term.lstrip("-") == "id":
+                break # id уникален, поля после него на порядок уже не влияют
+        else:
+            ordering.append("-id" if ordering and ordering[-1].startswith("-") else "id")
+        return tuple(ordering)
+
+    @staticmethod
+    def get_value(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    def get_position(self, row):
+        return [self.get_value(row, term.lstrip("-")) for term in self.ordering]
+
+    def order_by(self, queryset, reverse=False):
+        expressions = []
+        for term in self.ordering:
+            field = term.lstrip("-")
+            descending = term.startswith("-") != reverse
+            # NULL БОЛЬШЕ ЛЮБОГО ЗНАЧЕНИЯ - ЯВНО, ЧТОБЫ ПОРЯДОК НЕ ЗАВИСЕЛ ОТ СУБД (НА PostgreSQL ЭТО ПОРЯДОК ИНДЕКСА В ОБЕ СТОРОНЫ):
+            nulls = ({"nulls_first": True} if descending else {"nulls_last": True}) if self.is_nullable(field) else {}
+            expressions.append(F(field).desc(**nulls) if descending else F(field).asc(**nulls))
+        return queryset.order_by(*expressions)
+
+    def is_nullable(self, field):
+        try:
+            return self.model._meta.get_field(field).null
+        except FieldDoesNotExist:
+            return True
+
+    def beyond(self, field, value, upward):
+        """Условие "значение поля строго дальше value" в направлении обхода (upward - к большим значениям, NULL больше любого значения)"""
+        if value is None:
+            # ПОСЛЕ NULL НИЧЕГО НЕТ, А ДО NULL - ВСЕ НЕ-NULL ЗНАЧЕНИЯ:
+            return None if upward else Q(**{f"{field}__isnull": False})
+        if not upward:
+            return Q(**{f"{field}__lt": value})
+        condition = Q(**{f"{field}__gt": value})
+        return condition | Q(**{f"{field}__isnull": True}) if self.is_nullable(field) else condition
+
+    def keyset_filter(self, terms, position, after=True):
+        """
+        Условие "запись строго после (after=True) или строго до (after=False) позиции курсора" в порядке полей terms:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ... - с учётом направления сортировки и того, что NULL больше любого значения.
+        """
+        conditions = []
+        equal = []
+        for term, value in zip(terms, position):
+            field = term.lstrip("-")
+            beyond = self.beyond(field, value, upward=term.startswith("-") != after)
+            if beyond is not None:
+                conditions.append(reduce(and_, equal + [beyond]))
+            equal.append(Q(**{f"{field}__isnull": True}) if value is None else Q(**{field: value}))
+        return reduce(or_, conditions) if conditions else Q(pk__in=[])
+
+    def keyset_phases(self, position, after=True):
+        """
+        Условия для записей строго после (до) позиции курсора в виде "фаз" - выборок, которые в порядке обхода идут одна за другой
+        (следующая фаза запрашивается, только если предыдущих не хватило на страницу):
+            -> основная фаза - keyset_filter() по остальным полям и избыточная граница по первому полю (f1 >= v1 или f1 <= v1),
+               по которой PostgreSQL ограничивает диапазон индекса (f1, id), а не проверяет цепочку OR на каждой строке
+            -> NULL-значения первого поля (они идут после всех остальных) - отдельной фазой, а не через OR в основной фазе
+        """
+        term, value = self.ordering[0], position[0]
+        field, upward = term.lstrip("-"), term.startswith("-") != after
+        rest = self.keyset_filter(self.ordering[1:], position[1:], after)
+        if value is None:
+            same = Q(**{f"{field}__isnull": True}) & rest
+            return [same] if upward else [same, Q(**{f"{field}__isnull": False})]
+        if upward:
+            main = Q(**{f"{field}__gte": value}) & (Q(**{f"{field}__gt": value}) | Q(**{field: value}) & rest)
+            return [main, Q(**{f"{field}__isnull": True})] if self.is_nullable(field) else [main]
+        return [Q(**{f"{field}__lte": value}) & (Q(**{f"{field}__lt": value}) | Q(**{field: value}) & rest)]
+
+    def encode_cursor(self, position, direction):
+        payload = {
+            "o": list(self.ordering),
+            "p": [value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else value for value in position],
+            "d": direction,
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, queryset):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, "next"
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8"))
+            if tuple(payload["o"]) != self.ordering or payload["d"] not in ("next", "prev") or len(payload["p"]) != len(self.ordering):
+                raise ValueError("курсор получен для другой сортировки")
+            position = []
+            for term, value in zip(self.ordering, payload["p"]):
+                try:
+                    field = queryset.model._meta.get_field(term.lstrip("-"))
+                    value = field.to_python(value) if value is not None else None
+                except FieldDoesNotExist:
+                    pass # аннотация (например, релевантность поиска) - значение уже нужного типа
+                position.append(value)
+            return position, payload["d"]
+        except (TypeError, ValueError, KeyError, ValidationError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            logger.warning(f"Получен неверный курсор пагинации '{token}': {str(e)}!")
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        phases = self.prepare(queryset, request, view)
+        get_row_count = getattr(view, "get_row_count", None)
+        self.count, self.count_is_exact = get_row_count(queryset) if get_row_count is not None else count_rows(queryset)
+        rows = []
+        for phase in phases:
+            rows += phase[:self.page_size_value + 1 - len(rows)]
+            if len(rows) > self.page_size_value:
+                break
+        return self.set_page(rows)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Асинхронный вариант paginate_queryset() (для async_views.py): количество и страница записей - через асинхронный ORM"""
+        phases = self.prepare(queryset, request, view)
+        aget_row_count = getattr(view, "aget_row_count", None)
+        self.count, self.count_is_exact = await aget_row_count(queryset) if aget_row_count is not None else await acount_rows(queryset)
+        rows = []
+        for phase in phases:
+            rows += [row async for row in phase[:self.page_size_value + 1 - len(rows)]]
+            if len(rows) > self.page_size_value:
+                break
+        return self.set_page(rows)
+
+    def prepare(self, queryset, request, view=None):
+        """
+        Разбирает параметры пагинации и курсор и возвращает упорядоченные выборки записей страницы по фазам (см. keyset_phases()),
+        из которых читается на одну запись больше размера страницы, чтобы узнать, есть ли следующая
+        """
+        self.request = request
+        self.model = queryset.model
+        self.base_url = request.build_absolute_uri()
+        self.page_size_value = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.position, self.direction = self.decode_cursor(request, queryset)
+        if self.position is None:
+            return [self.order_by(queryset)]
+        # ПРЕДЫДУЩАЯ СТРАНИЦА: ИДЁМ ОТ КУРСОРА В ОБРАТНОМ ПОРЯДКЕ (А set_page() РАЗВОРАЧИВАЕТ РЕЗУЛЬТАТ):
+        after = self.direction == "next"
+        return [self.order_by(queryset.filter(phase), reverse=not after) for phase in self.keyset_phases(self.position, after=after)]
+
+    def set_page(self, rows):
+        if self.direction == "next":
+            self.has_next = len(rows) > self.page_size_value
+            self.has_previous = self.position is not None
+            self.page = rows[:self.page_size_value]
+        else:
+            self.has_previous = len(rows) > self.page_size_value
+            self.has_next = True
+            self.page = rows[:self.page_size_value][::-1]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), "next")
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), "prev")
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "count_is_exact": self.count_is_exact,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["count", "count_is_exact", "results"],
+            "properties": {
+                "count": {"type": "integer"},
+                "count_is_exact": {"type": "boolean"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,171 @@
+import datetime
+import heapq
+import os
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Film
+from .api_sync import APISynchronizer
+from .hit_counters import refresh_priority
+from .single_flight import run_once
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+class RefreshScheduler:
+    """
+    Класс для фонового поддержания актуальности записей о фильмах в нашей БД:
+        -> из БД выбираются самые "устаревшие" (по полю created_or_updated_at) и самые "горячие" (по полю hits) записи о фильмах
+           и складываются в очередь с приоритетом, учитывающим и то, и другое (см. hit_counters.refresh_priority)
+        -> записи обновляются по одной через APISynchronizer в пределах заданного бюджета запросов к API в час
+        -> запись, обновление которой завершилось ошибкой, не попадает в очередь, пока не истечёт пауза, растущая
+           экспоненциально с каждой ошибкой подряд (иначе вечно "устаревшая" запись вытесняла бы все остальные)
+        -> между обновлениями выдерживается равномерная пауза со случайным разбросом (jitter), чтобы не нагружать API "пачками"
+        -> работу можно приостановить/возобновить (методами pause()/resume() или файлом-флагом pause_file) и остановить (методом stop())
+    """
+
+    # КОЛИЧЕСТВО ЗАПРОСОВ К API, КОТОРОЕ ТРАТИТСЯ НА ОБНОВЛЕНИЕ ОДНОЙ ЗАПИСИ О ФИЛЬМЕ (/films/{id} И /staff):
+    REQUESTS_PER_FILM = 2
+    # КАК ЧАСТО (В СЕКУНДАХ) ПРОВЕРЯТЬ, НЕ СНЯТА ЛИ ПАУЗА:
+    PAUSE_POLL_INTERVAL = 1.0
+    # ПАУЗА ПЕРЕД ПОВТОРНЫМ ОБНОВЛЕНИЕМ ЗАПИСИ ПОСЛЕ ОШИБКИ: interval * 2 ** (ЧИСЛО ОШИБОК ПОДРЯД - 1), НО НЕ БОЛЬШЕ СУТОК:
+    FAILURE_BACKOFF_MAX = 24 * 3600
+
+    def __init__(self, synchronizer=None, requests_per_hour=None, jitter=None, batch_size=None, pause_file=None):
+        self.synchronizer = synchronizer or APISynchronizer()
+        self.requests_per_hour = requests_per_hour or settings.FILMS_REFRESH_REQUESTS_PER_HOUR
+        self.jitter = settings.FILMS_REFRESH_JITTER if jitter is None else jitter
+        self.batch_size = batch_size or settings.FILMS_REFRESH_BATCH_SIZE
+        self.pause_file = pause_file
+
+        if self.requests_per_hour <= 0:
+            raise ValueError("Бюджет запросов к API в час должен быть положительным числом!")
+        if not 0 <= self.jitter < 1:
+            raise ValueError("Разброс паузы (jitter) должен находиться в диапазоне [0, 1)!")
+
+        self._queue = [] # куча (heap) из кортежей (приоритет, id, kinopoisk_id): чем меньше приоритет, тем раньше обновляется запись
+        self._failures = {} # id записи -> (число ошибок подряд, время, до которого запись не обновляется)
+        self._running = threading.Event()
+        self._running.set()
+        self._stopped = threading.Event()
+        logger.debug("Инициализация RefreshScheduler: %s запросов в час, jitter=%s, batch_size=%s...", self.requests_per_hour, self.jitter, self.batch_size)
+
+    @property
+    def interval(self):
+        """Базовая пауза (в секундах) между обновлениями двух записей о фильмах, при которой бюджет запросов расходуется равномерно"""
+        return 3600 * self.REQUESTS_PER_FILM / self.requests_per_hour
+
+    def next_delay(self):
+        """Пауза перед следующим обновлением с учётом случайного разброса"""
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def pause(self):
+        logger.info("Фоновое обновление записей о фильмах приостановлено!")
+        self._running.clear()
+
+    def resume(self):
+        logger.info("Фоновое обновление записей о фильмах возобновлено!")
+        self._running.set()
+
+    def stop(self):
+        logger.info("Получен запрос на остановку фонового обновления записей о фильмах...")
+        self._stopped.set()
+
+    @property
+    def is_paused(self):
+        return not self._running.is_set() or bool(self.pause_file and os.path.exists(self.pause_file))
+
+    @property
+    def is_stopped(self):
+        return self._stopped.is_set()
+
+    def priority(self, film, now=None):
+        """Приоритет обновления записи о фильме для кучи: чем меньше значение, тем раньше запись попадёт в работу"""
+        return -refresh_priority(film["hits"], film["created_or_updated_at"], now=now)
+
+    def backoff(self, failures):
+        """Пауза (в секундах) перед повторным обновлением записи после failures ошибок подряд"""
+        return min(self.interval * 2 ** min(failures - 1, 32), self.FAILURE_BACKOFF_MAX)
+
+    def record_failure(self, film_id, now=None):
+        now = now or timezone.now()
+        failures = self._failures.get(film_id, (0, None))[0] + 1
+        retry_at = now + datetime.timedelta(seconds=self.backoff(failures))
+        self._failures[film_id] = (failures, retry_at)
+        logger.debug("Запись о фильме %s не будет обновляться до %s (ошибок подряд: %s)", film_id, retry_at, failures)
+
+    def backed_off(self, now=None):
+        """id записей о фильмах, пауза после ошибки обновления которых ещё не истекла"""
+        now = now or timezone.now()
+        return [film_id for film_id, (_, retry_at) in self._failures.items() if retry_at > now]
+
+    def candidates(self, now=None):
+        """Самые "устаревшие" и самые "горячие" записи о фильмах (только те, которые есть на стороне API и не ждут паузы после ошибки)"""
+        films = (
+            Film.objects.exclude(kinopoisk_id__isnull=True).exclude(id__in=self.backed_off(now))
+            .values("id", "kinopoisk_id", "hits", "created_or_updated_at")
+        )
+        stalest = films.order_by("created_or_updated_at", "id")[:self.batch_size]
+        hottest = films.order_by("-hits", "created_or_updated_at", "id")[:self.batch_size]
+        return list({film["id"]: film for film in (*stalest, *hottest)}.values())
+
+    def refill_queue(self):
+        """Пополняем очередь с приоритетом очередной порцией записей о фильмах из БД"""
+        added = 0
+        now = timezone.now()
+        for film in self.candidates(now=now):
+            heapq.heappush(self._queue, (self.priority(film, now=now), film["id"], film["kinopoisk_id"]))
+            added += 1
+        logger.debug("В очередь на обновление добавлено %s записей о фильмах (всего в очереди: %s)!", added, len(self._queue))
+        return added
+
+    def refresh_next(self):
+        """Обновляем запись о фильме с наивысшим приоритетом. Возвращает kinopoisk_id обновлённой записи (или None, если обновлять нечего)"""
+        if not self._queue and not self.refill_queue():
+            return None
+        _, film_id, kinopoisk_id = heapq.heappop(self._queue)
+        try:
+            run_once(f"sync-film:{kinopoisk_id}", lambda: self.synchronizer.sync_film_and_actors(kinopoisk_id))
+            self._failures.pop(film_id, None)
+        except Exception as e:
+            # ОШИБКА ОДНОЙ ЗАПИСИ НЕ ДОЛЖНА ОСТАНАВЛИВАТЬ ВЕСЬ ЦИКЛ (ЗАПИСЬ ВЕРНЁТСЯ В ОЧЕРЕДЬ ПОСЛЕ ПАУЗЫ, см. backoff()):
+            logger.error(f"Ошибка при фоновом обновлении записи о фильме с kinopoisk_id {kinopoisk_id}: {str(e)}!", exc_info=True)
+            self.record_failure(film_id)
+        return kinopoisk_id
+
+    def wait(self, seconds):
+        """Ждём заданное время, но сразу "просыпаемся" при остановке. Возвращает True, если ожидание было прервано остановкой"""
+        return self._stopped.wait(seconds)
+
+    def run(self, max_iterations=None):
+        """Основной цикл планировщика. Работает до вызова stop() (или до исчерпания max_iterations)"""
+
+        logger.info("Запуск фонового обновления записей о фильмах: одна запись каждые ~%.1f сек...", self.interval)
+        iterations = 0
+        while not self.is_stopped:
+            if max_iterations is not None and iterations >= max_iterations:
+                break
+            if self.is_paused:
+                self.wait(self.PAUSE_POLL_INTERVAL)
+                continue
+
+            started_at = time.monotonic()
+            kinopoisk_id = self.refresh_next()
+            iterations += 1
+            if kinopoisk_id is None:
+                logger.debug("Нет записей о фильмах для обновления, ожидание...")
+
+            # ВЫЧИТАЕМ ВРЕМЯ, ПОТРАЧЕННОЕ НА САМО ОБНОВЛЕНИЕ, ЧТОБЫ НЕ ВЫХОДИТЬ ЗА ПРЕДЕЛЫ БЮДЖЕТА ЗАПРОСОВ:
+            delay = max(0.0, self.next_delay() - (time.monotonic() - started_at))
+            if self.wait(delay):
+                break
+
+        logger.info("Фоновое обновление записей о фильмах завершено, выполнено итераций: %s!", iterations)
+        return iterations
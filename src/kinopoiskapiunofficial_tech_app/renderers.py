@@ -1,4 +1,17 @@
+import json
+
 from rest_framework.renderers import JSONRenderer, BrowsableAPIRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson # более быстрый кодировщик JSON (необязательная зависимость)
+except ImportError:
+    orjson = None
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
 
 
 class UTF8JSONRenderer(JSONRenderer):
@@ -24,6 +37,59 @@ class UTF8JSONRenderer(JSONRenderer):
     }
 
 
+class CompactJSONRenderer(JSONRenderer):
+    """
+    Компактный JSON без отступов и пробелов с не-ASCII символами (кириллицей) без экранирования:
+        -> если установлен orjson, кодирует через него (значения, которые orjson не умеет кодировать так же, как DRF, - даты, Decimal,
+           ленивые строки и т.д. - передаются в стандартный JSONEncoder DRF), иначе - через стандартный json
+        -> отступы добавляются только по запросу: параметром ?pretty=1 или через "indent" в Accept (так делает браузерный интерфейс DRF)
+    """
+
+    pretty_query_param = "pretty"
+    pretty_indent = 4
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        request = (renderer_context or {}).get("request")
+        if request is not None and request.query_params.get(self.pretty_query_param) in ("1", "true", "True"):
+            return self.pretty_indent
+        return super().get_indent(accepted_media_type, renderer_context)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        ret = None
+        # orjson УМЕЕТ ОТСТУПЫ ТОЛЬКО В 2 ПРОБЕЛА, ПОЭТОМУ "КРАСИВЫЙ" ВЫВОД ДЕЛАЕМ ЧЕРЕЗ json:
+        if orjson is not None and not indent:
+            try:
+                ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+            except (orjson.JSONEncodeError, TypeError) as e:
+                logger.debug("orjson не смог закодировать ответ (%s), используется стандартный json...", str(e))
+        if ret is None:
+            separators = (",", ": ") if indent else (",", ":")
+            ret = json.dumps(data, cls=self.encoder_class, indent=indent, ensure_ascii=False, allow_nan=not self.strict, separators=separators).encode("utf-8")
+        # КАК И JSONRenderer, ЭКРАНИРУЕМ U+2028/U+2029, ЧТОБЫ ОТВЕТ МОЖНО БЫЛО ВСТРАИВАТЬ В JavaScript:
+        return ret.replace("\u2028".encode("utf-8"), b"\\u2028").replace("\u2029".encode("utf-8"), b"\\u2029")
+
+
+class NDJSONRenderer(CompactJSONRenderer):
+    """
+    NDJSON (JSON Lines): одна запись - одна строка компактного JSON. Сами выгрузки передаются потоком (см. exports.stream_ndjson),
+    а через этот рендерер отдаются только одиночные ответы (например, ошибки фильтрации) - тоже одной строкой.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        return None # отступы сломали бы формат "одна запись - одна строка"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return super().render(data, accepted_media_type, renderer_context) + b"\n"
+
+
 class UTF8BrowsableAPIRenderer(BrowsableAPIRenderer):
     """Преобразует непонятный набор символов из поля 'Факты' (и не только) в читаемый текст"""
 
@@ -0,0 +1,259 @@
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from rest_framework.response import Response
+
+from .db_routing import may_fill_cache, may_read_cache
+from .single_flight import shared_cache_configured
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+def version_key(label):
+    return f"response-cache:version:{label}"
+
+
+def bump_version(*labels):
+    """
+    Увеличиваем счётчики версий данных для моделей с переданными метками (например, "film", "actor").
+    Все закешированные ответы, собранные при старой версии, перестают использоваться (ключ кеша содержит версии).
+    """
+    for label in labels:
+        try:
+            # ЕСЛИ СЧЁТЧИКА ЕЩЁ НЕТ (ИЛИ ОН ВЫТЕСНЕН ИЗ КЕША), НАЧИНАЕМ С ТЕКУЩЕГО ВРЕМЕНИ, А НЕ С 1 - ИНАЧЕ СТАРЫЕ КЛЮЧИ МОГЛИ БЫ "ОЖИТЬ":
+            cache.add(version_key(label), time.time_ns(), None)
+            cache.incr(version_key(label))
+        except Exception as e:
+            logger.warning(f"Не удалось обновить версию данных '{label}' для кеша ответов: {str(e)}!")
+
+
+def bump_version_on_commit(*labels):
+    """
+    Увеличиваем версии сразу и ещё раз после фиксации транзакции:
+    ответ, закешированный другим процессом между изменением и фиксацией (по ещё старым данным), тоже станет неактуальным.
+    """
+    bump_version(*labels)
+    transaction.on_commit(lambda: bump_version(*labels))
+
+
+class ResponseCache:
+    """
+    Класс для кеширования данных ответов (response.data) списков записей на стороне сервера:
+        -> ключ строится из пути и нормализованной строки запроса (фильтры, поиск, сортировка, курсор) и версий данных моделей,
+           от которых зависит ответ, поэтому при изменении записей (см. сигналы в models.py) старые ответы просто перестают находиться
+        -> сначала проверяется небольшой LRU-кеш в памяти процесса, затем общий кеш (settings.CACHES)
+        -> количество попаданий/промахов считается для каждого уровня (см. stats())
+    Кешируются только данные ответа, а не его отрисованное представление, поэтому ответ по-прежнему отрисовывается под каждого клиента.
+    """
+
+    # ПАРАМЕТРЫ ЗАПРОСА, КОТОРЫЕ НЕ ВЛИЯЮТ НА ДАННЫЕ ОТВЕТА:
+    IGNORED_PARAMS = ("format",)
+
+    def __init__(self, name, labels, maxsize=None, timeout=None):
+        self.name = name
+        self.labels = tuple(labels)
+        self.maxsize = maxsize or settings.RESPONSE_CACHE_LOCAL_MAXSIZE
+        self.timeout = timeout or settings.RESPONSE_CACHE_TIMEOUT
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    @property
+    def enabled(self):
+        return settings.RESPONSE_CACHE_ENABLED
+
+    @property
+    def shared(self):
+        """
+        Можно ли кешировать другие данные (количество записей, таблицу основной страницы) под версиями этого кеша: только если
+        кеш ответов включён и кеш по умолчанию общий для всех процессов - иначе версии у каждого процесса свои, и после изменения
+        записей в одном процессе остальные отдавали бы старые данные до истечения срока хранения
+        """
+        return self.enabled and shared_cache_configured()
+
+    def normalize_query(self, request):
+        """Строка запроса с отсортированными параметрами и без пустых значений (?b=2&a=1&c= и ?a=1&b=2 дают один ключ)"""
+        params = [
+            (name, value)
+            for name, values in sorted(request.query_params.lists())
+            if name not in self.IGNORED_PARAMS
+            for value in values
+            if value != ""
+        ]
+        return urlencode(params)
+
+    def versions(self):
+        keys = [version_key(label) for label in self.labels]
+        found = cache.get_many(keys)
+        return [found.get(key, 0) for key in keys]
+
+    async def aversions(self):
+        keys = [version_key(label) for label in self.labels]
+        found = await cache.aget_many(keys)
+        return [found.get(key, 0) for key in keys]
+
+    def key(self, request, versions=None):
+        versions = self.versions() if versions is None else versions
+        raw = "|".join((request.build_absolute_uri(request.path), self.normalize_query(request), *map(str, versions)))
+        return f"response-cache:{self.name}:{hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()}"
+
+    async def akey(self, request):
+        return self.key(request, await self.aversions())
+
+    def get(self, key):
+        data = self._get_local(key)
+        if data is not None:
+            return data
+        try:
+            data = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать ответ '{self.name}' из общего кеша: {str(e)}!")
+            data = None
+        return self._got_shared(key, data)
+
+    async def aget(self, key):
+        data = self._get_local(key)
+        if data is not None:
+            return data
+        try:
+            data = await cache.aget(key)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать ответ '{self.name}' из общего кеша: {str(e)}!")
+            data = None
+        return self._got_shared(key, data)
+
+    def _get_local(self, key):
+        with self._lock:
+            if key in self._local:
+                self._local.move_to_end(key)
+                self._stats["local_hits"] += 1
+                return self._local[key]
+        return None
+
+    def _got_shared(self, key, data):
+        if data is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["shared_hits"] += 1
+        self._remember(key, data)
+        return data
+
+    def set(self, key, data):
+        data = detach(data)
+        self._remember(key, data)
+        try:
+            cache.set(key, data, self.timeout)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить ответ '{self.name}' в общий кеш: {str(e)}!")
+
+    async def aset(self, key, data):
+        data = detach(data)
+        self._remember(key, data)
+        try:
+            await cache.aset(key, data, self.timeout)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить ответ '{self.name}' в общий кеш: {str(e)}!")
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._local[key] = data
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def stats(self):
+        """Статистика попаданий/промахов в кеш в текущем процессе"""
+        stats = {"local_hits": self._stats["local_hits"], "shared_hits": self._stats["shared_hits"], "misses": self._stats["misses"]}
+        total = sum(stats.values())
+        stats["hit_ratio"] = (stats["local_hits"] + stats["shared_hits"]) / total if total else 0.0
+        return stats
+
+
+def detach(data):
+    """Копия данных ответа без ссылок на сериализатор (ReturnList/ReturnDict держат его вместе со всеми объектами выборки)"""
+    if isinstance(data, dict):
+        return {key: detach(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [detach(value) for value in data]
+    return data
+
+
+class CachedListMixin:
+    """
+    Примесь для ListAPIView: GET-запросы списка записей сначала ищутся в кеше ответов response_cache
+    (кроме клиентов, которые должны видеть свои изменения, см. db_routing.may_read_cache()); в кеш попадают только ответы,
+    прочитанные из основной БД (db_routing.may_fill_cache()). Заголовок X-Cache: HIT, MISS или BYPASS (кеш пропущен).
+    """
+
+    response_cache = None
+
+    def list(self, request, *args, **kwargs):
+        if self.response_cache is None or not self.response_cache.enabled:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            key = self.response_cache.key(request)
+        except Exception as e:
+            # НЕДОСТУПНЫЙ КЕШ НЕ ДОЛЖЕН ЛОМАТЬ API - ПРОСТО ОТДАЁМ ОТВЕТ ИЗ БД:
+            logger.warning(f"Кеш ответов '{self.response_cache.name}' недоступен: {str(e)}!")
+            return super().list(request, *args, **kwargs)
+
+        cached = may_read_cache(request)
+        data = self.response_cache.get(key) if cached else None
+        if data is not None:
+            logger.debug("Ответ '%s' для %s получен из кеша!", self.response_cache.name, request.get_full_path())
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and may_fill_cache():
+            self.response_cache.set(key, response.data)
+        response["X-Cache"] = "MISS" if cached else "BYPASS"
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        """Асинхронный вариант list() (см. async_views.AsyncListMixin)"""
+        if self.response_cache is None or not self.response_cache.enabled:
+            return await super().alist(request, *args, **kwargs)
+
+        try:
+            key = await self.response_cache.akey(request)
+        except Exception as e:
+            logger.warning(f"Кеш ответов '{self.response_cache.name}' недоступен: {str(e)}!")
+            return await super().alist(request, *args, **kwargs)
+
+        cached = may_read_cache(request)
+        data = await self.response_cache.aget(key) if cached else None
+        if data is not None:
+            logger.debug("Ответ '%s' для %s получен из кеша!", self.response_cache.name, request.get_full_path())
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = await super().alist(request, *args, **kwargs)
+        if response.status_code == 200 and may_fill_cache():
+            await self.response_cache.aset(key, response.data)
+        response["X-Cache"] = "MISS" if cached else "BYPASS"
+        return response
+
+
+# ОТВЕТЫ СО СПИСКОМ ФИЛЬМОВ СОДЕРЖАТ ИМЕНА АКТЁРОВ, ПОЭТОМУ ЗАВИСЯТ ОТ ОБЕИХ МОДЕЛЕЙ:
+film_list_cache = ResponseCache("film-list", labels=("film", "actor"))
+actor_list_cache = ResponseCache("actor-list", labels=("actor",))
+# ФИЛЬМОГРАФИЯ АКТЁРОВ - ТОЖЕ ФИЛЬМЫ С ИМЕНАМИ АКТЁРОВ:
+actor_films_cache = ResponseCache("actor-films", labels=("film", "actor"))
@@ -0,0 +1,118 @@
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import CharField, F, FloatField, Func, Q, Value
+from django.db.models.functions import Greatest, Replace, Upper
+from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+from rest_framework.filters import SearchFilter
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+# ИМЯ АННОТАЦИИ С РЕЛЕВАНТНОСТЬЮ ЗАПИСИ ПОИСКОВОМУ ЗАПРОСУ (ПО НЕЙ СОРТИРУЕТ pagination.KeysetPagination, ЕСЛИ НЕ ЗАДАН ordering):
+RELEVANCE = "search_rank"
+
+
+def fold(text):
+    """Нормализация строки для поиска: верхний регистр и "Ё" -> "Е" (чтобы "ёлка" находила "Елка" и наоборот)"""
+    return text.upper().replace("Ё", "Е")
+
+
+def is_postgresql(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def folded(field_name, postgresql=True):
+    """
+    То же преобразование на стороне БД. На PostgreSQL это REPLACE(UPPER(поле), 'Ё', 'Е') - ровно то выражение,
+    по которому построены GIN-индексы pg_trgm (см. миграцию 0005), поэтому LIKE '%...%' по нему использует индекс.
+    На остальных СУБД (sqlite3 в тестах) UPPER() не работает с кириллицей, поэтому заменяются обе буквы "ё"/"Ё".
+    """
+    if postgresql:
+        return Replace(Upper(field_name), Value("Ё"), Value("Е"), output_field=CharField())
+    return Replace(Replace(F(field_name), Value("ё"), Value("е")), Value("Ё"), Value("Е"), output_field=CharField())
+
+
+def folded_contains(queryset, field_name, term):
+    """
+    Возвращает (queryset, условие): условие "поле содержит term" без учёта регистра и разницы между е/ё.
+    Нормализованное поле добавляется в queryset через alias(), поэтому в SELECT оно не попадает.
+    """
+    alias = f"_folded_{field_name.replace('__', '_')}"
+    if is_postgresql(queryset):
+        return queryset.alias(**{alias: folded(field_name)}), Q(**{f"{alias}__contains": fold(term)})
+    return queryset.alias(**{alias: folded(field_name, postgresql=False)}), Q(**{f"{alias}__icontains": term.replace("ё", "е").replace("Ё", "Е")})
+
+
+def word_similarity(term, field_name):
+    """Релевантность поля поисковому запросу - функция word_similarity() расширения pg_trgm (от 0 до 1)"""
+    return Func(Value(fold(term)), folded(field_name), function="WORD_SIMILARITY", output_field=FloatField())
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    Класс поиска (?search=...) для FilmListView/ActorListView, который работает по тем же search_fields, что и SearchFilter DRF, но:
+        -> поля с префиксом "%" ищутся по вхождению без учёта регистра и е/ё, а на PostgreSQL - по выражению с GIN-индексом pg_trgm
+           (вместо последовательного сканирования таблицы через UPPER(...) LIKE '%...%')
+        -> поля с префиксом "=" (числовые) участвуют в поиске, только если слово запроса является допустимым значением поля
+        -> на PostgreSQL записи получают аннотацию RELEVANCE (наибольшая word_similarity() по "%"-полям), по которой
+           они сортируются, если клиент не задал ordering
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return trigram_search(queryset, self.get_search_fields(view, request), self.get_search_terms(request), self.construct_search)
+
+
+def trigram_search(queryset, search_fields, search_terms, construct_search=None):
+    """
+    Поиск по словам search_terms в полях search_fields (с префиксами "%" и "=", см. TrigramSearchFilter) - общий для API
+    и админки (admin.TrigramSearchAdminMixin). construct_search - построение условия для полей без префиксов (по умолчанию icontains).
+    """
+    if not search_fields or not search_terms:
+        return queryset
+
+    trigram_fields = [field[1:] for field in search_fields if field.startswith("%")]
+    other_fields = [field for field in search_fields if not field.startswith("%")]
+
+    conditions = []
+    for term in search_terms:
+        alternatives = []
+        for field_name in trigram_fields:
+            queryset, condition = folded_contains(queryset, field_name, term)
+            alternatives.append(condition)
+        for field_name in other_fields:
+            if field_name.startswith("="):
+                field = queryset.model._meta.get_field(field_name[1:])
+                try:
+                    value = field.clean(term, None) # с проверкой диапазона значений (иначе БД вернула бы ошибку переполнения)
+                except ValidationError:
+                    continue # слово запроса не может быть значением этого поля (например, не число)
+                alternatives.append(Q(**{field.name: value}))
+            else:
+                lookup = construct_search(field_name, queryset) if construct_search is not None else f"{field_name}__icontains"
+                alternatives.append(Q(**{lookup: term}))
+        conditions.append(reduce(or_, alternatives) if alternatives else Q(pk__in=[]))
+    queryset = queryset.filter(reduce(and_, conditions))
+
+    if trigram_fields and is_postgresql(queryset):
+        similarities = [word_similarity(" ".join(search_terms), field_name) for field_name in trigram_fields]
+        queryset = queryset.annotate(**{RELEVANCE: Greatest(*similarities) if len(similarities) > 1 else similarities[0]})
+    logger.debug("Поиск записей %s по запросу %s в полях %s...", queryset.model.__name__, search_terms, search_fields)
+    return queryset
+
+
+class FoldedCharFilter(filters.CharFilter):
+    """Фильтр по вхождению строки без учёта регистра и разницы между е/ё (на PostgreSQL - с использованием GIN-индекса pg_trgm)"""
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        qs, condition = folded_contains(qs, self.field_name, value)
+        qs = qs.filter(condition)
+        return qs.distinct() if self.distinct else qs
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import Film, Actor
+from .sparse_fields import SparseFieldsSerializerMixin
+from .filmography import first_page
 
 import logging
 
@@ -7,9 +9,11 @@ import logging
 logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
 
 
-class FilmSerializer(serializers.ModelSerializer):
+class FilmSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Класс-сериализатор, используемый для преобразования объектов модели Film в формат json"""
 
+    expandable_fields = ("actors",) # при ?fields=... актёры выводятся только по ?expand=actors (см. sparse_fields.selected_fields)
+
     kinopoisk_id = serializers.IntegerField(required=False, allow_null=True, label="ID фильма на стороне API")
     name = serializers.CharField(allow_null=True, allow_blank=True, required=False, label="Название")
     year = serializers.IntegerField(allow_null=True, required=False, label="Год выхода")
@@ -20,17 +24,18 @@ class FilmSerializer(serializers.ModelSerializer):
         """
         Возвращает строковое представление поля actors.
         Также исключает проблему с циклической зависимостью между классами FilmSerializer и ActorSerializer.
+        Если актёры подгружены заранее (Film.objects.with_cast()), obj.actors.all() берёт их из кеша выборки, не обращаясь к БД.
         """
-        logger.debug(f"Получение записи об актёрах для фильма {obj.name} (ID: {obj.id})...")
+        logger.debug("Получение записи об актёрах для фильма %s (ID: %s)...", obj.name, obj.id)
         actors = obj.actors.all()
         result = [{"id": actor.id, "name": actor.name} for actor in actors]
-        logger.debug(f"Возвращено {len(result)} актёров для фильма {obj.name}!")
+        logger.debug("Возвращено %s актёров для фильма %s!", len(result), obj.name)
         return result
     
     def get_created_or_updated_at_formatted(self, obj):
-        logger.debug(f"Форматирование даты и времени для записи о фильме {obj.name} (ID: {obj.id})...")
+        logger.debug("Форматирование даты и времени для записи о фильме %s (ID: %s)...", obj.name, obj.id)
         formatted_datetime = obj.created_or_updated_at.strftime("%d.%m.%Y | %H:%M:%S")
-        logger.debug(f"Дата и время для записи о фильме отформатирована: {formatted_datetime}!")
+        logger.debug("Дата и время для записи о фильме отформатирована: %s!", formatted_datetime)
         return formatted_datetime
 
     class Meta:
@@ -39,23 +44,42 @@ class FilmSerializer(serializers.ModelSerializer):
         read_only_fields = ("created_or_updated_at",)
 
 
-class ActorSerializer(serializers.ModelSerializer):
+class ActorSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Класс-сериализатор, используемый для преобразования объектов модели Actor в формат json"""
 
+    # ФИЛЬМЫ АКТЁРА ВЫВОДЯТСЯ ТОЛЬКО ПО ?expand=films (см. sparse_fields.selected_fields):
+    expandable_fields = ("films",)
+    deferred_fields = ("films",)
+
     staff_id = serializers.IntegerField(required=False, allow_null=True, label="ID актёра на стороне API")
     name = serializers.CharField(allow_null=True, allow_blank=True, required=False, label="Имя/Ф.И.О.")
     poster_url = serializers.URLField(max_length=500, allow_null=True, allow_blank=True, required=False, label="Постер")
     profession = serializers.CharField(allow_null=True, allow_blank=True, required=False, label="Профессия/Специальность")
+    films = serializers.SerializerMethodField(label="Фильмы")
     created_or_updated_at_formatted = serializers.SerializerMethodField()
+
+    def get_films(self, obj):
+        """Первая страница фильмографии актёра одним запросом к промежуточной таблице (см. filmography.first_page)"""
+        logger.debug("Получение фильмов актёра %s (ID: %s)...", obj.name, obj.id)
+        return first_page(self.context.get("request"), obj)
     
     def get_created_or_updated_at_formatted(self, obj):
-        logger.debug(f"Форматирование даты и времени для записи об актёрах {obj.name} (ID: {obj.id})...")
+        logger.debug("Форматирование даты и времени для записи об актёрах %s (ID: %s)...", obj.name, obj.id)
         formatted_datetime = obj.created_or_updated_at.strftime("%d.%m.%Y | %H:%M:%S")
-        logger.debug(f"Дата и время для записи об актёрах отформатирована: {formatted_datetime}!")
+        logger.debug("Дата и время для записи об актёрах отформатирована: %s!", formatted_datetime)
         return formatted_datetime
     
     class Meta:
         model = Actor
-        fields = ("id", "staff_id", "name", "poster_url", "profession", "created_or_updated_at", "created_or_updated_at_formatted",)
+        fields = ("id", "staff_id", "name", "poster_url", "profession", "films", "created_or_updated_at", "created_or_updated_at_formatted",)
         read_only_fields = ("created_or_updated_at",)
 
+
+class FilmographySerializer(FilmSerializer):
+    """Класс-сериализатор для фильмографии актёров (filmography.filmography()): фильм и id актёра, к которому он относится"""
+
+    actor_id = serializers.IntegerField(read_only=True, label="ID актёра")
+
+    class Meta(FilmSerializer.Meta):
+        fields = ("actor_id", *FilmSerializer.Meta.fields)
+
@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+class _Call:
+    """Одно "находящееся в полёте" выполнение функции, результат которого ждут все одинаковые вызовы"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Класс для объединения одинаковых (с одним и тем же ключом) одновременных вызовов внутри одного процесса:
+    функция выполняется только первым вызовом, а остальные дожидаются его и получают тот же результат (или ту же ошибку).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            logger.debug("Вызов с ключом %s уже выполняется, ожидание его результата...", key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def advisory_lock_id(key):
+    """Превращает строковый ключ в 64-битное целое со знаком для pg_advisory_lock()"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+@contextmanager
+def advisory_lock(key, using="default"):
+    """
+    Межпроцессная блокировка по ключу через advisory-блокировки PostgreSQL (на уровне сессии).
+    Для остальных СУБД (например, sqlite3 в тестах) блокировка не выполняется.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        yield
+        return
+
+    lock_id = advisory_lock_id(key)
+    with connection.cursor() as cursor:
+        logger.debug("Ожидание advisory-блокировки %s для ключа %s...", lock_id, key)
+        cursor.execute("SELECT pg_advisory_lock(%s)", [lock_id])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
+        logger.debug("Advisory-блокировка %s для ключа %s снята!", lock_id, key)
+
+
+_single_flight = SingleFlight()
+
+# СКОЛЬКО СЕКУНД ХРАНИТЬ В ОБЩЕМ КЕШЕ РЕЗУЛЬТАТ ВЫПОЛНЕНИЯ ДЛЯ ДРУГИХ ПРОЦЕССОВ:
+RESULT_TIMEOUT = 60
+
+
+def shared_cache_configured():
+    """Общий ли кеш по умолчанию для всех процессов (у LocMemCache и DummyCache он свой в каждом процессе, см. CACHE_URL в настройках)"""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _run_locked(key, fn, requested_at):
+    with advisory_lock(key):
+        if not shared_cache_configured():
+            # РЕЗУЛЬТАТ ДРУГОГО ПРОЦЕССА ПОЛУЧИТЬ НЕГДЕ - ПРОЦЕССЫ ЛИШЬ ВЫПОЛНЯЮТ fn() ПО ОЧЕРЕДИ:
+            return fn()
+        # ПОКА МЫ ЖДАЛИ БЛОКИРОВКУ, ТАКОЙ ЖЕ ВЫЗОВ МОГ ЗАВЕРШИТЬСЯ В ДРУГОМ ПРОЦЕССЕ - ТОГДА ПЕРЕИСПОЛЬЗУЕМ ЕГО РЕЗУЛЬТАТ:
+        shared = cache.get(f"single-flight:{key}")
+        if shared is not None and shared["finished_at"] >= requested_at:
+            logger.debug("Результат для ключа %s получен от другого процесса!", key)
+            return shared["result"]
+        result = fn()
+        try:
+            cache.set(f"single-flight:{key}", {"result": result, "finished_at": time.time()}, RESULT_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить результат для ключа {key} в общий кеш: {str(e)}!")
+        return result
+
+
+def run_once(key, fn):
+    """
+    Выполняет fn() не более одного раза для всех одновременных вызовов с одним и тем же ключом:
+        -> внутри процесса вызовы объединяются через SingleFlight
+        -> между процессами вызовы упорядочиваются advisory-блокировкой PostgreSQL; результат передаётся другим процессам только
+           через общий кеш (shared_cache_configured()), без него каждый процесс выполняет fn() сам, дождавшись своей очереди
+    """
+    return _single_flight.do(key, _run_locked, key, fn, time.time())
@@ -0,0 +1,114 @@
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def split_param(request, name):
+    return [value.strip() for value in request.query_params.get(name, "").split(",") if value.strip()]
+
+
+def selected_fields(request, available, expandable=(), deferred=()):
+    """
+    Поля ответа, выбранные клиентом параметрами ?fields=id,name и ?expand=actors:
+        -> None, если ?fields= не передан (или запрос не на чтение) - ответ в прежнем, полном виде
+        -> иначе кортеж полей в порядке available: "id" выводится всегда, связанные записи (expandable) - только если их
+           запросили в ?expand= (или прямо в ?fields=)
+        -> поля deferred (например, фильмы актёра) есть в ответе только по ?expand=, поэтому без ?fields= для них возвращаются
+           все остальные поля
+    Неизвестные поля - ошибка 400, чтобы опечатка клиента не превращалась в молча урезанный ответ.
+    """
+    safe = request is not None and request.method in permissions.SAFE_METHODS
+    if not safe or FIELDS_PARAM not in request.query_params:
+        if not deferred:
+            return None
+        if not safe:
+            return tuple(name for name in available if name not in deferred)
+        fields = [name for name in available if name not in deferred]
+    else:
+        fields = split_param(request, FIELDS_PARAM)
+    expand = split_param(request, EXPAND_PARAM)
+    errors = {}
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        errors[FIELDS_PARAM] = [f"Неизвестные поля: {', '.join(unknown)}. Доступные поля: {', '.join(available)}."]
+    unknown = [name for name in expand if name not in expandable]
+    if unknown:
+        errors[EXPAND_PARAM] = [f"Нельзя раскрыть: {', '.join(unknown)}. Можно раскрыть: {', '.join(expandable) or '-'}."]
+    if errors:
+        raise ValidationError(errors)
+    wanted = {"id", *fields, *expand}
+    return tuple(name for name in available if name in wanted)
+
+
+def ordering_columns(request, queryset, view):
+    """Поля модели, по которым будет отсортирован список (их значения нужны пагинации для курсора)"""
+    terms = OrderingFilter().get_ordering(request, queryset, view) or ()
+    return {term.lstrip("-") for term in terms if isinstance(term, str) and term.lstrip("-") != "pk"}
+
+
+class SparseFieldsSerializerMixin:
+    """Примесь для ModelSerializer: при ?fields=... (см. selected_fields) сериализатор выводит только выбранные поля"""
+
+    expandable_fields = ()
+    deferred_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = selected_fields(self.context.get("request"), self.Meta.fields, self.expandable_fields, self.deferred_fields)
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    Примесь для представлений DRF с выбором полей ответа (?fields=...) и связанных записей (?expand=...):
+    queryset сужается до нужных столбцов через only() (плюс id и поля сортировки), а связанные записи, которые не запрошены,
+    не подгружаются вовсе (prefetch_related(None)). Сам вывод полей ограничивает SparseFieldsSerializerMixin сериализатора.
+    Представление может сузить expandable_fields сериализатора (например, раскрывать фильмы только у одного актёра, а не у списка).
+    """
+
+    expandable_fields = None
+
+    # ПОЛЯ СЕРИАЛИЗАТОРА, ВЫЧИСЛЯЕМЫЕ ИЗ ДРУГИХ ПОЛЕЙ МОДЕЛИ:
+    source_fields = {"created_or_updated_at_formatted": ("created_or_updated_at",)}
+
+    def get_selected_fields(self):
+        if not hasattr(self, "_selected_fields"):
+            serializer_class = self.get_serializer_class()
+            self._selected_fields = selected_fields(
+                self.request,
+                serializer_class.Meta.fields,
+                self.get_expandable_fields(),
+                getattr(serializer_class, "deferred_fields", ()),
+            )
+        return self._selected_fields
+
+    def get_expandable_fields(self):
+        if self.expandable_fields is not None:
+            return self.expandable_fields
+        return getattr(self.get_serializer_class(), "expandable_fields", ())
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selected = self.get_selected_fields()
+        if selected is None:
+            return queryset
+
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = {"id"} | (ordering_columns(self.request, queryset, self) & model_fields)
+        for name in selected:
+            columns.update(column for column in self.source_fields.get(name, (name,)) if column in model_fields)
+        if not set(self.get_expandable_fields()) & set(selected):
+            queryset = queryset.prefetch_related(None)
+        logger.debug("Выборка записей %s только с полями %s для ответа с полями %s...", queryset.model.__name__, sorted(columns), selected)
+        return queryset.only(*columns)
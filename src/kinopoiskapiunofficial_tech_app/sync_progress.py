@@ -0,0 +1,97 @@
+import asyncio
+import json
+import re
+import time
+
+from django.core.cache import cache
+
+import logging
+
+
+logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+
+
+RUN_ID_PATTERN = re.compile(r"^[\w-]{1,64}$")
+
+
+class SyncProgress:
+    """
+    Класс для публикации и чтения событий о ходе одного запуска синхронизации (run_id).
+    События хранятся в общем кеше под последовательными номерами, поэтому их может читать любой процесс (в т.ч. ASGI-процесс,
+    отдающий поток Server-Sent Events), а не только тот, который выполняет синхронизацию.
+    """
+
+    # СОБЫТИЯ, ПОСЛЕ КОТОРЫХ ЗАПУСК СИНХРОНИЗАЦИИ СЧИТАЕТСЯ ЗАВЕРШЁННЫМ:
+    TERMINAL_EVENTS = ("finished", "failed")
+    # СКОЛЬКО СЕКУНД ХРАНИТЬ СОБЫТИЯ В КЕШЕ:
+    TTL = 3600
+
+    def __init__(self, run_id):
+        if not RUN_ID_PATTERN.match(run_id or ""):
+            raise ValueError("Идентификатор запуска синхронизации (run_id) может содержать только буквы, цифры, '_' и '-' (не более 64 символов)!")
+        self.run_id = run_id
+
+    def key(self, suffix):
+        return f"sync-progress:{self.run_id}:{suffix}"
+
+    def publish(self, event, **data):
+        """Публикуем событие. Ошибки кеша не должны ломать саму синхронизацию"""
+        try:
+            cache.add(self.key("last"), 0, self.TTL)
+            seq = cache.incr(self.key("last"))
+            cache.set(self.key(seq), {"event": event, "data": data, "time": time.time()}, self.TTL)
+        except Exception as e:
+            logger.warning(f"Не удалось опубликовать событие '{event}' синхронизации {self.run_id}: {str(e)}!")
+
+    def _collect(self, last_seq, last, found):
+        # ОТДАЁМ ТОЛЬКО НЕПРЕРЫВНУЮ ПОСЛЕДОВАТЕЛЬНОСТЬ: СОБЫТИЕ МОГЛО УЖЕ ПОЛУЧИТЬ НОМЕР, НО ЕЩЁ НЕ ПОПАСТЬ В КЕШ
+        events = []
+        for seq in range(last_seq + 1, last + 1):
+            if self.key(seq) not in found:
+                break
+            events.append((seq, found[self.key(seq)]))
+        return events
+
+    def events_after(self, last_seq=0):
+        """События с номерами больше last_seq в виде списка кортежей (номер, событие)"""
+        last = cache.get(self.key("last"), 0)
+        if last <= last_seq:
+            return []
+        return self._collect(last_seq, last, cache.get_many([self.key(seq) for seq in range(last_seq + 1, last + 1)]))
+
+    async def aevents_after(self, last_seq=0):
+        """Асинхронная версия events_after() для ASGI-представлений"""
+        last = await cache.aget(self.key("last"), 0)
+        if last <= last_seq:
+            return []
+        return self._collect(last_seq, last, await cache.aget_many([self.key(seq) for seq in range(last_seq + 1, last + 1)]))
+
+
+def format_sse(seq, event):
+    """Одно событие в формате Server-Sent Events"""
+    data = json.dumps({**event["data"], "time": event["time"]}, ensure_ascii=False)
+    return f"id: {seq}\nevent: {event['event']}\ndata: {data}\n\n"
+
+
+async def stream_events(progress, last_seq=0, poll_interval=0.5, heartbeat_interval=15, timeout=600):
+    """
+    Асинхронный генератор потока Server-Sent Events: опрашивает общий кеш (не БД) и не держит поток (thread) на клиента.
+    Завершается после события из TERMINAL_EVENTS или по истечении timeout секунд.
+    """
+    started_at = last_activity = time.monotonic()
+    yield "retry: 2000\n\n"
+    while True:
+        for seq, event in await progress.aevents_after(last_seq):
+            last_seq = seq
+            last_activity = time.monotonic()
+            yield format_sse(seq, event)
+            if event["event"] in SyncProgress.TERMINAL_EVENTS:
+                return
+        now = time.monotonic()
+        if now - started_at >= timeout:
+            yield "event: timeout\ndata: {}\n\n"
+            return
+        if now - last_activity >= heartbeat_interval:
+            last_activity = now
+            yield ": keep-alive\n\n" # комментарий SSE, чтобы прокси не закрывали "молчащее" соединение
+        await asyncio.sleep(poll_interval)
@@ -39,7 +39,7 @@ class TestActorListView:
     def test_get_actor_list(self):
         response = self.client.get(self.url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == Actor.objects.count()
+        assert len(response.data["results"]) == Actor.objects.count()
 ######################################################################################################################################
 
 ################################################################ CREATE ################################################################
@@ -82,41 +82,41 @@ class TestActorListView:
     def test_filter_actor_by_staff_id_field(self):
         response = self.client.get(self.url, {"staff_id": 5003})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["staff_id"] == 5003
-        assert response.data[0]["name"] == "Тестовый актёр #3"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["staff_id"] == 5003
+        assert response.data["results"][0]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
 
     # ПРОВЕРКА ВОЗМОЖНОСТИ ФИЛЬТРАЦИИ ЗАПИСЕЙ В ТАБЛИЦЕ `Actor` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "name":
     def test_filter_actor_by_name_field(self):
         response = self.client.get(self.url, {"name": "#3"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["staff_id"] == 5003
-        assert response.data[0]["name"] == "Тестовый актёр #3"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["staff_id"] == 5003
+        assert response.data["results"][0]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
 
     # ПРОВЕРКА ВОЗМОЖНОСТИ ФИЛЬТРАЦИИ ЗАПИСЕЙ В ТАБЛИЦЕ `Actor` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "poster_url":
     def test_filter_actor_by_poster_url_field(self):
         response = self.client.get(self.url, {"poster_url": "_3"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["staff_id"] == 5003
-        assert response.data[0]["name"] == "Тестовый актёр #3"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["staff_id"] == 5003
+        assert response.data["results"][0]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
 
     # ПРОВЕРКА ВОЗМОЖНОСТИ ФИЛЬТРАЦИИ ЗАПИСЕЙ В ТАБЛИЦЕ `Actor` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "profession":
     def test_filter_actor_by_profession_field(self):
         response = self.client.get(self.url, {"profession": "#3"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["staff_id"] == 5003
-        assert response.data[0]["name"] == "Тестовый актёр #3"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["staff_id"] == 5003
+        assert response.data["results"][0]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
 ########################################################################################################################################
 
 ################################################################ ORDERING ################################################################
@@ -124,101 +124,101 @@ class TestActorListView:
     def test_ordering_actor_by_staff_id_field(self):
         response = self.client.get(self.url, {"ordering": "-staff_id"})
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["staff_id"] == 5005
-        assert response.data[0]["name"] == "Тестовый актёр #5"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_5.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
-        assert response.data[1]["staff_id"] == 5004
-        assert response.data[1]["name"] == "Тестовый актёр #4"
-        assert response.data[1]["poster_url"] == "https://example.com/poster_4.jpg"
-        assert response.data[1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
-        assert response.data[2]["staff_id"] == 5003
-        assert response.data[2]["name"] == "Тестовый актёр #3"
-        assert response.data[2]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
-        assert response.data[3]["staff_id"] == 5002
-        assert response.data[3]["name"] == "Тестовый актёр #2"
-        assert response.data[3]["poster_url"] == "https://example.com/poster_2.jpg"
-        assert response.data[3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
-        assert response.data[4]["staff_id"] == 5001
-        assert response.data[4]["name"] == "Тестовый актёр #1"
-        assert response.data[4]["poster_url"] == "https://example.com/poster_1.jpg"
-        assert response.data[4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
+        assert response.data["results"][0]["staff_id"] == 5005
+        assert response.data["results"][0]["name"] == "Тестовый актёр #5"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_5.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
+        assert response.data["results"][1]["staff_id"] == 5004
+        assert response.data["results"][1]["name"] == "Тестовый актёр #4"
+        assert response.data["results"][1]["poster_url"] == "https://example.com/poster_4.jpg"
+        assert response.data["results"][1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
+        assert response.data["results"][2]["staff_id"] == 5003
+        assert response.data["results"][2]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][2]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert response.data["results"][3]["staff_id"] == 5002
+        assert response.data["results"][3]["name"] == "Тестовый актёр #2"
+        assert response.data["results"][3]["poster_url"] == "https://example.com/poster_2.jpg"
+        assert response.data["results"][3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
+        assert response.data["results"][4]["staff_id"] == 5001
+        assert response.data["results"][4]["name"] == "Тестовый актёр #1"
+        assert response.data["results"][4]["poster_url"] == "https://example.com/poster_1.jpg"
+        assert response.data["results"][4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
 
     # ПРОВЕРКА ВОЗМОЖНОСТИ СОРТИРОВКИ ЗАПИСЕЙ В ТАБЛИЦЕ `Actor` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "name":
     def test_ordering_actor_by_name_field(self):
         response = self.client.get(self.url, {"ordering": "-name"})
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["staff_id"] == 5005
-        assert response.data[0]["name"] == "Тестовый актёр #5"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_5.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
-        assert response.data[1]["staff_id"] == 5004
-        assert response.data[1]["name"] == "Тестовый актёр #4"
-        assert response.data[1]["poster_url"] == "https://example.com/poster_4.jpg"
-        assert response.data[1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
-        assert response.data[2]["staff_id"] == 5003
-        assert response.data[2]["name"] == "Тестовый актёр #3"
-        assert response.data[2]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
-        assert response.data[3]["staff_id"] == 5002
-        assert response.data[3]["name"] == "Тестовый актёр #2"
-        assert response.data[3]["poster_url"] == "https://example.com/poster_2.jpg"
-        assert response.data[3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
-        assert response.data[4]["staff_id"] == 5001
-        assert response.data[4]["name"] == "Тестовый актёр #1"
-        assert response.data[4]["poster_url"] == "https://example.com/poster_1.jpg"
-        assert response.data[4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
+        assert response.data["results"][0]["staff_id"] == 5005
+        assert response.data["results"][0]["name"] == "Тестовый актёр #5"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_5.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
+        assert response.data["results"][1]["staff_id"] == 5004
+        assert response.data["results"][1]["name"] == "Тестовый актёр #4"
+        assert response.data["results"][1]["poster_url"] == "https://example.com/poster_4.jpg"
+        assert response.data["results"][1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
+        assert response.data["results"][2]["staff_id"] == 5003
+        assert response.data["results"][2]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][2]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert response.data["results"][3]["staff_id"] == 5002
+        assert response.data["results"][3]["name"] == "Тестовый актёр #2"
+        assert response.data["results"][3]["poster_url"] == "https://example.com/poster_2.jpg"
+        assert response.data["results"][3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
+        assert response.data["results"][4]["staff_id"] == 5001
+        assert response.data["results"][4]["name"] == "Тестовый актёр #1"
+        assert response.data["results"][4]["poster_url"] == "https://example.com/poster_1.jpg"
+        assert response.data["results"][4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
 
     # ПРОВЕРКА ВОЗМОЖНОСТИ СОРТИРОВКИ ЗАПИСЕЙ В ТАБЛИЦЕ `Actor` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "poster_url":
     def test_ordering_actor_by_poster_url_field(self):
         response = self.client.get(self.url, {"ordering": "-poster_url"})
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["staff_id"] == 5005
-        assert response.data[0]["name"] == "Тестовый актёр #5"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_5.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
-        assert response.data[1]["staff_id"] == 5004
-        assert response.data[1]["name"] == "Тестовый актёр #4"
-        assert response.data[1]["poster_url"] == "https://example.com/poster_4.jpg"
-        assert response.data[1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
-        assert response.data[2]["staff_id"] == 5003
-        assert response.data[2]["name"] == "Тестовый актёр #3"
-        assert response.data[2]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
-        assert response.data[3]["staff_id"] == 5002
-        assert response.data[3]["name"] == "Тестовый актёр #2"
-        assert response.data[3]["poster_url"] == "https://example.com/poster_2.jpg"
-        assert response.data[3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
-        assert response.data[4]["staff_id"] == 5001
-        assert response.data[4]["name"] == "Тестовый актёр #1"
-        assert response.data[4]["poster_url"] == "https://example.com/poster_1.jpg"
-        assert response.data[4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
+        assert response.data["results"][0]["staff_id"] == 5005
+        assert response.data["results"][0]["name"] == "Тестовый актёр #5"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_5.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
+        assert response.data["results"][1]["staff_id"] == 5004
+        assert response.data["results"][1]["name"] == "Тестовый актёр #4"
+        assert response.data["results"][1]["poster_url"] == "https://example.com/poster_4.jpg"
+        assert response.data["results"][1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
+        assert response.data["results"][2]["staff_id"] == 5003
+        assert response.data["results"][2]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][2]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert response.data["results"][3]["staff_id"] == 5002
+        assert response.data["results"][3]["name"] == "Тестовый актёр #2"
+        assert response.data["results"][3]["poster_url"] == "https://example.com/poster_2.jpg"
+        assert response.data["results"][3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
+        assert response.data["results"][4]["staff_id"] == 5001
+        assert response.data["results"][4]["name"] == "Тестовый актёр #1"
+        assert response.data["results"][4]["poster_url"] == "https://example.com/poster_1.jpg"
+        assert response.data["results"][4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
 
     # ПРОВЕРКА ВОЗМОЖНОСТИ СОРТИРОВКИ ЗАПИСЕЙ В ТАБЛИЦЕ `Actor` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "profession":
     def test_ordering_actor_by_profession_field(self):
         response = self.client.get(self.url, {"ordering": "-profession"})
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["staff_id"] == 5005
-        assert response.data[0]["name"] == "Тестовый актёр #5"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_5.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
-        assert response.data[1]["staff_id"] == 5004
-        assert response.data[1]["name"] == "Тестовый актёр #4"
-        assert response.data[1]["poster_url"] == "https://example.com/poster_4.jpg"
-        assert response.data[1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
-        assert response.data[2]["staff_id"] == 5003
-        assert response.data[2]["name"] == "Тестовый актёр #3"
-        assert response.data[2]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
-        assert response.data[3]["staff_id"] == 5002
-        assert response.data[3]["name"] == "Тестовый актёр #2"
-        assert response.data[3]["poster_url"] == "https://example.com/poster_2.jpg"
-        assert response.data[3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
-        assert response.data[4]["staff_id"] == 5001
-        assert response.data[4]["name"] == "Тестовый актёр #1"
-        assert response.data[4]["poster_url"] == "https://example.com/poster_1.jpg"
-        assert response.data[4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
+        assert response.data["results"][0]["staff_id"] == 5005
+        assert response.data["results"][0]["name"] == "Тестовый актёр #5"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_5.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #5 тестового актёра #5"
+        assert response.data["results"][1]["staff_id"] == 5004
+        assert response.data["results"][1]["name"] == "Тестовый актёр #4"
+        assert response.data["results"][1]["poster_url"] == "https://example.com/poster_4.jpg"
+        assert response.data["results"][1]["profession"] == "Тестовая профессия #4 тестового актёра #4"
+        assert response.data["results"][2]["staff_id"] == 5003
+        assert response.data["results"][2]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][2]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][2]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert response.data["results"][3]["staff_id"] == 5002
+        assert response.data["results"][3]["name"] == "Тестовый актёр #2"
+        assert response.data["results"][3]["poster_url"] == "https://example.com/poster_2.jpg"
+        assert response.data["results"][3]["profession"] == "Тестовая профессия #2 тестового актёра #2"
+        assert response.data["results"][4]["staff_id"] == 5001
+        assert response.data["results"][4]["name"] == "Тестовый актёр #1"
+        assert response.data["results"][4]["poster_url"] == "https://example.com/poster_1.jpg"
+        assert response.data["results"][4]["profession"] == "Тестовая профессия #1 тестового актёра #1"
 ##########################################################################################################################################
 
 ################################################################ SEARCH ################################################################
@@ -226,9 +226,9 @@ class TestActorListView:
     def test_search_actor_by_any_field(self):
         response = self.client.get(self.url, {"search": "#3"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["staff_id"] == 5003
-        assert response.data[0]["name"] == "Тестовый актёр #3"
-        assert response.data[0]["poster_url"] == "https://example.com/poster_3.jpg"
-        assert response.data[0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["staff_id"] == 5003
+        assert response.data["results"][0]["name"] == "Тестовый актёр #3"
+        assert response.data["results"][0]["poster_url"] == "https://example.com/poster_3.jpg"
+        assert response.data["results"][0]["profession"] == "Тестовая профессия #3 тестового актёра #3"
 ########################################################################################################################################
@@ -0,0 +1,89 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_admin/admin_test.py -v && coverage report
+"""
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from kinopoiskapiunofficial_tech_app import counts
+from kinopoiskapiunofficial_tech_app.models import User, Film, Actor
+
+
+@pytest.mark.django_db
+class TestAdmin:
+    """Класс тестов для админки фильмов и актёров (запросы списка, поиск, автодополнение актёров и количество записей)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.admin = User.objects.create_superuser(username="admin_for_test", password="password_for_test", email="admin@example.com")
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.actors = [Actor.objects.create(staff_id=5000 + i, name=name) for i, name in enumerate(("Пётр Фёдоров", "Иван Петров", "Анна Иванова"))]
+        self.films = []
+        self.film_list_url = reverse("admin:kinopoiskapiunofficial_tech_app_film_changelist")
+        self.actor_list_url = reverse("admin:kinopoiskapiunofficial_tech_app_actor_changelist")
+
+    def create_films(self, count, start=0):
+        for i in range(start, start + count):
+            film = Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i)
+            film.actors.add(*self.actors)
+            self.films.append(film)
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        assert response.status_code == 200
+        return response, [query["sql"] for query in queries.captured_queries]
+
+################################################################ CHANGELIST ################################################################
+    # ПРОВЕРКА НЕЗАВИСИМОСТИ КОЛИЧЕСТВА ЗАПРОСОВ СПИСКА ФИЛЬМОВ ОТ КОЛИЧЕСТВА ФИЛЬМОВ (АКТЁРЫ - ОДНИМ ЗАПРОСОМ):
+    def test_film_changelist_query_count(self):
+        self.create_films(2)
+        _, few = self.get(self.film_list_url)
+        self.create_films(20, start=2)
+        response, many = self.get(self.film_list_url)
+        assert len(few) == len(many)
+        assert "Пётр Фёдоров, Иван Петров, Анна Иванова" in response.content.decode("utf-8")
+
+    # ПРОВЕРКА ОТСУТСТВИЯ ПОДСЧЁТА ВСЕХ ЗАПИСЕЙ БЕЗ ФИЛЬТРОВ ПРИ ПОИСКЕ:
+    def test_no_full_result_count(self):
+        self.create_films(3)
+        _, queries = self.get(self.film_list_url, {"q": "фильм #1"})
+        assert sum("COUNT" in sql for sql in queries) == 1 # только количество найденных (с ограничением LIMIT)
+
+    # ПРОВЕРКА ОЦЕНКИ КОЛИЧЕСТВА ЗАПИСЕЙ НА БОЛЬШОЙ ТАБЛИЦЕ PostgreSQL:
+    def test_estimated_count(self, mocker):
+        self.create_films(3)
+        mocker.patch.object(counts, "is_postgresql", return_value=True)
+        mocker.patch.object(counts, "table_estimate", return_value=250000)
+        response, queries = self.get(self.film_list_url)
+        assert response.context["cl"].result_count == 250000
+        assert not any("COUNT" in sql for sql in queries)
+
+################################################################ SEARCH ################################################################
+    # ПРОВЕРКА ПОИСКА БЕЗ УЧЁТА РАЗНИЦЫ МЕЖДУ Е/Ё И ПО ТОЧНОМУ ID (sqlite3 НЕ ПРИВОДИТ РЕГИСТР КИРИЛЛИЦЫ, ПОЭТОМУ СЛОВА - С ЗАГЛАВНОЙ):
+    def test_search(self):
+        response, _ = self.get(self.actor_list_url, {"q": "Федоров"})
+        assert list(response.context["cl"].result_list) == [self.actors[0]]
+        response, _ = self.get(self.actor_list_url, {"q": "5002"})
+        assert list(response.context["cl"].result_list) == [self.actors[2]]
+        response, _ = self.get(self.actor_list_url, {"q": "Петр"})
+        assert set(response.context["cl"].result_list) == {self.actors[0], self.actors[1]}
+
+################################################################ AUTOCOMPLETE ################################################################
+    # ПРОВЕРКА ФОРМЫ ФИЛЬМА БЕЗ СПИСКА ВСЕХ АКТЁРОВ И АВТОДОПОЛНЕНИЯ АКТЁРОВ:
+    def test_cast_autocomplete(self):
+        self.create_films(1)
+        film = Film.objects.create(kinopoisk_id=2000, name="Фильм без актёров", year=2020)
+        response, _ = self.get(reverse("admin:kinopoiskapiunofficial_tech_app_film_change", args=(film.pk,)))
+        html = response.content.decode("utf-8")
+        assert "admin-autocomplete" in html
+        assert "Анна Иванова" not in html # в форме только выбранные актёры
+
+        response, _ = self.get(reverse("admin:autocomplete"), {
+            "app_label": "kinopoiskapiunofficial_tech_app", "model_name": "film", "field_name": "actors", "term": "Иванов",
+        })
+        assert [item["id"] for item in response.json()["results"]] == [str(self.actors[2].pk)]
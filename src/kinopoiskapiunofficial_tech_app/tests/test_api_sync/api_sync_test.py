@@ -221,4 +221,28 @@ class TestAPISynchronizer:
         
         with pytest.raises(Exception, match="Ошибка при запросе к API: 400"):
             self.synchronizer.make_request("http://test.url")
+
+    def test_make_request_rate_limit_wait_is_capped(self, mocker, settings):
+        """Ответ 429 с Retry-After дольше max_wait: запрос не повторяется и сразу завершается ошибкой (без ожидания)"""
+        settings.API_RATE_LIMIT_MAX_WAIT = 5
+        sleep = mocker.patch("kinopoiskapiunofficial_tech_app.api_sync.time.sleep")
+        limited = mocker.MagicMock(status_code=429, headers={"Retry-After": "3600"})
+        limited.raise_for_status.side_effect = requests.HTTPError()
+        get = mocker.patch("requests.get", return_value=limited)
+
+        with pytest.raises(Exception, match="Ошибка при запросе к API: 429"):
+            APISynchronizer().make_request("http://test.url")
+        assert get.call_count == 1
+        sleep.assert_not_called()
+
+    def test_make_request_rate_limit_wait_within_cap(self, mocker):
+        """Ответ 429 с Retry-After не дольше max_wait: ждём и повторяем запрос"""
+        sleep = mocker.patch("kinopoiskapiunofficial_tech_app.api_sync.time.sleep")
+        limited = mocker.MagicMock(status_code=429, headers={"Retry-After": "2"})
+        ok = mocker.MagicMock(status_code=200)
+        ok.json.return_value = {"success": True}
+        mocker.patch("requests.get", side_effect=[limited, ok])
+
+        assert APISynchronizer(max_wait=2).make_request("http://test.url") == {"success": True}
+        sleep.assert_called_once_with(2.0)
 ###############################################################################################################################################
@@ -0,0 +1,133 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_api_sync/archive_synchronizer_test.py::TestArchiveSynchronizer -v && coverage report
+"""
+
+import zlib
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from kinopoiskapiunofficial_tech_app.models import Film, Actor, UpstreamPayload
+from kinopoiskapiunofficial_tech_app.api_sync import APISynchronizer, ArchiveSynchronizer
+
+
+FILMS_RESPONSE = {
+    "items": [
+        {"kinopoiskId": 123, "nameRu": None, "nameOriginal": "Test film", "year": 2014},
+        {"kinopoiskId": 456, "nameRu": "Тестовый фильм", "nameOriginal": "Another film", "year": 2015},
+    ],
+    "totalPages": 3,
+}
+
+STAFF_RESPONSE = [
+    {"staffId": 1, "nameRu": "Тестовый актёр", "posterUrl": "https://example.com/poster_1.jpg", "professionText": "Актёр"},
+]
+
+
+@pytest.mark.django_db
+class TestArchiveSynchronizer:
+    """Класс тестов для архива ответов API и ArchiveSynchronizer"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker):
+        def fake_get(url, headers=None, params=None):
+            response = mocker.MagicMock()
+            response.status_code = 200
+            response.json.return_value = FILMS_RESPONSE if url.endswith("/films") else STAFF_RESPONSE
+            return response
+
+        self.requests_get = mocker.patch("requests.get", side_effect=fake_get)
+        APISynchronizer().sync_films_and_actors(page=2)
+
+    ################################################################ АРХИВИРОВАНИЕ ОТВЕТОВ ################################################################
+    def test_every_response_is_archived_compressed(self):
+        assert UpstreamPayload.objects.filter(endpoint="/films", params={"page": 2}).count() == 1
+        assert UpstreamPayload.objects.filter(endpoint="/staff").count() == 2
+        payload = UpstreamPayload.objects.get(endpoint="/films")
+        assert payload.data == FILMS_RESPONSE
+        assert zlib.decompress(bytes(payload.payload))
+
+    def test_archive_is_append_only(self):
+        payload = UpstreamPayload.objects.first()
+        payload.endpoint = "/changed"
+        with pytest.raises(ValueError):
+            payload.save()
+
+    def test_archive_disabled(self, settings):
+        settings.UPSTREAM_ARCHIVE_ENABLED = False
+        UpstreamPayload.objects.all().delete()
+        APISynchronizer().get_films(page=1)
+        assert not UpstreamPayload.objects.exists()
+    ########################################################################################################################################################
+
+    ################################################################ ПЕРЕСБОРКА ИЗ АРХИВА ################################################################
+    def test_rematerialize_without_network(self):
+        Film.objects.all().delete()
+        Actor.objects.all().delete()
+        self.requests_get.reset_mock()
+
+        call_command("rematerialize_archive")
+
+        self.requests_get.assert_not_called()
+        assert Film.objects.count() == 2
+        assert Film.objects.get(kinopoisk_id=123).name == "Test film"
+        assert Film.objects.get(kinopoisk_id=456).actors.count() == 1
+        assert Actor.objects.count() == 1
+
+    def test_rematerialize_with_changed_mapping(self, mocker):
+        original = APISynchronizer.format_film_data
+        mocker.patch.object(
+            APISynchronizer,
+            "format_film_data",
+            side_effect=lambda film: {**original(film), "name": film.get("nameOriginal") or film.get("nameRu")},
+        )
+        result = ArchiveSynchronizer().rematerialize()
+        assert result == {"pages": 1, "films": 0, "synced_count": 2}
+        assert Film.objects.get(kinopoisk_id=456).name == "Another film"
+
+    def test_rematerialize_uses_latest_payload(self):
+        UpstreamPayload.archive("/films", {"page": 2}, {"items": [{"kinopoiskId": 123, "nameRu": "Новое название", "year": 2014}], "totalPages": 3})
+        ArchiveSynchronizer().rematerialize()
+        assert Film.objects.get(kinopoisk_id=123).name == "Новое название"
+
+    def test_rematerialize_stale_film_payload_does_not_override_newer_page(self):
+        UpstreamPayload.objects.filter(endpoint="/films").delete()
+        UpstreamPayload.archive("/films/123", {}, {"kinopoiskId": 123, "nameRu": "Старое название", "year": 2014})
+        UpstreamPayload.archive("/films", {"page": 2}, {"items": [{"kinopoiskId": 123, "nameRu": "Новое название", "year": 2014}], "totalPages": 3})
+        result = ArchiveSynchronizer().rematerialize()
+        assert result == {"pages": 1, "films": 1, "synced_count": 2}
+        assert Film.objects.get(kinopoisk_id=123).name == "Новое название"
+
+        UpstreamPayload.archive("/films/123", {}, {"kinopoiskId": 123, "nameRu": "Самое новое название", "year": 2014})
+        ArchiveSynchronizer().rematerialize()
+        assert Film.objects.get(kinopoisk_id=123).name == "Самое новое название"
+
+    def test_rematerialize_isolates_database_errors(self, mocker):
+        UpstreamPayload.archive("/films/123", {}, {"kinopoiskId": 123, "nameRu": "Фильм с ошибкой", "year": 2014})
+        UpstreamPayload.archive("/films/789", {}, {"kinopoiskId": 789, "nameRu": "Отдельный фильм", "year": 2016})
+        UpstreamPayload.archive("/staff", {"filmId": 789}, STAFF_RESPONSE)
+        Film.objects.all().delete()
+        original = APISynchronizer.sync_actors_for_film
+
+        def sync_actors_for_film(synchronizer, film):
+            if film.kinopoisk_id == 123:
+                # ОШИБКА БД, ПОСЛЕ КОТОРОЙ ТРАНЗАКЦИЯ НЕПРИГОДНА ДЛЯ ЗАПРОСОВ ДО ОТКАТА (КАК В PostgreSQL):
+                with transaction.atomic(savepoint=False):
+                    raise IntegrityError("Тестовая ошибка БД!")
+            return original(synchronizer, film)
+
+        mocker.patch.object(APISynchronizer, "sync_actors_for_film", autospec=True, side_effect=sync_actors_for_film)
+        call_command("rematerialize_archive")
+
+        assert Film.objects.get(kinopoisk_id=456).actors.count() == 1
+        assert Film.objects.get(kinopoisk_id=789).actors.count() == 1
+        assert Film.objects.get(kinopoisk_id=123).actors.count() == 0
+        assert Film.objects.get(kinopoisk_id=123).name == "Test film" # отдельный ответ /films/123 откатился вместе с ошибкой
+
+    def test_archive_synchronizer_never_calls_api(self):
+        with pytest.raises(Exception, match="Запросы к API при пересборке данных из архива запрещены!"):
+            ArchiveSynchronizer().make_request("https://kinopoiskapiunofficial.tech/api/v2.2/films")
+        with pytest.raises(Exception, match="В архиве нет ответа API"):
+            ArchiveSynchronizer().get_actors(film_id=999)
+    ########################################################################################################################################################
@@ -3,6 +3,7 @@
 """
 
 import pytest
+import requests
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -98,6 +99,22 @@ class TestDownloadFilmsAndActorsByGETMethodView:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.data == {"error": "Тестовое сообщение об ошибке!"}
 
+    def test_rate_limit_fails_fast(self, mocker, settings):
+        """При ответе API 429 запрос к представлению не ждёт снятия лимита дольше API_RATE_LIMIT_REQUEST_MAX_WAIT"""
+        settings.API_RATE_LIMIT_REQUEST_MAX_WAIT = 0
+        sleep = mocker.patch("kinopoiskapiunofficial_tech_app.api_sync.time.sleep")
+        limited = mocker.MagicMock(status_code=429, headers={"Retry-After": "30"})
+        limited.raise_for_status.side_effect = requests.HTTPError()
+        get = mocker.patch("requests.get", return_value=limited)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {"error": "Ошибка при запросе к API: 429!"}
+        assert get.call_count == 1
+        sleep.assert_not_called()
+
     ################################################################ ПРОВЕРКИ ДОСТУПА ################################################################
     def test_access_denied_for_unauthenticated_user(self):
         """Проверка запрета доступа для неаутентифицированных пользователей"""
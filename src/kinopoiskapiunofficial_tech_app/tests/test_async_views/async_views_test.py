@@ -0,0 +1,195 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_async_views/async_views_test.py -v && coverage report
+"""
+
+import importlib
+import json
+import sys
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.hit_counters import film_hits
+from kinopoiskapiunofficial_tech_app.db_routing import ReplicaRouter
+from kinopoiskapiunofficial_tech_app.fast_serializers import FastListMixin
+from kinopoiskapiunofficial_tech_app.async_views import AsyncRetrieveMixin
+
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    """Класс тестов для асинхронного чтения списков и страниц фильмов/актёров (async_views.read_view, настройка API_ASYNC_READS)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        cache.clear()
+        film_hits._take()
+        settings.RESPONSE_CACHE_ENABLED = True
+        self.settings = settings
+        self.sync_client = APIClient()
+        self.client = AsyncClient()
+        self.user = User.objects.create_user(username="username_for_test", password="password_for_test")
+        self.actors = [Actor.objects.create(staff_id=5000 + i, name=f"Тестовый актёр #{i}") for i in range(3)]
+        self.films = []
+        for i in range(5):
+            film = Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i, owner=self.user)
+            film.actors.add(*self.actors[:i % 3 + 1])
+            self.films.append(film)
+        yield
+        settings.API_ASYNC_READS = False
+        self.reload_urls()
+        cache.clear()
+        film_hits._take()
+
+    def reload_urls(self):
+        """Маршруты строятся при импорте urls.py, поэтому после изменения API_ASYNC_READS их нужно импортировать заново"""
+        importlib.reload(sys.modules["kinopoiskapiunofficial_tech_app.urls"])
+        importlib.reload(sys.modules[self.settings.ROOT_URLCONF])
+        clear_url_caches()
+
+    def enable_async_reads(self):
+        self.settings.API_ASYNC_READS = True
+        self.reload_urls()
+
+    def get(self, url, params=None, **headers):
+        response = async_to_sync(self.client.get)(url, params or {}, headers=headers)
+        return response, json.loads(response.content) if response.content else None
+
+    def sync_get(self, url, params=None):
+        response = self.sync_client.get(url, params or {})
+        assert response.status_code == status.HTTP_200_OK
+        cache.clear()
+        return json.loads(response.content)
+
+################################################################ ROUTES ################################################################
+    # ПРОВЕРКА МАРШРУТОВ: БЕЗ НАСТРОЙКИ - ОБЫЧНЫЕ ПРЕДСТАВЛЕНИЯ DRF, С НЕЙ - АСИНХРОННЫЕ ПО ТЕМ ЖЕ АДРЕСАМ:
+    def test_routes(self):
+        url = reverse("api_v1:film-list")
+        assert not iscoroutinefunction(resolve(url).func)
+        self.enable_async_reads()
+        match = resolve(url)
+        assert iscoroutinefunction(match.func)
+        assert match.func.cls.__name__ == "FilmListView"
+        assert match.func.csrf_exempt is True
+        assert iscoroutinefunction(resolve(reverse("main:actor-detail", kwargs={"pk": self.actors[0].pk})).func)
+        assert not iscoroutinefunction(resolve(reverse("api_v1:film-bulk")).func)
+
+################################################################ LISTS ################################################################
+    # ПРОВЕРКА СПИСКОВ: ТОТ ЖЕ ОТВЕТ, ЧТО У СИНХРОННОГО ПРЕДСТАВЛЕНИЯ (С ФИЛЬТРАМИ, ПОИСКОМ, СОРТИРОВКОЙ И ВЫБОРОМ ПОЛЕЙ):
+    @pytest.mark.parametrize("name, params", [
+        ("api_v1:film-list", {}),
+        ("api_v1:film-list", {"year_gte": 2002, "ordering": "-year"}),
+        ("api_v1:film-list", {"fields": "name", "expand": "actors"}),
+        ("api_v1:film-list", {"search": "2003"}),
+        ("api_v1:actor-list", {"ordering": "-name"}),
+    ])
+    def test_list_matches_sync(self, name, params):
+        url = reverse(name)
+        expected = self.sync_get(url, params)
+        self.enable_async_reads()
+        response, data = self.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+        assert data == expected
+
+    # ПРОВЕРКА КУРСОРНОЙ ПАГИНАЦИИ (СЛЕДУЮЩАЯ И ПРЕДЫДУЩАЯ СТРАНИЦЫ) И КЕША ОТВЕТОВ:
+    def test_list_pagination_and_cache(self, mocker):
+        sync_list = mocker.spy(FastListMixin, "list")
+        self.enable_async_reads()
+        response, first = self.get(reverse("api_v1:film-list"), {"page_size": 2})
+        assert [film["kinopoisk_id"] for film in first["results"]] == [1000, 1001]
+        assert first["count"] == 5 and first["count_is_exact"] is True
+        _, second = self.get(first["next"])
+        assert [film["kinopoisk_id"] for film in second["results"]] == [1002, 1003]
+        _, back = self.get(second["previous"])
+        assert back["results"] == first["results"]
+        response, again = self.get(reverse("api_v1:film-list"), {"page_size": 2})
+        assert response["X-Cache"] == "HIT"
+        assert again == first
+        assert sync_list.call_count == 0
+
+    # ПРОВЕРКА ОШИБОК ЗАПРОСА (НЕВЕРНЫЙ КУРСОР, НЕИЗВЕСТНОЕ ПОЛЕ) - ТЕ ЖЕ ОТВЕТЫ DRF:
+    def test_list_errors(self):
+        self.enable_async_reads()
+        response, _ = self.get(reverse("api_v1:film-list"), {"cursor": "неверный"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response, data = self.get(reverse("api_v1:film-list"), {"fields": "unknown"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "fields" in data
+
+    # ПРОВЕРКА ОТВЕТА 304 ПО ETag И УЧЁТА ОБРАЩЕНИЙ К ФИЛЬМАМ:
+    def test_list_not_modified(self):
+        self.enable_async_reads()
+        response, data = self.get(reverse("api_v1:film-list"))
+        assert film_hits._take() == {film.pk: 1 for film in self.films}
+        again, _ = self.get(reverse("api_v1:film-list"), **{"If-None-Match": response["ETag"]})
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+
+################################################################ DETAILS ################################################################
+    # ПРОВЕРКА СТРАНИЦ ЗАПИСЕЙ: ТОТ ЖЕ ОТВЕТ, ЧТО У СИНХРОННОГО ПРЕДСТАВЛЕНИЯ, 304 ПО ETag И 404 ДЛЯ НЕСУЩЕСТВУЮЩЕЙ ЗАПИСИ:
+    @pytest.mark.parametrize("name", ["api_v1:film-detail", "api_v1:actor-detail"])
+    def test_detail(self, name, mocker):
+        pk = self.films[2].pk if name == "api_v1:film-detail" else self.actors[0].pk
+        url = reverse(name, kwargs={"pk": pk})
+        expected = self.sync_get(url)
+        self.enable_async_reads()
+        aretrieve = mocker.spy(AsyncRetrieveMixin, "aretrieve")
+        response, data = self.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert data == expected
+        assert aretrieve.call_count == 1
+        again, _ = self.get(url, **{"If-None-Match": response["ETag"]})
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+        response, _ = self.get(reverse(name, kwargs={"pk": 10 ** 6}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # ПРОВЕРКА РАСКРЫТИЯ ФИЛЬМОВ АКТЁРА (?expand=films) - ЕГО ОБСЛУЖИВАЕТ ОБЫЧНОЕ ПРЕДСТАВЛЕНИЕ:
+    def test_detail_expand_falls_back_to_sync(self, mocker):
+        url = reverse("api_v1:actor-detail", kwargs={"pk": self.actors[0].pk})
+        expected = self.sync_get(url, {"expand": "films"})
+        self.enable_async_reads()
+        aretrieve = mocker.spy(AsyncRetrieveMixin, "aretrieve")
+        response, data = self.get(url, {"expand": "films"})
+        assert response.status_code == status.HTTP_200_OK
+        assert data == expected
+        assert len(data["films"]["results"]) == 5
+        assert aretrieve.call_count == 0
+
+################################################################ FALLBACKS ################################################################
+    # ПРОВЕРКА БРАУЗЕРНОГО ИНТЕРФЕЙСА DRF (ОБЫЧНОЕ ПРЕДСТАВЛЕНИЕ):
+    def test_browsable_api(self):
+        self.enable_async_reads()
+        response = async_to_sync(self.client.get)(reverse("api_v1:film-list"), headers={"Accept": "text/html"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "text/html" in response["Content-Type"]
+
+    # ПРОВЕРКА ЗАПИСИ ПО ТОМУ ЖЕ АДРЕСУ (ОБЫЧНОЕ ПРЕДСТАВЛЕНИЕ DRF В ПОТОКЕ) С ПРОВЕРКОЙ ПРАВ ДОСТУПА:
+    def test_write_through_same_url(self):
+        self.enable_async_reads()
+        url = reverse("api_v1:film-list")
+        response = async_to_sync(self.client.post)(url, {"kinopoisk_id": 3000, "name": "Новый фильм", "year": 2020}, content_type="application/json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        async_to_sync(self.client.aforce_login)(self.user)
+        response = async_to_sync(self.client.post)(url, {"kinopoisk_id": 3000, "name": "Новый фильм", "year": 2020}, content_type="application/json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Film.objects.filter(kinopoisk_id=3000, owner=self.user).exists()
+        response, data = self.get(url, {"kinopoisk_id": 3000})
+        assert [film["name"] for film in data["results"]] == ["Новый фильм"]
+
+################################################################ REPLICAS ################################################################
+    # ПРОВЕРКА ЧТЕНИЯ С РЕПЛИК В АСИНХРОННЫХ ПРЕДСТАВЛЕНИЯХ (ФЛАГ ЗАПРОСА ДОХОДИТ ДО АСИНХРОННОГО ORM, см. db_routing.py):
+    def test_replica_reads(self, mocker):
+        self.settings.DATABASE_REPLICAS = ["default"] # "реплика" - сама основная БД (см. test_db_routing)
+        db_for_read = mocker.spy(ReplicaRouter, "db_for_read")
+        self.enable_async_reads()
+        response, _ = self.get(reverse("api_v1:film-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert db_for_read.spy_return_list and set(db_for_read.spy_return_list) == {"default"}
@@ -0,0 +1,170 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_bulk/bulk_write_test.py -v && coverage report
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestBulkWrite:
+    """Класс тестов для пакетной записи фильмов и актёров (FilmBulkView, ActorBulkView)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="username_for_test_1", password="password_for_test_1", is_staff=True)
+        self.user = User.objects.create_user(username="username_for_test_2", password="password_for_test_2", is_staff=False)
+        self.other_user = User.objects.create_user(username="username_for_test_3", password="password_for_test_3", is_staff=False)
+        self.films = [Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i, owner=self.user) for i in range(3)]
+        self.foreign_film = Film.objects.create(kinopoisk_id=2000, name="Чужой фильм", year=1999, owner=self.other_user)
+        self.films_url = reverse("api_v1:film-bulk")
+        self.actors_url = reverse("api_v1:actor-bulk")
+
+################################################################ CREATE ################################################################
+    # ПРОВЕРКА ПАКЕТНОГО СОЗДАНИЯ ЗАПИСЕЙ ОДНИМ INSERT (ВЛАДЕЛЕЦ - ТЕКУЩИЙ ПОЛЬЗОВАТЕЛЬ, РЕЗУЛЬТАТ ПО КАЖДОМУ ОБЪЕКТУ):
+    def test_create(self):
+        self.client.force_authenticate(user=self.user)
+        data = [{"kinopoisk_id": 3000 + i, "name": f"Новый фильм #{i}", "year": 2020} for i in range(5)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.films_url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [result["status"] for result in response.data["results"]] == [201] * 5
+        assert [result["data"]["kinopoisk_id"] for result in response.data["results"]] == [3000, 3001, 3002, 3003, 3004]
+        assert response.data["results"][0]["data"]["actors"] == []
+        assert Film.objects.filter(kinopoisk_id__gte=3000, owner=self.user).count() == 5
+        inserts = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        assert len(inserts) == 1
+
+    # ПРОВЕРКА ОТКЛОНЕНИЯ ВСЕГО ПАКЕТА ПРИ ОШИБКЕ В ОДНОМ ОБЪЕКТЕ (ДУБЛИКАТЫ В ПАКЕТЕ И В БД, НЕВЕРНЫЕ ТИПЫ):
+    def test_create_rejects_whole_batch(self):
+        self.client.force_authenticate(user=self.user)
+        data = [
+            {"kinopoisk_id": 3000, "name": "Новый фильм"},
+            {"kinopoisk_id": 3000, "name": "Дубликат в пакете"},
+            {"kinopoisk_id": 1000, "name": "Дубликат в БД"},
+            {"year": "не число"},
+        ]
+        response = self.client.post(self.films_url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        results = response.data["results"]
+        assert [result["status"] for result in results] == [424, 400, 400, 400]
+        assert "kinopoisk_id" in results[1]["errors"] and "kinopoisk_id" in results[2]["errors"]
+        assert "year" in results[3]["errors"]
+        assert not Film.objects.filter(kinopoisk_id=3000).exists()
+
+    # ПРОВЕРКА ЗАПРЕТА ПАКЕТНОЙ ЗАПИСИ НЕАУТЕНТИФИЦИРОВАННЫМ ПОЛЬЗОВАТЕЛЯМ:
+    def test_create_unauthenticated(self):
+        response = self.client.post(self.films_url, [{"name": "Фильм"}], format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    # ПРОВЕРКА ФОРМАТА ТЕЛА ЗАПРОСА И ОГРАНИЧЕНИЯ РАЗМЕРА ПАКЕТА:
+    def test_invalid_body(self, settings):
+        settings.API_BULK_MAX_ITEMS = 2
+        self.client.force_authenticate(user=self.user)
+        assert self.client.post(self.films_url, {"name": "Фильм"}, format="json").status_code == status.HTTP_400_BAD_REQUEST
+        assert self.client.post(self.films_url, [], format="json").status_code == status.HTTP_400_BAD_REQUEST
+        response = self.client.post(self.films_url, [{}, {}, {}], format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "error" in response.data
+
+    # ПРОВЕРКА ПАКЕТНОГО СОЗДАНИЯ АКТЁРОВ:
+    def test_create_actors(self):
+        self.client.force_authenticate(user=self.user)
+        data = [{"staff_id": 1, "name": "Актёр #1"}, {"staff_id": 2, "name": "Актёр #2", "poster_url": "https://example.com/2.jpg"}]
+        response = self.client.post(self.actors_url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert list(Actor.objects.order_by("staff_id").values_list("staff_id", "owner")) == [(1, self.user.pk), (2, self.user.pk)]
+########################################################################################################################################
+
+################################################################ UPDATE ################################################################
+    # ПРОВЕРКА ПАКЕТНОГО ИЗМЕНЕНИЯ ЗАПИСЕЙ ВЛАДЕЛЬЦЕМ (ОДИН SELECT И ОДИН UPDATE, ДАТА ИЗМЕНЕНИЯ ОБНОВЛЯЕТСЯ):
+    def test_partial_update(self):
+        self.client.force_authenticate(user=self.user)
+        updated_at = Film.objects.get(pk=self.films[0].pk).created_or_updated_at
+        data = [{"id": film.pk, "name": f"Изменённый фильм #{i}"} for i, film in enumerate(self.films)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.films_url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["data"]["name"] for result in response.data["results"]] == ["Изменённый фильм #0", "Изменённый фильм #1", "Изменённый фильм #2"]
+        assert [result["data"]["year"] for result in response.data["results"]] == [2000, 2001, 2002] # PATCH не трогает остальные поля
+        assert Film.objects.get(pk=self.films[0].pk).created_or_updated_at > updated_at
+        updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        assert len(updates) == 1
+
+    # ПРОВЕРКА ПРАВ НА КАЖДУЮ ЗАПИСЬ: ЧУЖАЯ ЗАПИСЬ В ПАКЕТЕ ОТКЛОНЯЕТ ВЕСЬ ПАКЕТ:
+    def test_update_foreign_record(self):
+        self.client.force_authenticate(user=self.user)
+        data = [{"id": self.films[0].pk, "name": "Изменено"}, {"id": self.foreign_film.pk, "name": "Изменено"}]
+        response = self.client.patch(self.films_url, data, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert [result["status"] for result in response.data["results"]] == [424, 403]
+        assert not Film.objects.filter(name="Изменено").exists()
+
+    # ПРОВЕРКА ИЗМЕНЕНИЯ ЛЮБЫХ ЗАПИСЕЙ АДМИНОМ ПРОЕКТА:
+    def test_update_by_admin(self):
+        self.client.force_authenticate(user=self.admin)
+        data = [{"id": self.films[0].pk, "name": "Изменено"}, {"id": self.foreign_film.pk, "name": "Изменено"}]
+        response = self.client.put(self.films_url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert Film.objects.filter(name="Изменено").count() == 2
+
+    # ПРОВЕРКА ОШИБОК ПО ID: НЕСУЩЕСТВУЮЩАЯ ЗАПИСЬ, ПОВТОР В ПАКЕТЕ, ОТСУТСТВИЕ id, ЗАНЯТОЕ УНИКАЛЬНОЕ ЗНАЧЕНИЕ:
+    def test_update_errors(self):
+        self.client.force_authenticate(user=self.user)
+        data = [
+            {"id": 999999, "name": "Нет такой записи"},
+            {"id": self.films[0].pk, "kinopoisk_id": 1000}, # своё же значение - не ошибка
+            {"id": self.films[0].pk, "name": "Повтор"},
+            {"name": "Без id"},
+            {"id": self.films[1].pk, "kinopoisk_id": 1002},
+        ]
+        response = self.client.patch(self.films_url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [result["status"] for result in response.data["results"]] == [404, 424, 400, 400, 400]
+        assert "kinopoisk_id" in response.data["results"][4]["errors"]
+########################################################################################################################################
+
+################################################################ DELETE ################################################################
+    # ПРОВЕРКА ПАКЕТНОГО УДАЛЕНИЯ ЗАПИСЕЙ ВЛАДЕЛЬЦЕМ:
+    def test_delete(self):
+        self.client.force_authenticate(user=self.user)
+        ids = [film.pk for film in self.films[:2]]
+        response = self.client.delete(self.films_url, ids, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert [(result["id"], result["status"]) for result in response.data["results"]] == [(ids[0], 204), (ids[1], 204)]
+        assert list(Film.objects.values_list("kinopoisk_id", flat=True)) == [1002, 2000]
+
+    # ПРОВЕРКА ЗАПРЕТА УДАЛЕНИЯ ПАКЕТА С ЧУЖОЙ ЗАПИСЬЮ:
+    def test_delete_foreign_record(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.delete(self.films_url, [self.films[0].pk, self.foreign_film.pk], format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert Film.objects.count() == 4
+
+    # ПРОВЕРКА НЕКОРРЕКТНЫХ ID ПРИ УДАЛЕНИИ:
+    def test_delete_invalid_ids(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.delete(self.films_url, [self.films[0].pk, "abc", True], format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [result["status"] for result in response.data["results"]] == [424, 400, 400]
+        assert Film.objects.count() == 4
+########################################################################################################################################
+
+################################################################ CACHE ################################################################
+    # ПРОВЕРКА СБРОСА КЕША СПИСКОВ ПОСЛЕ ПАКЕТНОЙ ЗАПИСИ (bulk_create()/bulk_update() НЕ ОТПРАВЛЯЮТ СИГНАЛЫ):
+    def test_bumps_response_cache_version(self, mocker):
+        bump = mocker.patch("kinopoiskapiunofficial_tech_app.bulk.bump_version_on_commit")
+        self.client.force_authenticate(user=self.user)
+        self.client.post(self.films_url, [{"name": "Новый фильм"}], format="json")
+        self.client.patch(self.films_url, [{"id": self.films[0].pk, "name": "Изменено"}], format="json")
+        assert [call.args for call in bump.call_args_list] == [("film",), ("film",)]
@@ -0,0 +1,184 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_conditional_requests/conditional_requests_test.py -v && coverage report
+"""
+
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.hit_counters import film_hits
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    """Класс тестов для условных GET-запросов (ETag/Last-Modified и ответ 304) к фильмам и актёрам"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        cache.clear()
+        film_hits._take()
+        self.client = APIClient()
+        self.actors = [Actor.objects.create(staff_id=5000+i, name=f"Тестовый актёр #{i}") for i in range(3)]
+        self.film = Film.objects.create(kinopoisk_id=1001, name="Тестовый фильм #1", year=2001)
+        self.film.actors.add(*self.actors[:2])
+        self.film_url = reverse("api_v1:film-detail", kwargs={"pk": self.film.pk})
+        self.actor_url = reverse("api_v1:actor-detail", kwargs={"pk": self.actors[0].pk})
+        self.list_url = reverse("api_v1:film-list")
+
+    def revalidate(self, url, response, **params):
+        """Повторный запрос с валидаторами из предыдущего ответа"""
+        with CaptureQueriesContext(connection) as context:
+            again = self.client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+        return again, len(context.captured_queries)
+
+################################################################ DETAIL ################################################################
+    # ПРОВЕРКА НАЛИЧИЯ ВАЛИДАТОРОВ В ОТВЕТЕ И ОТВЕТА 304 БЕЗ ТЕЛА И БЕЗ ВЫБОРКИ ЗАПИСИ:
+    # (У ФИЛЬМА С АКТЁРАМИ - ТОЛЬКО ETag: ДАТЫ ИЗМЕНЕНИЯ НЕ СДВИГАЮТСЯ ПРИ УДАЛЕНИИ АКТЁРА ИЗ ФИЛЬМА)
+    @pytest.mark.parametrize("attr, has_last_modified", [("film_url", False), ("actor_url", True)])
+    def test_detail_not_modified(self, attr, has_last_modified):
+        url = getattr(self, attr)
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"].startswith('"')
+        assert ("Last-Modified" in response) is has_last_modified
+
+        again, queries = self.revalidate(url, response)
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+        assert again.content == b""
+        assert queries == 1 # только запрос валидаторов
+
+    # ПРОВЕРКА If-Modified-Since:
+    def test_detail_if_modified_since(self):
+        response = self.client.get(self.actor_url)
+        again = self.client.get(self.actor_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+        past = http_date((self.actors[0].created_or_updated_at - datetime.timedelta(hours=1)).timestamp())
+        assert self.client.get(self.actor_url, HTTP_IF_MODIFIED_SINCE=past).status_code == status.HTTP_200_OK
+
+    # ПРОВЕРКА СМЕНЫ ETag ПРИ ИЗМЕНЕНИИ ЗАПИСИ И ПРИ ИЗМЕНЕНИИ СОСТАВА АКТЁРОВ ФИЛЬМА:
+    def test_detail_etag_changes(self):
+        response = self.client.get(self.film_url)
+        self.film.actors.remove(self.actors[1])
+        self.film.actors.add(self.actors[2])
+        again, _ = self.revalidate(self.film_url, response)
+        assert again.status_code == status.HTTP_200_OK
+        assert again["ETag"] != response["ETag"]
+
+        self.actors[0].name = "Новое имя"
+        self.actors[0].save()
+        third, _ = self.revalidate(self.film_url, again)
+        assert third.status_code == status.HTTP_200_OK
+
+    # ПРОВЕРКА ЗАМЕНЫ АКТЁРОВ С ТЕМ ЖЕ КОЛИЧЕСТВОМ И ТОЙ ЖЕ СУММОЙ id ({0, 3} -> {1, 2}):
+    def test_detail_cast_swap_with_same_id_sum(self):
+        self.actors.append(Actor.objects.create(staff_id=5003, name="Тестовый актёр #3"))
+        Actor.objects.update(created_or_updated_at=self.actors[3].created_or_updated_at) # и дата последнего изменения актёров та же
+        self.film.actors.set([self.actors[0], self.actors[3]])
+        response = self.client.get(self.film_url)
+        self.film.actors.set([self.actors[1], self.actors[2]])
+        again, _ = self.revalidate(self.film_url, response)
+        assert again.status_code == status.HTTP_200_OK
+        assert [actor["id"] for actor in again.data["actors"]] == [self.actors[1].pk, self.actors[2].pk]
+
+    # ПРОВЕРКА ТОГО, ЧТО УДАЛЕНИЕ АКТЁРА ИЗ ФИЛЬМА НЕ ДАЁТ 304 ПО If-Modified-Since (LAST-MODIFIED У ФИЛЬМА НЕТ):
+    def test_detail_cast_removal_with_if_modified_since(self):
+        future = http_date((self.film.created_or_updated_at + datetime.timedelta(hours=1)).timestamp())
+        self.client.get(self.film_url)
+        self.film.actors.remove(self.actors[1])
+        response = self.client.get(self.film_url, HTTP_IF_MODIFIED_SINCE=future)
+        assert response.status_code == status.HTTP_200_OK
+        assert [actor["id"] for actor in response.data["actors"]] == [self.actors[0].pk]
+
+    # ПРОВЕРКА ТОГО, ЧТО РАЗНЫЕ ФОРМАТЫ ОТВЕТА ИМЕЮТ РАЗНЫЕ ETag:
+    def test_etag_depends_on_format(self):
+        assert self.client.get(self.film_url, {"format": "json"})["ETag"] != self.client.get(self.film_url, {"format": "api"})["ETag"]
+
+    # ПРОВЕРКА ТОГО, ЧТО ОТВЕТ 304 ТОЖЕ УЧИТЫВАЕТСЯ В СЧЁТЧИКЕ ОБРАЩЕНИЙ К ФИЛЬМУ:
+    def test_not_modified_counts_hit(self):
+        response = self.client.get(self.film_url)
+        self.revalidate(self.film_url, response)
+        assert film_hits.pending() == {self.film.pk: 2}
+
+    # ПРОВЕРКА ОТВЕТА ДЛЯ НЕСУЩЕСТВУЮЩЕЙ ЗАПИСИ:
+    def test_missing_record(self):
+        response = self.client.get(reverse("api_v1:film-detail", kwargs={"pk": 999999}), HTTP_IF_NONE_MATCH='"etag"')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "ETag" not in response
+
+################################################################ LIST ################################################################
+    # ПРОВЕРКА ОТВЕТА 304 ДЛЯ СПИСКА ЗАПИСЕЙ И СМЕНЫ ETag ПРИ ИЗМЕНЕНИИ ОТФИЛЬТРОВАННЫХ ЗАПИСЕЙ:
+    def test_list_not_modified(self):
+        response = self.client.get(self.list_url, {"year": 2001})
+        again, queries = self.revalidate(self.list_url, response, year=2001)
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+        assert queries == 2 # только агрегирующий запрос и COUNT (без общего кеша количество не кешируется)
+
+        Film.objects.create(kinopoisk_id=1002, name="Тестовый фильм #2", year=2001)
+        assert self.revalidate(self.list_url, response, year=2001)[0].status_code == status.HTTP_200_OK
+
+    # ПРОВЕРКА СМЕНЫ ETag СПИСКА ПРИ ИЗМЕНЕНИИ ПАРАМЕТРОВ ЗАПРОСА И ПРИ УДАЛЕНИИ ЗАПИСИ:
+    def test_list_etag_changes(self):
+        response = self.client.get(self.list_url)
+        assert self.client.get(self.list_url, {"ordering": "-name"})["ETag"] != response["ETag"]
+        Film.objects.create(kinopoisk_id=1002, name="Тестовый фильм #2", year=2002)
+        response = self.client.get(self.list_url)
+        Film.objects.filter(kinopoisk_id=1002).get().delete()
+        assert self.revalidate(self.list_url, response)[0].status_code == status.HTTP_200_OK
+
+    # ПРОВЕРКА ТОГО, ЧТО У СПИСКА НЕТ Last-Modified И ПОСЛЕ УДАЛЕНИЯ ЗАПИСИ If-Modified-Since НЕ ДАЁТ 304:
+    def test_list_without_last_modified(self):
+        Film.objects.create(kinopoisk_id=1002, name="Тестовый фильм #2", year=2002)
+        response = self.client.get(self.list_url)
+        assert "ETag" in response and "Last-Modified" not in response
+        Film.objects.filter(kinopoisk_id=1002).delete()
+        future = http_date((self.film.created_or_updated_at + datetime.timedelta(hours=1)).timestamp())
+        again = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=future)
+        assert again.status_code == status.HTTP_200_OK
+        assert len(again.data["results"]) == 1
+
+    # ПРОВЕРКА СПИСКА АКТЁРОВ:
+    def test_actor_list_not_modified(self):
+        url = reverse("api_v1:actor-list")
+        response = self.client.get(url)
+        assert self.revalidate(url, response)[0].status_code == status.HTTP_304_NOT_MODIFIED
+
+################################################################ LIST WITHOUT SHARED CACHE ################################################################
+    # БЕЗ ОБЩЕГО КЕША ВЕРСИИ ДАННЫХ У КАЖДОГО ПРОЦЕССА СВОИ: ИЗМЕНЕНИЯ, ВЕРСИИ ПО КОТОРЫМ УВЕЛИЧИЛ "ДРУГОЙ ПРОЦЕСС",
+    # ДОЛЖНЫ МЕНЯТЬ ETag СПИСКА И ЗДЕСЬ (СИГНАЛЫ ОТКЛЮЧЕНЫ ПОДМЕНОЙ bump_version_on_commit):
+    @pytest.mark.parametrize("change", ["cast_swap", "actor_rename", "cast_removal", "film_delete"])
+    def test_list_changes_from_other_process(self, mocker, change):
+        Film.objects.create(kinopoisk_id=1002, name="Тестовый фильм #2", year=2002)
+        response = self.client.get(self.list_url)
+        mocker.patch("kinopoiskapiunofficial_tech_app.models.bump_version_on_commit")
+        if change == "cast_swap":
+            self.film.actors.set([self.actors[1], self.actors[2]]) # {0, 1} -> {1, 2}
+        elif change == "actor_rename":
+            Actor.objects.filter(pk=self.actors[0].pk).update(name="Новое имя", created_or_updated_at=self.actors[2].created_or_updated_at + datetime.timedelta(seconds=1))
+        elif change == "cast_removal":
+            self.film.actors.remove(self.actors[1])
+        else:
+            Film.objects.filter(kinopoisk_id=1002).delete()
+        assert self.revalidate(self.list_url, response)[0].status_code == status.HTTP_200_OK
+
+    # ОДНИ И ТЕ ЖЕ ДАННЫЕ - ОДИН И ТОТ ЖЕ ETag В ЛЮБОМ ПРОЦЕССЕ (ВЕРСИИ ДАННЫХ В ETag НЕ ВХОДЯТ):
+    def test_list_etag_does_not_depend_on_local_versions(self):
+        response = self.client.get(self.list_url)
+        cache.set("response-cache:version:film", 42)
+        cache.set("response-cache:version:actor", 7)
+        assert self.revalidate(self.list_url, response)[0].status_code == status.HTTP_304_NOT_MODIFIED
+
+    # С ОБЩИМ КЕШЕМ ETag СПИСКА СТРОИТСЯ ПО ВЕРСИЯМ ДАННЫХ (ИХ УВЕЛИЧИВАЮТ СИГНАЛЫ ПРИ ЛЮБОМ ИЗМЕНЕНИИ):
+    def test_list_with_shared_cache(self, settings, tmp_path):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        response = self.client.get(self.list_url)
+        assert self.revalidate(self.list_url, response)[0].status_code == status.HTTP_304_NOT_MODIFIED
+        self.film.actors.remove(self.actors[1])
+        assert self.revalidate(self.list_url, response)[0].status_code == status.HTTP_200_OK
@@ -0,0 +1,122 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_counts/row_counts_test.py -v && coverage report
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app import counts
+from kinopoiskapiunofficial_tech_app.models import Film
+from kinopoiskapiunofficial_tech_app.response_cache import film_list_cache
+
+
+@pytest.mark.django_db
+class TestRowCounts:
+    """Класс тестов для количества записей в списках (точного, из кеша и оценки PostgreSQL)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        cache.clear()
+        film_list_cache.clear_local()
+        settings.API_COUNT_EXACT_THRESHOLD = 3
+        self.client = APIClient()
+        self.url = reverse("api_v1:film-list")
+        self.films = [Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i) for i in range(5)]
+        yield
+        cache.clear()
+        film_list_cache.clear_local()
+
+################################################################ COUNT_ROWS ################################################################
+    # ПРОВЕРКА ТОЧНОГО КОЛИЧЕСТВА ДО ПОРОГА (ОДИН COUNT С LIMIT):
+    def test_exact_under_threshold(self):
+        with CaptureQueriesContext(connection) as queries:
+            assert counts.count_rows(Film.objects.filter(year__lt=2002)) == (2, True)
+        assert len(queries) == 1
+        assert "LIMIT" in queries[0]["sql"]
+
+    # ПРОВЕРКА ПОЛНОГО COUNT ПОСЛЕ ПОРОГА НЕ НА PostgreSQL:
+    def test_full_count_over_threshold_without_postgresql(self):
+        with CaptureQueriesContext(connection) as queries:
+            assert counts.count_rows(Film.objects.all()) == (5, True)
+        assert len(queries) == 2
+
+    # ПРОВЕРКА ОЦЕНКИ ИЗ СТАТИСТИКИ ТАБЛИЦЫ ДЛЯ ВЫБОРКИ БЕЗ ФИЛЬТРОВ НА PostgreSQL:
+    def test_table_estimate_for_unfiltered_queryset(self, mocker):
+        mocker.patch.object(counts, "is_postgresql", return_value=True)
+        table_estimate = mocker.patch.object(counts, "table_estimate", return_value=120000)
+        planner_estimate = mocker.patch.object(counts, "planner_estimate")
+        with CaptureQueriesContext(connection) as queries:
+            assert counts.count_rows(Film.objects.order_by("name"), cache_key="row-count:test") == (120000, False)
+        assert len(queries) == 0
+        table_estimate.assert_called_once()
+        planner_estimate.assert_not_called()
+        assert cache.get("row-count:test") is None # оценка не кешируется
+
+    # ПРОВЕРКА ТОЧНОГО КОЛИЧЕСТВА, ЕСЛИ ПО СТАТИСТИКЕ ТАБЛИЦА МАЛЕНЬКАЯ:
+    def test_small_table_estimate_falls_back_to_count(self, mocker):
+        mocker.patch.object(counts, "is_postgresql", return_value=True)
+        mocker.patch.object(counts, "table_estimate", return_value=2)
+        assert counts.count_rows(Film.objects.filter(year__lt=2002)) == (2, True)
+
+    # ПРОВЕРКА ОЦЕНКИ ПЛАНИРОВЩИКА ДЛЯ ОТФИЛЬТРОВАННОЙ ВЫБОРКИ БОЛЬШЕ ПОРОГА НА PostgreSQL:
+    def test_planner_estimate_over_threshold(self, mocker):
+        mocker.patch.object(counts, "is_postgresql", return_value=True)
+        table_estimate = mocker.patch.object(counts, "table_estimate")
+        mocker.patch.object(counts, "planner_estimate", return_value=1)
+        # ОЦЕНКА НЕ МЕНЬШЕ УЖЕ ПОСЧИТАННЫХ ЗАПИСЕЙ (ПОРОГ + 1):
+        assert counts.count_rows(Film.objects.filter(year__gte=2000)) == (4, False)
+        table_estimate.assert_not_called()
+
+    # ПРОВЕРКА ЧТЕНИЯ ТОЧНОГО КОЛИЧЕСТВА ИЗ КЕША:
+    def test_cached_count(self):
+        assert counts.count_rows(Film.objects.filter(year__lt=2002), cache_key="row-count:test") == (2, True)
+        with CaptureQueriesContext(connection) as queries:
+            assert counts.count_rows(Film.objects.filter(year__lt=2002), cache_key="row-count:test") == (2, True)
+        assert len(queries) == 0
+
+################################################################ API ################################################################
+    # ПРОВЕРКА КОЛИЧЕСТВА В ОТВЕТЕ: ОДНО НА ВСЕ СТРАНИЦЫ, С УЧЁТОМ ФИЛЬТРОВ:
+    def test_count_in_response(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data["count"], response.data["count_is_exact"]) == (5, True)
+        response = self.client.get(response.data["next"])
+        assert response.data["count"] == 5
+        response = self.client.get(self.url, {"year_gte": 2003})
+        assert (response.data["count"], response.data["count_is_exact"]) == (2, True)
+
+    # ПРОВЕРКА ПРИЗНАКА ОЦЕНКИ В ОТВЕТЕ:
+    def test_estimated_count_in_response(self, mocker):
+        mocker.patch.object(counts, "is_postgresql", return_value=True)
+        mocker.patch.object(counts, "table_estimate", return_value=120000)
+        response = self.client.get(self.url)
+        assert (response.data["count"], response.data["count_is_exact"]) == (120000, False)
+
+    # ПРОВЕРКА СБРОСА КЕШИРОВАННОГО КОЛИЧЕСТВА ПРИ ИЗМЕНЕНИИ ЗАПИСЕЙ (С ОБЩИМ КЕШЕМ):
+    def test_cached_count_invalidated_on_write(self, settings, tmp_path):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        settings.RESPONSE_CACHE_ENABLED = True
+        assert self.client.get(self.url, {"page_size": 2}).data["count"] == 5
+        with CaptureQueriesContext(connection) as queries:
+            assert self.client.get(self.url, {"page_size": 1}).data["count"] == 5
+        assert not any("COUNT" in query["sql"] for query in queries.captured_queries)
+        Film.objects.create(kinopoisk_id=2000, name="Новый фильм", year=2020)
+        assert self.client.get(self.url, {"page_size": 2}).data["count"] == 6
+        self.films[0].delete()
+        assert self.client.get(self.url, {"page_size": 2}).data["count"] == 5
+
+    # ПРОВЕРКА ТОГО, ЧТО БЕЗ ОБЩЕГО КЕША (ИЛИ С ВЫКЛЮЧЕННЫМ КЕШЕМ ОТВЕТОВ) КОЛИЧЕСТВО НЕ КЕШИРУЕТСЯ - ВЕРСИИ У КАЖДОГО ПРОЦЕССА СВОИ:
+    @pytest.mark.parametrize("shared, enabled", [(False, True), (True, False)])
+    def test_count_not_cached_without_shared_cache(self, settings, tmp_path, shared, enabled):
+        if shared:
+            settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        settings.RESPONSE_CACHE_ENABLED = enabled
+        self.client.get(self.url, {"page_size": 2})
+        with CaptureQueriesContext(connection) as queries:
+            assert self.client.get(self.url, {"page_size": 1}).data["count"] == 5
+        assert any("COUNT" in query["sql"] for query in queries.captured_queries)
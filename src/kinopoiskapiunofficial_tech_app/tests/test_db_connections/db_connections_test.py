@@ -0,0 +1,67 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_db_connections/db_connections_test.py -v && coverage report
+"""
+
+import runpy
+import sys
+
+import pytest
+from django.conf import settings
+
+
+SETTINGS_PATH = settings.BASE_DIR / "authors_books_project" / "settings.py"
+
+
+class TestConnectionReuse:
+    """Класс тестов для настроек повторного использования подключений к PostgreSQL (постоянные подключения и пул)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        self.monkeypatch = monkeypatch
+        monkeypatch.setattr(sys, "argv", ["manage.py", "runserver"])
+        for name in ("DB_POOL", "DB_CONN_MAX_AGE", "SERVER_INTERFACE", "DB_REPLICA_HOSTS", "DB_POOL_MAX_SIZE"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("DB_ENGINE", "django.db.backends.postgresql")
+        monkeypatch.setenv("DB_HOST", "primary")
+
+    def load(self, **env):
+        """Настройки проекта (settings.py), прочитанные заново с переменными окружения env"""
+        for name, value in env.items():
+            self.monkeypatch.setenv(name, value)
+        return runpy.run_path(str(SETTINGS_PATH))
+
+################################################################ PERSISTENT CONNECTIONS ################################################################
+    # ПРОВЕРКА ПОСТОЯННЫХ ПОДКЛЮЧЕНИЙ С ПРОВЕРКОЙ ПЕРЕД ПОВТОРНЫМ ИСПОЛЬЗОВАНИЕМ (WSGI ПО УМОЛЧАНИЮ):
+    def test_persistent_connections(self):
+        database = self.load()["DATABASES"]["default"]
+        assert database["CONN_MAX_AGE"] == 60
+        assert database["CONN_HEALTH_CHECKS"] is True
+        assert "pool" not in database.get("OPTIONS", {})
+        assert self.load(DB_CONN_MAX_AGE="300")["DATABASES"]["default"]["CONN_MAX_AGE"] == 300
+
+    # ПРОВЕРКА ОТКЛЮЧЕНИЯ ПОСТОЯННЫХ ПОДКЛЮЧЕНИЙ ПОД ASGI БЕЗ ПУЛА:
+    def test_asgi_without_pool(self):
+        assert self.load(SERVER_INTERFACE="asgi")["DATABASES"]["default"]["CONN_MAX_AGE"] == 0
+
+################################################################ POOL ################################################################
+    # ПРОВЕРКА ПУЛА ПОДКЛЮЧЕНИЙ: РАЗМЕРЫ И ТАЙМАУТЫ, ПРОВЕРКА ПРИ ВЫДАЧЕ, БЕЗ ПОСТОЯННЫХ ПОДКЛЮЧЕНИЙ DJANGO, ОДИНАКОВО ДЛЯ WSGI И ASGI:
+    @pytest.mark.parametrize("interface", ["wsgi", "asgi"])
+    def test_pool(self, interface):
+        database = self.load(DB_POOL="1", DB_POOL_MAX_SIZE="20", SERVER_INTERFACE=interface)["DATABASES"]["default"]
+        assert database["CONN_MAX_AGE"] == 0
+        assert database["CONN_HEALTH_CHECKS"] is True
+        assert database["OPTIONS"]["pool"] == {"min_size": 2, "max_size": 20, "timeout": 10.0, "max_lifetime": 3600.0, "max_idle": 600.0}
+
+    # ПРОВЕРКА НАСТРОЕК ПОДКЛЮЧЕНИЙ У РЕПЛИК (ТЕ ЖЕ, ЧТО У ОСНОВНОЙ БД):
+    def test_replicas_share_connection_settings(self):
+        databases = self.load(DB_POOL="1", DB_REPLICA_HOSTS="replica-a")["DATABASES"]
+        assert databases["replica_1"]["HOST"] == "replica-a"
+        assert databases["replica_1"]["OPTIONS"] == databases["default"]["OPTIONS"]
+        assert databases["replica_1"]["CONN_HEALTH_CHECKS"] is True
+
+    # ПРОВЕРКА ДРУГИХ СУБД: НАСТРОЙКИ ПОДКЛЮЧЕНИЙ НЕ МЕНЯЮТСЯ:
+    def test_other_engines(self):
+        database = self.load(DB_ENGINE="django.db.backends.sqlite3", DB_POOL="1")["DATABASES"]["default"]
+        assert "CONN_MAX_AGE" not in database
+        assert "OPTIONS" not in database
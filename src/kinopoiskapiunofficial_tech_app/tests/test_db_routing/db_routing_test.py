@@ -0,0 +1,179 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_db_routing/db_routing_test.py -v && coverage report
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework import status
+from django.test import Client
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.db_routing import ReplicaRouter, ReplicaRoutingMiddleware, _primary_writes, _replica_reads
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+    """Класс тестов для чтения с реплик БД (ReplicaRouter, ReplicaRoutingMiddleware)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, mocker):
+        cache.clear()
+        # В ТЕСТАХ "РЕПЛИКА" - ЭТО САМА ОСНОВНАЯ БД: ВЫБОР РЕПЛИКИ ВИДЕН ПО ЗНАЧЕНИЮ, КОТОРОЕ ВЕРНУЛ МАРШРУТИЗАТОР ("default" ВМЕСТО None):
+        settings.DATABASE_REPLICAS = ["default"]
+        self.db_for_read = mocker.spy(ReplicaRouter, "db_for_read")
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(username="admin_for_test", password="password_for_test", email="admin@example.com")
+        self.film = Film.objects.create(kinopoisk_id=1000, name="Тестовый фильм", year=2000, owner=self.admin)
+        self.film.actors.add(Actor.objects.create(staff_id=5000, name="Тестовый актёр"))
+        yield
+        cache.clear()
+
+    def routed_reads(self):
+        """Результаты всех вызовов db_for_read() с момента прошлой проверки"""
+        reads = list(self.db_for_read.spy_return_list)
+        self.db_for_read.spy_return_list.clear()
+        return reads
+
+################################################################ REPLICA READS ################################################################
+    # ПРОВЕРКА ЧТЕНИЯ С РЕПЛИК ДЛЯ СПИСКОВ, СТРАНИЦ ЗАПИСЕЙ, ФИЛЬМОГРАФИИ И ГЛАВНОЙ СТРАНИЦЫ:
+    @pytest.mark.parametrize("name, kwargs", [
+        ("api_v1:film-list", {}),
+        ("api_v1:film-detail", {"pk": None}),
+        ("api_v1:actor-list", {}),
+        ("main:index", {}),
+    ])
+    def test_safe_requests_read_from_replica(self, name, kwargs):
+        kwargs = {key: self.film.pk for key in kwargs}
+        self.routed_reads()
+        response = self.client.get(reverse(name, kwargs=kwargs))
+        assert response.status_code == status.HTTP_200_OK
+        reads = self.routed_reads()
+        assert reads and set(reads) == {"default"}
+        assert _replica_reads.get() is False
+
+    # ПРОВЕРКА ЧТЕНИЯ ИЗ ОСНОВНОЙ БД ДЛЯ АДМИНКИ:
+    def test_admin_reads_from_primary(self):
+        self.client.force_login(self.admin)
+        self.routed_reads()
+        response = self.client.get(reverse("admin:kinopoiskapiunofficial_tech_app_film_changelist"))
+        assert response.status_code == status.HTTP_200_OK
+        reads = self.routed_reads()
+        assert reads and set(reads) == {None}
+
+    # ПРОВЕРКА ЧТЕНИЯ ИЗ ОСНОВНОЙ БД ВНЕ ЗАПРОСОВ (СИНХРОНИЗАЦИЯ, КОМАНДЫ manage.py):
+    def test_outside_requests_reads_from_primary(self):
+        self.routed_reads()
+        assert Film.objects.filter(pk=self.film.pk).exists()
+        assert self.routed_reads() == [None]
+
+################################################################ READ YOUR WRITES ################################################################
+    # ПРОВЕРКА cookie ПОСЛЕ ЗАПРОСА НА ИЗМЕНЕНИЕ И ЧТЕНИЯ ИЗ ОСНОВНОЙ БД, ПОКА ОНА ЕСТЬ:
+    def test_sticky_primary_after_write(self, settings):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse("api_v1:film-bulk"), [{"kinopoisk_id": 3000, "name": "Новый фильм", "year": 2020}], format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+        assert cookie["max-age"] == settings.REPLICA_STICKY_SECONDS
+        assert cookie["httponly"]
+
+        self.routed_reads()
+        response = self.client.get(reverse("api_v1:film-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert any(film["kinopoisk_id"] == 3000 for film in response.data["results"])
+        reads = self.routed_reads()
+        assert reads and set(reads) == {None}
+
+        # ПОСЛЕ ИСТЕЧЕНИЯ cookie (БРАУЗЕР ЕЁ УДАЛЯЕТ) ЧТЕНИЕ СНОВА ИДЁТ С РЕПЛИК:
+        del self.client.cookies[settings.REPLICA_STICKY_COOKIE]
+        self.client.get(reverse("api_v1:film-list"))
+        assert set(self.routed_reads()) == {"default"}
+
+    # ПРОВЕРКА ОТСУТСТВИЯ cookie ПОСЛЕ ОТКЛОНЁННЫХ ЗАПРОСОВ НА ИЗМЕНЕНИЕ (НЕТ ПРАВ, ОШИБКА ВАЛИДАЦИИ) - В ОСНОВНУЮ БД НИЧЕГО НЕ ЗАПИСАНО:
+    @pytest.mark.parametrize("authenticated, data, expected_status", [
+        (False, [{"kinopoisk_id": 3000, "name": "Новый фильм", "year": 2020}], status.HTTP_403_FORBIDDEN),
+        (True, [{"kinopoisk_id": 1000, "name": "Повтор", "year": 2020}, {"name": None}], status.HTTP_400_BAD_REQUEST),
+    ])
+    def test_no_sticky_cookie_for_rejected_write(self, settings, authenticated, data, expected_status):
+        if authenticated:
+            self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse("api_v1:film-bulk"), data, format="json")
+        assert response.status_code == expected_status
+        assert settings.REPLICA_STICKY_COOKIE not in response.cookies
+
+    # ПРОВЕРКА ОТСУТСТВИЯ cookie, ЕСЛИ ЗАПИСЬ В ОСНОВНУЮ БД БЫЛА, НО ЗАПРОС ЗАВЕРШИЛСЯ ОШИБКОЙ (ИЗМЕНЕНИЯ ОТКАТЫВАЮТСЯ):
+    def test_no_sticky_cookie_for_failed_write(self, settings, mocker):
+        def view(request):
+            Film.objects.filter(pk=self.film.pk).update(year=2001)
+            return HttpResponse(status=500)
+
+        middleware = ReplicaRoutingMiddleware(view)
+        request = mocker.MagicMock(method="POST", COOKIES={})
+        before = _primary_writes.get()
+        assert settings.REPLICA_STICKY_COOKIE not in middleware(request).cookies
+        assert _primary_writes.get() is before # отметка о записи не выходит за пределы запроса
+        middleware = ReplicaRoutingMiddleware(lambda request: (view(request), HttpResponse())[1])
+        assert settings.REPLICA_STICKY_COOKIE in middleware(request).cookies
+
+    # ПРОВЕРКА ЧТЕНИЯ ИЗ ОСНОВНОЙ БД ПОСЛЕ ЗАПИСИ В ТОМ ЖЕ КОНТЕКСТЕ:
+    def test_reads_after_write_use_primary(self):
+        router = ReplicaRouter()
+        token = _replica_reads.set(True)
+        try:
+            assert router.db_for_read(Film) == "default"
+            assert router.db_for_write(Film) == "default"
+            assert router.db_for_read(Film) is None
+        finally:
+            _replica_reads.reset(token)
+
+################################################################ CACHES ################################################################
+    # ПРОВЕРКА ТОГО, ЧТО ЧТЕНИЯ С РЕПЛИК НЕ ЗАПОЛНЯЮТ КЕШИ, А КЛИЕНТ ПОСЛЕ СВОЕЙ ЗАПИСИ ЧИТАЕТ ИЗ ОСНОВНОЙ БД МИМО КЕШЕЙ:
+    def test_write_then_read_with_cache(self, settings, mocker):
+        settings.RESPONSE_CACHE_ENABLED = True
+        # КЕШ В ПАМЯТИ ПРОЦЕССА СЧИТАЕМ ОБЩИМ, ЧТОБЫ ПРОВЕРИТЬ ВСЕ КЕШИ ПО ЕГО КЛЮЧАМ (см. ResponseCache.shared):
+        mocker.patch("kinopoiskapiunofficial_tech_app.response_cache.shared_cache_configured", return_value=True)
+        url = reverse("api_v1:film-list")
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse("api_v1:film-bulk"), [{"kinopoisk_id": 3000, "name": "Новый фильм", "year": 2020}], format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+
+        # ДРУГОЙ КЛИЕНТ ЧИТАЕТ С РЕПЛИКИ (ОНА МОГЛА ЕЩЁ НЕ ПОЛУЧИТЬ НОВЫЙ ФИЛЬМ) - НИ ОТВЕТ, НИ КОЛИЧЕСТВО, НИ ТАБЛИЦА НЕ КЕШИРУЮТСЯ:
+        reader = APIClient()
+        self.routed_reads()
+        assert reader.get(url)["X-Cache"] == "MISS"
+        assert reader.get(url)["X-Cache"] == "MISS"
+        assert Client().get(reverse("main:index")).status_code == status.HTTP_200_OK
+        assert set(self.routed_reads()) == {"default"}
+        assert not [key for key in cache._cache if ":response-cache:film-list:" in key or ":row-count:" in key or "template.cache" in key]
+
+        # ПИСАВШИЙ КЛИЕНТ (С cookie) ЧИТАЕТ ИЗ ОСНОВНОЙ БД МИМО КЕША И ВИДИТ СВОЙ ФИЛЬМ, А ЕГО ОТВЕТ УЖЕ МОЖНО КЕШИРОВАТЬ:
+        response = self.client.get(url)
+        assert response["X-Cache"] == "BYPASS"
+        assert any(film["kinopoisk_id"] == 3000 for film in response.data["results"])
+        assert set(self.routed_reads()) == {None}
+        assert self.client.get(url)["X-Cache"] == "BYPASS"
+        assert reader.get(url)["X-Cache"] == "HIT"
+
+################################################################ NO REPLICAS ################################################################
+    # ПРОВЕРКА РАБОТЫ БЕЗ РЕПЛИК (НАСТРОЙКА ПО УМОЛЧАНИЮ): ВСЁ ИДЁТ В ОСНОВНУЮ БД, cookie НЕ СТАВИТСЯ:
+    def test_without_replicas(self, settings):
+        settings.DATABASE_REPLICAS = []
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse("api_v1:film-bulk"), [{"kinopoisk_id": 3000, "name": "Новый фильм", "year": 2020}], format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert settings.REPLICA_STICKY_COOKIE not in response.cookies
+        self.routed_reads()
+        self.client.get(reverse("api_v1:film-list"))
+        assert set(self.routed_reads()) == {None}
+
+    # ПРОВЕРКА МИГРАЦИЙ: ТОЛЬКО ДЛЯ ОСНОВНОЙ БД:
+    def test_allow_migrate(self, settings):
+        settings.DATABASE_REPLICAS = ["replica_1"]
+        router = ReplicaRouter()
+        assert router.allow_migrate("replica_1", "kinopoiskapiunofficial_tech_app") is False
+        assert router.allow_migrate("default", "kinopoiskapiunofficial_tech_app") is None
@@ -0,0 +1,122 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_exports/ndjson_export_test.py -v && coverage report
+"""
+
+import gzip
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.serializers import FilmSerializer, ActorSerializer
+
+
+@pytest.mark.django_db
+class TestNDJSONExport:
+    """Класс тестов для потоковой выгрузки фильмов и актёров в формате NDJSON (FilmExportView и ActorExportView)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.EXPORT_CHUNK_SIZE = 2 # несколько порций даже на маленьких данных
+        self.client = APIClient()
+        self.actors = [Actor.objects.create(staff_id=5000+i, name=f"Тестовый актёр #{i}") for i in range(5)]
+        self.films = [Film.objects.create(kinopoisk_id=1000+i, name=f"Тестовый фильм #{i}", year=2000+i) for i in range(5)]
+        for i, film in enumerate(self.films):
+            film.actors.add(*self.actors[i:i+2])
+        self.url = reverse("api_v1:film-export")
+
+    @staticmethod
+    def read(response):
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        body = b"".join(response.streaming_content)
+        if response.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        assert body.endswith(b"\n")
+        return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+################################################################ EXPORT ################################################################
+    # ПРОВЕРКА ТОГО, ЧТО ВЫГРУЗКА СОДЕРЖИТ ВСЕ ФИЛЬМЫ В ТОМ ЖЕ ФОРМАТЕ, ЧТО И FilmSerializer (ВКЛЮЧАЯ АКТЁРОВ НА ГРАНИЦАХ ПОРЦИЙ):
+    def test_film_export(self):
+        response = self.client.get(self.url)
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert 'filename="films.ndjson"' in response["Content-Disposition"]
+        expected = json.loads(json.dumps(FilmSerializer(Film.objects.with_cast().order_by("id"), many=True).data))
+        assert self.read(response) == expected
+
+    # ПРОВЕРКА ВЫГРУЗКИ АКТЁРОВ:
+    def test_actor_export(self):
+        rows = self.read(self.client.get(reverse("api_v1:actor-export")))
+        assert rows == json.loads(json.dumps(ActorSerializer(Actor.objects.order_by("id"), many=True).data))
+
+    # ПРОВЕРКА ТОГО, ЧТО АКТЁРЫ ЗАПРАШИВАЮТСЯ ОДНИМ ЗАПРОСОМ НА ПОРЦИЮ, А НЕ НА КАЖДЫЙ ФИЛЬМ:
+    def test_casts_are_batched_per_chunk(self):
+        response = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            rows = self.read(response)
+        assert len(rows) == 5
+        assert len(context.captured_queries) == 1 + 3 # фильмы + актёры для каждой из 3 порций
+
+    # ПРОВЕРКА ФИЛЬТРАЦИИ ЧЕРЕЗ FilmFilterSet/ActorFilterSet:
+    def test_filters(self):
+        rows = self.read(self.client.get(self.url, {"year_gte": 2003}))
+        assert [row["kinopoisk_id"] for row in rows] == [1003, 1004]
+        rows = self.read(self.client.get(reverse("api_v1:actor-export"), {"name": "актёр #4"}))
+        assert [row["staff_id"] for row in rows] == [5004]
+
+    # ПРОВЕРКА ОТВЕТА НА НЕКОРРЕКТНЫЙ ФИЛЬТР (ОШИБКА - ОДНОЙ СТРОКОЙ JSON, ДО НАЧАЛА ПОТОКА):
+    def test_invalid_filter(self):
+        response = self.client.get(self.url, {"year_gte": "abc"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "year_gte" in json.loads(response.content)
+
+    # ПРОВЕРКА СЖАТИЯ ПОТОКА, ЕСЛИ КЛИЕНТ ПРИНИМАЕТ gzip:
+    def test_gzip(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert len(self.read(response)) == 5
+        assert "Content-Encoding" not in self.client.get(self.url)
+
+    # ПРОВЕРКА ПУСТОЙ ВЫГРУЗКИ:
+    def test_empty_export(self):
+        response = self.client.get(self.url, {"name": "нет такого фильма"})
+        assert response.status_code == status.HTTP_200_OK
+        assert b"".join(response.streaming_content) == b""
+
+################################################################ ASGI ################################################################
+    @staticmethod
+    def aread(response):
+        """Тело потокового ответа под ASGI: поток должен быть асинхронным (синхронный Django прочитал бы в память целиком)"""
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming and response.is_async
+
+        async def consume():
+            return [chunk async for chunk in response.streaming_content]
+
+        chunks = async_to_sync(consume)()
+        body = b"".join(chunks)
+        if response.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return chunks, [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+    # ПРОВЕРКА АСИНХРОННОЙ ВЫГРУЗКИ ПОД ASGI: ТЕ ЖЕ ДАННЫЕ, ПОРЦИЯМИ ПО EXPORT_CHUNK_SIZE ЗАПИСЕЙ:
+    def test_asgi_export_is_async(self):
+        response = async_to_sync(AsyncClient().get)(self.url)
+        chunks, rows = self.aread(response)
+        assert rows == self.read(self.client.get(self.url))
+        assert [len(chunk.splitlines()) for chunk in chunks] == [2, 2, 1]
+
+    # ПРОВЕРКА АСИНХРОННОЙ ВЫГРУЗКИ С ФИЛЬТРОМ И СЖАТИЕМ gzip:
+    def test_asgi_export_gzip(self):
+        response = async_to_sync(AsyncClient().get)(self.url, {"year_gte": 2003}, headers={"Accept-Encoding": "gzip"})
+        assert response["Content-Encoding"] == "gzip"
+        _, rows = self.aread(response)
+        assert [row["kinopoisk_id"] for row in rows] == [1003, 1004]
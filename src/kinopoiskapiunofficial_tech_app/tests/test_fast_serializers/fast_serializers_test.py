@@ -0,0 +1,119 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_fast_serializers/fast_serializers_test.py -v && coverage report
+"""
+
+import datetime
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.serializers import FilmSerializer, ActorSerializer
+from kinopoiskapiunofficial_tech_app.fast_serializers import FORMATTED, FastFilmSerializer, FastActorSerializer, format_datetime
+
+
+@pytest.mark.django_db
+class TestFastSerializers:
+    """Класс тестов для быстрых сериализаторов FastFilmSerializer/FastActorSerializer (ответ должен совпадать с FilmSerializer/ActorSerializer)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.actors = [
+            Actor.objects.create(staff_id=5000+i, name=f"Тестовый актёр #{i}", poster_url=f"https://example.com/poster_{i}.jpg", profession="Актёр" if i % 2 else None)
+            for i in range(4)
+        ]
+        self.films = [Film.objects.create(kinopoisk_id=1000+i, name=f"Тестовый фильм «{i}»", year=2000+i if i % 2 else None) for i in range(3)]
+        self.films[0].actors.add(self.actors[3], self.actors[1])
+        self.films[1].actors.add(self.actors[0])
+        # ДАТЫ НА ГРАНИЦЕ СУТОК: ISO-ПРЕДСТАВЛЕНИЕ ВЫВОДИТСЯ В TIME_ZONE ПРОЕКТА, А ОТФОРМАТИРОВАННОЕ - В UTC (КАК В СЕРИАЛИЗАТОРАХ):
+        Film.objects.filter(pk=self.films[2].pk).update(created_or_updated_at=datetime.datetime(2024, 12, 31, 22, 30, 5, 123456, tzinfo=datetime.timezone.utc))
+        Actor.objects.filter(pk=self.actors[2].pk).update(created_or_updated_at=datetime.datetime(2024, 1, 1, 0, 0, 0, tzinfo=datetime.timezone.utc))
+
+    @staticmethod
+    def as_json(data):
+        return json.dumps(data, ensure_ascii=False, sort_keys=False)
+
+################################################################ EQUIVALENCE ################################################################
+    # ПРОВЕРКА ПОЛНОГО СОВПАДЕНИЯ ВЫВОДА (ВКЛЮЧАЯ ПОРЯДОК КЛЮЧЕЙ И АКТЁРОВ) С FilmSerializer:
+    def test_film_output_matches_serializer(self):
+        expected = FilmSerializer(Film.objects.with_cast().order_by("id"), many=True).data
+        fast = FastFilmSerializer()
+        actual = fast.to_representation(Film.objects.order_by("id").values(*fast.fields))
+        assert self.as_json(actual) == self.as_json(expected)
+
+    # ПРОВЕРКА ПОЛНОГО СОВПАДЕНИЯ ВЫВОДА С ActorSerializer:
+    def test_actor_output_matches_serializer(self):
+        expected = ActorSerializer(Actor.objects.order_by("id"), many=True).data
+        fast = FastActorSerializer()
+        actual = fast.to_representation(Actor.objects.order_by("id").values(*fast.fields))
+        assert self.as_json(actual) == self.as_json(expected)
+
+    # ПРОВЕРКА СОВПАДЕНИЯ ВЫВОДА, КОГДА ДАТА ФОРМАТИРУЕТСЯ В ЗАПРОСЕ (strftime() НА sqlite3) И КОГДА СУБД ЭТОГО НЕ УМЕЕТ (В PYTHON):
+    @pytest.mark.parametrize("in_database", [True, False])
+    @pytest.mark.parametrize("model, serializer_class, fast_class", [
+        (Film, FilmSerializer, FastFilmSerializer),
+        (Actor, ActorSerializer, FastActorSerializer),
+    ])
+    def test_formatted_in_database(self, mocker, in_database, model, serializer_class, fast_class):
+        if not in_database:
+            mocker.patch("kinopoiskapiunofficial_tech_app.fast_serializers.formatted_datetime", return_value=None)
+        queryset = model.objects.with_cast() if model is Film else model.objects.all()
+        expected = serializer_class(queryset.order_by("id"), many=True).data
+        fast = fast_class()
+        rows = fast.values(model.objects.order_by("id"))
+        assert (FORMATTED in rows[0]) == in_database
+        assert self.as_json(fast.to_representation(rows)) == self.as_json(expected)
+        assert (FORMATTED in next(iter(fast_class(["name"]).values(model.objects.all())))) is False
+
+    # ПРОВЕРКА СОВПАДЕНИЯ ОТВЕТОВ ПРЕДСТАВЛЕНИЙ В БЫСТРОМ И ОБЫЧНОМ РЕЖИМАХ (С ФИЛЬТРАМИ И СОРТИРОВКОЙ):
+    @pytest.mark.parametrize("url_name, params", [
+        ("api_v1:film-list", {}),
+        ("api_v1:film-list", {"ordering": "-year", "page_size": 2}),
+        ("api_v1:actor-list", {"ordering": "profession"}),
+        ("api_v1:actor-list", {"search": "актёр #2"}),
+    ])
+    def test_view_output_matches_slow_path(self, settings, url_name, params):
+        settings.API_FAST_READ_ENABLED = True
+        fast = self.client.get(reverse(url_name), params, format="json")
+        settings.API_FAST_READ_ENABLED = False
+        slow = self.client.get(reverse(url_name), params, format="json")
+        assert fast.status_code == slow.status_code == status.HTTP_200_OK
+        assert fast.content == slow.content
+
+    # ПРОВЕРКА ПЕРЕХОДА ПО КУРСОРУ, ПОЛУЧЕННОМУ В БЫСТРОМ РЕЖИМЕ:
+    def test_cursor_from_fast_path(self, settings):
+        settings.API_FAST_READ_ENABLED = True
+        first = self.client.get(reverse("api_v1:film-list"), {"ordering": "created_or_updated_at", "page_size": 2})
+        second = self.client.get(first.data["next"])
+        ids = [film["id"] for film in first.data["results"] + second.data["results"]]
+        assert ids == list(Film.objects.order_by("created_or_updated_at", "id").values_list("id", flat=True))
+
+################################################################ FORMATTER ################################################################
+    # ПРОВЕРКА ФОРМАТИРОВАНИЯ ДАТ (В ТОМ ЧИСЛЕ В ДРУГОЙ ВРЕМЕННОЙ ЗОНЕ):
+    def test_format_datetime(self):
+        value = datetime.datetime(2024, 3, 5, 7, 8, 9, tzinfo=datetime.timezone.utc)
+        assert format_datetime(value) == ("2024-03-05T10:08:09+03:00", "05.03.2024 | 07:08:09")
+        assert format_datetime(None) == (None, None)
+        with timezone.override("UTC"):
+            assert format_datetime(value) == ("2024-03-05T07:08:09Z", "05.03.2024 | 07:08:09")
+
+    # ПРОВЕРКА ПЕРЕДАННЫХ ВРЕМЕННОЙ ЗОНЫ И СТРОКИ, УЖЕ ОТФОРМАТИРОВАННОЙ В ЗАПРОСЕ:
+    def test_format_datetime_with_timezone_and_formatted(self):
+        value = datetime.datetime(2024, 3, 5, 7, 8, 9, tzinfo=datetime.timezone.utc)
+        assert format_datetime(value, datetime.timezone.utc, "из БД") == ("2024-03-05T07:08:09Z", "из БД")
+
+################################################################ BENCH ################################################################
+    # ПРОВЕРКА КОМАНДЫ bench_serializers НА МАЛЕНЬКОМ НАБОРЕ (ВСЕ ЗАМЕРЫ В ОТЧЁТЕ):
+    def test_bench_serializers_command(self):
+        out = StringIO()
+        call_command("bench_serializers", rows=50, repeat=1, stdout=out)
+        output = out.getvalue()
+        for name in ("зона на запись", "зона на страницу", "строка из БД", "сериализация + JSON"):
+            assert name in output
@@ -45,7 +45,7 @@ class TestFilmListView:
     def test_get_film_list(self):
         response = self.client.get(self.url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == Film.objects.count()
+        assert len(response.data["results"]) == Film.objects.count()
 ######################################################################################################################################
 
 ################################################################ CREATE ################################################################
@@ -85,52 +85,52 @@ class TestFilmListView:
     def test_filter_film_by_kinopoisk_id_field(self):
         response = self.client.get(self.url, {"kinopoisk_id": 1005})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["kinopoisk_id"] == 1005
-        assert response.data[0]["name"] == "Тестовый фильм #5"
-        assert response.data[0]["year"] == 2005
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["kinopoisk_id"] == 1005
+        assert response.data["results"][0]["name"] == "Тестовый фильм #5"
+        assert response.data["results"][0]["year"] == 2005
     
     # ПРОВЕРКА ВОЗМОЖНОСТИ ФИЛЬТРАЦИИ ЗАПИСЕЙ В ТАБЛИЦЕ `Film` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "name":
     def test_filter_film_by_name_field(self):
         response = self.client.get(self.url, {"name__icontains": "фильм"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 5
-        assert response.data[0]["kinopoisk_id"] == 1001
-        assert response.data[0]["name"] == "Тестовый фильм #1"
-        assert response.data[0]["year"] == 2001
-        assert response.data[1]["kinopoisk_id"] == 1002
-        assert response.data[1]["name"] == "Тестовый фильм #2"
-        assert response.data[1]["year"] == 2002
-        assert response.data[2]["kinopoisk_id"] == 1003
-        assert response.data[2]["name"] == "Тестовый фильм #3"
-        assert response.data[2]["year"] == 2003
-        assert response.data[3]["kinopoisk_id"] == 1004
-        assert response.data[3]["name"] == "Тестовый фильм #4"
-        assert response.data[3]["year"] == 2004
-        assert response.data[4]["kinopoisk_id"] == 1005
-        assert response.data[4]["name"] == "Тестовый фильм #5"
-        assert response.data[4]["year"] == 2005
+        assert len(response.data["results"]) == 5
+        assert response.data["results"][0]["kinopoisk_id"] == 1001
+        assert response.data["results"][0]["name"] == "Тестовый фильм #1"
+        assert response.data["results"][0]["year"] == 2001
+        assert response.data["results"][1]["kinopoisk_id"] == 1002
+        assert response.data["results"][1]["name"] == "Тестовый фильм #2"
+        assert response.data["results"][1]["year"] == 2002
+        assert response.data["results"][2]["kinopoisk_id"] == 1003
+        assert response.data["results"][2]["name"] == "Тестовый фильм #3"
+        assert response.data["results"][2]["year"] == 2003
+        assert response.data["results"][3]["kinopoisk_id"] == 1004
+        assert response.data["results"][3]["name"] == "Тестовый фильм #4"
+        assert response.data["results"][3]["year"] == 2004
+        assert response.data["results"][4]["kinopoisk_id"] == 1005
+        assert response.data["results"][4]["name"] == "Тестовый фильм #5"
+        assert response.data["results"][4]["year"] == 2005
     
     # ПРОВЕРКА ВОЗМОЖНОСТИ ФИЛЬТРАЦИИ ЗАПИСЕЙ В ТАБЛИЦЕ `Film` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "year":
     def test_filter_film_by_year_field(self):
         response = self.client.get(self.url, {"year_gte": 2001, "year_lte": 2005})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 5
-        assert response.data[0]["kinopoisk_id"] == 1001
-        assert response.data[0]["name"] == "Тестовый фильм #1"
-        assert response.data[0]["year"] == 2001
-        assert response.data[1]["kinopoisk_id"] == 1002
-        assert response.data[1]["name"] == "Тестовый фильм #2"
-        assert response.data[1]["year"] == 2002
-        assert response.data[2]["kinopoisk_id"] == 1003
-        assert response.data[2]["name"] == "Тестовый фильм #3"
-        assert response.data[2]["year"] == 2003
-        assert response.data[3]["kinopoisk_id"] == 1004
-        assert response.data[3]["name"] == "Тестовый фильм #4"
-        assert response.data[3]["year"] == 2004
-        assert response.data[4]["kinopoisk_id"] == 1005
-        assert response.data[4]["name"] == "Тестовый фильм #5"
-        assert response.data[4]["year"] == 2005
+        assert len(response.data["results"]) == 5
+        assert response.data["results"][0]["kinopoisk_id"] == 1001
+        assert response.data["results"][0]["name"] == "Тестовый фильм #1"
+        assert response.data["results"][0]["year"] == 2001
+        assert response.data["results"][1]["kinopoisk_id"] == 1002
+        assert response.data["results"][1]["name"] == "Тестовый фильм #2"
+        assert response.data["results"][1]["year"] == 2002
+        assert response.data["results"][2]["kinopoisk_id"] == 1003
+        assert response.data["results"][2]["name"] == "Тестовый фильм #3"
+        assert response.data["results"][2]["year"] == 2003
+        assert response.data["results"][3]["kinopoisk_id"] == 1004
+        assert response.data["results"][3]["name"] == "Тестовый фильм #4"
+        assert response.data["results"][3]["year"] == 2004
+        assert response.data["results"][4]["kinopoisk_id"] == 1005
+        assert response.data["results"][4]["name"] == "Тестовый фильм #5"
+        assert response.data["results"][4]["year"] == 2005
 ########################################################################################################################################
 
 ################################################################ ORDERING ################################################################
@@ -138,61 +138,61 @@ class TestFilmListView:
     def test_ordering_film_by_kinopoisk_id_field(self):
         response = self.client.get(self.url, {"ordering": "-kinopoisk_id"})
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["kinopoisk_id"] == 1005
-        assert response.data[0]["name"] == "Тестовый фильм #5"
-        assert response.data[0]["year"] == 2005
-        assert response.data[1]["kinopoisk_id"] == 1004
-        assert response.data[1]["name"] == "Тестовый фильм #4"
-        assert response.data[1]["year"] == 2004
-        assert response.data[2]["kinopoisk_id"] == 1003
-        assert response.data[2]["name"] == "Тестовый фильм #3"
-        assert response.data[2]["year"] == 2003
-        assert response.data[3]["kinopoisk_id"] == 1002
-        assert response.data[3]["name"] == "Тестовый фильм #2"
-        assert response.data[3]["year"] == 2002
-        assert response.data[4]["kinopoisk_id"] == 1001
-        assert response.data[4]["name"] == "Тестовый фильм #1"
-        assert response.data[4]["year"] == 2001
+        assert response.data["results"][0]["kinopoisk_id"] == 1005
+        assert response.data["results"][0]["name"] == "Тестовый фильм #5"
+        assert response.data["results"][0]["year"] == 2005
+        assert response.data["results"][1]["kinopoisk_id"] == 1004
+        assert response.data["results"][1]["name"] == "Тестовый фильм #4"
+        assert response.data["results"][1]["year"] == 2004
+        assert response.data["results"][2]["kinopoisk_id"] == 1003
+        assert response.data["results"][2]["name"] == "Тестовый фильм #3"
+        assert response.data["results"][2]["year"] == 2003
+        assert response.data["results"][3]["kinopoisk_id"] == 1002
+        assert response.data["results"][3]["name"] == "Тестовый фильм #2"
+        assert response.data["results"][3]["year"] == 2002
+        assert response.data["results"][4]["kinopoisk_id"] == 1001
+        assert response.data["results"][4]["name"] == "Тестовый фильм #1"
+        assert response.data["results"][4]["year"] == 2001
     
     # ПРОВЕРКА ВОЗМОЖНОСТИ СОРТИРОВКИ ЗАПИСЕЙ В ТАБЛИЦЕ `Film` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "name":
     def test_ordering_film_by_name_field(self):
         response = self.client.get(self.url, {"ordering": "-name"})
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["kinopoisk_id"] == 1005
-        assert response.data[0]["name"] == "Тестовый фильм #5"
-        assert response.data[0]["year"] == 2005
-        assert response.data[1]["kinopoisk_id"] == 1004
-        assert response.data[1]["name"] == "Тестовый фильм #4"
-        assert response.data[1]["year"] == 2004
-        assert response.data[2]["kinopoisk_id"] == 1003
-        assert response.data[2]["name"] == "Тестовый фильм #3"
-        assert response.data[2]["year"] == 2003
-        assert response.data[3]["kinopoisk_id"] == 1002
-        assert response.data[3]["name"] == "Тестовый фильм #2"
-        assert response.data[3]["year"] == 2002
-        assert response.data[4]["kinopoisk_id"] == 1001
-        assert response.data[4]["name"] == "Тестовый фильм #1"
-        assert response.data[4]["year"] == 2001
+        assert response.data["results"][0]["kinopoisk_id"] == 1005
+        assert response.data["results"][0]["name"] == "Тестовый фильм #5"
+        assert response.data["results"][0]["year"] == 2005
+        assert response.data["results"][1]["kinopoisk_id"] == 1004
+        assert response.data["results"][1]["name"] == "Тестовый фильм #4"
+        assert response.data["results"][1]["year"] == 2004
+        assert response.data["results"][2]["kinopoisk_id"] == 1003
+        assert response.data["results"][2]["name"] == "Тестовый фильм #3"
+        assert response.data["results"][2]["year"] == 2003
+        assert response.data["results"][3]["kinopoisk_id"] == 1002
+        assert response.data["results"][3]["name"] == "Тестовый фильм #2"
+        assert response.data["results"][3]["year"] == 2002
+        assert response.data["results"][4]["kinopoisk_id"] == 1001
+        assert response.data["results"][4]["name"] == "Тестовый фильм #1"
+        assert response.data["results"][4]["year"] == 2001
     
     # ПРОВЕРКА ВОЗМОЖНОСТИ СОРТИРОВКИ ЗАПИСЕЙ В ТАБЛИЦЕ `Film` ПОДКЛЮЧЁННОЙ БД ВСЕМИ ПОЛЬЗОВАТЕЛЯМИ ПО ПОЛЮ "year":
     def test_ordering_film_by_year_field(self):
         response = self.client.get(self.url, {"ordering": "-year"})
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["kinopoisk_id"] == 1005
-        assert response.data[0]["name"] == "Тестовый фильм #5"
-        assert response.data[0]["year"] == 2005
-        assert response.data[1]["kinopoisk_id"] == 1004
-        assert response.data[1]["name"] == "Тестовый фильм #4"
-        assert response.data[1]["year"] == 2004
-        assert response.data[2]["kinopoisk_id"] == 1003
-        assert response.data[2]["name"] == "Тестовый фильм #3"
-        assert response.data[2]["year"] == 2003
-        assert response.data[3]["kinopoisk_id"] == 1002
-        assert response.data[3]["name"] == "Тестовый фильм #2"
-        assert response.data[3]["year"] == 2002
-        assert response.data[4]["kinopoisk_id"] == 1001
-        assert response.data[4]["name"] == "Тестовый фильм #1"
-        assert response.data[4]["year"] == 2001
+        assert response.data["results"][0]["kinopoisk_id"] == 1005
+        assert response.data["results"][0]["name"] == "Тестовый фильм #5"
+        assert response.data["results"][0]["year"] == 2005
+        assert response.data["results"][1]["kinopoisk_id"] == 1004
+        assert response.data["results"][1]["name"] == "Тестовый фильм #4"
+        assert response.data["results"][1]["year"] == 2004
+        assert response.data["results"][2]["kinopoisk_id"] == 1003
+        assert response.data["results"][2]["name"] == "Тестовый фильм #3"
+        assert response.data["results"][2]["year"] == 2003
+        assert response.data["results"][3]["kinopoisk_id"] == 1002
+        assert response.data["results"][3]["name"] == "Тестовый фильм #2"
+        assert response.data["results"][3]["year"] == 2002
+        assert response.data["results"][4]["kinopoisk_id"] == 1001
+        assert response.data["results"][4]["name"] == "Тестовый фильм #1"
+        assert response.data["results"][4]["year"] == 2001
 ##########################################################################################################################################
 
 ################################################################ SEARCH ################################################################
@@ -200,8 +200,8 @@ class TestFilmListView:
     def test_search_film_by_any_field(self):
         response = self.client.get(self.url, {"search": "#3"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["kinopoisk_id"] == 1003
-        assert response.data[0]["name"] == "Тестовый фильм #3"
-        assert response.data[0]["year"] == 2003
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["kinopoisk_id"] == 1003
+        assert response.data["results"][0]["name"] == "Тестовый фильм #3"
+        assert response.data["results"][0]["year"] == 2003
 ########################################################################################################################################
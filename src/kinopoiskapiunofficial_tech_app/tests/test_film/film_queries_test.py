@@ -0,0 +1,63 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_film/film_queries_test.py::TestFilmQueries -v && coverage report
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+
+
+@pytest.mark.django_db
+class TestFilmQueries:
+    """Класс тестов количества запросов к БД при выводе фильмов с актёрами"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.url = reverse("api_v1:film-list")
+
+    def create_films(self, count, start=0):
+        for i in range(start, start + count):
+            film = Film.objects.create(kinopoisk_id=1000+i, name=f"Тестовый фильм #{i}", year=2000+i)
+            film.actors.add(*[
+                Actor.objects.create(staff_id=5000+i*10+j, name=f"Тестовый актёр #{i}-{j}", poster_url=f"https://example.com/poster_{i}_{j}.jpg")
+                for j in range(3)
+            ])
+
+    def get_with_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        return response, context.captured_queries
+
+    ################################################################ СПИСОК ФИЛЬМОВ ################################################################
+    def test_film_list_query_count_does_not_depend_on_film_count(self):
+        self.create_films(2)
+        _, few_queries = self.get_with_queries(self.url)
+        self.create_films(10, start=2)
+        response, many_queries = self.get_with_queries(self.url)
+        assert len(response.data["results"]) == 12
+        assert all(len(film["actors"]) == 3 for film in response.data["results"])
+        assert len(many_queries) == len(few_queries) == 4 # валидаторы ETag (дата изменения) + количество + фильмы + актёры всех фильмов одним запросом
+
+    def test_cast_query_fetches_only_id_and_name(self):
+        self.create_films(2)
+        _, queries = self.get_with_queries(self.url)
+        cast_sql = queries[-1]["sql"]
+        assert "poster_url" not in cast_sql
+        assert "profession" not in cast_sql
+    ###################################################################################################################################################
+
+    ################################################################ ДЕТАЛИ ФИЛЬМА ################################################################
+    def test_film_detail_query_count(self):
+        self.create_films(1)
+        film = Film.objects.get()
+        response, queries = self.get_with_queries(reverse("api_v1:film-detail", kwargs={"pk": film.pk}))
+        assert [actor["name"] for actor in response.data["actors"]] == ["Тестовый актёр #0-0", "Тестовый актёр #0-1", "Тестовый актёр #0-2"]
+        assert len(queries) == 3 # валидаторы ETag (с агрегатом по актёрам) + фильм + его актёры
+    ##################################################################################################################################################
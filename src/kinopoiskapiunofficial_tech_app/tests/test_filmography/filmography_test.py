@@ -0,0 +1,162 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_filmography/filmography_test.py -v && coverage report
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.pagination import KeysetPagination
+from kinopoiskapiunofficial_tech_app.response_cache import actor_films_cache
+
+
+@pytest.mark.django_db
+class TestFilmography:
+    """Класс тестов для фильмографии актёров (/actors/<pk>/films/, /actors/films/?actor_id=... и ?expand=films у актёра)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        cache.clear()
+        actor_films_cache.clear_local()
+        self.client = APIClient()
+        self.actors = [Actor.objects.create(staff_id=5000 + i, name=f"Тестовый актёр #{i}") for i in range(3)]
+        self.films = [Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i) for i in range(5)]
+        # АКТЁР #0 - ВО ВСЕХ ФИЛЬМАХ, АКТЁР #1 - В ЧЁТНЫХ, АКТЁР #2 - НИГДЕ:
+        for i, film in enumerate(self.films):
+            film.actors.add(self.actors[0], *([self.actors[1]] if i % 2 == 0 else []))
+        self.actor_url = reverse("api_v1:actor-films", kwargs={"pk": self.actors[0].pk})
+        self.batch_url = reverse("api_v1:actor-films-batch")
+        yield
+        cache.clear()
+        actor_films_cache.clear_local()
+
+    def walk(self, url, params):
+        """Все страницы списка по ссылкам next"""
+        response = self.client.get(url, params)
+        rows = []
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            rows += response.data["results"]
+            if response.data["next"] is None:
+                return rows
+            response = self.client.get(response.data["next"])
+
+################################################################ ACTOR FILMS ################################################################
+    # ПРОВЕРКА ФИЛЬМОВ ОДНОГО АКТЁРА ПО ПОРЯДКУ id И ОБХОДА СТРАНИЦ:
+    def test_actor_films(self):
+        response = self.client.get(self.actor_url, {"page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data["count"], response.data["count_is_exact"]) == (5, True)
+        rows = self.walk(self.actor_url, {"page_size": 2})
+        assert [row["id"] for row in rows] == [film.pk for film in self.films]
+        assert {row["actor_id"] for row in rows} == {self.actors[0].pk}
+        assert rows[0]["actors"] == [{"id": self.actors[0].pk, "name": self.actors[0].name}, {"id": self.actors[1].pk, "name": self.actors[1].name}]
+
+    # ПРОВЕРКА ПУСТОЙ ФИЛЬМОГРАФИИ И НЕСУЩЕСТВУЮЩЕГО АКТЁРА:
+    def test_empty_and_missing_actor(self):
+        response = self.client.get(reverse("api_v1:actor-films", kwargs={"pk": self.actors[2].pk}))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == [] and response.data["count"] == 0
+        response = self.client.get(reverse("api_v1:actor-films", kwargs={"pk": 999999}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # ПРОВЕРКА ОДНОГО ЗАПРОСА ФИЛЬМОВ ЧЕРЕЗ ПРОМЕЖУТОЧНУЮ ТАБЛИЦУ (БЕЗ DISTINCT И ПОДЗАПРОСОВ):
+    def test_single_join_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.batch_url, {"actor_id": f"{self.actors[0].pk},{self.actors[1].pk}"})
+        assert response.status_code == status.HTTP_200_OK
+        # ВАЛИДАТОРЫ ETag + КОЛИЧЕСТВО + ФИЛЬМЫ + АКТЁРЫ ФИЛЬМОВ СТРАНИЦЫ:
+        assert len(queries) == 4
+        films_sql = queries[2]["sql"]
+        assert "INNER JOIN" in films_sql and '"actor_id" IN' in films_sql
+        assert "DISTINCT" not in films_sql and "EXISTS" not in films_sql
+
+    # ПРОВЕРКА ОДИНАКОВОГО ОТВЕТА В БЫСТРОМ РЕЖИМЕ И ЧЕРЕЗ ОБЫЧНЫЙ СЕРИАЛИЗАТОР:
+    def test_fast_and_regular_serializers_match(self, settings):
+        params = {"actor_id": f"{self.actors[0].pk},{self.actors[1].pk}"}
+        fast = self.client.get(self.batch_url, params).json()
+        cache.clear()
+        actor_films_cache.clear_local()
+        settings.API_FAST_READ_ENABLED = False
+        assert self.client.get(self.batch_url, params).json() == fast
+
+################################################################ BATCH ################################################################
+    # ПРОВЕРКА ФИЛЬМОВ НЕСКОЛЬКИХ АКТЁРОВ: ПО АКТЁРАМ, ВНУТРИ - ПО id, ОБЩИЙ ФИЛЬМ - У КАЖДОГО АКТЁРА:
+    def test_batch(self):
+        rows = self.walk(self.batch_url, {"actor_id": f"{self.actors[1].pk},{self.actors[0].pk},{self.actors[2].pk}", "page_size": 3})
+        expected = [(self.actors[0].pk, film.pk) for film in self.films] + [(self.actors[1].pk, film.pk) for film in self.films[::2]]
+        assert [(row["actor_id"], row["id"]) for row in rows] == expected
+
+    # ПРОВЕРКА ВЫБОРА ПОЛЕЙ В ФИЛЬМОГРАФИИ:
+    def test_sparse_fields(self):
+        response = self.client.get(self.batch_url, {"actor_id": self.actors[1].pk, "fields": "actor_id,name"})
+        assert response.data["results"][0] == {"actor_id": self.actors[1].pk, "id": self.films[0].pk, "name": self.films[0].name}
+
+    # ПРОВЕРКА ОШИБОК В ПАРАМЕТРЕ actor_id:
+    @pytest.mark.parametrize("value", ["", "1,abc", "-1"])
+    def test_batch_invalid_actor_ids(self, value):
+        response = self.client.get(self.batch_url, {"actor_id": value})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "actor_id" in response.data
+
+    # ПРОВЕРКА ОГРАНИЧЕНИЯ КОЛИЧЕСТВА АКТЁРОВ В ОДНОМ ЗАПРОСЕ:
+    def test_batch_too_many_actors(self, settings):
+        settings.API_FILMOGRAPHY_MAX_ACTORS = 2
+        response = self.client.get(self.batch_url, {"actor_id": ",".join(str(actor.pk) for actor in self.actors)})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # ПРОВЕРКА СБРОСА КЕША ОТВЕТОВ ПРИ ИЗМЕНЕНИИ СОСТАВА АКТЁРОВ:
+    def test_cache_invalidated_on_cast_change(self):
+        url = reverse("api_v1:actor-films", kwargs={"pk": self.actors[2].pk})
+        assert self.client.get(url).data["count"] == 0
+        self.films[1].actors.add(self.actors[2])
+        response = self.client.get(url)
+        assert [row["id"] for row in response.data["results"]] == [self.films[1].pk]
+
+################################################################ EXPAND ################################################################
+    # ПРОВЕРКА ФИЛЬМОВ АКТЁРА ТОЛЬКО ПО ?expand=films:
+    def test_actor_detail_expand_films(self):
+        url = reverse("api_v1:actor-detail", kwargs={"pk": self.actors[1].pk})
+        assert "films" not in self.client.get(url).data
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"expand": "films"})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 3 # валидаторы ETag (с агрегатом по фильмам) + актёр + его фильмы
+        assert response.data["films"] == {
+            "next": None,
+            "results": [{"id": film.pk, "kinopoisk_id": film.kinopoisk_id, "name": film.name, "year": film.year} for film in self.films[::2]],
+        }
+        response = self.client.get(url, {"fields": "name", "expand": "films"})
+        assert set(response.data) == {"id", "name", "films"}
+
+    # ПРОВЕРКА ССЫЛКИ НА ПРОДОЛЖЕНИЕ ФИЛЬМОГРАФИИ, ЕСЛИ ФИЛЬМОВ БОЛЬШЕ СТРАНИЦЫ:
+    def test_expand_films_next_link(self, mocker):
+        mocker.patch.object(KeysetPagination, "page_size", 2)
+        response = self.client.get(reverse("api_v1:actor-detail", kwargs={"pk": self.actors[0].pk}), {"expand": "films"})
+        films = response.data["films"]
+        assert [film["id"] for film in films["results"]] == [film.pk for film in self.films[:2]]
+        assert films["next"].startswith(f"http://testserver{self.actor_url}?cursor=")
+        rows = self.walk(films["next"], {})
+        assert [row["id"] for row in rows] == [film.pk for film in self.films[2:]]
+
+    # ПРОВЕРКА СМЕНЫ ETag АКТЁРА С ?expand=films ПРИ ИЗМЕНЕНИИ ЕГО ФИЛЬМА:
+    def test_expand_films_etag(self):
+        url = reverse("api_v1:actor-detail", kwargs={"pk": self.actors[0].pk})
+        response = self.client.get(url, {"expand": "films"})
+        assert self.client.get(url, {"expand": "films"}, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == status.HTTP_304_NOT_MODIFIED
+        self.films[0].name = "Новое название"
+        self.films[0].save()
+        again = self.client.get(url, {"expand": "films"}, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert again.status_code == status.HTTP_200_OK
+        assert again.data["films"]["results"][0]["name"] == "Новое название"
+
+    # ПРОВЕРКА ОШИБКИ ?expand=films У СПИСКА АКТЁРОВ (ДЛЯ НЕГО ЕСТЬ /actors/films/?actor_id=...):
+    def test_expand_films_not_allowed_on_actor_list(self):
+        response = self.client.get(reverse("api_v1:actor-list"), {"expand": "films"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "expand" in response.data
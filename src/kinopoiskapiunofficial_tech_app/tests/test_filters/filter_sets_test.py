@@ -0,0 +1,117 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_filters/filter_sets_test.py -v && coverage report
+"""
+
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.custom_set_filters.actors import ActorFilterSet
+from kinopoiskapiunofficial_tech_app.custom_set_filters.films import FilmFilterSet
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+
+
+def plan(filter_set_class, data, queryset):
+    """План запроса (EXPLAIN) для отфильтрованного queryset"""
+    filter_set = filter_set_class(data, queryset=queryset)
+    assert filter_set.is_valid(), filter_set.errors
+    return filter_set.qs.explain()
+
+
+@pytest.mark.django_db
+class TestFilterSets:
+    """Класс тестов для наборов фильтров FilmFilterSet и ActorFilterSet"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.actors = [Actor.objects.create(staff_id=500 + i, name=f"Пётр Актёров #{i}") for i in range(3)]
+        self.films = []
+        for i in range(5):
+            film = Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i)
+            film.actors.set(self.actors[:i])
+            self.films.append(film)
+        self.films_url = reverse("api_v1:film-list")
+        self.actors_url = reverse("api_v1:actor-list")
+
+    def kinopoisk_ids(self, params):
+        response = self.client.get(self.films_url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [film["kinopoisk_id"] for film in response.data["results"]]
+
+################################################################ INTEGER FILTERS ################################################################
+    # ПРОВЕРКА ТОЧНОГО СОВПАДЕНИЯ (РАНЬШЕ "kinopoisk_id=100" НАХОДИЛ ВСЕ ID, СОДЕРЖАЩИЕ "100"):
+    def test_exact(self):
+        assert self.kinopoisk_ids({"kinopoisk_id": 1003}) == [1003]
+        assert self.kinopoisk_ids({"kinopoisk_id": 100}) == []
+
+    # ПРОВЕРКА СПИСКА ЗНАЧЕНИЙ И ДИАПАЗОНА:
+    def test_in_and_range(self):
+        assert self.kinopoisk_ids({"kinopoisk_id_in": "1001,1004,7"}) == [1001, 1004]
+        assert self.kinopoisk_ids({"kinopoisk_id_gte": 1001, "kinopoisk_id_lte": 1003}) == [1001, 1002, 1003]
+
+    # ПРОВЕРКА ОТКЛОНЕНИЯ НЕЦЕЛЫХ ЗНАЧЕНИЙ (NumberFilter ПРИНЯЛ БЫ 1001.5 И СРАВНИЛ С ОКРУГЛЁННЫМ):
+    @pytest.mark.parametrize("value", ["1001.5", "abc"])
+    def test_invalid_value(self, value):
+        response = self.client.get(self.films_url, {"kinopoisk_id": value})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # ПРОВЕРКА ИСПОЛЬЗОВАНИЯ УНИКАЛЬНОГО ИНДЕКСА ДЛЯ ВСЕХ ЦЕЛОЧИСЛЕННЫХ ФИЛЬТРОВ (БЕЗ ПРИВЕДЕНИЯ ПОЛЯ К СТРОКЕ):
+    @pytest.mark.parametrize("data", [{"kinopoisk_id": "1001"}, {"kinopoisk_id_in": "1001,1002"}, {"kinopoisk_id_gte": "1001", "kinopoisk_id_lte": "1003"}])
+    def test_film_filters_use_index(self, data):
+        assert "USING INDEX" in plan(FilmFilterSet, data, Film.objects.all())
+
+    @pytest.mark.parametrize("data", [{"staff_id": "501"}, {"staff_id_in": "501,502"}, {"staff_id_gte": "501", "staff_id_lte": "502"}])
+    def test_actor_filters_use_index(self, data):
+        assert "USING INDEX" in plan(ActorFilterSet, data, Actor.objects.all())
+
+    # ПРОВЕРКА ФИЛЬТРАЦИИ АКТЁРОВ ЧЕРЕЗ API:
+    def test_actor_staff_id(self):
+        response = self.client.get(self.actors_url, {"staff_id_in": "500,502"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [actor["staff_id"] for actor in response.data["results"]] == [500, 502]
+
+################################################################ ACTORS ################################################################
+    # ПРОВЕРКА ФИЛЬТРАЦИИ ФИЛЬМОВ ПО ИМЕНИ АКТЁРА БЕЗ ДУБЛИРОВАНИЯ (У ФИЛЬМОВ ПО НЕСКОЛЬКО ПОДХОДЯЩИХ АКТЁРОВ):
+    def test_actors_by_name_no_duplicates(self):
+        assert self.kinopoisk_ids({"actors": "Петр"}) == [1001, 1002, 1003, 1004]
+        assert self.kinopoisk_ids({"actors": "Актеров #2"}) == [1003, 1004]
+
+    # ПРОВЕРКА ФИЛЬТРАЦИИ ФИЛЬМОВ ПО СПИСКУ ID АКТЁРОВ:
+    def test_actors_by_id(self):
+        ids = f"{self.actors[0].pk},{self.actors[1].pk}"
+        assert self.kinopoisk_ids({"actor_id": ids}) == [1001, 1002, 1003, 1004]
+        assert self.kinopoisk_ids({"actor_id": self.actors[2].pk}) == [1003, 1004]
+
+    # ПРОВЕРКА ТОГО, ЧТО ФИЛЬТР ПО АКТЁРАМ - EXISTS-ПОДЗАПРОС ПО ИНДЕКСУ ПРОМЕЖУТОЧНОЙ ТАБЛИЦЫ, А НЕ JOIN С DISTINCT:
+    @pytest.mark.parametrize("data", [{"actors": "Петр"}, {"actor_id": "1,2"}])
+    def test_actors_use_exists(self, data):
+        filter_set = FilmFilterSet(data, queryset=Film.objects.all())
+        sql = str(filter_set.qs.query)
+        assert "EXISTS" in sql and "DISTINCT" not in sql
+        assert "film_actors" in plan(FilmFilterSet, data, Film.objects.all()).split("SUBQUERY", 1)[1]
+
+################################################################ TIMESTAMPS ################################################################
+    # ПРОВЕРКА ФИЛЬТРОВ ПО ДАТЕ ИЗМЕНЕНИЯ ("ДО" ВКЛЮЧАЕТ ВЕСЬ ДЕНЬ, В ТЕКУЩЕЙ ВРЕМЕННОЙ ЗОНЕ):
+    def test_created_or_updated_at_range(self):
+        moments = [timezone.make_aware(datetime.datetime(2024, 1, day, 23, 30)) for day in (1, 2, 3, 4, 5)]
+        for film, moment in zip(self.films, moments):
+            Film.objects.filter(pk=film.pk).update(created_or_updated_at=moment)
+        assert self.kinopoisk_ids({"created_or_updated_at_gte": "02.01.2024", "created_or_updated_at_lte": "04.01.2024"}) == [1001, 1002, 1003]
+        assert self.kinopoisk_ids({"created_or_updated_at_lte": "01.01.2024"}) == [1000]
+
+    # ПРОВЕРКА ФИЛЬТРА ПО ДАТЕ ИЗМЕНЕНИЯ АКТЁРОВ:
+    def test_actor_created_or_updated_at(self):
+        Actor.objects.filter(pk=self.actors[0].pk).update(created_or_updated_at=timezone.make_aware(datetime.datetime(2020, 6, 1, 12)))
+        response = self.client.get(self.actors_url, {"created_or_updated_at_lte": "01.06.2020"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [actor["staff_id"] for actor in response.data["results"]] == [500]
+
+    # ПРОВЕРКА ТОГО, ЧТО ДАТА ИЗМЕНЕНИЯ ФИЛЬТРУЕТСЯ ТОЛЬКО ДИАПАЗОНОМ (БЕЗ ПОИСКА ПОДСТРОКИ В ДАТЕ), КАК У ФИЛЬМОВ:
+    def test_no_substring_filter_on_timestamps(self):
+        assert "created_or_updated_at" not in ActorFilterSet.base_filters
+        assert "created_or_updated_at" not in FilmFilterSet.base_filters
@@ -0,0 +1,109 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_hit_counters/hit_counters_test.py::TestHitCounters -v && coverage report
+"""
+
+import datetime
+import threading
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film
+from kinopoiskapiunofficial_tech_app.hit_counters import HitCounter, film_hits, refresh_priority
+from kinopoiskapiunofficial_tech_app.refresh_scheduler import RefreshScheduler
+
+
+@pytest.mark.django_db
+class TestHitCounters:
+    """Класс тестов для счётчиков обращений к записям о фильмах"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.films = [Film.objects.create(kinopoisk_id=1000+i, name=f"Тестовый фильм #{i}", year=2000+i) for i in range(1, 4)]
+        film_hits._take() # сбрасываем то, что могли накопить предыдущие тесты
+        yield
+        film_hits._take()
+
+    ################################################################ ПОДСЧЁТ ОБРАЩЕНИЙ НА ПУТИ ЧТЕНИЯ ################################################################
+    def test_detail_view_counts_hit_in_memory(self):
+        response = self.client.get(reverse("api_v1:film-detail", kwargs={"pk": self.films[0].pk}))
+        assert response.status_code == status.HTTP_200_OK
+        assert film_hits.pending() == {self.films[0].pk: 1}
+        # В БД НИЧЕГО НЕ ЗАПИСЫВАЕТСЯ ДО СБРОСА:
+        assert Film.objects.get(pk=self.films[0].pk).hits == 0
+
+    def test_list_view_counts_hits_for_every_returned_film(self):
+        self.client.get(reverse("api_v1:film-list"))
+        self.client.get(reverse("api_v1:film-list"), {"kinopoisk_id": 1001})
+        assert film_hits.pending() == {self.films[0].pk: 2, self.films[1].pk: 1, self.films[2].pk: 1}
+
+    def test_missing_film_is_not_counted(self):
+        response = self.client.get(reverse("api_v1:film-detail", kwargs={"pk": 999999}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert film_hits.pending() == {}
+    ####################################################################################################################################################################
+
+    ################################################################ ПАКЕТНЫЙ СБРОС В БД ################################################################
+    def test_flush_is_one_query_and_keeps_timestamps(self, django_assert_num_queries):
+        before = {film.pk: Film.objects.get(pk=film.pk).created_or_updated_at for film in self.films}
+        film_hits.hit(self.films[0].pk, self.films[0].pk, self.films[1].pk, self.films[2].pk)
+        with django_assert_num_queries(1):
+            assert film_hits.flush() == 3
+        assert [Film.objects.get(pk=film.pk).hits for film in self.films] == [2, 1, 1]
+        assert {film.pk: Film.objects.get(pk=film.pk).created_or_updated_at for film in self.films} == before
+        assert film_hits.pending() == {}
+
+    def test_flush_accumulates(self):
+        film_hits.hit(self.films[0].pk)
+        film_hits.flush()
+        film_hits.hit(self.films[0].pk)
+        film_hits.flush()
+        assert Film.objects.get(pk=self.films[0].pk).hits == 2
+
+    def test_flush_threshold_triggers_background_flush(self, mocker):
+        counter = HitCounter(Film, flush_threshold=2, flush_interval=3600)
+        thread = mocker.patch("kinopoiskapiunofficial_tech_app.hit_counters.threading.Thread")
+        counter.hit(self.films[0].pk)
+        thread.assert_not_called()
+        counter.hit(self.films[1].pk)
+        thread.assert_called_once()
+
+    def test_only_one_background_flush_thread(self, mocker):
+        counter = HitCounter(Film, flush_threshold=1, flush_interval=3600)
+        # ОДНОВРЕМЕННЫЕ ОБРАЩЕНИЯ, ПОКА ПОТОК СБРОСА ЕЩЁ РАБОТАЕТ, НЕ ЗАПУСКАЮТ НОВЫЕ ПОТОКИ
+        # (ПОТОКИ-"КЛИЕНТЫ" СОЗДАЁМ ДО ПОДМЕНЫ threading.Thread):
+        workers = [threading.Thread(target=counter.hit, args=(self.films[0].pk,)) for _ in range(10)]
+        thread = mocker.patch("kinopoiskapiunofficial_tech_app.hit_counters.threading.Thread")
+        thread.return_value.is_alive.return_value = True
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        thread.assert_called_once()
+        # ПОСЛЕ ЗАВЕРШЕНИЯ ПОТОКА СЛЕДУЮЩЕЕ ОБРАЩЕНИЕ ЗАПУСКАЕТ НОВЫЙ:
+        thread.return_value.is_alive.return_value = False
+        counter.hit(self.films[0].pk)
+        assert thread.call_count == 2
+    #######################################################################################################################################################
+
+    ################################################################ ПРИОРИТЕТ ОБНОВЛЕНИЯ ################################################################
+    def test_refresh_priority_combines_hits_and_staleness(self):
+        now = timezone.now()
+        day_ago = now - datetime.timedelta(days=1)
+        assert refresh_priority(0, now, now=now) == 0
+        assert refresh_priority(100, day_ago, now=now) > refresh_priority(0, day_ago, now=now)
+        assert refresh_priority(0, now - datetime.timedelta(days=2), now=now) > refresh_priority(0, day_ago, now=now)
+
+    def test_scheduler_prefers_hot_films(self, mocker):
+        now = timezone.now()
+        Film.objects.update(created_or_updated_at=now - datetime.timedelta(hours=10))
+        Film.objects.filter(pk=self.films[0].pk).update(created_or_updated_at=now - datetime.timedelta(hours=12))
+        Film.objects.filter(pk=self.films[2].pk).update(hits=1000)
+        synchronizer = mocker.MagicMock()
+        scheduler = RefreshScheduler(synchronizer=synchronizer, requests_per_hour=3600, jitter=0, batch_size=1)
+        assert [scheduler.refresh_next() for _ in range(2)] == [1003, 1001]
+    #######################################################################################################################################################
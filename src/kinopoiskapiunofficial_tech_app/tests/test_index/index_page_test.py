@@ -0,0 +1,143 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_index/index_page_test.py -v && coverage report
+"""
+
+import re
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+
+
+@pytest.mark.django_db
+class TestIndexPage:
+    """Класс тестов для основной страницы с таблицей фильмов (страницы, подгрузка актёров и кеш таблицы)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        cache.clear()
+        settings.INDEX_PAGE_SIZE = 2
+        self.client = Client()
+        self.url = reverse("main:index")
+        self.films = []
+        for i in range(5):
+            film = Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i)
+            film.actors.add(*[Actor.objects.create(staff_id=5000 + i * 10 + j, name=f"Тестовый актёр #{i}-{j}") for j in range(2)])
+            self.films.append(film)
+        yield
+        cache.clear()
+
+    # ФИКСТУРА ОБЩЕГО КЕША (ФАЙЛЫ) С ВКЛЮЧЁННЫМ КЕШЕМ ОТВЕТОВ - ТОЛЬКО С НИМ ТАБЛИЦА КЕШИРУЕТСЯ (см. ResponseCache.shared):
+    @pytest.fixture
+    def shared_cache(self, settings, tmp_path):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        settings.RESPONSE_CACHE_ENABLED = True
+        return tmp_path
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        assert response.status_code == 200
+        return response.content.decode("utf-8"), len(queries)
+
+    @staticmethod
+    def film_names(html):
+        return re.findall(r"<td>(Тестовый фильм #\d+|[^<]*)</td>\s*<td>\d+</td>", html)
+
+    @staticmethod
+    def link(html, name):
+        found = re.search(rf'href="\?{name}=(\d+)"', html)
+        return int(found.group(1)) if found else None
+
+################################################################ PAGES ################################################################
+    # ПРОВЕРКА ПЕРВОЙ СТРАНИЦЫ: ФИЛЬМЫ С АКТЁРАМИ ЗА ДВА ЗАПРОСА (ФИЛЬМЫ + АКТЁРЫ ВСЕЙ СТРАНИЦЫ) И БЕЗ COUNT:
+    def test_first_page(self):
+        html, queries = self.get(self.url)
+        assert self.film_names(html) == ["Тестовый фильм #0", "Тестовый фильм #1"]
+        assert all(f"Тестовый актёр #{i}-{j}" in html for i in range(2) for j in range(2))
+        assert "Тестовый актёр #2-0" not in html
+        assert queries == 2
+        assert self.link(html, "after") == self.films[1].pk
+        assert self.link(html, "before") is None
+
+    # ПРОВЕРКА ОБХОДА ВСЕХ СТРАНИЦ ВПЕРЁД И НАЗАД:
+    def test_walk_pages(self):
+        names, after = [], None
+        while True:
+            html, _ = self.get(self.url, {"after": after} if after is not None else {})
+            names += self.film_names(html)
+            after = self.link(html, "after")
+            if after is None:
+                break
+        assert names == [film.name for film in self.films]
+
+        html, _ = self.get(self.url, {"before": self.films[4].pk})
+        assert self.film_names(html) == ["Тестовый фильм #2", "Тестовый фильм #3"]
+        assert self.link(html, "before") == self.films[2].pk
+        html, _ = self.get(self.url, {"before": self.films[2].pk})
+        assert self.film_names(html) == ["Тестовый фильм #0", "Тестовый фильм #1"]
+        assert self.link(html, "before") is None
+
+    # ПРОВЕРКА НЕКОРРЕКТНОГО ПАРАМЕТРА СТРАНИЦЫ (ПЕРВАЯ СТРАНИЦА ВМЕСТО ОШИБКИ):
+    def test_invalid_bound(self):
+        html, _ = self.get(self.url, {"after": "abc"})
+        assert self.film_names(html) == ["Тестовый фильм #0", "Тестовый фильм #1"]
+
+    # ПРОВЕРКА ГРАНИЦЫ СТРАНИЦЫ, КОТОРАЯ НЕ ЯВЛЯЕТСЯ id ФИЛЬМА (ПЕРВАЯ СТРАНИЦА И НИКАКИХ НОВЫХ КЛЮЧЕЙ КЕША):
+    @pytest.mark.parametrize("name", ["after", "before"])
+    def test_unknown_bound(self, name, shared_cache):
+        first, _ = self.get(self.url)
+        keys = set(shared_cache.iterdir())
+        for value in (10 ** 6, 10 ** 6 + 1):
+            html, _ = self.get(self.url, {name: value})
+            assert html == first
+        assert set(shared_cache.iterdir()) == keys
+
+################################################################ CACHE ################################################################
+    # ПРОВЕРКА ОТВЕТА ИЗ КЕША БЕЗ ЗАПРОСОВ К БД (ГРАНИЦА СТРАНИЦЫ ПРОВЕРЯЕТСЯ ТОЛЬКО ПРИ ПРОМАХЕ):
+    def test_cached_table(self, shared_cache):
+        first, queries = self.get(self.url, {"after": self.films[1].pk})
+        assert queries == 3 # проверка границы, фильмы и актёры
+        again, queries = self.get(self.url, {"after": self.films[1].pk})
+        assert again == first
+        assert queries == 0
+        self.get(self.url)
+        _, queries = self.get(self.url)
+        assert queries == 0
+
+    # ПРОВЕРКА ТОГО, ЧТО БЕЗ ОБЩЕГО КЕША (ИЛИ С ВЫКЛЮЧЕННЫМ КЕШЕМ ОТВЕТОВ) ТАБЛИЦА НЕ КЕШИРУЕТСЯ - ВЕРСИИ У КАЖДОГО ПРОЦЕССА СВОИ:
+    @pytest.mark.parametrize("shared, enabled", [(False, True), (True, False)])
+    def test_table_not_cached_without_shared_cache(self, settings, tmp_path, shared, enabled):
+        if shared:
+            settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        settings.RESPONSE_CACHE_ENABLED = enabled
+        self.get(self.url)
+        _, queries = self.get(self.url)
+        assert queries == 2
+
+    # ПРОВЕРКА СБРОСА КЕША ТАБЛИЦЫ ПРИ ИЗМЕНЕНИИ ФИЛЬМА И АКТЁРА:
+    def test_cache_invalidated_on_changes(self, shared_cache):
+        self.get(self.url)
+        self.films[0].name = "Новое название"
+        self.films[0].save()
+        html, queries = self.get(self.url)
+        assert "Новое название" in html and queries == 2
+        actor = self.films[1].actors.first()
+        actor.name = "Новое имя актёра"
+        actor.save()
+        html, _ = self.get(self.url)
+        assert "Новое имя актёра" in html
+
+    # ПРОВЕРКА НЕЗАВИСИМОСТИ КОЛИЧЕСТВА ЗАПРОСОВ ОТ КОЛИЧЕСТВА ФИЛЬМОВ:
+    def test_query_count_does_not_depend_on_film_count(self, settings):
+        settings.INDEX_PAGE_SIZE = 100
+        _, few = self.get(self.url)
+        for i in range(5, 30):
+            Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i).actors.add(*self.films[0].actors.all())
+        _, many = self.get(self.url)
+        assert few == many == 2
@@ -0,0 +1,61 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_indexes/indexes_test.py -v && coverage report
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+
+
+def indexes(model):
+    with connection.cursor() as cursor:
+        return connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+
+@pytest.mark.django_db
+class TestIndexes:
+    """Класс тестов для индексов фильмов и актёров (миграция 0006) и команды bench_indexes"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.film = Film.objects.create(kinopoisk_id=1001, name="Тестовый фильм #1", year=2001)
+
+################################################################ MIGRATION ################################################################
+    # ПРОВЕРКА СОСТАВНЫХ ИНДЕКСОВ (С id ПОСЛЕДНИМ СТОЛБЦОМ):
+    def test_composite_indexes(self):
+        assert indexes(Film)["film_year_id_idx"]["columns"] == ["year", "id"]
+        assert indexes(Film)["film_name_id_idx"]["columns"] == ["name", "id"]
+        assert indexes(Actor)["actor_name_id_idx"]["columns"] == ["name", "id"]
+
+    # ПРОВЕРКА ИНДЕКСА ОБРАТНОЙ СТОРОНЫ ПРОМЕЖУТОЧНОЙ ТАБЛИЦЫ И ЕГО ИСПОЛЬЗОВАНИЯ (ТОЛЬКО ИНДЕКС, БЕЗ ЧТЕНИЯ ТАБЛИЦЫ):
+    def test_through_index(self):
+        through = Film.actors.through
+        assert indexes(through)["film_actors_actor_film_idx"]["columns"] == ["actor_id", "film_id"]
+        plan = through.objects.filter(actor_id=1).values_list("film_id", flat=True).explain()
+        assert "COVERING INDEX film_actors_actor_film_idx" in plan
+
+    # ПРОВЕРКА ИСПОЛЬЗОВАНИЯ ИНДЕКСА ДЛЯ ФИЛЬТРА ПО ГОДАМ ВЫХОДА С СОРТИРОВКОЙ ПО ГОДУ:
+    def test_year_index_used(self):
+        plan = Film.objects.filter(year__gte=2000, year__lte=2005).order_by("year", "id").explain()
+        assert "film_year_id_idx" in plan
+        assert "TEMP B-TREE" not in plan # сортировка не нужна - строки идут в порядке индекса
+
+################################################################ BENCHMARK ################################################################
+    # ПРОВЕРКА КОМАНДЫ bench_indexes НА МАЛЕНЬКОМ НАБОРЕ: ВСЕ ИНДЕКСЫ В ОТЧЁТЕ, ТЕСТОВЫЕ ЗАПИСИ И ИНДЕКСЫ НЕ ОСТАЮТСЯ/НЕ ПРОПАДАЮТ:
+    def test_bench_indexes_command(self):
+        out = StringIO()
+        call_command("bench_indexes", films=300, actors=50, cast=3, repeat=1, batch_size=100, stdout=out)
+        output = out.getvalue()
+        for name in ("film_year_id_idx", "film_name_id_idx", "actor_name_id_idx", "film_actors_actor_film_idx"):
+            assert f"{name}:" in output
+            assert "без индекса" in output
+        without_year_index = output.split("film_year_id_idx:", 1)[1].split("без индекса:", 1)[1].splitlines()[0]
+        assert "film_year_id_idx" not in without_year_index and "TEMP B-TREE" in without_year_index # план после удаления индекса - свой
+        assert "film_updated_brin_idx: индекса нет" in output # BRIN - только на PostgreSQL
+        assert list(Film.objects.values_list("kinopoisk_id", flat=True)) == [1001]
+        assert Actor.objects.count() == 0
+        assert "film_year_id_idx" in indexes(Film)
@@ -0,0 +1,108 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_logging/log_handlers_test.py -v && coverage report
+"""
+
+import logging
+import threading
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from kinopoiskapiunofficial_tech_app.log_handlers import QueuedFileHandler
+from kinopoiskapiunofficial_tech_app.models import Actor
+from kinopoiskapiunofficial_tech_app.serializers import ActorSerializer
+
+
+class Counted:
+    """Аргумент сообщения, который считает, сколько раз его переводили в строку"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "значение"
+
+
+class TestLogging:
+    """Класс тестов для отложенных сообщений логов и записи логов в файл через очередь"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.logger = logging.getLogger("kinopoiskapiunofficial_tech_app.tests.log_handlers")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.path = tmp_path / "app.log"
+        self.handler = QueuedFileHandler(str(self.path))
+        self.handler.setLevel(logging.INFO)
+        self.handler.setFormatter(logging.Formatter("{levelname} {threadName} {message}", style="{"))
+        self.logger.addHandler(self.handler)
+        yield
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+################################################################ QUEUE ################################################################
+    # ПРОВЕРКА ЗАПИСИ В ФАЙЛ ФОНОВЫМ ПОТОКОМ (С ФОРМАТОМ ИЗ НАСТРОЕК И ОТСЕЧЕНИЕМ ПО УРОВНЮ ОБРАБОТЧИКА):
+    def test_writes_in_background(self):
+        self.logger.info("Запись о фильме %s (ID: %s) сохранена!", "Тестовый фильм", 1)
+        self.logger.debug("Не попадёт в файл")
+        self.handler.close() # дописывает очередь до конца
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        assert lines == [f"INFO {threading.current_thread().name} Запись о фильме Тестовый фильм (ID: 1) сохранена!"]
+
+    # ПРОВЕРКА ПОДСТАНОВКИ АРГУМЕНТОВ В ПОТОКЕ ЗАПРОСА (ИЗМЕНЕНИЕ АРГУМЕНТА ПОСЛЕ ВЫЗОВА НЕ МЕНЯЕТ СООБЩЕНИЕ):
+    def test_message_is_formatted_on_caller_thread(self):
+        names = ["до изменения"]
+        self.logger.info("Список: %s", names)
+        names[0] = "после изменения"
+        self.handler.close()
+        assert "Список: ['до изменения']" in self.path.read_text(encoding="utf-8")
+
+    # ПРОВЕРКА ТОГО ЖЕ СООБЩЕНИЯ У ДРУГИХ ОБРАБОТЧИКОВ ЛОГГЕРА:
+    def test_other_handlers_get_same_message(self):
+        stream = StringIO()
+        console = logging.StreamHandler(stream)
+        self.logger.addHandler(console)
+        try:
+            self.logger.info("Страница %s из %s", 1, 10)
+        finally:
+            self.logger.removeHandler(console)
+        assert stream.getvalue() == "Страница 1 из 10\n"
+
+    # ПРОВЕРКА ПОВТОРНОГО ЗАКРЫТИЯ ОБРАБОТЧИКА (logging.shutdown() ПОСЛЕ РУЧНОГО close()):
+    def test_close_twice(self):
+        self.handler.close()
+        self.handler.close()
+
+################################################################ LAZY ################################################################
+    # ПРОВЕРКА ОТСУТСТВИЯ ПОДСТАНОВКИ АРГУМЕНТОВ ОТКЛЮЧЁННЫХ СООБЩЕНИЙ (В ТОМ ЧИСЛЕ ПРИ СЕРИАЛИЗАЦИИ ЗАПИСЕЙ):
+    def test_disabled_messages_are_not_formatted(self):
+        value = Counted()
+        self.logger.setLevel(logging.INFO)
+        self.logger.debug("Значение: %s", value)
+        assert value.calls == 0
+
+        app_logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+        level = app_logger.level
+        app_logger.setLevel(logging.INFO)
+        try:
+            name = Counted()
+            data = ActorSerializer(Actor(id=1, staff_id=1, name=name, created_or_updated_at=timezone.now())).data
+        finally:
+            app_logger.setLevel(level)
+        assert data["name"] == "значение"
+        assert name.calls == 1 # только поле name, без DEBUG-сообщений get_created_or_updated_at_formatted()
+
+################################################################ BENCH ################################################################
+    # ПРОВЕРКА КОМАНДЫ bench_logging НА МАЛЕНЬКОМ НАБОРЕ (ВСЕ ЗАМЕРЫ В ОТЧЁТЕ, ОБРАБОТЧИКИ ИЗ НАСТРОЕК ВОССТАНОВЛЕНЫ):
+    def test_bench_logging_command(self):
+        app_logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
+        handlers, level = app_logger.handlers[:], app_logger.level
+        out = StringIO()
+        call_command("bench_logging", rows=50, messages=100, requests=10, per_request=2, repeat=1, stdout=out)
+        output = out.getvalue()
+        for name in ("на запись", "на DEBUG-сообщение", "на запрос"):
+            assert name in output
+        assert app_logger.handlers == handlers and app_logger.level == level
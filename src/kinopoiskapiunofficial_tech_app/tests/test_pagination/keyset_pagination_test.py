@@ -0,0 +1,140 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_pagination/keyset_pagination_test.py -v && coverage report
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.pagination import KeysetPagination
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Класс тестов для курсорной пагинации KeysetPagination в представлениях FilmListView и ActorListView"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        # ПОВТОРЯЮЩИЕСЯ И ПУСТЫЕ (NULL) ЗНАЧЕНИЯ, ЧТОБЫ ПРОВЕРИТЬ ОДНОЗНАЧНОСТЬ ПОРЯДКА:
+        for i, (name, year) in enumerate([("Б", 2001), ("А", None), ("В", 2001), (None, 1999), ("А", 2005), ("Г", None), ("Д", 2001)]):
+            Film.objects.create(kinopoisk_id=1000+i, name=name, year=year)
+        for i in range(1, 6):
+            Actor.objects.create(staff_id=5000+i, name=f"Тестовый актёр #{i}")
+        self.url = reverse("api_v1:film-list")
+
+    def expected_ids(self, field, descending=False):
+        """Ожидаемый порядок id: по полю (NULL больше любого значения), при равенстве - по id в том же направлении"""
+        films = list(Film.objects.values("id", field))
+        present = sorted((film for film in films if film[field] is not None), key=lambda film: (film[field], film["id"]), reverse=descending)
+        missing = sorted((film for film in films if film[field] is None), key=lambda film: film["id"], reverse=descending)
+        return [film["id"] for film in (missing + present if descending else present + missing)]
+
+    def walk(self, url, params):
+        """Проходим все страницы по ссылкам next. Возвращает id записей и список ответов"""
+        ids, responses = [], []
+        response = self.client.get(url, params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            responses.append(response)
+            ids += [row["id"] for row in response.data["results"]]
+            if response.data["next"] is None:
+                return ids, responses
+            response = self.client.get(response.data["next"])
+
+################################################################ NEXT ################################################################
+    # ПРОВЕРКА ФОРМАТА ОТВЕТА И ПОРЯДКА ПО УМОЛЧАНИЮ (ПО id):
+    def test_response_shape_and_default_ordering(self):
+        response = self.client.get(self.url, {"page_size": 3})
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {"count", "count_is_exact", "next", "previous", "results"}
+        assert response.data["count"] == Film.objects.count() and response.data["count_is_exact"] is True
+        assert response.data["previous"] is None
+        assert [film["id"] for film in response.data["results"]] == list(Film.objects.order_by("id").values_list("id", flat=True)[:3])
+
+    # ПРОВЕРКА ОБХОДА ВСЕХ СТРАНИЦ ДЛЯ КАЖДОГО ПОЛЯ СОРТИРОВКИ И НАПРАВЛЕНИЯ (БЕЗ ПРОПУСКОВ И ПОВТОРОВ):
+    @pytest.mark.parametrize("ordering", ["name", "-name", "year", "-year", "kinopoisk_id", "-kinopoisk_id"])
+    def test_walk_all_pages(self, ordering):
+        ids, responses = self.walk(self.url, {"ordering": ordering, "page_size": 2})
+        assert ids == self.expected_ids(ordering.lstrip("-"), descending=ordering.startswith("-"))
+        assert len(responses) == 4
+
+    # ПРОВЕРКА ТОГО, ЧТО ЗАПИСИ, ДОБАВЛЕННЫЕ "ПЕРЕД" КУРСОРОМ, НЕ СДВИГАЮТ СЛЕДУЮЩУЮ СТРАНИЦУ (В ОТЛИЧИЕ ОТ OFFSET):
+    def test_next_page_is_stable_after_insert(self):
+        first = self.client.get(self.url, {"ordering": "year", "page_size": 3})
+        Film.objects.create(kinopoisk_id=2000, name="Новый фильм", year=1900)
+        second = self.client.get(first.data["next"])
+        assert [film["id"] for film in second.data["results"]] == self.expected_ids("year")[4:7]
+
+    # ПРОВЕРКА ТОГО, ЧТО ЗАПРОС СТРАНИЦЫ НЕ СОДЕРЖИТ OFFSET:
+    def test_page_query_has_no_offset(self):
+        first = self.client.get(self.url, {"ordering": "-year", "page_size": 2})
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(first.data["next"])
+        assert not any("OFFSET" in query["sql"].upper() for query in context.captured_queries)
+
+    # ПРОВЕРКА ПЛАНОВ ЗАПРОСОВ СТРАНИЦ (EXPLAIN): ДИАПАЗОН ИНДЕКСА (year, id) ПО ГРАНИЦЕ КУРСОРА, БЕЗ ОБЪЕДИНЕНИЯ OR И БЕЗ СОРТИРОВКИ,
+    # А NULL-ЗНАЧЕНИЯ - ОТДЕЛЬНЫМ ЗАПРОСОМ ТОЛЬКО ТОГДА, КОГДА ДО НИХ ДОШЛА СТРАНИЦА:
+    @pytest.mark.parametrize("ordering", ["year", "-year"])
+    def test_page_queries_use_index_range(self, ordering):
+        response = self.client.get(self.url, {"ordering": ordering, "page_size": 2})
+        plans = []
+        while response.data["next"] is not None:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(response.data["next"])
+            page_queries = [query["sql"] for query in context.captured_queries if "ORDER BY" in query["sql"] and "LIMIT" in query["sql"]]
+            assert page_queries
+            for sql in page_queries:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                    plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+                assert "film_year_id_idx (year" in plan
+                assert "MULTI-INDEX OR" not in plan and "TEMP B-TREE" not in plan
+                plans.append(plan)
+        assert any("(year=?" in plan for plan in plans) # фаза с NULL-значениями (year IS NULL)
+
+################################################################ PREVIOUS ################################################################
+    # ПРОВЕРКА ОБХОДА СТРАНИЦ В ОБРАТНУЮ СТОРОНУ ПО ССЫЛКАМ previous:
+    @pytest.mark.parametrize("ordering", ["year", "-year", "name", "-name"])
+    def test_previous_pages(self, ordering):
+        _, responses = self.walk(self.url, {"ordering": ordering, "page_size": 2})
+        response = responses[-1]
+        for expected in reversed(responses[:-1]):
+            response = self.client.get(response.data["previous"])
+            assert response.status_code == status.HTTP_200_OK
+            assert [film["id"] for film in response.data["results"]] == [film["id"] for film in expected.data["results"]]
+        assert response.data["previous"] is None
+
+################################################################ PAGE SIZE ################################################################
+    # ПРОВЕРКА РАЗМЕРА СТРАНИЦЫ ПО УМОЛЧАНИЮ И ЕГО ОГРАНИЧЕНИЯ СВЕРХУ:
+    def test_page_size_is_capped(self, mocker):
+        mocker.patch.object(KeysetPagination, "page_size", 4)
+        mocker.patch.object(KeysetPagination, "max_page_size", 5)
+        assert len(self.client.get(self.url).data["results"]) == 4
+        assert len(self.client.get(self.url, {"page_size": 100}).data["results"]) == 5
+        assert len(self.client.get(self.url, {"page_size": "abc"}).data["results"]) == 4
+
+    # ПРОВЕРКА ТОГО, ЧТО РАЗМЕР СТРАНИЦЫ ПО УМОЛЧАНИЮ ЧИТАЕТСЯ ИЗ НАСТРОЕК ПРИ КАЖДОМ ЗАПРОСЕ:
+    def test_page_size_from_settings(self, settings):
+        settings.API_PAGE_SIZE = 3
+        assert len(self.client.get(self.url).data["results"]) == 3
+        settings.API_MAX_PAGE_SIZE = 4
+        assert len(self.client.get(self.url, {"page_size": 100}).data["results"]) == 4
+
+    # ПРОВЕРКА ПАГИНАЦИИ СПИСКА АКТЁРОВ:
+    def test_actor_list_is_paginated(self):
+        ids, responses = self.walk(reverse("api_v1:actor-list"), {"ordering": "-staff_id", "page_size": 2})
+        assert ids == list(Actor.objects.order_by("-staff_id").values_list("id", flat=True))
+        assert len(responses) == 3
+
+################################################################ ERRORS ################################################################
+    # ПРОВЕРКА ОТВЕТА НА НЕКОРРЕКТНЫЙ КУРСОР И НА КУРСОР ОТ ДРУГОЙ СОРТИРОВКИ:
+    def test_invalid_cursor(self):
+        assert self.client.get(self.url, {"cursor": "not-a-cursor"}).status_code == status.HTTP_404_NOT_FOUND
+        first = self.client.get(self.url, {"ordering": "year", "page_size": 2})
+        cursor = first.data["next"].split("cursor=")[1].split("&")[0]
+        assert self.client.get(self.url, {"ordering": "name", "cursor": cursor}).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,119 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_refresh_scheduler/refresh_scheduler_test.py::TestRefreshScheduler -v && coverage report
+"""
+
+import datetime
+
+import pytest
+from django.utils import timezone
+from kinopoiskapiunofficial_tech_app.models import Film
+from kinopoiskapiunofficial_tech_app.api_sync import APISynchronizer
+from kinopoiskapiunofficial_tech_app.refresh_scheduler import RefreshScheduler
+
+
+@pytest.mark.django_db
+class TestRefreshScheduler:
+    """Класс тестов для RefreshScheduler"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker):
+        now = timezone.now()
+        # СОЗДАЁМ ФИЛЬМЫ И "СОСТАРИВАЕМ" ИХ В ОБРАТНОМ ПОРЯДКЕ: ФИЛЬМ #3 - САМЫЙ "УСТАРЕВШИЙ":
+        for i in range(1, 4):
+            film = Film.objects.create(kinopoisk_id=1000+i, name=f"Тестовый фильм #{i}", year=2000+i)
+            Film.objects.filter(pk=film.pk).update(created_or_updated_at=now - datetime.timedelta(days=i))
+        Film.objects.create(kinopoisk_id=None, name="Фильм без ID на стороне API", year=2010)
+        self.synchronizer = mocker.MagicMock()
+        self.scheduler = RefreshScheduler(synchronizer=self.synchronizer, requests_per_hour=3600, jitter=0.1, batch_size=10)
+        mocker.patch.object(self.scheduler, "wait", return_value=False) # НЕ ЖДЁМ РЕАЛЬНО МЕЖДУ ИТЕРАЦИЯМИ
+
+    ################################################################ ОЧЕРЕДЬ С ПРИОРИТЕТОМ ################################################################
+    def test_refresh_stalest_films_first(self):
+        refreshed = [self.scheduler.refresh_next() for _ in range(3)]
+        assert refreshed == [1003, 1002, 1001]
+        assert [call.args[0] for call in self.synchronizer.sync_film_and_actors.call_args_list] == [1003, 1002, 1001]
+
+    def test_refresh_next_without_films(self):
+        Film.objects.all().delete()
+        assert self.scheduler.refresh_next() is None
+        self.synchronizer.sync_film_and_actors.assert_not_called()
+
+    def test_refresh_error_does_not_stop_loop(self):
+        self.synchronizer.sync_film_and_actors.side_effect = Exception("API error")
+        assert self.scheduler.run(max_iterations=3) == 3
+        assert self.synchronizer.sync_film_and_actors.call_count == 3
+
+    def test_failing_film_does_not_starve_others(self):
+        # ФИЛЬМ #3 - САМЫЙ "УСТАРЕВШИЙ", НО ЕГО ОБНОВЛЕНИЕ ВСЕГДА ЗАВЕРШАЕТСЯ ОШИБКОЙ:
+        def sync_film_and_actors(kinopoisk_id):
+            if kinopoisk_id == 1003:
+                raise Exception("API error")
+        self.synchronizer.sync_film_and_actors.side_effect = sync_film_and_actors
+        refreshed = [self.scheduler.refresh_next() for _ in range(5)]
+        assert refreshed == [1003, 1002, 1001, 1002, 1001]
+        [(failures, retry_at)] = self.scheduler._failures.values()
+        assert failures == 1
+
+        # ПОСЛЕ ПАУЗЫ ФИЛЬМ СНОВА В ОЧЕРЕДИ, А С КАЖДОЙ ОШИБКОЙ ПОДРЯД ПАУЗА УДВАИВАЕТСЯ:
+        assert self.scheduler.candidates(now=retry_at)[0]["kinopoisk_id"] == 1003
+        assert [self.scheduler.backoff(n) for n in (1, 2, 3)] == [2, 4, 8]
+        assert self.scheduler.backoff(100) == RefreshScheduler.FAILURE_BACKOFF_MAX
+
+    def test_failures_are_reset_after_success(self):
+        film_id = Film.objects.get(kinopoisk_id=1003).pk
+        self.scheduler.record_failure(film_id, now=timezone.now() - datetime.timedelta(days=1))
+        assert self.scheduler.refresh_next() == 1003
+        assert self.scheduler._failures == {}
+    ##########################################################################################################################################################
+
+    ################################################################ БЮДЖЕТ ЗАПРОСОВ И JITTER ################################################################
+    def test_interval_spreads_budget_evenly(self):
+        # 3600 ЗАПРОСОВ В ЧАС ПРИ 2 ЗАПРОСАХ НА ФИЛЬМ - ОДИН ФИЛЬМ КАЖДЫЕ 2 СЕКУНДЫ:
+        assert self.scheduler.interval == 2
+        for _ in range(100):
+            assert 1.8 <= self.scheduler.next_delay() <= 2.2
+
+    def test_invalid_budget(self):
+        with pytest.raises(ValueError):
+            RefreshScheduler(synchronizer=self.synchronizer, requests_per_hour=-1)
+        with pytest.raises(ValueError):
+            RefreshScheduler(synchronizer=self.synchronizer, requests_per_hour=100, jitter=1.5)
+    ##########################################################################################################################################################
+
+    ################################################################ ПАУЗА И ВОЗОБНОВЛЕНИЕ ################################################################
+    def test_pause_and_resume(self):
+        self.scheduler.pause()
+        assert self.scheduler.is_paused
+        self.scheduler.wait.side_effect = lambda seconds: self.scheduler.resume()
+        assert self.scheduler.run(max_iterations=1) == 1
+        assert not self.scheduler.is_paused
+        self.synchronizer.sync_film_and_actors.assert_called_once_with(1003)
+
+    def test_pause_file(self, tmp_path):
+        pause_file = tmp_path / "pause"
+        pause_file.touch()
+        self.scheduler.pause_file = str(pause_file)
+        assert self.scheduler.is_paused
+        pause_file.unlink()
+        assert not self.scheduler.is_paused
+
+    def test_stop(self):
+        self.scheduler.stop()
+        assert self.scheduler.run() == 0
+        self.synchronizer.sync_film_and_actors.assert_not_called()
+    ##########################################################################################################################################################
+
+    ################################################################ ОБНОВЛЕНИЕ ОДНОГО ФИЛЬМА ################################################################
+    def test_sync_film_and_actors(self, mocker):
+        mocker.patch.object(APISynchronizer, "get_film", return_value={"kinopoiskId": 1001, "nameRu": None, "nameOriginal": "Test film", "year": 2021})
+        mocker.patch.object(APISynchronizer, "get_actors", return_value=[
+            {"staffId": 1, "nameRu": "Тестовый актёр", "posterUrl": "https://example.com/poster_1.jpg", "professionText": "Актёр"},
+        ])
+        result = APISynchronizer().sync_film_and_actors(1001)
+        film = Film.objects.get(kinopoisk_id=1001)
+        assert result == {"film_id": film.id, "kinopoisk_id": 1001, "actors_count": 1}
+        assert film.name == "Test film"
+        assert film.year == 2021
+        assert film.actors.count() == 1
+    ##########################################################################################################################################################
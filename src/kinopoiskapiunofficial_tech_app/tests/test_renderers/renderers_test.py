@@ -0,0 +1,76 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_renderers/renderers_test.py -v && coverage report
+"""
+
+import datetime
+import decimal
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app import renderers
+from kinopoiskapiunofficial_tech_app.models import Film
+from kinopoiskapiunofficial_tech_app.renderers import CompactJSONRenderer
+
+
+DATA = {
+    "name": "Фильм «Тест»\u2028",
+    "year": 2001,
+    "rating": decimal.Decimal("7.50"),
+    "updated": datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    "actors": [{"id": 1, "name": "Актёр"}],
+    1: None,
+}
+
+
+@pytest.mark.django_db
+class TestCompactJSONRenderer:
+    """Класс тестов для рендерера CompactJSONRenderer"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        Film.objects.create(kinopoisk_id=1001, name="Тестовый фильм #1", year=2001)
+        self.url = reverse("api_v1:film-list")
+
+################################################################ RENDER ################################################################
+    # ПРОВЕРКА СОВПАДЕНИЯ ВЫВОДА С КОМПАКТНЫМ JSONRenderer DRF (С orjson И БЕЗ НЕГО):
+    @pytest.mark.parametrize("with_orjson", [True, False])
+    def test_output_matches_drf(self, mocker, with_orjson):
+        if not with_orjson:
+            mocker.patch.object(renderers, "orjson", None)
+        body = CompactJSONRenderer().render(DATA, "application/json", {})
+        assert json.loads(body) == json.loads(JSONRenderer().render(DATA, "application/json", {}))
+        assert "Фильм «Тест»".encode("utf-8") in body # кириллица без экранирования
+        assert b"\\u2028" in body
+        assert b": " not in body and b", " not in body
+
+    # ПРОВЕРКА ОТСТУПОВ ПО ПАРАМЕТРУ ?pretty=1 И ИХ ОТСУТСТВИЯ ПО УМОЛЧАНИЮ:
+    def test_pretty_query_param(self):
+        compact = self.client.get(self.url, {"format": "json"})
+        pretty = self.client.get(self.url, {"format": "json", "pretty": 1})
+        assert compact.status_code == pretty.status_code == status.HTTP_200_OK
+        assert b"\n" not in compact.content
+        assert b'\n    "next": null' in pretty.content
+        assert json.loads(compact.content) == json.loads(pretty.content)
+
+    # ПРОВЕРКА ТОГО, ЧТО КОМПАКТНЫЙ РЕНДЕРЕР ВЫБИРАЕТСЯ ПО УМОЛЧАНИЮ ДЛЯ КЛИЕНТОВ API:
+    def test_negotiated_by_default(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        assert isinstance(response.accepted_renderer, CompactJSONRenderer)
+        assert "Тестовый фильм #1".encode("utf-8") in response.content
+
+    # ПРОВЕРКА ОТСТУПОВ ИЗ ЗАГОЛОВКА Accept (ИМЕННО ТАК ИХ ЗАПРАШИВАЕТ БРАУЗЕРНЫЙ ИНТЕРФЕЙС DRF):
+    def test_indent_from_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/json; indent=2")
+        assert b'\n  "next": null' in response.content
+
+    # ПРОВЕРКА БРАУЗЕРНОГО ИНТЕРФЕЙСА DRF:
+    def test_browsable_api(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="text/html")
+        assert response.status_code == status.HTTP_200_OK
+        assert "Тестовый фильм #1" in response.content.decode("utf-8")
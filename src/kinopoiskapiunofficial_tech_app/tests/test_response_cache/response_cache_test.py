@@ -0,0 +1,230 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_response_cache/response_cache_test.py -v && coverage report
+"""
+
+import os
+import runpy
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as project_settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.response_cache import ResponseCache, bump_version, film_list_cache, actor_list_cache
+
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Класс тестов для кеша ответов списков записей (ResponseCache и CachedListMixin)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.RESPONSE_CACHE_ENABLED = True
+        cache.clear()
+        film_list_cache.clear_local()
+        actor_list_cache.clear_local()
+
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="username_for_test_1", password="password_for_test_1", is_staff=True)
+        self.actor = Actor.objects.create(staff_id=5001, name="Тестовый актёр #1")
+        self.film = Film.objects.create(kinopoisk_id=1001, name="Тестовый фильм #1", year=2001)
+        self.film.actors.add(self.actor)
+        self.url = reverse("api_v1:film-list")
+
+        yield
+        cache.clear()
+        film_list_cache.clear_local()
+        actor_list_cache.clear_local()
+
+    def get_with_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return response, len(context.captured_queries)
+
+################################################################ HIT / MISS ################################################################
+    # ПРОВЕРКА ТОГО, ЧТО ПОВТОРНЫЙ ЗАПРОС ОТДАЁТСЯ ИЗ КЕША БЕЗ ЗАПРОСОВ К БД:
+    def test_repeated_request_is_served_from_cache(self):
+        first, first_queries = self.get_with_queries(self.url)
+        second, second_queries = self.get_with_queries(self.url)
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert first_queries > 0
+        assert second_queries == 2 # только агрегат и COUNT для валидаторов ETag (без общего кеша количество не кешируется, см. counts)
+        assert second.data == first.data
+
+    # ПРОВЕРКА НОРМАЛИЗАЦИИ СТРОКИ ЗАПРОСА (ПОРЯДОК ПАРАМЕТРОВ И ПУСТЫЕ ЗНАЧЕНИЯ НЕ ВЛИЯЮТ НА КЛЮЧ):
+    def test_query_string_is_normalized(self):
+        self.client.get(f"{self.url}?year=2001&ordering=name&name=")
+        response = self.client.get(f"{self.url}?ordering=name&year=2001")
+        assert response["X-Cache"] == "HIT"
+        assert self.client.get(f"{self.url}?ordering=-name&year=2001")["X-Cache"] == "MISS"
+
+    # ПРОВЕРКА ПОПАДАНИЯ В ОБЩИЙ КЕШ, КОГДА В ПАМЯТИ ПРОЦЕССА ОТВЕТА НЕТ (НАПРИМЕР, ДРУГОЙ ПРОЦЕСС):
+    def test_shared_cache_is_used_when_local_is_empty(self):
+        self.client.get(self.url)
+        film_list_cache.clear_local()
+        before = film_list_cache.stats()
+        response, queries = self.get_with_queries(self.url)
+        assert response["X-Cache"] == "HIT"
+        assert queries == 2
+        assert film_list_cache.stats()["shared_hits"] == before["shared_hits"] + 1
+
+    # ПРОВЕРКА СТАТИСТИКИ ПОПАДАНИЙ/ПРОМАХОВ:
+    def test_stats(self):
+        response_cache = ResponseCache("test", labels=("film",), maxsize=2, timeout=60)
+        assert response_cache.stats()["hit_ratio"] == 0.0
+        response_cache.set("a", {"results": []})
+        assert response_cache.get("a") == {"results": []}
+        assert response_cache.get("b") is None
+        assert response_cache.stats() == {"local_hits": 1, "shared_hits": 0, "misses": 1, "hit_ratio": 0.5}
+
+    # ПРОВЕРКА ВЫТЕСНЕНИЯ САМЫХ ДАВНО ИСПОЛЬЗОВАННЫХ ОТВЕТОВ ИЗ ПАМЯТИ ПРОЦЕССА:
+    def test_local_lru_eviction(self):
+        response_cache = ResponseCache("test", labels=("film",), maxsize=2, timeout=60)
+        for key in ("a", "b"):
+            response_cache.set(key, {"key": key})
+        response_cache.get("a")
+        response_cache.set("c", {"key": "c"})
+        assert list(response_cache._local) == ["a", "c"]
+
+################################################################ INVALIDATION ################################################################
+    # ПРОВЕРКА СБРОСА КЕША ПРИ СОЗДАНИИ/ИЗМЕНЕНИИ/УДАЛЕНИИ ЗАПИСИ О ФИЛЬМЕ:
+    def test_film_changes_invalidate_film_list(self):
+        self.client.get(self.url)
+        film = Film.objects.create(kinopoisk_id=1002, name="Тестовый фильм #2")
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data["results"]) == 2
+
+        film.name = "Новое название"
+        film.save()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][1]["name"] == "Новое название"
+
+        film.delete()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data["results"]) == 1
+
+    # ПРОВЕРКА СБРОСА КЕША ПРИ ИЗМЕНЕНИИ СОСТАВА АКТЁРОВ ФИЛЬМА И ПРИ ПЕРЕИМЕНОВАНИИ АКТЁРА:
+    def test_cast_changes_invalidate_film_list(self):
+        self.client.get(self.url)
+        self.film.actors.clear()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["actors"] == []
+
+        self.film.actors.add(self.actor)
+        self.client.get(self.url)
+        self.actor.name = "Новое имя"
+        self.actor.save()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["actors"] == [{"id": self.actor.id, "name": "Новое имя"}]
+
+    # ПРОВЕРКА ТОГО, ЧТО ИЗМЕНЕНИЕ ФИЛЬМА НЕ СБРАСЫВАЕТ КЕШ СПИСКА АКТЁРОВ:
+    def test_film_changes_keep_actor_list_cached(self):
+        url = reverse("api_v1:actor-list")
+        self.client.get(url)
+        Film.objects.create(kinopoisk_id=1002, name="Тестовый фильм #2")
+        assert self.client.get(url)["X-Cache"] == "HIT"
+
+    # ПРОВЕРКА СБРОСА КЕША ПРИ СОЗДАНИИ ЗАПИСИ ЧЕРЕЗ API:
+    def test_post_invalidates_list(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(self.url, {"kinopoisk_id": 1003, "name": "Тестовый фильм #3"}, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(self.client.get(self.url).data["results"]) == 2
+
+    # ПРОВЕРКА ТОГО, ЧТО ПРИ ВЫКЛЮЧЕННОМ КЕШЕ ОТВЕТЫ ВСЕГДА ФОРМИРУЮТСЯ ИЗ БД:
+    def test_disabled_cache(self, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+        self.client.get(self.url)
+        response, queries = self.get_with_queries(self.url)
+        assert "X-Cache" not in response
+        assert queries > 0
+
+
+class TestSharedCache:
+    """Класс тестов для общего кеша процессов (CACHE_URL): версии данных, изменённые в одном процессе, видны остальным"""
+
+    SETTINGS_PATH = project_settings.BASE_DIR / "authors_books_project" / "settings.py"
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch, tmp_path):
+        self.monkeypatch = monkeypatch
+        monkeypatch.setattr(sys, "argv", ["manage.py", "runserver"])
+        for name in ("CACHE_URL", "RESPONSE_CACHE_ENABLED"):
+            monkeypatch.delenv(name, raising=False)
+        self.cache_url = f"file://{tmp_path / 'cache'}"
+
+    def load(self, **env):
+        """Настройки проекта (settings.py), прочитанные заново с переменными окружения env"""
+        for name, value in env.items():
+            self.monkeypatch.setenv(name, value)
+        return runpy.run_path(str(self.SETTINGS_PATH))
+
+    def bump_in_another_process(self, label, cache_url=""):
+        """Изменение версии данных в отдельном процессе с настройками тестов и общим кешем cache_url"""
+        code = "import django; django.setup(); from kinopoiskapiunofficial_tech_app.response_cache import bump_version; bump_version(%r)"
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "authors_books_project.settings_for_tests", "CACHE_URL": cache_url}
+        subprocess.run([sys.executable, "-c", code % label], cwd=project_settings.BASE_DIR, env=env, check=True, timeout=60)
+
+################################################################ SETTINGS ################################################################
+    # ПРОВЕРКА ВЫБОРА БЭКЕНДА ОБЩЕГО КЕША ПО CACHE_URL И ВКЛЮЧЕНИЯ КЕША ОТВЕТОВ ПО УМОЛЧАНИЮ ТОЛЬКО С НИМ:
+    @pytest.mark.parametrize("cache_url, backend, enabled", [
+        ("", "django.core.cache.backends.locmem.LocMemCache", False),
+        ("redis://cache:6379/0", "django.core.cache.backends.redis.RedisCache", True),
+        ("memcached://cache:11211", "django.core.cache.backends.memcached.PyMemcacheCache", True),
+    ])
+    def test_backend_from_cache_url(self, cache_url, backend, enabled):
+        loaded = self.load(CACHE_URL=cache_url)
+        assert loaded["CACHES"]["default"]["BACKEND"] == backend
+        assert loaded["RESPONSE_CACHE_ENABLED"] is enabled
+        assert self.load(CACHE_URL=cache_url, RESPONSE_CACHE_ENABLED="False")["RESPONSE_CACHE_ENABLED"] is False
+
+    # ПРОВЕРКА ОШИБКИ ПРИ НЕИЗВЕСТНОЙ СХЕМЕ АДРЕСА ОБЩЕГО КЕША:
+    def test_unknown_cache_url(self):
+        with pytest.raises(ValueError):
+            self.load(CACHE_URL="mongodb://cache")
+
+################################################################ VERSIONS ################################################################
+    # ПРОВЕРКА ТОГО, ЧТО НОВАЯ ВЕРСИЯ ДАННЫХ ИЗ ДРУГОГО ПРОЦЕССА ДОХОДИТ ЧЕРЕЗ НАСТРОЕННЫЙ ОБЩИЙ КЕШ И ЗАКЕШИРОВАННЫЙ ОТВЕТ ПЕРЕСТАЁТ НАХОДИТЬСЯ:
+    def test_version_bump_from_another_process(self, settings, rf):
+        settings.CACHES = self.load(CACHE_URL=self.cache_url)["CACHES"]
+        response_cache = ResponseCache("test", labels=("film", "actor"), maxsize=2, timeout=60)
+        request = Request(rf.get(reverse("api_v1:film-list"), {"year": 2001}))
+        bump_version("film", "actor")
+        old_key = response_cache.key(request)
+        response_cache.set(old_key, {"results": []})
+        actor_version = response_cache.versions()[1]
+
+        self.bump_in_another_process("film", self.cache_url)
+        new_key = response_cache.key(request)
+        assert new_key != old_key
+        assert response_cache.versions()[1] == actor_version
+        assert response_cache.get(new_key) is None
+
+    # ПРОВЕРКА ТОГО, ЧТО БЕЗ ОБЩЕГО КЕША (КЕШ В ПАМЯТИ ПРОЦЕССА) НОВАЯ ВЕРСИЯ ИЗ ДРУГОГО ПРОЦЕССА НЕ ВИДНА:
+    def test_process_local_cache_does_not_share_versions(self, settings):
+        settings.CACHES = self.load()["CACHES"]
+        response_cache = ResponseCache("test", labels=("film",), maxsize=2, timeout=60)
+        bump_version("film")
+        before = response_cache.versions()
+        self.bump_in_another_process("film")
+        assert response_cache.versions() == before
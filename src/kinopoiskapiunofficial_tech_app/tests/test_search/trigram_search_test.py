@@ -0,0 +1,95 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_search/trigram_search_test.py -v && coverage report
+"""
+
+import pytest
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from kinopoiskapiunofficial_tech_app import search
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+from kinopoiskapiunofficial_tech_app.search import RELEVANCE, TrigramSearchFilter, fold
+from kinopoiskapiunofficial_tech_app.views import FilmListView
+
+
+def postgresql_sql(queryset):
+    """SQL запроса в диалекте PostgreSQL (без подключения к серверу)"""
+    wrapper = DatabaseWrapper({**connection.settings_dict, "ENGINE": "django.db.backends.postgresql"}, alias="postgresql")
+    sql, params = queryset.query.get_compiler(connection=wrapper).as_sql()
+    return sql % tuple(repr(param) for param in params)
+
+
+@pytest.mark.django_db
+class TestTrigramSearch:
+    """Класс тестов для поиска фильмов и актёров по названию/имени без учёта регистра и е/ё"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.tree = Film.objects.create(kinopoisk_id=1001, name="Ёлки", year=2010)
+        self.hedgehog = Film.objects.create(kinopoisk_id=1002, name="Ежик в тумане", year=1975)
+        self.other = Film.objects.create(kinopoisk_id=2010, name="Тестовый фильм", year=2001)
+        self.actor = Actor.objects.create(staff_id=501, name="Пётр Фёдоров", profession="Актёр")
+        self.films_url = reverse("api_v1:film-list")
+        self.actors_url = reverse("api_v1:actor-list")
+
+    def names(self, response):
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(item["name"] for item in response.data["results"])
+
+################################################################ FOLDING ################################################################
+    # ПРОВЕРКА НОРМАЛИЗАЦИИ СТРОКИ ПОИСКОВОГО ЗАПРОСА:
+    def test_fold(self):
+        assert fold("ёлки") == fold("Елки") == "ЕЛКИ"
+
+    # ПРОВЕРКА ПОИСКА ФИЛЬМОВ ПО ?search= БЕЗ УЧЁТА РАЗНИЦЫ МЕЖДУ Е И Ё (В ОБЕ СТОРОНЫ):
+    @pytest.mark.parametrize("term, expected", [("Елки", ["Ёлки"]), ("Ёжик", ["Ежик в тумане"]), ("фильм", ["Тестовый фильм"])])
+    def test_search_films(self, term, expected):
+        assert self.names(self.client.get(self.films_url, {"search": term})) == expected
+
+    # ПРОВЕРКА ФИЛЬТРА ?name= С ТОЙ ЖЕ НОРМАЛИЗАЦИЕЙ:
+    def test_name_filter(self):
+        assert self.names(self.client.get(self.films_url, {"name": "Елк"})) == ["Ёлки"]
+        assert self.names(self.client.get(self.actors_url, {"name": "Петр Федоров"})) == ["Пётр Фёдоров"]
+
+    # ПРОВЕРКА ПОИСКА АКТЁРОВ ПО ПРОФЕССИИ:
+    def test_search_actors_by_profession(self):
+        assert self.names(self.client.get(self.actors_url, {"search": "Актер"})) == ["Пётр Фёдоров"]
+
+################################################################ EXACT FIELDS ################################################################
+    # ПРОВЕРКА ТОЧНОГО СОВПАДЕНИЯ ЧИСЛОВЫХ ПОЛЕЙ (kinopoisk_id, year) И ИХ ПРОПУСКА ДЛЯ НЕЧИСЛОВЫХ СЛОВ:
+    def test_numeric_fields(self):
+        assert self.names(self.client.get(self.films_url, {"search": "2010"})) == ["Ёлки", "Тестовый фильм"]
+        assert self.names(self.client.get(self.films_url, {"search": "201"})) == []
+        assert self.names(self.client.get(self.films_url, {"search": "99999999999999999999"})) == []
+
+    # ПРОВЕРКА ТОГО, ЧТО ВСЕ СЛОВА ЗАПРОСА ДОЛЖНЫ НАЙТИСЬ:
+    def test_all_terms_required(self):
+        assert self.names(self.client.get(self.films_url, {"search": "Ежик 1975"})) == ["Ежик в тумане"]
+        assert self.names(self.client.get(self.films_url, {"search": "Ежик 2010"})) == []
+
+################################################################ POSTGRESQL ################################################################
+    # ПРОВЕРКА SQL ДЛЯ PostgreSQL: УСЛОВИЕ ПО ВЫРАЖЕНИЮ ИНДЕКСА pg_trgm И РЕЛЕВАНТНОСТЬ ЧЕРЕЗ WORD_SIMILARITY:
+    def test_postgresql_sql(self, mocker):
+        mocker.patch.object(search, "is_postgresql", return_value=True)
+        request = Request(APIRequestFactory().get(self.films_url, {"search": "ёлки"}))
+        queryset = TrigramSearchFilter().filter_queryset(request, Film.objects.all(), FilmListView())
+        assert RELEVANCE in queryset.query.annotation_select
+        sql = postgresql_sql(queryset)
+        assert """REPLACE(UPPER("kinopoiskapiunofficial_tech_app_film"."name"), 'Ё', 'Е')::text LIKE '%ЕЛКИ%'""" in sql
+        assert "WORD_SIMILARITY('ЕЛКИ', REPLACE(UPPER(" in sql
+        assert "UPPER('" not in sql # без UPPER() над параметром - иначе выражение не совпало бы с индексом
+
+    # ПРОВЕРКА СОРТИРОВКИ ПО РЕЛЕВАНТНОСТИ, ЕСЛИ КЛИЕНТ НЕ ЗАДАЛ ordering:
+    def test_relevance_ordering(self, mocker):
+        mocker.patch.object(search, "is_postgresql", return_value=True)
+        mocker.patch.object(search, "word_similarity", side_effect=lambda term, field_name: search.folded(field_name, postgresql=False))
+        # ВМЕСТО WORD_SIMILARITY (ЕЁ НЕТ В sqlite3) "РЕЛЕВАНТНОСТЬЮ" СЛУЖИТ САМО НОРМАЛИЗОВАННОЕ НАЗВАНИЕ:
+        response = self.client.get(self.films_url, {"search": "Е"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["name"] for item in response.data["results"]] == ["Ёлки", "Ежик в тумане"]
+        assert RELEVANCE not in response.data["results"][0]
@@ -0,0 +1,101 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_single_flight/single_flight_test.py::TestSingleFlight -v && coverage report
+"""
+
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from kinopoiskapiunofficial_tech_app import single_flight
+from kinopoiskapiunofficial_tech_app.single_flight import SingleFlight, advisory_lock, advisory_lock_id, run_once, shared_cache_configured
+
+
+class TestSingleFlight:
+    """Класс тестов для объединения одинаковых одновременных вызовов (SingleFlight, advisory_lock, run_once)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        cache.clear()
+        self.single_flight = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow_sync(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return {"synced_count": self.calls}
+
+    def run_concurrently(self, target, count):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+        threads[0].start()
+        self.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1) # даём остальным потокам "встать в очередь" за первым вызовом
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    ################################################################ ОБЪЕДИНЕНИЕ ВЫЗОВОВ ВНУТРИ ПРОЦЕССА ################################################################
+    def test_concurrent_calls_share_one_execution(self):
+        results = self.run_concurrently(lambda: self.single_flight.do("sync-page:3", self.slow_sync), 5)
+        assert self.calls == 1
+        assert results == [{"synced_count": 1}] * 5
+
+    def test_different_keys_are_not_coalesced(self):
+        assert self.single_flight.do("sync-page:1", lambda: 1) == 1
+        assert self.single_flight.do("sync-page:2", lambda: 2) == 2
+
+    def test_error_is_shared_and_key_is_released(self):
+        def failing():
+            raise ValueError("API error")
+        with pytest.raises(ValueError, match="API error"):
+            self.single_flight.do("sync-page:3", failing)
+        assert self.single_flight.do("sync-page:3", lambda: "ok") == "ok"
+    ##########################################################################################################################################################################
+
+    ################################################################ МЕЖПРОЦЕССНАЯ БЛОКИРОВКА ################################################################
+    def test_advisory_lock_id_is_stable_signed_bigint(self):
+        assert advisory_lock_id("sync-page:3") == advisory_lock_id("sync-page:3")
+        assert advisory_lock_id("sync-page:3") != advisory_lock_id("sync-page:4")
+        assert -2**63 <= advisory_lock_id("sync-page:3") < 2**63
+
+    def test_advisory_lock_on_postgresql(self, mocker):
+        connection = mocker.MagicMock(vendor="postgresql")
+        cursor = connection.cursor.return_value.__enter__.return_value
+        mocker.patch.object(single_flight, "connections", {"default": connection})
+        with advisory_lock("sync-page:3"):
+            cursor.execute.assert_called_once_with("SELECT pg_advisory_lock(%s)", [advisory_lock_id("sync-page:3")])
+        cursor.execute.assert_called_with("SELECT pg_advisory_unlock(%s)", [advisory_lock_id("sync-page:3")])
+
+    def use_shared_cache(self, settings, tmp_path):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        assert shared_cache_configured()
+
+    def test_result_from_other_process_is_reused(self, settings, tmp_path):
+        self.use_shared_cache(settings, tmp_path)
+        # "ДРУГОЙ ПРОЦЕСС" ЗАВЕРШИЛ ТАКУЮ ЖЕ СИНХРОНИЗАЦИЮ, ПОКА МЫ ЖДАЛИ БЛОКИРОВКУ:
+        cache.set("single-flight:sync-page:3", {"result": {"synced_count": 7}, "finished_at": time.time() + 1})
+        assert run_once("sync-page:3", self.slow_sync) == {"synced_count": 7}
+        assert self.calls == 0
+
+    def test_stale_result_from_other_process_is_not_reused(self, settings, tmp_path):
+        self.use_shared_cache(settings, tmp_path)
+        cache.set("single-flight:sync-page:3", {"result": {"synced_count": 7}, "finished_at": time.time() - 60})
+        self.release.set()
+        assert run_once("sync-page:3", self.slow_sync) == {"synced_count": 1}
+
+    def test_process_local_cache_is_not_used_for_results(self):
+        # КЕШ В ПАМЯТИ ПРОЦЕССА ДРУГИМ ПРОЦЕССАМ НЕ ВИДЕН - РЕЗУЛЬТАТ В НЁМ НЕ ИЩЕТСЯ И НЕ СОХРАНЯЕТСЯ:
+        assert not shared_cache_configured()
+        cache.set("single-flight:sync-page:3", {"result": {"synced_count": 7}, "finished_at": time.time() + 1})
+        self.release.set()
+        assert run_once("sync-page:3", self.slow_sync) == {"synced_count": 1}
+        assert cache.get("single-flight:sync-page:3")["result"] == {"synced_count": 7}
+    ############################################################################################################################################################
@@ -0,0 +1,99 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_sparse_fields/sparse_fields_test.py -v && coverage report
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from kinopoiskapiunofficial_tech_app.models import Film, Actor
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+    """Класс тестов для выбора полей ответа (?fields=...) и раскрытия актёров (?expand=actors)"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.actors = [Actor.objects.create(staff_id=5000 + i, name=f"Тестовый актёр #{i}") for i in range(2)]
+        self.films = [Film.objects.create(kinopoisk_id=1000 + i, name=f"Тестовый фильм #{i}", year=2000 + i) for i in range(3)]
+        for film in self.films:
+            film.actors.set(self.actors)
+        self.films_url = reverse("api_v1:film-list")
+        self.film_url = reverse("api_v1:film-detail", kwargs={"pk": self.films[0].pk})
+        self.actors_url = reverse("api_v1:actor-list")
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return response, [query["sql"] for query in queries.captured_queries]
+
+################################################################ LIST ################################################################
+    # ПРОВЕРКА ПРЕЖНЕГО (ПОЛНОГО) ВИДА ОТВЕТА БЕЗ ПАРАМЕТРА fields:
+    def test_legacy_shape(self):
+        response, _ = self.get(self.films_url, {})
+        assert list(response.data["results"][0]) == ["id", "kinopoisk_id", "name", "year", "actors", "created_or_updated_at", "created_or_updated_at_formatted"]
+
+    # ПРОВЕРКА ВЫБОРА ПОЛЕЙ В ОБОИХ РЕЖИМАХ ЧТЕНИЯ: id ВСЕГДА, АКТЁРЫ НЕ ЗАПРАШИВАЮТСЯ ИЗ БД, ЛИШНИЕ СТОЛБЦЫ НЕ ЧИТАЮТСЯ:
+    @pytest.mark.parametrize("fast_read", [True, False])
+    def test_fields_without_cast(self, settings, fast_read):
+        settings.API_FAST_READ_ENABLED = fast_read
+        response, queries = self.get(self.films_url, {"fields": "name"})
+        assert response.data["results"] == [{"id": film.pk, "name": film.name} for film in self.films]
+        assert not any("film_actors" in sql for sql in queries)
+        page_query = queries[-1]
+        assert '"name"' in page_query and '"year"' not in page_query and '"created_or_updated_at"' not in page_query.split("FROM")[0]
+
+    # ПРОВЕРКА РАСКРЫТИЯ АКТЁРОВ ПО ?expand=actors В ОБОИХ РЕЖИМАХ ЧТЕНИЯ:
+    @pytest.mark.parametrize("fast_read", [True, False])
+    def test_expand_actors(self, settings, fast_read):
+        settings.API_FAST_READ_ENABLED = fast_read
+        response, queries = self.get(self.films_url, {"fields": "name", "expand": "actors"})
+        expected_actors = [{"id": actor.pk, "name": actor.name} for actor in self.actors]
+        assert response.data["results"][0] == {"id": self.films[0].pk, "name": self.films[0].name, "actors": expected_actors}
+
+    # ПРОВЕРКА ВЫЧИСЛЯЕМОГО ПОЛЯ (ДАТА В ФОРМАТЕ "дд.мм.гггг | чч:мм:сс" БЕЗ ISO-ПРЕДСТАВЛЕНИЯ):
+    @pytest.mark.parametrize("fast_read", [True, False])
+    def test_formatted_date_only(self, settings, fast_read):
+        settings.API_FAST_READ_ENABLED = fast_read
+        response, _ = self.get(self.actors_url, {"fields": "created_or_updated_at_formatted"})
+        assert list(response.data["results"][0]) == ["id", "created_or_updated_at_formatted"]
+
+    # ПРОВЕРКА ПАГИНАЦИИ ПО ПОЛЮ СОРТИРОВКИ, КОТОРОЕ НЕ ВЫВОДИТСЯ (ЕГО ЗНАЧЕНИЕ НУЖНО ДЛЯ КУРСОРА):
+    @pytest.mark.parametrize("fast_read", [True, False])
+    def test_ordering_by_unselected_field(self, settings, fast_read):
+        settings.API_FAST_READ_ENABLED = fast_read
+        response, queries = self.get(self.films_url, {"fields": "name", "ordering": "-year", "page_size": 2})
+        assert [film["name"] for film in response.data["results"]] == ["Тестовый фильм #2", "Тестовый фильм #1"]
+        response, _ = self.get(response.data["next"], {})
+        assert [film["name"] for film in response.data["results"]] == ["Тестовый фильм #0"]
+
+    # ПРОВЕРКА ОШИБКИ ДЛЯ НЕИЗВЕСТНЫХ ПОЛЕЙ И НЕДОПУСТИМОГО РАСКРЫТИЯ:
+    @pytest.mark.parametrize("params, key", [({"fields": "name,rating"}, "fields"), ({"fields": "name", "expand": "films"}, "expand")])
+    def test_unknown_fields(self, params, key):
+        response = self.client.get(self.films_url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert key in response.data
+########################################################################################################################################
+
+################################################################ DETAIL ################################################################
+    # ПРОВЕРКА ВЫБОРА ПОЛЕЙ ДЛЯ ОДНОЙ ЗАПИСИ (БЕЗ ЗАПРОСА АКТЁРОВ, С ОТДЕЛЬНЫМ ETag):
+    def test_detail(self):
+        response, queries = self.get(self.film_url, {"fields": "year"})
+        assert response.data == {"id": self.films[0].pk, "year": 2000}
+        full = self.client.get(self.film_url)
+        assert full.data["actors"] and full["ETag"] != response["ETag"]
+        assert sum("film_actors" in sql for sql in queries) == 1 # только агрегат для ETag, без подгрузки актёров
+
+    # ПРОВЕРКА ТОГО, ЧТО ВЫБОР ПОЛЕЙ НЕ ВЛИЯЕТ НА ЗАПИСЬ (ВСЕ ПОЛЯ СЕРИАЛИЗАТОРА ПРИНИМАЮТСЯ ПРИ ИЗМЕНЕНИИ):
+    def test_write_ignores_fields(self, django_user_model):
+        user = django_user_model.objects.create_user(username="username_for_test", password="password_for_test", is_staff=True)
+        self.client.force_authenticate(user=user)
+        response = self.client.patch(f"{self.film_url}?fields=id", {"year": 1999}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["year"] == 1999
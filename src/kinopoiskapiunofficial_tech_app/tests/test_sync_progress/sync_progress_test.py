@@ -0,0 +1,142 @@
+"""
+~/programming/django_projects/authors_books_api$ coverage run -m pytest src/kinopoiskapiunofficial_tech_app/tests/test_sync_progress/sync_progress_test.py::TestSyncProgress -v && coverage report
+"""
+
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from kinopoiskapiunofficial_tech_app.api_sync import APISynchronizer
+from kinopoiskapiunofficial_tech_app.sync_progress import SyncProgress
+
+
+User = get_user_model()
+
+
+async def read_stream(response):
+    return b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8")
+
+
+def parse_events(body):
+    events = []
+    for block in body.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.django_db
+class TestSyncProgress:
+    """Класс тестов для событий о ходе синхронизации и потока Server-Sent Events"""
+
+    # МЕТОД КЛАССА (ФИКСТУРА) С ДЕКОРАТОРОМ ДЛЯ ИНИЦИАЛИЗАЦИИ ВХОДНЫХ ДАННЫХ ПЕРЕД КАЖДЫМ ТЕСТОМ:
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="user_for_test", password="password_for_test", is_staff=False)
+        mocker.patch.object(APISynchronizer, "get_films", return_value={
+            "items": [{"kinopoiskId": 123, "nameRu": "Тестовый фильм", "year": 2014}],
+            "totalPages": 1,
+        })
+        mocker.patch.object(APISynchronizer, "get_actors", return_value=[
+            {"staffId": 456, "nameRu": "Тестовый актёр", "posterUrl": "https://example.com/poster_1.jpg", "professionText": "Актёр"},
+        ])
+        self.sync_url = reverse("api_v1:download-films-and-actors-by-get-method")
+
+    def progress_url(self, run_id):
+        return reverse("api_v1:download-films-and-actors-progress", kwargs={"run_id": run_id})
+
+    ################################################################ ПУБЛИКАЦИЯ СОБЫТИЙ ################################################################
+    def test_events_are_numbered_in_order(self):
+        progress = SyncProgress("run-1")
+        progress.publish("started", page=1)
+        progress.publish("film_started", kinopoisk_id=123)
+        events = progress.events_after(0)
+        assert [(seq, event["event"]) for seq, event in events] == [(1, "started"), (2, "film_started")]
+        assert [seq for seq, _ in progress.events_after(1)] == [2]
+        assert progress.events_after(2) == []
+
+    def test_events_after_stops_at_gap(self):
+        progress = SyncProgress("run-1")
+        progress.publish("started", page=1)
+        progress.publish("film_started", kinopoisk_id=123)
+        cache.delete(progress.key(1))
+        assert progress.events_after(0) == []
+
+    def test_invalid_run_id(self):
+        with pytest.raises(ValueError):
+            SyncProgress("../../etc")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.sync_url, {"run_id": "bad id!"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rate_limit_wait_is_published(self, mocker):
+        sleep = mocker.patch("kinopoiskapiunofficial_tech_app.api_sync.time.sleep")
+        limited = mocker.MagicMock(status_code=429, headers={"Retry-After": "2"})
+        ok = mocker.MagicMock(status_code=200)
+        ok.json.return_value = {"items": []}
+        mocker.patch("requests.get", side_effect=[limited, ok])
+        progress = SyncProgress("run-1")
+        assert APISynchronizer(progress=progress).make_request("https://kinopoiskapiunofficial.tech/api/v2.2/films") == {"items": []}
+        sleep.assert_called_once_with(2.0)
+        [(_, event)] = progress.events_after(0)
+        assert event["event"] == "rate_limit_wait"
+        assert event["data"] == {"url": "/films", "seconds": 2.0}
+    ######################################################################################################################################################
+
+    ################################################################ ПОТОК SERVER-SENT EVENTS ################################################################
+    def test_stream_of_finished_sync(self):
+        self.client.force_login(self.user) # поток событий - обычное (не DRF) представление, аутентифицируемся через сессию
+        response = self.client.get(self.sync_url, {"run_id": "run-1"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["run_id"] == "run-1"
+
+        response = self.client.get(self.progress_url("run-1"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        events = parse_events(async_to_sync(read_stream)(response))
+        assert [event for event, _ in events] == ["started", "film_started", "actors_written", "film_finished", "finished"]
+        assert events[2][1]["count"] == 1
+        assert events[-1][1]["synced_count"] == 1
+
+    def test_stream_resumes_after_last_event_id(self):
+        self.client.force_login(self.user) # поток событий - обычное (не DRF) представление, аутентифицируемся через сессию
+        self.client.get(self.sync_url, {"run_id": "run-1"})
+        response = self.client.get(self.progress_url("run-1"), HTTP_LAST_EVENT_ID="3")
+        events = parse_events(async_to_sync(read_stream)(response))
+        assert [event for event, _ in events] == ["film_finished", "finished"]
+
+    def test_stream_of_failed_sync(self, mocker):
+        mocker.patch.object(APISynchronizer, "get_films", side_effect=Exception("API error"))
+        self.client.force_login(self.user) # поток событий - обычное (не DRF) представление, аутентифицируемся через сессию
+        self.client.get(self.sync_url, {"run_id": "run-1"})
+        events = parse_events(async_to_sync(read_stream)(self.client.get(self.progress_url("run-1"))))
+        assert events[-1] == ("failed", {"message": "API error", "time": events[-1][1]["time"]})
+
+    def test_stream_warns_without_shared_cache(self, caplog):
+        self.client.force_login(self.user) # поток событий - обычное (не DRF) представление, аутентифицируемся через сессию
+        self.client.get(self.sync_url, {"run_id": "run-1"})
+        with caplog.at_level("WARNING", logger="kinopoiskapiunofficial_tech_app"):
+            self.client.get(self.progress_url("run-1"))
+        assert "без общего кеша" in caplog.text
+
+    def test_stream_does_not_warn_with_shared_cache(self, caplog, settings, tmp_path):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        self.client.force_login(self.user) # поток событий - обычное (не DRF) представление, аутентифицируемся через сессию
+        self.client.get(self.sync_url, {"run_id": "run-1"})
+        with caplog.at_level("WARNING", logger="kinopoiskapiunofficial_tech_app"):
+            events = parse_events(async_to_sync(read_stream)(self.client.get(self.progress_url("run-1"))))
+        assert "без общего кеша" not in caplog.text
+        assert events[-1][0] == "finished"
+
+    def test_stream_requires_authentication(self):
+        response = self.client.get(self.progress_url("run-1"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    ###########################################################################################################################################################
@@ -1,5 +1,6 @@
 from django.urls import path
-from .views import index, FilmListView, FilmDetailView, ActorListView, ActorDetailView, DownloadFilmsAndActorsByGETMethodView
+from .async_views import read_view
+from .views import index, FilmListView, FilmDetailView, ActorListView, ActorDetailView, ActorFilmListView, FilmExportView, ActorExportView, FilmBulkView, ActorBulkView, DownloadFilmsAndActorsByGETMethodView, sync_progress_stream
 
 
 app_name = "main"
@@ -7,11 +8,19 @@ app_name = "main"
 urlpatterns = [
     path("", index, name="index"), # страница таблицы с фильмами и актёрами
     
-    path("films/", FilmListView.as_view(), name="film-list"), # страница со списком фильмов
-    path("films/<int:pk>/", FilmDetailView.as_view(), name="film-detail"),  # страница фильма с искомым id/pk
+    # СПИСКИ И СТРАНИЦЫ ЗАПИСЕЙ: ПРИ API_ASYNC_READS ЧТЕНИЕ - АСИНХРОННОЕ (см. async_views.read_view):
+    path("films/", read_view(FilmListView), name="film-list"), # страница со списком фильмов
+    path("films/<int:pk>/", read_view(FilmDetailView), name="film-detail"),  # страница фильма с искомым id/pk
+    path("films/export.ndjson", FilmExportView.as_view(), name="film-export"), # выгрузка всех фильмов потоком (NDJSON)
+    path("films/bulk/", FilmBulkView.as_view(), name="film-bulk"), # пакетное создание/изменение/удаление фильмов
     
-    path("actors/", ActorListView.as_view(), name="actor-list"), # страница со списком актёров
-    path("actors/<int:pk>/", ActorDetailView.as_view(), name="actor-detail"),  # страница актёра с искомым id/pk
+    path("actors/", read_view(ActorListView), name="actor-list"), # страница со списком актёров
+    path("actors/<int:pk>/", read_view(ActorDetailView), name="actor-detail"),  # страница актёра с искомым id/pk
+    path("actors/<int:pk>/films/", ActorFilmListView.as_view(), name="actor-films"), # фильмы актёра
+    path("actors/films/", ActorFilmListView.as_view(), name="actor-films-batch"), # фильмы нескольких актёров (?actor_id=1,2,3)
+    path("actors/export.ndjson", ActorExportView.as_view(), name="actor-export"), # выгрузка всех актёров потоком (NDJSON)
+    path("actors/bulk/", ActorBulkView.as_view(), name="actor-bulk"), # пакетное создание/изменение/удаление актёров
 
     path("films-and-actors/download/get/", DownloadFilmsAndActorsByGETMethodView.as_view(), name="download-films-and-actors-by-get-method"),
+    path("films-and-actors/download/progress/<str:run_id>/", sync_progress_stream, name="download-films-and-actors-progress"), # поток событий (SSE) о ходе синхронизации
 ]
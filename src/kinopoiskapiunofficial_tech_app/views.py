@@ -1,23 +1,50 @@
 
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
 from django.db.models.functions import Cast
 from django.db.models import CharField
 
 from rest_framework import generics, permissions, authentication, status
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.views import APIView
 
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Film, Actor
-from .serializers import FilmSerializer, ActorSerializer
+from .serializers import FilmSerializer, ActorSerializer, FilmographySerializer
 
 from .custom_set_filters.films import FilmFilterSet
 from . custom_set_filters.actors import ActorFilterSet
 
 from .custom_permissions import ReadForAllCreateUpdateDeleteForOwnerOrAdmin, AuthenticatedOnly
 from .api_sync import APISynchronizer
+from .hit_counters import film_hits
+from .single_flight import run_once, shared_cache_configured
+from .sync_progress import RUN_ID_PATTERN, SyncProgress, stream_events
+from .pagination import KeysetPagination
+from .search import TrigramSearchFilter
+from .response_cache import CachedListMixin, film_list_cache, actor_list_cache, actor_films_cache
+from .conditional_requests import ConditionalListMixin, ConditionalDetailMixin
+from .fast_serializers import FastListMixin, FastFilmSerializer, FastActorSerializer, FastFilmographySerializer
+from .exports import stream_ndjson, astream_ndjson, acompress_sequence
+from .renderers import NDJSONRenderer, CompactJSONRenderer
+from .bulk import BulkWriteMixin
+from .sparse_fields import SparseFieldsMixin
+from .counts import RowCountMixin
+from .filmography import ORDERING as FILMOGRAPHY_ORDERING, filmography, parse_actor_ids
+from .async_views import AsyncListMixin, AsyncRetrieveMixin
+from .db_routing import may_fill_cache, may_read_cache
 
 import logging
 
@@ -25,39 +52,128 @@ import logging
 logger = logging.getLogger("kinopoiskapiunofficial_tech_app")
 
 
+def load_index_page(after=None, before=None):
+    """
+    Страница таблицы на основной странице: INDEX_PAGE_SIZE фильмов по порядку id после after (или перед before) с актёрами,
+    подгруженными одним запросом на всю страницу. Без OFFSET и COUNT, поэтому стоимость не растёт с количеством фильмов.
+    Граница, не являющаяся id существующего фильма, игнорируется (первая страница, is_first).
+    """
+    page_size = settings.INDEX_PAGE_SIZE
+    # ГРАНИЦЕЙ СТРАНИЦЫ МОЖЕТ БЫТЬ ТОЛЬКО id СУЩЕСТВУЮЩЕГО ФИЛЬМА (ИЗ ССЫЛОК ТАБЛИЦЫ):
+    for name, value in (("after", after), ("before", before)):
+        if value is not None and not Film.objects.filter(pk=value).exists():
+            logger.warning(f"Ошибка: параметр '{name}' основной страницы не является id фильма. Переданное значение: {value}!")
+            after = before = None
+    films = Film.objects.with_cast().only("id", "name", "year")
+    films = Film.objects.with_cast().only("id", "name", "year")
+    if before is not None:
+        rows = list(films.filter(id__lt=before).order_by("-id")[:page_size + 1])
+        has_previous, has_next = len(rows) > page_size, True
+        rows = rows[:page_size][::-1]
+    else:
+        rows = list((films.filter(id__gt=after) if after is not None else films).order_by("id")[:page_size + 1])
+        has_previous, has_next = after is not None, len(rows) > page_size
+        rows = rows[:page_size]
+    logger.info("Загружено %s записей о фильмах для страницы таблицы (после %s, до %s)!", len(rows), after, before)
+    return {
+        "films": rows,
+        "next_after": rows[-1].id if has_next and rows else None,
+        "previous_before": rows[0].id if has_previous and rows else None,
+        "is_first": after is None and before is None,
+    }
+
+
 def index(request):
-    """Функция представления для основной страницы с таблицей фильмов и связанных с ними актёров"""
+    """
+    Функция представления для основной страницы с таблицей фильмов и связанных с ними актёров:
+        -> фильмы выводятся страницами (?after=<id> - следующая, ?before=<id> - предыдущая, см. load_index_page());
+           id, не принадлежащий ни одному фильму, игнорируется (первая страница)
+        -> отрисованная таблица (шаблон index_table.html) кешируется с версиями данных фильмов и актёров из кеша ответов,
+           поэтому после любого изменения каталога страница отрисовывается заново, а до него - без запросов к БД;
+           только с общим кешем и включённым кешем ответов (см. ResponseCache.shared), иначе версии у каждого процесса свои
+        -> таблица с границей, не являющейся id фильма, не кешируется, поэтому произвольные числа не создают ключей кеша
+        -> в кеш попадают только таблицы, прочитанные из основной БД, а клиентам, которые должны видеть свои изменения,
+           кешированная таблица не отдаётся (см. db_routing.may_fill_cache() и may_read_cache())
+    """
 
     logger.debug("Запрос на получение записей о фильмах и актёрах в виде таблицы...")
 
-    films = Film.objects.all()
-    actors = Actor.objects.all()
-    logger.info(f"Успешно загружено {films.count()} записей о фильмах и {actors.count()} актёрах!")
-    
+    bounds = {}
+    for name in ("after", "before"):
+        value = request.GET.get(name)
+        if value is not None:
+            if not value.isdigit():
+                logger.warning(f"Ошибка: параметр '{name}' основной страницы не является числом. Переданное значение: {value}!")
+                continue
+            bounds[name] = int(value)
+    if len(bounds) > 1:
+        bounds.pop("before")
+
+    versions = None
+    if film_list_cache.shared:
+        try:
+            versions = film_list_cache.versions()
+        except Exception as e:
+            logger.warning(f"Не удалось получить версии данных для кеша основной страницы: {str(e)}!")
+
+    # БЕЗ ОБЩЕГО КЕША ИЛИ ВЕРСИЙ ДАННЫХ ТАБЛИЦА НЕ КЕШИРУЕТСЯ:
+    page_key = "|".join(f"{name}={value}" for name, value in bounds.items())
+    key = make_template_fragment_key("index_table", [page_key, "|".join(map(str, versions))]) if versions is not None else None
+
+    table = None
+    if key is not None and may_read_cache(request):
+        try:
+            table = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать таблицу основной страницы из кеша: {str(e)}!")
+    if table is None:
+        page = load_index_page(**bounds)
+        table = render_to_string("kinopoiskapiunofficial_tech_app/index_table.html", {"page": page}, request)
+        # ГРАНИЦА ОТБРОШЕНА В load_index_page() - ПОД КЛЮЧОМ С НЕЙ НИЧЕГО НЕ СОХРАНЯЕМ:
+        if key is not None and not (bounds and page["is_first"]) and may_fill_cache():
+            try:
+                cache.set(key, table, settings.INDEX_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Не удалось сохранить таблицу основной страницы в кеш: {str(e)}!")
+
     context = {
-        "films": films,
-        "actors": actors,
+        "table": table,
     }
     logger.debug("Контекст для шаблона сформирован!")
     
     return render(request, "kinopoiskapiunofficial_tech_app/index.html", context)
 
 
-class FilmListView(generics.ListCreateAPIView):
+class FilmListView(RowCountMixin, ConditionalListMixin, CachedListMixin, FastListMixin, SparseFieldsMixin, AsyncListMixin, generics.ListCreateAPIView):
     """Класс обработки запросов и возврата ответов для всех записей из таблицы "Film" подключённой БД с их последующей передачей на соответствующую страницу (в данном случае это localhost/api/v1/films)"""
 
-    queryset = Film.objects.all()
+    queryset = Film.objects.with_cast()
     serializer_class = FilmSerializer
+    fast_serializer_class = FastFilmSerializer # для чтения списка (см. fast_serializers.FastListMixin)
     permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
-    filter_backends = (DjangoFilterBackend, OrderingFilter, SearchFilter,)
+    filter_backends = (DjangoFilterBackend, OrderingFilter, TrigramSearchFilter,)
     filterset_class = FilmFilterSet
+    pagination_class = KeysetPagination
+    response_cache = film_list_cache
+    cast_field = "actors" # ETag списка меняется и при изменении состава актёров фильмов (см. ConditionalListMixin)
     ordering_fields = ("kinopoisk_id", "name", "year", "created_or_updated_at",)
-    search_fields = ("kinopoisk_id", "name", "year",)
+    search_fields = ("=kinopoisk_id", "%name", "=year",) # "%" - поиск по триграммному индексу, "=" - точное совпадение (см. search.TrigramSearchFilter)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        # УЧИТЫВАЕМ ОБРАЩЕНИЯ К ОТДАННЫМ ЗАПИСЯМ (ТОЛЬКО В ПАМЯТИ, БЕЗ ЗАПРОСОВ К БД):
+        film_hits.hit(*(film["id"] for film in response.data["results"]))
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        response = await super().alist(request, *args, **kwargs)
+        film_hits.hit(*(film["id"] for film in response.data["results"]))
+        return response
 
     def perform_create(self, serializer):
-        logger.debug(f"Сохранение новой записи о фильме для пользователя {self.request.user}...")
+        logger.debug("Сохранение новой записи о фильме для пользователя %s...", self.request.user)
         serializer.save(owner=self.request.user)
-        logger.info(f"Новая запись о фильме сохранена с владельцем {self.request.user}!")
+        logger.info("Новая запись о фильме сохранена с владельцем %s!", self.request.user)
 
     def get_view_name(self):
         logger.debug("Получение и вывод в шаблоне списка записей DRF заданного названия для фильмов...")
@@ -68,17 +184,33 @@ class FilmListView(generics.ListCreateAPIView):
         return "Страница API с фильмами"
 
 
-class FilmDetailView(generics.RetrieveUpdateDestroyAPIView):
+class FilmDetailView(ConditionalDetailMixin, SparseFieldsMixin, AsyncRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """Класс обработки запросов и возврата ответов для запрошенной по id записи из таблицы "Film" подключённой БД с её последующей передачей на соответствующую страницу (в данном случае это localhost/api/v1/films/<int:pk>)""" # <int:pk> - это id
 
-    queryset = Film.objects.all()
+    queryset = Film.objects.with_cast()
     serializer_class = FilmSerializer
     permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
+    cast_field = "actors" # ETag фильма меняется и при изменении состава его актёров
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        # УЧИТЫВАЕМ ОБРАЩЕНИЕ К ЗАПИСИ (ТОЛЬКО В ПАМЯТИ, БЕЗ ЗАПРОСОВ К БД):
+        film_hits.hit(response.data["id"])
+        return response
+
+    async def aretrieve(self, request, *args, **kwargs):
+        response = await super().aretrieve(request, *args, **kwargs)
+        film_hits.hit(response.data["id"])
+        return response
+
+    def not_modified(self, request, *args, **kwargs):
+        # ОТВЕТ 304 - ТОЖЕ ОБРАЩЕНИЕ К ЗАПИСИ:
+        film_hits.hit(int(kwargs["pk"]))
 
     def perform_create(self, serializer):
-        logger.debug(f"Сохранение новой записи о фильме для пользователя {self.request.user}...")
+        logger.debug("Сохранение новой записи о фильме для пользователя %s...", self.request.user)
         serializer.save(owner=self.request.user)
-        logger.info(f"Новая запись о фильме сохранена с владельцем {self.request.user}!")
+        logger.info("Новая запись о фильме сохранена с владельцем %s!", self.request.user)
     
     def get_view_name(self):
         logger.debug("Получение и вывод в шаблоне одной записи DRF заданного названия для одного фильма...")
@@ -89,21 +221,25 @@ class FilmDetailView(generics.RetrieveUpdateDestroyAPIView):
         return "Страница API с конкретным фильмом"
 
     
-class ActorListView(generics.ListCreateAPIView):
+class ActorListView(RowCountMixin, ConditionalListMixin, CachedListMixin, FastListMixin, SparseFieldsMixin, AsyncListMixin, generics.ListCreateAPIView):
     """Класс обработки запросов и возврата ответов для всех записей из таблицы "Actor" подключённой БД с их последующей передачей на соответствующую страницу (в данном случае это localhost/api/v1/actors)"""
 
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
+    fast_serializer_class = FastActorSerializer # для чтения списка (см. fast_serializers.FastListMixin)
     permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
-    filter_backends = (DjangoFilterBackend, OrderingFilter, SearchFilter,)
+    filter_backends = (DjangoFilterBackend, OrderingFilter, TrigramSearchFilter,)
     filterset_class = ActorFilterSet
+    pagination_class = KeysetPagination
+    response_cache = actor_list_cache
     ordering_fields = ("id", "staff_id", "name", "poster_url", "profession", "created_or_updated_at",)
-    search_fields = ("id", "staff_id", "name", "poster_url", "profession",)
+    search_fields = ("=id", "=staff_id", "%name", "=poster_url", "%profession",) # "%" - поиск по триграммному индексу, "=" - точное совпадение (см. search.TrigramSearchFilter)
+    expandable_fields = () # фильмы актёров страницы - через /actors/films/?actor_id=... (см. ActorFilmListView)
 
     def perform_create(self, serializer):
-        logger.debug(f"Сохранение новой записи об актёре для пользователя {self.request.user}...")
+        logger.debug("Сохранение новой записи об актёре для пользователя %s...", self.request.user)
         serializer.save(owner=self.request.user)
-        logger.info(f"Новая запись об актёре сохранена с владельцем {self.request.user}!")
+        logger.info("Новая запись об актёре сохранена с владельцем %s!", self.request.user)
     
     def get_view_name(self):
         logger.debug("Получение и вывод в шаблоне списка записей DRF заданного названия для актёров...")
@@ -114,17 +250,22 @@ class ActorListView(generics.ListCreateAPIView):
         return "Страница API с актёрами"
 
 
-class ActorDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ActorDetailView(ConditionalDetailMixin, SparseFieldsMixin, AsyncRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """Класс обработки запросов и возврата ответов для запрошенной по id записи из таблицы "Actor" подключённой БД с её последующей передачей на соответствующую страницу (в данном случае это localhost/api/v1/actors/<int:pk>)""" # <int:pk> - это id
 
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
     permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
 
+    @property
+    def cast_field(self):
+        # С ?expand=films ETag АКТЁРА МЕНЯЕТСЯ И ПРИ ИЗМЕНЕНИИ ЕГО ФИЛЬМОВ (см. ConditionalDetailMixin):
+        return "film_actors" if "films" in (self.get_selected_fields() or ()) else None
+
     def perform_create(self, serializer):
-        logger.debug(f"Сохранение новой записи об актёре для пользователя {self.request.user}...")
+        logger.debug("Сохранение новой записи об актёре для пользователя %s...", self.request.user)
         serializer.save(owner=self.request.user)
-        logger.info(f"Новая запись об актёре сохранена с владельцем {self.request.user}!")
+        logger.info("Новая запись об актёре сохранена с владельцем %s!", self.request.user)
     
     def get_view_name(self):
         logger.debug("Получение и вывод в шаблоне одной записи DRF заданного названия для актёров, относящихся к одному фильму...")
@@ -135,6 +276,125 @@ class ActorDetailView(generics.RetrieveUpdateDestroyAPIView):
         return "Страница API с конкретным актёром"
 
 
+class ActorFilmListView(RowCountMixin, ConditionalListMixin, CachedListMixin, FastListMixin, SparseFieldsMixin, generics.ListAPIView):
+    """
+    Класс вывода фильмографии актёров (см. filmography.filmography()):
+        -> localhost/api/v1/actors/<int:pk>/films/ - фильмы одного актёра
+        -> localhost/api/v1/actors/films/?actor_id=1,2,3 - фильмы нескольких актёров одним запросом (у каждого фильма - actor_id)
+    Фильмы выбираются одним запросом по индексу промежуточной таблицы (actor_id, film_id) в том же порядке, поэтому курсорная
+    пагинация не сортирует выборку отдельно.
+    """
+
+    queryset = Film.objects.with_cast()
+    serializer_class = FilmographySerializer
+    fast_serializer_class = FastFilmographySerializer # для чтения списка (см. fast_serializers.FastListMixin)
+    permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
+    filter_backends = ()
+    pagination_class = KeysetPagination
+    response_cache = actor_films_cache
+    cast_field = "actors"
+    ordering = FILMOGRAPHY_ORDERING
+
+    def get(self, request, *args, **kwargs):
+        if "pk" in kwargs and not Actor.objects.filter(pk=kwargs["pk"]).exists():
+            logger.warning(f"Запрошена фильмография несуществующего актёра {kwargs['pk']}!")
+            raise NotFound("Актёр не найден.")
+        return super().get(request, *args, **kwargs)
+
+    def get_actor_ids(self):
+        if not hasattr(self, "_actor_ids"):
+            self._actor_ids = [self.kwargs["pk"]] if "pk" in self.kwargs else parse_actor_ids(self.request)
+        return self._actor_ids
+
+    def get_queryset(self):
+        return filmography(self.get_actor_ids(), super().get_queryset())
+
+    def get_view_name(self):
+        return "Фильмы актёра" if "pk" in self.kwargs else "Фильмы актёров"
+
+
+class NDJSONExportView(generics.GenericAPIView):
+    """
+    Базовый класс выгрузки всех (отфильтрованных) записей таблицы потоком в формате NDJSON (см. exports.stream_ndjson).
+    Под ASGI поток - асинхронный (exports.astream_ndjson): синхронный генератор ASGI-обработчик Django прочитал бы в память целиком.
+    Если клиент принимает gzip (заголовок Accept-Encoding), поток сжимается "на лету".
+    """
+
+    permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
+    renderer_classes = (NDJSONRenderer, CompactJSONRenderer,) # второй - для ошибок клиентам, которые принимают только application/json
+    filter_backends = (DjangoFilterBackend,)
+    fast_serializer_class = None
+    filename = None
+
+    ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+    def get(self, request):
+        # НЕКОРРЕКТНЫЕ ФИЛЬТРЫ ПРОВЕРЯЮТСЯ ЗДЕСЬ (DjangoFilterBackend ВОЗВРАЩАЕТ 400), ДО НАЧАЛА ПОТОКА:
+        queryset = self.filter_queryset(self.get_queryset()).order_by("id")
+        logger.debug("Запуск выгрузки записей %s в формате NDJSON. Пользователь: %s, параметры: %s", queryset.model.__name__, request.user, request.GET)
+
+        gzip = bool(self.ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")))
+        if isinstance(request._request, ASGIRequest):
+            stream = astream_ndjson(queryset, self.fast_serializer_class())
+            stream = acompress_sequence(stream) if gzip else stream
+        else:
+            stream = stream_ndjson(queryset, self.fast_serializer_class())
+            stream = compress_sequence(stream) if gzip else stream
+        response = StreamingHttpResponse(stream, content_type=NDJSONRenderer.media_type)
+        if gzip:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        response["Content-Disposition"] = f'attachment; filename="{self.filename}"'
+        response["X-Accel-Buffering"] = "no" # отключаем буферизацию ответа в nginx
+        return response
+
+
+class FilmExportView(NDJSONExportView):
+    """Класс выгрузки всех записей из таблицы "Film" потоком в формате NDJSON (localhost/api/v1/films/export.ndjson)"""
+
+    queryset = Film.objects.all()
+    filterset_class = FilmFilterSet
+    fast_serializer_class = FastFilmSerializer
+    filename = "films.ndjson"
+
+    def get_view_name(self):
+        return "Выгрузка фильмов"
+
+
+class ActorExportView(NDJSONExportView):
+    """Класс выгрузки всех записей из таблицы "Actor" потоком в формате NDJSON (localhost/api/v1/actors/export.ndjson)"""
+
+    queryset = Actor.objects.all()
+    filterset_class = ActorFilterSet
+    fast_serializer_class = FastActorSerializer
+    filename = "actors.ndjson"
+
+    def get_view_name(self):
+        return "Выгрузка актёров"
+
+
+class FilmBulkView(BulkWriteMixin, generics.GenericAPIView):
+    """Класс пакетного создания, изменения и удаления записей из таблицы "Film" (localhost/api/v1/films/bulk/, см. bulk.BulkWriteMixin)"""
+
+    queryset = Film.objects.with_cast()
+    serializer_class = FilmSerializer
+    permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
+
+    def get_view_name(self):
+        return "Пакетная запись фильмов"
+
+
+class ActorBulkView(BulkWriteMixin, generics.GenericAPIView):
+    """Класс пакетного создания, изменения и удаления записей из таблицы "Actor" (localhost/api/v1/actors/bulk/, см. bulk.BulkWriteMixin)"""
+
+    queryset = Actor.objects.all()
+    serializer_class = ActorSerializer
+    permission_classes = (ReadForAllCreateUpdateDeleteForOwnerOrAdmin,)
+
+    def get_view_name(self):
+        return "Пакетная запись актёров"
+
+
 class DownloadFilmsAndActorsByGETMethodView(APIView):
     
     authentication_classes = (authentication.SessionAuthentication, authentication.BasicAuthentication,)
@@ -143,24 +403,40 @@ class DownloadFilmsAndActorsByGETMethodView(APIView):
     def get(self, request):
         """Эндпоинт для загрузки информации о фильмах в базу данных (localhost) через браузер (GET-методом)"""
 
-        logger.debug(f"GET-запрос для синхронизации фильмов и актёров. Пользователь: {request.user}, параметры: {request.GET}")
+        logger.debug("GET-запрос для синхронизации фильмов и актёров. Пользователь: %s, параметры: %s", request.user, request.GET)
 
+        # ЕСЛИ КЛИЕНТ ПЕРЕДАЛ СВОЙ run_id, ПУБЛИКУЕМ ХОД СИНХРОНИЗАЦИИ ДЛЯ ПОТОКА СОБЫТИЙ (см. sync_progress_stream):
+        run_id = request.GET.get("run_id")
+        if run_id is not None and not RUN_ID_PATTERN.match(run_id):
+            logger.warning(f"Ошибка: некорректный параметр 'run_id'. Переданное значение: {run_id}!")
+            return Response(
+                {"error": "Параметр 'run_id' может содержать только буквы, цифры, '_' и '-' (не более 64 символов)!"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        progress = SyncProgress(run_id) if run_id is not None else None
         try:
-            api = APISynchronizer()
+            # В ЗАПРОСЕ НЕ ЖДЁМ СНЯТИЯ ЛИМИТА API ДОЛЬШЕ API_RATE_LIMIT_REQUEST_MAX_WAIT - ОШИБКА СРАЗУ ВОЗВРАЩАЕТСЯ КЛИЕНТУ:
+            api = APISynchronizer(progress=progress, max_wait=settings.API_RATE_LIMIT_REQUEST_MAX_WAIT)
             # ПОЛУЧАЕМ ЗНАЧЕНИЕ СТРАНИЦЫ ИЗ GET-ПАРАМЕТРОВ И ПРЕОБРАЗУЕМ ЕГО В ЧИСЛО (int()):
             page = int(request.GET.get("page", 1))
-            logger.debug(f"Запуск синхронизации для страницы {page}...")
-            result = api.sync_films_and_actors(page=page, user=request.user)
-            logger.info(f"Успешно синхронизировано {result['synced_count']} фильмов и актёров. Страница {result['current_page']} из {result['total_pages']}!")
-            return Response(
-                {
-                    "message": f"Информация о {result['synced_count']} фильмах и их актёрах успешно загружена в Вашу базу данных!",
-                    "page": result["current_page"],
-                    "total_pages": result["total_pages"]
-                },
-                status=status.HTTP_200_OK
-            )
+            logger.debug("Запуск синхронизации для страницы %s...", page)
+            # ОДНОВРЕМЕННЫЕ ЗАПРОСЫ НА СИНХРОНИЗАЦИЮ ОДНОЙ И ТОЙ ЖЕ СТРАНИЦЫ ОБЪЕДИНЯЮТСЯ В ОДНУ СИНХРОНИЗАЦИЮ С ОБЩИМ РЕЗУЛЬТАТОМ:
+            result = run_once(f"sync-page:{page}", lambda: api.sync_films_and_actors(page=page, user=request.user))
+            logger.info("Успешно синхронизировано %s фильмов и актёров. Страница %s из %s!", result['synced_count'], result['current_page'], result['total_pages'])
+            data = {
+                "message": f"Информация о {result['synced_count']} фильмах и их актёрах успешно загружена в Вашу базу данных!",
+                "page": result["current_page"],
+                "total_pages": result["total_pages"]
+            }
+            if progress is not None:
+                # ЗАВЕРШАЮЩЕЕ СОБЫТИЕ ПУБЛИКУЕТ ПРЕДСТАВЛЕНИЕ, А НЕ СИНХРОНИЗАТОР: ТАК ЕГО ПОЛУЧАТ И ЗАПРОСЫ, "ПРИСОЕДИНИВШИЕСЯ" К ЧУЖОЙ СИНХРОНИЗАЦИИ
+                progress.publish("finished", **result)
+                data["run_id"] = run_id
+            return Response(data, status=status.HTTP_200_OK)
         except ValueError:
+            if progress is not None:
+                progress.publish("failed", message="Параметр 'page' должен иметь числовое значение!")
             logger.warning(f"Ошибка: параметр 'page' не является числом. Переданное значение: {request.GET.get('page')}!")
             return Response(
                 {"error": "Параметр 'page' должен иметь числовое значение!"},
@@ -168,7 +444,39 @@ class DownloadFilmsAndActorsByGETMethodView(APIView):
             )
         except Exception as e:
             logger.error(f"Ошибка при синхронизации фильмов и актёров: {str(e)}!", exc_info=True)
+            if progress is not None:
+                progress.publish("failed", message=str(e))
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+
+async def sync_progress_stream(request, run_id):
+    """
+    Асинхронная функция представления для потока событий (Server-Sent Events) о ходе синхронизации с заданным run_id
+    (run_id передаётся клиентом в параметре запроса к DownloadFilmsAndActorsByGETMethodView)
+    """
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Учетные данные не были предоставлены."}, status=status.HTTP_403_FORBIDDEN)
+    try:
+        progress = SyncProgress(run_id)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # ПРИ ПЕРЕПОДКЛЮЧЕНИИ БРАУЗЕР ПРИСЫЛАЕТ НОМЕР ПОСЛЕДНЕГО ПОЛУЧЕННОГО СОБЫТИЯ - ПРОДОЛЖАЕМ С НЕГО:
+    try:
+        last_seq = int(request.headers.get("Last-Event-ID", 0))
+    except ValueError:
+        last_seq = 0
+    logger.debug("Подключение к потоку событий синхронизации %s. Пользователь: %s, последнее событие: %s...", run_id, user, last_seq)
+    if not shared_cache_configured():
+        # СОБЫТИЯ ВИДНЫ ТОЛЬКО В ТОМ ПРОЦЕССЕ, ГДЕ ИДЁТ СИНХРОНИЗАЦИЯ (СМ. CACHE_URL В НАСТРОЙКАХ):
+        logger.warning(f"Поток событий синхронизации {run_id} отдаётся без общего кеша: события синхронизации, запущенной другим процессом, в нём не появятся!")
+
+    response = StreamingHttpResponse(stream_events(progress, last_seq=last_seq), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no" # отключаем буферизацию ответа в nginx
+    return response